@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""CPU 실행 프로파일 벤치마크: 기존 설정(fp16 + 어텐션 슬라이싱 1) vs CPU 프로파일의 스텝당 지연 시간
+
+축소된 SD15 구조 UNet에 각 프로파일을 apply_profile()로 적용하고
+같은 입력으로 UNet 한 스텝(forward)을 반복 실행하여 스텝당 시간을 비교합니다.
+CPU 프로파일은 fp32 + SDPA + channels_last이며, bf16 지원 CPU면 bf16 autocast 변형도 측정합니다.
+
+사용 예:
+    python bench/bench_cpu_profile.py --scale 4 --resolution 64
+    python bench/bench_cpu_profile.py --threads 8 --interop-threads 1 --bf16 on
+"""
+
+import argparse
+import dataclasses
+import logging
+import os
+import statistics
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from diffusers import UNet2DConditionModel
+
+from src.nicediff.domains.generation.services.execution_profile import (
+    CUDA_PROFILE, resolve_profile, apply_profile, apply_thread_settings, cpu_supports_bf16
+)
+
+
+class UnetOnlyPipeline:
+    """apply_profile이 사용하는 부분(unet, 어텐션 슬라이싱 on/off)만 가진 파이프라인"""
+
+    def __init__(self, unet):
+        self.unet = unet
+
+    def enable_attention_slicing(self, slice_size=1):
+        self.unet.set_attention_slice(slice_size)
+
+    def disable_attention_slicing(self):
+        self.unet.set_attention_slice(None)  # 기본 SDPA 프로세서로 복귀
+
+
+def build_unet(scale: int, dtype: torch.dtype):
+    """축소된 SD15 구조 UNet (가중치는 같은 시드로 초기화)"""
+    torch.manual_seed(0)
+    width = 32 * scale
+    unet = UNet2DConditionModel(
+        block_out_channels=(width, width * 2, width * 4), layers_per_block=2, sample_size=32,
+        in_channels=4, out_channels=4, cross_attention_dim=width * 2, attention_head_dim=8,
+        down_block_types=('CrossAttnDownBlock2D', 'CrossAttnDownBlock2D', 'DownBlock2D'),
+        up_block_types=('UpBlock2D', 'CrossAttnUpBlock2D', 'CrossAttnUpBlock2D'),
+    )
+    return unet.to(dtype=dtype).eval(), width * 2
+
+
+def time_steps(unet, inputs, steps: int) -> list:
+    """UNet forward 반복 실행 후 스텝별 시간(ms)"""
+    times = []
+    with torch.no_grad():
+        for _ in range(steps + 2):
+            started = time.perf_counter()
+            unet(*inputs)
+            times.append((time.perf_counter() - started) * 1000)
+    return times[2:]  # 워밍업 제외
+
+
+def run_profile(profile, args) -> list:
+    unet, context_dim = build_unet(args.scale, profile.dtype)
+    apply_profile(UnetOnlyPipeline(unet), profile)
+    sample = torch.randn(1, 4, args.resolution, args.resolution, dtype=profile.dtype)
+    if profile.channels_last:
+        sample = sample.to(memory_format=torch.channels_last)
+    inputs = (sample, torch.tensor([500]), torch.randn(1, 77, context_dim, dtype=profile.dtype))
+    return time_steps(unet, inputs, args.steps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=4, help='채널 크기 배율 (클수록 큰 UNet)')
+    parser.add_argument('--resolution', type=int, default=64, help='잠재 공간 해상도')
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=None, help='intra-op 스레드 수 (기본: torch 기본값)')
+    parser.add_argument('--interop-threads', type=int, default=None, help='inter-op 스레드 수')
+    parser.add_argument('--bf16', choices=['auto', 'on', 'off'], default='auto',
+                        help='bf16 autocast 변형 측정 여부 (auto: CPU가 지원할 때만)')
+    args = parser.parse_args()
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    # 기존 동작: GPU 프로파일에서 CUDA 전용 항목(오프로드/xformers)만 뺀 것
+    legacy = dataclasses.replace(CUDA_PROFILE, name='legacy', cpu_offload=False, xformers=False, vae_slicing=False)
+    cpu = resolve_profile('cpu', {'bf16_autocast': False, 'num_threads': args.threads,
+                                  'num_interop_threads': args.interop_threads})
+    apply_thread_settings(cpu)
+    modes = [('legacy (fp16, slicing 1)', legacy), ('cpu (fp32, sdpa, CL)', cpu)]
+    if args.bf16 == 'on' or (args.bf16 == 'auto' and cpu_supports_bf16()):
+        modes.append(('cpu + bf16 autocast', dataclasses.replace(cpu, autocast_dtype=torch.bfloat16)))
+
+    print(f"\n🔧 UNet x{args.scale}, {args.resolution}x{args.resolution} 잠재, {args.steps}스텝, "
+          f"스레드 {torch.get_num_threads()}/{torch.get_num_interop_threads()}, bf16 지원: {cpu_supports_bf16()}")
+    print(f"{'mode':<26} | {'mean (ms)':>9} | {'median (ms)':>11} | {'min (ms)':>8}")
+    print('-' * 64)
+    medians = {}
+    for mode, profile in modes:
+        try:
+            times = run_profile(profile, args)
+        except (RuntimeError, NotImplementedError) as e:
+            print(f"{mode:<26} | 실패: {e}")
+            continue
+        medians[mode] = statistics.median(times)
+        print(f"{mode:<26} | {statistics.mean(times):>9.2f} | {statistics.median(times):>11.2f} | {min(times):>8.2f}")
+
+    baseline = medians.get(modes[0][0])
+    if baseline:
+        for mode, median in list(medians.items())[1:]:
+            print(f"\n{mode}: 기존 대비 {baseline / median:.2f}배 (median 비교)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""생성 대기열 묶음 실행 벤치마크: 작업 N개를 하나씩 실행할 때와 한 번에 묶어 실행할 때의 처리량(images/sec)
+
+축소된 SD15 구조 UNet(CPU)으로 파이프라인의 디노이즈 루프(CFG로 배치 2배 forward + 스케줄러 step)를 재현합니다.
+Txt2ImgMode.generate_batch와 같이 프롬프트 임베딩을 이어 붙이고 샘플마다 생성기를 따로 써서 초기 노이즈를 만들며,
+묶음 크기별(기본 1/2/4/8) 처리량과 묶음 1 대비 배율, 단독 실행과의 결과 차이(최대 절대 오차)를 출력합니다.
+
+사용 예:
+    python bench/bench_generation_batch.py --scale 2 --resolution 32 --steps 10
+    python bench/bench_generation_batch.py --batches 1 2 4 8 16 --threads 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from diffusers import UNet2DConditionModel, EulerDiscreteScheduler
+
+
+def build_unet(scale: int):
+    """축소된 SD15 구조 UNet (가중치는 같은 시드로 초기화)"""
+    torch.manual_seed(0)
+    width = 32 * scale
+    unet = UNet2DConditionModel(
+        block_out_channels=(width, width * 2, width * 4), layers_per_block=2, sample_size=32,
+        in_channels=4, out_channels=4, cross_attention_dim=width * 2, attention_head_dim=8,
+        down_block_types=('CrossAttnDownBlock2D', 'CrossAttnDownBlock2D', 'DownBlock2D'),
+        up_block_types=('UpBlock2D', 'CrossAttnUpBlock2D', 'CrossAttnUpBlock2D'),
+    )
+    return unet.eval(), width * 2
+
+
+def make_jobs(count: int, context_dim: int) -> list:
+    """프롬프트(임베딩)와 시드만 다른 작업들"""
+    jobs = []
+    for i in range(count):
+        embed_generator = torch.Generator().manual_seed(1000 + i)
+        jobs.append({
+            'seed': 42 + i,
+            'prompt_embeds': torch.randn(1, 77, context_dim, generator=embed_generator),
+            'negative_prompt_embeds': torch.zeros(1, 77, context_dim),
+        })
+    return jobs
+
+
+def denoise(unet, scheduler, jobs: list, args) -> torch.Tensor:
+    """파이프라인 디노이즈 루프 재현 (작업 묶음 하나 = UNet forward 한 번/스텝)"""
+    latents = torch.cat([
+        torch.randn(1, 4, args.resolution, args.resolution, generator=torch.Generator().manual_seed(job['seed']))
+        for job in jobs
+    ])
+    prompt_embeds = torch.cat([torch.cat([job['negative_prompt_embeds'] for job in jobs]),
+                               torch.cat([job['prompt_embeds'] for job in jobs])])
+    scheduler.set_timesteps(args.steps)
+    latents = latents * scheduler.init_noise_sigma
+    with torch.no_grad():
+        for t in scheduler.timesteps:
+            model_input = scheduler.scale_model_input(torch.cat([latents] * 2), t)
+            noise_uncond, noise_text = unet(model_input, t, encoder_hidden_states=prompt_embeds).sample.chunk(2)
+            noise_pred = noise_uncond + args.cfg * (noise_text - noise_uncond)
+            latents = scheduler.step(noise_pred, t, latents).prev_sample
+    return latents
+
+
+def run(unet, jobs: list, batch: int, args) -> tuple:
+    """작업 목록을 batch개씩 묶어 실행. (images/sec, 결과 latents)"""
+    scheduler = EulerDiscreteScheduler(beta_start=0.00085, beta_end=0.012, beta_schedule='scaled_linear')
+    denoise(unet, scheduler, jobs[:batch], args)  # 워밍업
+    outputs = []
+    started = time.perf_counter()
+    for i in range(0, len(jobs), batch):
+        outputs.append(denoise(unet, scheduler, jobs[i:i + batch], args))
+    elapsed = time.perf_counter() - started
+    return len(jobs) / elapsed, torch.cat(outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=2, help='채널 크기 배율 (클수록 큰 UNet)')
+    parser.add_argument('--resolution', type=int, default=32, help='잠재 공간 해상도')
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--cfg', type=float, default=7.0)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 2, 4, 8], help='측정할 묶음 크기')
+    parser.add_argument('--jobs', type=int, default=None, help='작업 수 (기본: 가장 큰 묶음 크기)')
+    parser.add_argument('--threads', type=int, default=None, help='intra-op 스레드 수 (기본: torch 기본값)')
+    args = parser.parse_args()
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    unet, context_dim = build_unet(args.scale)
+    jobs = make_jobs(args.jobs or max(args.batches), context_dim)
+
+    print(f"\n🔧 UNet x{args.scale}, {args.resolution}x{args.resolution} 잠재, {args.steps}스텝, "
+          f"작업 {len(jobs)}개, 스레드 {torch.get_num_threads()}")
+    print(f"{'batch':>5} | {'images/sec':>10} | {'speedup':>7} | {'max abs diff':>12}")
+    print('-' * 46)
+    baseline, reference = None, None
+    for batch in args.batches:
+        throughput, latents = run(unet, jobs, batch, args)
+        if baseline is None:
+            baseline, reference = throughput, latents
+        diff = (latents - reference).abs().max().item()
+        print(f"{batch:>5} | {throughput:>10.2f} | {throughput / baseline:>6.2f}x | {diff:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""LoRA 실행 벤치마크: 비융합(어댑터 연산) vs 융합(FusedLoraCache)의 스텝당 지연 시간
+
+축소된 SD15 구조 UNet에 LoRA 어댑터 여러 개를 붙이고
+같은 입력으로 UNet 한 스텝(forward)을 반복 실행하여 스텝당 시간을 비교합니다.
+융합 비용(델타 새로 계산 / 캐시된 델타 재적용)과 해제 비용도 함께 측정합니다.
+
+사용 예:
+    python bench/bench_lora_fuse.py --loras 5 --scale 4
+    python bench/bench_lora_fuse.py --loras 5 --scale 8 --device cuda --dtype float16
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from diffusers import UNet2DConditionModel
+from peft import LoraConfig
+
+from src.nicediff.domains.generation.services.fused_lora_cache import FusedLoraCache
+
+
+class UnetOnlyPipeline:
+    """FusedLoraCache가 사용하는 부분(unet, disable_lora/enable_lora)만 가진 파이프라인"""
+
+    def __init__(self, unet):
+        self.unet = unet
+
+    def disable_lora(self):
+        self.unet.disable_lora()
+
+    def enable_lora(self):
+        self.unet.enable_lora()
+
+
+def build_unet(scale: int, num_loras: int, rank: int, device: str, dtype: torch.dtype):
+    """축소된 SD15 구조 UNet + 무작위 LoRA 어댑터"""
+    torch.manual_seed(0)
+    width = 32 * scale
+    unet = UNet2DConditionModel(
+        block_out_channels=(width, width * 2, width * 4), layers_per_block=2, sample_size=32,
+        in_channels=4, out_channels=4, cross_attention_dim=width * 2, attention_head_dim=8,
+        down_block_types=('CrossAttnDownBlock2D', 'CrossAttnDownBlock2D', 'DownBlock2D'),
+        up_block_types=('UpBlock2D', 'CrossAttnUpBlock2D', 'CrossAttnUpBlock2D'),
+    )
+    names = []
+    for i in range(num_loras):
+        name = f'lora_{i}'
+        unet.add_adapter(LoraConfig(r=rank, lora_alpha=rank, target_modules=['to_q', 'to_k', 'to_v', 'to_out.0']),
+                         adapter_name=name)
+        names.append(name)
+    with torch.no_grad():
+        for param_name, param in unet.named_parameters():
+            if 'lora_B' in param_name:
+                param.normal_(std=0.01)  # 기본 초기화(0)면 델타가 0이라 비현실적
+    unet.set_adapters(names, weights=[0.6] * len(names))
+    return unet.to(device=device, dtype=dtype).eval(), names, width * 2
+
+
+def time_steps(unet, inputs, steps: int, device: str) -> list:
+    """UNet forward 반복 실행 후 스텝별 시간(ms)"""
+    times = []
+    with torch.no_grad():
+        for _ in range(steps + 2):
+            if device.startswith('cuda'):
+                torch.cuda.synchronize()
+            started = time.perf_counter()
+            unet(*inputs)
+            if device.startswith('cuda'):
+                torch.cuda.synchronize()
+            times.append((time.perf_counter() - started) * 1000)
+    return times[2:]  # 워밍업 제외
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loras', type=int, default=5, help='동시에 적용할 LoRA 개수')
+    parser.add_argument('--rank', type=int, default=16)
+    parser.add_argument('--scale', type=int, default=4, help='채널 크기 배율 (클수록 큰 UNet)')
+    parser.add_argument('--resolution', type=int, default=64, help='잠재 공간 해상도')
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--dtype', choices=['float32', 'float16', 'bfloat16'], default='float32')
+    args = parser.parse_args()
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    dtype = getattr(torch, args.dtype)
+    unet, names, context_dim = build_unet(args.scale, args.loras, args.rank, args.device, dtype)
+    inputs = (
+        torch.randn(1, 4, args.resolution, args.resolution, device=args.device, dtype=dtype),
+        torch.tensor([500], device=args.device),
+        torch.randn(1, 77, context_dim, device=args.device, dtype=dtype),
+    )
+    pipeline = UnetOnlyPipeline(unet)
+    cache = FusedLoraCache()
+    key = 'bench||' + '|'.join(names)
+
+    print(f"\n🔧 UNet x{args.scale}, LoRA {args.loras}개 (rank {args.rank}), {args.resolution}x{args.resolution} 잠재, "
+          f"{args.device}/{args.dtype}, {args.steps}스텝")
+
+    unfused = time_steps(unet, inputs, args.steps, args.device)
+    fuse_miss_ms = timed(lambda: cache.fuse(pipeline, key))
+    fused = time_steps(unet, inputs, args.steps, args.device)
+    unfuse_ms = timed(cache.unfuse)
+    fuse_hit_ms = timed(lambda: cache.fuse(pipeline, key))
+    fused_again = time_steps(unet, inputs, args.steps, args.device)
+    cache.unfuse()
+
+    print(f"{'mode':<22} | {'mean (ms)':>9} | {'median (ms)':>11} | {'min (ms)':>8}")
+    print('-' * 60)
+    for mode, times in (('unfused', unfused), ('fused', fused), ('fused (cached delta)', fused_again)):
+        print(f"{mode:<22} | {statistics.mean(times):>9.2f} | {statistics.median(times):>11.2f} | {min(times):>8.2f}")
+    speedup = statistics.median(unfused) / statistics.median(fused)
+    print(f"\n스텝당 {speedup:.2f}배 (융합/비융합 median 비교)")
+    print(f"융합 비용: 델타 계산 {fuse_miss_ms:.1f}ms, 캐시 적중 {fuse_hit_ms:.1f}ms, 해제 {unfuse_ms:.1f}ms")
+    print(f"델타 캐시: {cache.get_stats()['size_mb']:.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
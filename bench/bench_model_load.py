@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""모델 로드 벤치마크: from_pretrained vs mmap 텐서 단위 로더의 단계별 시간/최대 메모리
+
+SD15 / SDXL 구조를 축소한 작은 파이프라인을 float32 diffusers 형식으로 저장한 뒤
+각 로드 방식을 별도 프로세스에서 float16으로 로드하며 단계별 경과 시간과
+최대 RSS(및 Linux에서는 파일 매핑을 뺀 익명 메모리)를 측정합니다.
+
+사용 예:
+    python bench/bench_model_load.py --shapes sd15 sdxl --scale 4
+    python bench/bench_model_load.py --shapes sdxl --scale 8 --device cuda
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ('from_pretrained', 'mmap')
+
+
+class RssSampler:
+    """백그라운드 스레드로 RSS를 샘플링하여 단계별 최대값 기록"""
+
+    def __init__(self, interval: float = 0.002):
+        import psutil
+        self.process = psutil.Process()
+        self.interval = interval
+        self.phase = 'baseline'
+        self.peaks = {}
+        self.times = {}
+        self._phase_started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        memory = self.process.memory_info()
+        rss = memory.rss
+        anon = rss - getattr(memory, 'shared', 0)  # Linux: 파일 매핑(mmap/page cache) 제외
+        peak_rss, peak_anon = self.peaks.get(self.phase, (0, 0))
+        self.peaks[self.phase] = (max(peak_rss, rss), max(peak_anon, anon))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            time.sleep(self.interval)
+
+    def mark(self, phase: str):
+        self._sample()
+        now = time.perf_counter()
+        self.times[self.phase] = self.times.get(self.phase, 0.0) + now - self._phase_started
+        self.phase, self._phase_started = phase, now
+        self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.mark('done')
+        self._stop.set()
+        self._thread.join()
+
+
+def build_fixture(root: Path, shape: str, scale: int):
+    """축소된 SD15/SDXL 구조 파이프라인을 float32 diffusers 형식으로 저장"""
+    import torch
+    from diffusers import AutoencoderKL, EulerDiscreteScheduler, UNet2DConditionModel
+    from diffusers import StableDiffusionPipeline, StableDiffusionXLPipeline
+    from transformers import CLIPTextConfig, CLIPTextModel, CLIPTextModelWithProjection
+
+    torch.manual_seed(0)
+    width = 32 * scale
+    text_config = CLIPTextConfig(
+        bos_token_id=0, eos_token_id=2, pad_token_id=1, vocab_size=1000,
+        hidden_size=width, intermediate_size=width * 4, num_attention_heads=4,
+        num_hidden_layers=5, projection_dim=width, hidden_act='gelu',
+    )
+    vae = AutoencoderKL(
+        block_out_channels=[width, width * 2], in_channels=3, out_channels=3, latent_channels=4,
+        down_block_types=['DownEncoderBlock2D'] * 2, up_block_types=['UpDecoderBlock2D'] * 2,
+    )
+    scheduler = EulerDiscreteScheduler(beta_start=0.00085, beta_end=0.012, beta_schedule='scaled_linear')
+    common_unet = dict(
+        block_out_channels=(width, width * 2), layers_per_block=2, sample_size=32,
+        in_channels=4, out_channels=4,
+        down_block_types=('DownBlock2D', 'CrossAttnDownBlock2D'),
+        up_block_types=('CrossAttnUpBlock2D', 'UpBlock2D'),
+    )
+
+    if shape == 'sdxl':
+        unet = UNet2DConditionModel(
+            **common_unet, cross_attention_dim=width * 2, attention_head_dim=(2, 4),
+            use_linear_projection=True, transformer_layers_per_block=(1, 2),
+            addition_embed_type='text_time', addition_time_embed_dim=8,
+            projection_class_embeddings_input_dim=6 * 8 + width,
+        )
+        pipeline = StableDiffusionXLPipeline(
+            vae=vae, text_encoder=CLIPTextModel(text_config), text_encoder_2=CLIPTextModelWithProjection(text_config),
+            tokenizer=None, tokenizer_2=None, unet=unet, scheduler=scheduler,
+        )
+    else:
+        unet = UNet2DConditionModel(**common_unet, cross_attention_dim=width)
+        pipeline = StableDiffusionPipeline(
+            vae=vae, text_encoder=CLIPTextModel(text_config), tokenizer=None, unet=unet, scheduler=scheduler,
+            safety_checker=None, feature_extractor=None, requires_safety_checker=False,
+        )
+
+    folder = root / f'{shape}_x{scale}'
+    pipeline.save_pretrained(str(folder), safe_serialization=True)
+    size_mb = sum(f.stat().st_size for f in folder.rglob('*.safetensors')) / (1024 * 1024)
+    return folder, size_mb
+
+
+def run_child(mode: str, shape: str, folder: str, device: str):
+    """별도 프로세스에서 로드 1회 수행 후 단계별 결과를 JSON으로 출력"""
+    import torch
+    from diffusers import StableDiffusionPipeline, StableDiffusionXLPipeline
+    from src.nicediff.domains.generation.services.mmap_loader import MmapWeightLoader
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    pipeline_class = StableDiffusionXLPipeline if shape == 'sdxl' else StableDiffusionPipeline
+
+    with RssSampler() as sampler:
+        if mode == 'mmap':
+            pipeline = MmapWeightLoader(torch.float16, on_phase=sampler.mark).load_pipeline(pipeline_class, Path(folder))
+        else:
+            sampler.mark('load')
+            pipeline = pipeline_class.from_pretrained(folder, torch_dtype=torch.float16, use_safetensors=True)
+        sampler.mark('to_device')
+        pipeline.to(device)
+
+    baseline_rss, baseline_anon = sampler.peaks.get('baseline', (0, 0))
+    phases = [
+        {'phase': phase, 'seconds': seconds,
+         'rss_mb': (sampler.peaks[phase][0] - baseline_rss) / 2 ** 20,
+         'anon_mb': (sampler.peaks[phase][1] - baseline_anon) / 2 ** 20}
+        for phase, seconds in sampler.times.items() if phase != 'baseline'
+    ]
+    print(json.dumps(phases))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shapes', nargs='+', choices=['sd15', 'sdxl'], default=['sd15', 'sdxl'])
+    parser.add_argument('--scale', type=int, default=4, help='채널/히든 크기 배율 (클수록 큰 픽스처)')
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--repeat', type=int, default=2, help='방식별 반복 횟수 (가장 빠른 결과 사용)')
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'SHAPE', 'FOLDER'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child, args.device)
+        return
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        for shape in args.shapes:
+            folder, size_mb = build_fixture(Path(tmp), shape, args.scale)
+            print(f"\n🔧 {shape.upper()} 구조 픽스처 (x{args.scale}): float32 가중치 {size_mb:.1f}MB → float16 로드")
+            print(f"{'mode':<16} | {'phase':<10} | {'time (s)':>8} | {'peak RSS (MB)':>13} | {'peak anon (MB)':>14}")
+            print('-' * 74)
+            for mode in MODES:
+                best = None
+                for _ in range(args.repeat):
+                    output = subprocess.run(
+                        [sys.executable, __file__, '--device', args.device, '--child', mode, shape, str(folder)],
+                        check=True, capture_output=True, text=True,
+                    ).stdout.strip().splitlines()[-1]
+                    phases = json.loads(output)
+                    if best is None or sum(p['seconds'] for p in phases) < sum(p['seconds'] for p in best):
+                        best = phases
+                for p in best:
+                    print(f"{mode:<16} | {p['phase']:<10} | {p['seconds']:>8.3f} | {p['rss_mb']:>+13.1f} | {p['anon_mb']:>+14.1f}")
+                total = sum(p['seconds'] for p in best)
+                print(f"{mode:<16} | {'total':<10} | {total:>8.3f} | {max(p['rss_mb'] for p in best):>+13.1f} | "
+                      f"{max(p['anon_mb'] for p in best):>+14.1f}")
+            print("(메모리는 로드 직전 대비 증가량)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""모델 스캔 벤치마크: 워커 수에 따른 스캔 시간 비교
+
+합성 safetensors 스텁(헤더만 있는 파일) 트리를 만든 뒤
+ModelScanner를 워커 수별로 콜드 스캔(인덱스/헤더 캐시 없음)하고,
+마지막으로 인덱스 히트만으로 끝나는 재스캔 시간을 측정합니다.
+
+사용 예:
+    python bench/bench_scan_workers.py --files 10000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.model_scanner import ModelScanner
+from src.nicediff.services.metadata_parser import MetadataParser
+
+
+def _write_stub(path: Path, index: int, tensor_count: int):
+    """텐서 항목 + __metadata__ 를 가진 헤더 전용 safetensors 파일 생성"""
+    header = {
+        '__metadata__': {
+            'ss_base_model_version': 'sdxl_base_v1-0' if index % 2 else 'sd_v1',
+            'ss_tag_frequency': json.dumps({'train': {f'tag_{index % 97}': 3, 'solo': 10}}),
+        }
+    }
+    offset = 0
+    for t in range(tensor_count):
+        header[f'lora_unet_down_blocks_{t}.lora_down.weight'] = {
+            'dtype': 'F16', 'shape': [4, 320], 'data_offsets': [offset, offset + 2560],
+        }
+        offset += 2560
+    raw = json.dumps(header).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(raw)))
+        f.write(raw)
+
+
+def build_tree(root: Path, files: int, folders: int, tensor_count: int, png_ratio: float):
+    """합성 LoRA/체크포인트 트리 생성"""
+    png_every = int(1 / png_ratio) if png_ratio > 0 else 0
+    if png_every:
+        from PIL import Image, PngImagePlugin
+    for i in range(files):
+        model_type = 'loras' if i % 4 else 'checkpoints'
+        folder = root / model_type / f'folder_{i % folders:03d}'
+        folder.mkdir(parents=True, exist_ok=True)
+        model_path = folder / f'model_{i:05d}.safetensors'
+        _write_stub(model_path, i, tensor_count)
+        if png_every and i % png_every == 0:
+            pnginfo = PngImagePlugin.PngInfo()
+            pnginfo.add_text('parameters', f'1girl, solo\nNegative prompt: lowres\nSteps: 20, Sampler: Euler a, CFG scale: 7, Seed: {i}, Size: 512x512')
+            Image.new('RGB', (64, 64)).save(model_path.with_suffix('.png'), pnginfo=pnginfo)
+
+
+def run_scan(root: Path, workers: int, index_path: Path) -> tuple:
+    """스캔 1회 실행 후 (경과 시간, 항목 수, 재파싱 수) 반환"""
+    scanner = ModelScanner(
+        {'checkpoints': str(root / 'checkpoints'), 'loras': str(root / 'loras')},
+        index_path=index_path,
+        max_workers=workers,
+    )
+    start = time.perf_counter()
+    result = asyncio.run(scanner.scan_all_models())
+    elapsed = time.perf_counter() - start
+    count = sum(len(items) for data in result.values() for items in data.values())
+    return elapsed, count, scanner.reparsed_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--folders', type=int, default=50)
+    parser.add_argument('--tensors', type=int, default=64, help='스텁당 텐서 헤더 항목 수')
+    parser.add_argument('--png-ratio', type=float, default=0.1, help='PNG 미리보기를 가진 파일 비율')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--root', type=str, default=None, help='기존 트리 재사용 경로')
+    args = parser.parse_args()
+
+    # 파일별 로그가 측정을 왜곡하지 않도록 경고 이상만 출력
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.root) if args.root else Path(tmp) / 'models'
+        if not (root / 'loras').exists():
+            print(f"🔧 합성 트리 생성: {args.files}개 파일 → {root}")
+            t0 = time.perf_counter()
+            build_tree(root, args.files, args.folders, args.tensors, args.png_ratio)
+            print(f"   생성 완료 ({time.perf_counter() - t0:.1f}s)")
+
+        # OS 페이지 캐시를 데워서 첫 측정만 불리해지지 않도록 함
+        run_scan(root, max(args.workers), Path(tmp) / 'warmup_index.json')
+
+        print(f"\n{'workers':>8} | {'cold scan (s)':>13} | {'files/s':>9} | {'speedup':>7}")
+        print('-' * 48)
+        baseline = None
+        for workers in args.workers:
+            MetadataParser.header_cache.invalidate()
+            index_path = Path(tmp) / f'index_{workers}.json'
+            elapsed, count, _ = run_scan(root, workers, index_path)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} | {elapsed:>13.3f} | {count / elapsed:>9.0f} | {baseline / elapsed:>6.2f}x")
+
+        MetadataParser.header_cache.invalidate()
+        elapsed, count, reparsed = run_scan(root, max(args.workers), index_path)
+        print(f"\n⚡ 인덱스 재스캔 ({count}개, 재파싱 {reparsed}개): {elapsed:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
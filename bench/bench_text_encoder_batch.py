@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""텍스트 인코더 묶음 forward 벤치마크: 긴 프롬프트(300+ 토큰) 청크를 하나씩 vs 한 번에 인코딩
+
+임의 초기화한 CLIP 텍스트 모델(기본은 SD15 텍스트 인코더 크기)로 긍정/부정 프롬프트를 75토큰 청크로 나누어
+기존 방식(청크마다 batch 1 forward + 청크별 가중치 적용)과 AdvancedTextEncoder의 묶음 방식
+(모든 청크를 한 행씩 쌓아 forward 한 번 + 행별 가중치 일괄 적용)의 인코딩 시간과 결과 차이를 비교합니다.
+
+사용 예:
+    python bench/bench_text_encoder_batch.py --tokens 320 --negative-tokens 120
+    python bench/bench_text_encoder_batch.py --layers 4 --hidden 256 --weight-mode comfy++
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import CLIPTextConfig, CLIPTextModel
+
+from src.nicediff.domains.generation.services.advanced_encoder import AdvancedTextEncoder
+
+BOS, EOS = 49406, 49407
+
+
+def build_encoder(args) -> AdvancedTextEncoder:
+    torch.manual_seed(0)
+    config = CLIPTextConfig(vocab_size=49408, hidden_size=args.hidden, intermediate_size=args.hidden * 4,
+                            num_hidden_layers=args.layers, num_attention_heads=max(1, args.hidden // 64),
+                            max_position_embeddings=77, bos_token_id=BOS, eos_token_id=EOS, pad_token_id=EOS)
+    text_encoder = CLIPTextModel(config).eval()
+    tokenizer = SimpleNamespace(bos_token_id=BOS, eos_token_id=EOS, pad_token_id=EOS)
+    return AdvancedTextEncoder(SimpleNamespace(tokenizer=tokenizer, text_encoder=text_encoder), weight_mode=args.weight_mode)
+
+
+def make_prompt(seed: int, length: int):
+    """(토큰, 가중치, 단어 ID) — 일부 단어에 (word:1.2)/[word] 가중치"""
+    generator = torch.Generator().manual_seed(seed)
+    tokens = torch.randint(1000, 40000, (length,), generator=generator).tolist()
+    weights = [(1.2, 1.0, 1.0, 0.909)[i % 4] for i in range(length)]
+    word_ids = [1 + i // 2 for i in range(length)]
+    return tokens, weights, word_ids
+
+
+def encode_sequential(encoder: AdvancedTextEncoder, prompts) -> list:
+    """기존 방식: 프롬프트별, 청크별로 batch 1 forward"""
+    results = []
+    for rows in prompts:
+        chunks = [encoder._encode_prompt_rows([[row]])[0] for row in rows]
+        results.append(chunks[0] if len(chunks) == 1 else torch.mean(torch.stack(chunks), dim=0))
+    return results
+
+
+def encode_batched(encoder: AdvancedTextEncoder, prompts) -> list:
+    return encoder._encode_prompt_rows(prompts)
+
+
+def time_runs(fn, repeats: int) -> tuple:
+    outputs = fn()  # 워밍업
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        outputs = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return times, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=320, help='긍정 프롬프트 토큰 수')
+    parser.add_argument('--negative-tokens', type=int, default=160, help='부정 프롬프트 토큰 수')
+    parser.add_argument('--hidden', type=int, default=768, help='텍스트 인코더 hidden size (SD15: 768)')
+    parser.add_argument('--layers', type=int, default=12, help='텍스트 인코더 레이어 수 (SD15: 12)')
+    parser.add_argument('--weight-mode', choices=['A1111', 'comfy++', 'none'], default='A1111')
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=None, help='intra-op 스레드 수 (기본: torch 기본값)')
+    args = parser.parse_args()
+
+    logging.getLogger('nicediff').setLevel(logging.WARNING)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    encoder = build_encoder(args)
+    prompts = [encoder._chunk_rows(*make_prompt(0, args.tokens), chunk_size=77),
+               encoder._chunk_rows(*make_prompt(1, args.negative_tokens), chunk_size=77)]
+
+    with torch.no_grad():
+        sequential_times, sequential = time_runs(lambda: encode_sequential(encoder, prompts), args.repeats)
+        batched_times, batched = time_runs(lambda: encode_batched(encoder, prompts), args.repeats)
+    diff = max((a - b).abs().max().item() for a, b in zip(sequential, batched))
+
+    chunks = sum(len(rows) for rows in prompts)
+    print(f"\n🔧 CLIP {args.layers}층/{args.hidden}, 긍정 {args.tokens} + 부정 {args.negative_tokens} 토큰 "
+          f"({chunks}청크), 가중치 {args.weight_mode}, 스레드 {torch.get_num_threads()}")
+    print(f"{'mode':<22} | {'forwards':>8} | {'median (ms)':>11} | {'min (ms)':>8}")
+    print('-' * 60)
+    print(f"{'sequential (batch 1)':<22} | {chunks:>8} | {statistics.median(sequential_times):>11.2f} | {min(sequential_times):>8.2f}")
+    print(f"{'batched':<22} | {1:>8} | {statistics.median(batched_times):>11.2f} | {min(batched_times):>8.2f}")
+    print(f"\n묶음 방식: {statistics.median(sequential_times) / statistics.median(batched_times):.2f}배, "
+          f"결과 최대 절대 오차 {diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
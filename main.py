@@ -42,6 +42,7 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from nicegui import app, ui
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, Response
 from src.nicediff.pages.inference_page import InferencePage
 from src.nicediff.core.state_manager import StateManager
 
@@ -276,6 +277,20 @@ async def setup_static_files():
     except Exception as e:
         print(f"⚠️ 정적 파일 서빙 설정 실패: {e}")
 
+# 모델/LoRA 미리보기 썸네일 (이름에 원본 mtime이 포함되므로 영구 캐시 가능)
+@app.get('/thumbnails/{name}')
+async def get_thumbnail(name: str):
+    """썸네일 캐시 파일 제공 (없으면 생성 후 제공)"""
+    thumbnail_cache = state_manager.thumbnail_cache
+    thumbnail_path = await thumbnail_cache.get_or_create(name) if thumbnail_cache else None
+    if thumbnail_path is None:
+        return Response(status_code=404)
+    return FileResponse(
+        thumbnail_path,
+        media_type=thumbnail_cache.media_type,
+        headers={'Cache-Control': 'public, max-age=31536000, immutable'}
+    )
+
 # 앱 시작 시 초기화
 @app.on_startup
 async def startup():
@@ -2,12 +2,15 @@
 # (도메인 주도 설계 원칙에 따라 정리된 버전)
 
 import asyncio
+import copy
 import json
+import random
 import time
 try:
     import tomllib
 except ImportError:
     import tomli as tomllib
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
@@ -15,12 +18,17 @@ from typing import Any, Callable, Dict, List, Optional
 import torch
 
 from ..services.model_scanner import ModelScanner
+from ..services.model_watcher import ModelWatcher
+from ..services.model_hasher import ModelHashService
+from ..services.thumbnail_cache import ThumbnailCache
+from ..services.search_index import ModelSearchIndex
 from ..services.metadata_parser import MetadataParser
 from ..services.tokenizer_manager import TokenizerManager
 from ..domains.generation.model_definitions.generation_params import GenerationParams
 from ..domains.generation.model_definitions.history_item import HistoryItem
 from ..domains.generation.services.model_loader import ModelLoader
 from ..domains.generation.services.image_saver import ImageSaver
+from ..domains.generation.services.generation_queue import GenerationQueue, GenerationJob
 from ..domains.generation.strategies.basic_strategy import BasicGenerationStrategy
 from ..domains.generation.processors.prompt_processor import PromptProcessor
 from ..services.long_prompt_handler import LongPromptHandler
@@ -34,6 +42,16 @@ from .logger import (
 class StateManager:
     """중앙 상태 관리자 (도메인 주도 설계 원칙 적용)"""
     
+    # 스캐너 모델 타입 → 상태 키
+    SCAN_STATE_KEYS = {
+        'checkpoints': 'available_checkpoints',
+        'vae': 'available_vae',
+        'loras': 'available_loras',
+    }
+    
+    # 무한 생성 반복 작업은 직접 누른 생성 요청보다 뒤에 처리
+    REPEAT_PRIORITY = -1
+    
     def __init__(self):
         self._state: Dict[str, Any] = {
             'current_model_info': None,
@@ -83,8 +101,20 @@ class StateManager:
         
         # 도메인 서비스 초기화
         self.model_loader = ModelLoader(self.device)
+        # 생성 작업 대기열 (파이프라인이 하나이므로 작업자 1개, initialize에서 시작)
+        # 설정이 같은 txt2img 작업은 한 번의 파이프라인 호출로 묶어 실행 ([generation_queue] max_batch/max_wait)
+        self.generation_queue = GenerationQueue(
+            self._run_generation_job, workers=1,
+            on_change=self._on_generation_queue_changed, on_repeat=self._next_repeat_params,
+            batch_runner=self._run_generation_batch, batch_key=self._generation_batch_key
+        )
         self.image_saver = ImageSaver()
         self.tokenizer_manager = None  # initialize에서 설정
+        self.model_scanner = None  # _scan_models에서 설정
+        self.model_watcher = None  # 스캔 완료 후 모델 폴더 감시
+        self.model_hasher = None  # 스캔 완료 후 백그라운드 해시 계산
+        self.thumbnail_cache = None  # initialize에서 설정 (미리보기 썸네일)
+        self.model_search_index = ModelSearchIndex()  # 이름/트리거 워드/태그 검색
         self.prompt_processor = PromptProcessor('SD15')  # 기본값으로 SD15
         self.long_prompt_handler = None  # initialize에서 설정
         
@@ -112,23 +142,121 @@ class StateManager:
             }
             warning_emoji(r"config.toml이 없어 기본 경로를 사용합니다.")
         
+        # 미리보기 썸네일 캐시 ([thumbnails] 설정)
+        thumb_config = self.config.get('thumbnails', {})
+        self.thumbnail_cache = ThumbnailCache(
+            cache_dir=thumb_config.get('cache_dir', 'models/.thumbnails'),
+            max_size=thumb_config.get('size', 256),
+            image_format=thumb_config.get('format', 'webp'),
+            quality=thumb_config.get('quality', 80),
+            max_workers=thumb_config.get('workers', 4)
+        )
+        
+        # 장치별 실행 프로파일 ([execution] 설정: profile = auto/cuda/cpu, dtype, bf16_autocast, channels_last,
+        # num_threads, num_interop_threads). 이후 로드하는 파이프라인과 외부 VAE에 적용
+        self.model_loader.configure_execution(self.config.get('execution', {}))
+        
+        # 파이프라인 LRU 캐시 예산 ([pipeline_cache] 설정, 없으면 자동)
+        cache_config = self.config.get('pipeline_cache', {})
+        self.model_loader.configure_cache(
+            max_vram_mb=cache_config.get('max_vram_mb'),
+            max_ram_mb=cache_config.get('max_ram_mb'),
+            max_entries=cache_config.get('max_entries', 3)
+        )
+        
+        # LoRA 실행 방식 ([lora] fuse = true면 생성 전 융합, 조합별 델타 캐시)
+        lora_config = self.config.get('lora', {})
+        self.model_loader.configure_lora(
+            fuse=lora_config.get('fuse', False),
+            fused_cache_entries=lora_config.get('fused_cache_entries', 4),
+            fused_cache_mb=lora_config.get('fused_cache_mb', 2048),
+            state_cache_entries=lora_config.get('state_cache_entries', 16),
+            state_cache_mb=lora_config.get('state_cache_mb', 1024)
+        )
+        
+        # 외부 VAE LRU ([vae_cache] 설정) - VAE 전환 시 다시 읽지 않음
+        self.model_loader.configure_vae_cache(max_entries=self.config.get('vae_cache', {}).get('max_entries', 4))
+        
+        # 변환된 파이프라인 디스크 캐시 ([converted_cache] 설정, 기본 꺼짐)
+        converted_config = self.config.get('converted_cache', {})
+        self.model_loader.configure_converted_cache(
+            enabled=converted_config.get('enabled', False),
+            cache_dir=converted_config.get('cache_dir', 'models/.diffusers_cache'),
+            max_size_gb=converted_config.get('max_size_gb', 20.0),
+            sha256_provider=self._checkpoint_sha256
+        )
+        
+        # 프롬프트 임베딩 캐시 (시드만 바꾸는 반복 생성에서 텍스트 인코더 생략, max_entries = 0이면 끔)
+        prompt_cache_config = self.config.get('prompt_cache', {})
+        self.model_loader.configure_prompt_cache(
+            max_entries=prompt_cache_config.get('max_entries', 64),
+            max_mb=prompt_cache_config.get('max_mb', 256)
+        )
+        
+        # 가중치 로딩 방식 ([loading] mmap = true면 diffusers 형식 폴더를 mmap으로 로드)
+        # 로드 단계별 계측은 최근 profile_log_entries개를 profile_log(JSONL)에 보관
+        loading_config = self.config.get('loading', {})
+        self.model_loader.configure_loading(
+            mmap=loading_config.get('mmap', False),
+            profile_log=loading_config.get('profile_log', 'logs/model_load_profiles.jsonl'),
+            profile_log_entries=loading_config.get('profile_log_entries', 200)
+        )
+        
+        # 다음 모델 예측 프리페치 ([prefetch] 설정, prebuild는 RAM을 쓰므로 기본 꺼짐)
+        prefetch_config = self.config.get('prefetch', {})
+        self.model_loader.configure_prefetch(
+            enabled=prefetch_config.get('enabled', True),
+            prebuild=prefetch_config.get('prebuild', False),
+            max_concurrent=prefetch_config.get('max_concurrent', 1),
+            hover_delay=prefetch_config.get('hover_delay', 0.4),
+            history_path=prefetch_config.get('history_path', 'models/.nicediff_model_usage.json'),
+            should_pause=lambda: self.get('is_generating')
+        )
+        
         # 토크나이저 매니저 초기화
         self.tokenizer_manager = TokenizerManager(self.config.get('paths', {}).get('tokenizers', 'models/tokenizers'))
         
+        # 생성 대기열 묶음 실행 (max_batch개까지, 모자라면 max_wait초까지 기다림) + 작업자 시작
+        queue_config = self.config.get('generation_queue', {})
+        self.generation_queue.configure_batching(
+            max_batch=queue_config.get('max_batch', 4),
+            max_wait=queue_config.get('max_wait', 0.0)
+        )
+        self.generation_queue.start()
+        
         # NOTE: 모델 스캔은 오래 걸릴 수 있으므로 백그라운드 작업으로 실행
         asyncio.create_task(self._scan_models())
     
     async def _scan_models(self):
         """ModelScanner를 사용하여 모델을 스캔하고, 표준화된 키로 상태를 업데이트합니다."""
         self.set('status_message', '모델 스캔 중...')
+        # 전체 스캔 중에는 감시자/해시 작업이 같은 인덱스를 건드리지 않도록 중지
+        await self._stop_model_watcher()
+        await self._stop_model_hasher()
         paths_config = self.config.get('paths', {})
-        scanner = ModelScanner(paths_config=paths_config)
-        all_models_data = await scanner.scan_all_models()
+        scan_config = self.config.get('scan', {})
+        scanner = ModelScanner(
+            paths_config=paths_config,
+            max_workers=scan_config.get('workers'),
+            batch_size=scan_config.get('batch_size', 64)
+        )
+        self.model_scanner = scanner
+
+        # 인덱스에 남아있는 마지막 스캔 결과를 먼저 반영 (디스크 탐색 없이 즉시)
+        cached_models_data = await asyncio.to_thread(scanner.get_cached_models)
+        if any(cached_models_data.values()):
+            info(r"⚡ 스캔 인덱스에서 이전 결과 복원")
+            self._apply_scan_result(cached_models_data)
+            await asyncio.to_thread(self.model_search_index.rebuild, cached_models_data)
+
+        # 배치가 도착할 때마다 상태에 병합하고 UI가 카드를 추가할 수 있도록 알림
+        async for model_type, batch in scanner.scan_models_stream():
+            self._merge_scan_batch(model_type, batch)
+        all_models_data = scanner.last_result
         
-        # 이제 스캐너가 'checkpoints' 키로 결과를 반환하므로, 이 코드가 정상 작동합니다.
-        self.set('available_checkpoints', all_models_data.get('checkpoints', {}))
-        self.set('available_vae', all_models_data.get('vae', {}))
-        self.set('available_loras', all_models_data.get('loras', {}))        
+        # 최종 정렬 결과로 교체 (삭제된 항목 정리 포함)
+        self._apply_scan_result(all_models_data)
+        await asyncio.to_thread(self.model_search_index.rebuild, all_models_data)
 
         # 토크나이저 스캔
         if self.tokenizer_manager:
@@ -142,6 +270,189 @@ class StateManager:
         self._notify('loras_updated', loras_data)
         info(f"📢 LoRA 업데이트 이벤트 발생: {sum(len(items) for items in loras_data.values())}개 LoRA")
 
+        # 이후 변경은 폴더 감시로 증분 반영
+        await self._start_model_watcher(scanner)
+        
+        # 해시가 없는 모델은 백그라운드에서 낮은 우선순위로 계산
+        self._start_model_hasher(scanner)
+        
+        # 미리보기 썸네일 미리 생성 및 오래된 썸네일 정리
+        await asyncio.to_thread(self._prewarm_thumbnails, all_models_data, True)
+
+    def _prewarm_thumbnails(self, models_data: Dict[str, Any], prune: bool = False):
+        """체크포인트/LoRA 미리보기 PNG의 썸네일 생성 요청 (동기 함수)"""
+        if self.thumbnail_cache is None:
+            return
+        preview_paths = [
+            Path(item['path']).with_suffix('.png')
+            for model_type in ('checkpoints', 'loras')
+            for items in models_data.get(model_type, {}).values()
+            for item in items
+        ]
+        names = self.thumbnail_cache.prewarm(path for path in preview_paths if path.exists())
+        if prune:
+            self.thumbnail_cache.prune(names)
+
+    def _start_model_hasher(self, scanner: ModelScanner):
+        """모델 해시 서비스 시작 ([hashing] 설정)"""
+        hash_config = self.config.get('hashing', {})
+        if not hash_config.get('enabled', True):
+            return
+        self.model_hasher = ModelHashService(
+            scanner.scan_index,
+            full_hash=hash_config.get('full_sha256', False),
+            max_mb_per_sec=hash_config.get('max_mb_per_sec', 64.0),
+            should_pause=lambda: self.get('is_generating') or self.get('is_loading_model')
+        )
+        self.model_hasher.start()
+        self.model_hasher.enqueue_missing()
+
+    async def _stop_model_hasher(self):
+        if self.model_hasher is not None:
+            await asyncio.to_thread(self.model_hasher.stop)
+            self.model_hasher = None
+
+    def _checkpoint_sha256(self, model_path: Path) -> Optional[str]:
+        """변환 캐시 키용 전체 SHA-256 (스캔 인덱스에 저장된 값 재사용, 없으면 계산 후 저장)"""
+        if self.model_hasher is None:
+            return None
+        return self.model_hasher.ensure_sha256(Path(model_path))
+
+    def get_model_hash(self, model_path: str) -> Optional[str]:
+        """모델 파일의 대표 해시 (AutoV2 또는 빠른 해시, 아직 계산 전이면 None)"""
+        if self.model_hasher is None or not model_path:
+            return None
+        return ModelHashService.short_hash(self.model_hasher.get_hashes(Path(model_path)))
+
+    def find_model_by_hash(self, model_hash: str, model_type: str = 'checkpoints') -> Optional[Dict[str, Any]]:
+        """해시로 available_* 목록에서 모델 정보 찾기 (경로가 바뀌어도 같은 파일이면 찾음)"""
+        if self.model_hasher is None or not model_hash:
+            return None
+        model_path = self.model_hasher.find_by_hash(model_hash, model_type)
+        if model_path is None:
+            return None
+        state_key = self.SCAN_STATE_KEYS.get(model_type)
+        for folder_models in (self.get(state_key) or {}).values():
+            for model_info in folder_models:
+                if model_info['path'] == model_path:
+                    return model_info
+        return None
+
+    async def _start_model_watcher(self, scanner: ModelScanner):
+        """모델 폴더 감시 시작 (이전 감시자는 중지)"""
+        await self._stop_model_watcher()
+        scan_config = self.config.get('scan', {})
+        if not scan_config.get('watch', True):
+            return
+        self.model_watcher = ModelWatcher(
+            scanner,
+            self._apply_model_delta,
+            poll_interval=scan_config.get('poll_interval', 5.0),
+            force_polling=scan_config.get('force_polling', False)
+        )
+        self.model_watcher.start()
+
+    async def _stop_model_watcher(self):
+        if self.model_watcher is not None:
+            await self.model_watcher.stop()
+            self.model_watcher = None
+
+    async def refresh_models(self):
+        """수동 새로고침: 폴링 감시 중이면 즉시 한 번 비교, 아니면 인덱스 기반 증분 재스캔"""
+        watcher = self.model_watcher
+        if watcher is not None and watcher.is_running and watcher.mode == 'polling':
+            await watcher.poll_once()
+        else:
+            await self._scan_models()
+
+    def _apply_model_delta(self, model_type: str, delta: Dict[str, Any]):
+        """폴더 감시 델타(added/modified/removed)를 available_* 상태에 반영"""
+        state_key = self.SCAN_STATE_KEYS.get(model_type)
+        if state_key is None:
+            return
+
+        removed = set(delta.get('removed', []))
+        changed_items = delta.get('added', []) + delta.get('modified', [])
+        changed = {item['path']: item for item in changed_items}
+        merged = {}
+        for folder, items in (self.get(state_key) or {}).items():
+            folder_items = [changed.pop(item['path'], item) for item in items if item['path'] not in removed]
+            if folder_items:
+                merged[folder] = folder_items
+        for item in changed.values():
+            folder_items = merged.setdefault(item['folder'], [])
+            folder_items.append(item)
+            folder_items.sort(key=lambda x: x['name'].lower())
+
+        self.set_silent(state_key, merged)
+        self.model_search_index.apply_delta(model_type, delta)
+        self._prewarm_thumbnails({model_type: {'changed': list(changed_items)}})
+        if self.model_hasher is not None:
+            self.model_hasher.enqueue(item['path'] for item in changed_items)
+        self._notify('models_delta', {'model_type': model_type, 'state_key': state_key, **delta}, debounce=False)
+
+    def _merge_scan_batch(self, model_type: str, batch: Dict[str, List[Dict[str, Any]]]):
+        """스트리밍 스캔 배치 하나를 available_* 상태에 병합 (같은 경로는 교체)"""
+        state_key = self.SCAN_STATE_KEYS.get(model_type)
+        if state_key is None:
+            return
+
+        merged = dict(self.get(state_key) or {})
+        for folder, items in batch.items():
+            folder_items = list(merged.get(folder, []))
+            position_by_path = {item['path']: i for i, item in enumerate(folder_items)}
+            for item in items:
+                position = position_by_path.get(item['path'])
+                if position is None:
+                    folder_items.append(item)
+                else:
+                    folder_items[position] = item
+            merged[folder] = folder_items
+
+        # 전체 다시 그리기를 피하기 위해 상태는 조용히 갱신하고 배치 이벤트만 발생
+        self.set_silent(state_key, merged)
+        for items in batch.values():
+            self.model_search_index.add_items(model_type, items)
+        self._notify('models_batch', {'model_type': model_type, 'state_key': state_key, 'items': batch}, debounce=False)
+
+    def search_models(self, query: str, model_type: Optional[str] = None, base_model: Optional[str] = None,
+                      limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """이름/트리거 워드/학습 태그/기본 모델/폴더로 모델 검색 (접두사/오타 허용, 점수순)"""
+        return self.model_search_index.search(query, model_type=model_type, base_model=base_model, limit=limit)
+
+    def hint_model(self, model_info: Dict[str, Any], reason: str = 'hover'):
+        """UI에서 곧 로드할 것 같은 모델 힌트 (마우스 오버/선택) → 백그라운드 프리페치"""
+        if not model_info or self.get('is_loading_model'):
+            return
+        current_model_info = self.get('current_model_info')
+        if (current_model_info and current_model_info.get('path') == model_info.get('path') and
+                self.model_loader.get_current_pipeline() is not None):
+            return
+        self.model_loader.hint_next_model(model_info, reason)
+
+    def get_prefetch_status(self) -> Dict[str, Any]:
+        """프리페치 진행 상황 및 통계"""
+        prefetcher = self.model_loader.prefetcher
+        return prefetcher.get_status() if prefetcher is not None else {}
+
+    def get_execution_profile(self) -> Dict[str, Any]:
+        """현재 실행 프로파일 요약 (UI 표시용)"""
+        return self.model_loader.profile.describe()
+
+    def get_load_profiles(self, limit: Optional[int] = 20, model_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 모델 로드 계측 기록 (최신순, model_path를 주면 해당 모델만)"""
+        return self.model_loader.load_profiler.recent(limit, model_path)
+
+    def get_pipeline_cache_stats(self) -> Dict[str, Any]:
+        """파이프라인 캐시 적중/실패 및 메모리 사용량 (공유 구성 요소 통계 포함)"""
+        return self.model_loader.get_cache_stats()
+
+    def _apply_scan_result(self, all_models_data: Dict[str, Any]):
+        """스캔 결과를 표준화된 상태 키에 반영"""
+        self.set('available_checkpoints', all_models_data.get('checkpoints', {}))
+        self.set('available_vae', all_models_data.get('vae', {}))
+        self.set('available_loras', all_models_data.get('loras', {}))
+
     # --- 모델 선택 및 로딩 ---
     async def select_model(self, model_info: Dict[str, Any]):
         """1단계: GPU 로딩 없이, 메타데이터 표시를 위해 모델을 '선택'만 합니다."""
@@ -149,9 +460,21 @@ class StateManager:
         self.set('current_model_info', model_info)
         self.set('sd_model_type', model_info.get('model_type', 'SD15'))
         
+        # 선택 후 로드까지의 시간 동안 파일을 미리 읽어 둠
+        self.hint_model(model_info, reason='select')
+        
         # 선택 이벤트 발생
         self._notify('model_selection_changed', model_info)
 
+    @asynccontextmanager
+    async def _pipeline_change(self):
+        """모델/VAE/LoRA 변경 구간 (실행 중인 생성 작업이 있으면 끝난 뒤, 다음 작업 전에 적용)"""
+        lock = self.generation_queue.pipeline_lock
+        if lock.locked():
+            info_emoji(r"생성 작업 실행 중 - 작업이 끝나면 변경을 적용합니다")
+        async with lock:
+            yield
+
     async def load_model_pipeline(self, model_info: Dict[str, Any]) -> bool:
         """[최종 수정] 모델 로딩의 모든 과정을 책임지는 중앙 처리 메서드"""
     
@@ -163,21 +486,22 @@ class StateManager:
             self._notify_user(f"'{model_info['name']}' 모델은 이미 로드되어 있습니다.", 'info')
             return True
 
+        # 로드 단계별 시간/메모리 계측 (끝나면 model_load_profile 이벤트 + 롤링 로그)
+        load_profile = self.model_loader.load_profiler.start(model_info)
         try:
             self.set('is_loading_model', True)
             self._notify('model_loading_started', {'name': model_info['name']})
             
-            # 기존 모델 언로드
-            self.model_loader.unload_model()
-            
-            # 도메인 서비스를 사용하여 모델 로드
-            await self.model_loader.load_model(model_info)
+            # 도메인 서비스를 사용하여 모델 로드 (이전 모델은 LRU 캐시에 남고 예산을 넘으면 강등/제거)
+            async with self._pipeline_change():
+                await self.model_loader.load_model(model_info, load_profile=load_profile)
             self.set('current_model_info', model_info)
             
             # VAE 자동 선택은 사용자가 'Automatic'을 선택했을 때만 실행
             current_vae_path = self.get('current_vae_path')
             if current_vae_path is None:
-                await self._auto_select_vae(model_info)
+                with load_profile.phase('vae_auto_select'):
+                    await self._auto_select_vae(model_info)
             
             # Top_bar에서는 파라미터 자동 적용 금지 - 프롬프트 패널과 파라미터 패널에서만 설정
             info_emoji(r"파라미터 자동 적용 비활성화 (Top_bar에서는 체크포인트와 VAE만 선택)")
@@ -195,6 +519,8 @@ class StateManager:
             
             success(f"PromptProcessor 업데이트: {model_type} 모드 (최대 {self.prompt_processor.max_tokens} 토큰)")
             
+            self._notify('model_load_profile', self.model_loader.load_profiler.finish(load_profile), debounce=False)
+            
             # 모델 로딩 완료 알림 (선택 알림은 이미 select_model에서 발생했으므로 생략)
             self._notify('model_loaded', model_info)
             
@@ -206,6 +532,7 @@ class StateManager:
             import traceback
             traceback.print_exc()
             error_msg = f"모델 로드 실패: {str(e)}"
+            self._notify('model_load_profile', self.model_loader.load_profiler.finish(load_profile, False, str(e)), debounce=False)
             self._notify_user(error_msg, 'negative')
             self._notify('model_loading_finished', {'success': False, 'error': str(e)})
             return False
@@ -359,6 +686,9 @@ class StateManager:
         
         # 기본적으로 내장 VAE 사용
         info_emoji(r"체크포인트 내장 VAE 사용 (별도 VAE 없음)")
+        # 이전에 외부 VAE로 교체했다면 보관해 둔 내장 VAE로 복원 (다시 로드하지 않음)
+        async with self._pipeline_change():
+            self.model_loader.restore_baked_vae()
         self.set('current_vae_path', 'baked_in')
         self._notify('vae_auto_selected', 'baked_in')
 
@@ -373,7 +703,8 @@ class StateManager:
         
         try:
             # 도메인 서비스를 사용하여 VAE 로드
-            success = await self.model_loader.load_vae(vae_path)
+            async with self._pipeline_change():
+                success = await self.model_loader.load_vae(vae_path)
             
             if success:
                 self.set('current_vae_path', vae_path)
@@ -389,111 +720,152 @@ class StateManager:
         finally:
             self.set('is_loading_model', False)
 
-    async def generate_image(self):
+    async def generate_image(self, priority: int = 0) -> List[GenerationJob]:
         """
-        이미지 생성 실행 (중복 생성 방지 강화 + UI 동기화 강화)
-        - 생성 파라미터는 반드시 current_params(파라미터/프롬프트 패널)에서만 수집
-        - 모델/LoRA/프리뷰 등 외부 상태는 생성 파라미터에 직접 포함하지 않음
-        - 혹시라도 외부 값이 params_dict에 들어가면 경고 로그 출력 및 무시
+        이미지 생성 요청을 대기열에 등록 (생성 중에도 요청을 받아 순서대로 처리)
+        - 생성 파라미터는 반드시 current_params(파라미터/프롬프트 패널)에서만 수집하고 등록 시점에 스냅샷
+        - 반복 횟수(iterations)만큼 작업을 등록 (시드는 배치 크기만큼 증가)
+        - 무한 반복 생성이 켜져 있으면 완료될 때마다 다시 등록
         """
-        # 중복 생성 방지 강화
-        if self.get('is_generating'):
-            warning_emoji(r"이미 생성 중입니다 - 중복 요청 무시")
-            self._notify_user('이미 생성 중입니다.', 'warning')
-            return
-        
-        # 생성 상태 체크 (추가 안전장치)
-        if hasattr(self, '_generation_in_progress') and self._generation_in_progress:
-            warning_emoji(r"생성 진행 중 - 중복 요청 무시")
-            self._notify_user('이미 생성 중입니다.', 'warning')
-            return
-        
         if not self.model_loader.get_current_pipeline():
             self._notify_user('모델을 먼저 로드해주세요.', 'warning')
-            return
+            return []
+        
+        # 파라미터 수집 (current_params에서만)
+        params = self.get('current_params')
+        if not params:
+            failure(r"파라미터가 없습니다")
+            return []
+        
+        current_mode = self.get('current_mode', 'txt2img')
+        init_image = None
+        if current_mode in ['img2img', 'inpaint', 'upscale']:
+            init_image = self.get('init_image')
+            if init_image is None:
+                failure(r"img2img 모드에서 원본 이미지가 없습니다")
+                self._notify_user('이미지를 먼저 업로드해주세요.', 'warning')
+                return []
+            success(f"원본 이미지 보존 확인: {getattr(init_image, 'size', type(init_image))}")
         
-        # 생성 상태 설정 (중복 방지 강화)
         self.stop_generation_flag.clear()
-        self.set('is_generating', True)
-        self._generation_in_progress = True
-        process_emoji(r"이미지 생성 시작...")
+        repeat = bool(self.get('infinite_generation', False))
+        if repeat:
+            self.set('infinite_mode', True)
+            priority = min(priority, self.REPEAT_PRIORITY)
+        iterations = 1 if repeat else max(1, int(getattr(params, 'iterations', 1) or 1))
         
+        jobs = []
+        for i in range(iterations):
+            snapshot = self._snapshot_params(params, seed_offset=i * max(1, params.batch_size))
+            jobs.append(self.generation_queue.submit(snapshot, current_mode, priority, init_image, repeat=repeat))
+        process_emoji(f"생성 작업 {len(jobs)}개 등록 (대기 {self.generation_queue.pending_count}개)")
+        return jobs
+
+    @staticmethod
+    def _snapshot_params(params: GenerationParams, seed_offset: int = 0) -> GenerationParams:
+        """등록 시점의 파라미터 복사본 (이후 UI 변경이 대기 중인 작업에 섞이지 않도록)"""
+        snapshot = copy.copy(params)
+        if seed_offset and snapshot.seed >= 0:
+            snapshot.seed = (snapshot.seed + seed_offset) % (2**32)
+        return snapshot
+
+    async def _run_generation_job(self, job: GenerationJob):
+        """대기열 작업자: 작업 하나를 생성 → 저장까지 처리"""
+        if not self.model_loader.get_current_pipeline():
+            raise RuntimeError('모델이 로드되어 있지 않습니다')
+        process_emoji(f"생성 작업 시작: {job.job_id} (대기 {job.timings()['queued']:.2f}s)")
         try:
+            # [lora] fuse 모드: 활성 LoRA 조합을 가중치에 융합 (같은 조합이면 캐시된 델타 재사용)
+            await self.model_loader.prepare_loras_for_generation()
             pipeline = self.model_loader.get_current_pipeline()
-            current_mode = self.get('current_mode', 'txt2img')
-            
-            # 파라미터 수집 (current_params에서만)
-            params = self.get('current_params')
-            if not params:
-                failure(r"파라미터가 없습니다")
-                return
-            
-            # img2img 모드에서 원본 이미지 보존 강화
-            if current_mode in ['img2img', 'inpaint', 'upscale']:
-                init_image = self.get('init_image')
-                if not init_image:
-                    failure(r"img2img 모드에서 원본 이미지가 없습니다")
-                    self._notify_user('이미지를 먼저 업로드해주세요.', 'warning')
-                    return
-                
-                success(f"원본 이미지 보존 확인: {init_image.size}")
-                # 원본 이미지를 파라미터에 추가
-                params.init_image = init_image
-            
-            # 생성 실행
-            result = await self._execute_generation(pipeline, params, current_mode)
+            params = job.params
+            if job.init_image is not None:
+                params.init_image = job.init_image
             
-            if result and result.images:
-                success(f"생성 완료: {len(result.images)}개 이미지")
-                
-                # 생성된 이미지 저장 (원본 이미지 보존)
-                # self.set_generated_images(result.images)  # 중복 저장 제거 - _execute_generation에서 이미 저장됨
-                
-                # 이벤트 발생
-                self._notify('generation_completed', {'images': result.images})
-                
-                # 히스토리 업데이트 (메서드명 수정)
-                # self._update_history(result.images)  # 이 메서드는 존재하지 않음
-                
-            else:
-                failure(r"생성 실패")
+            result = await self._execute_generation(pipeline, params, job.mode, job=job)
+            if not (result and result.images) and not job.cancel_requested:
                 self._notify_user('이미지 생성에 실패했습니다.', 'negative')
-                
-        except Exception as e:
-            failure(f"이미지 생성 중 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            self._notify_user(f'생성 중 오류가 발생했습니다: {str(e)}', 'negative')
+            return result
+        finally:
+            self._notify('generation_finished', {'job_id': job.job_id, 'cancelled': job.cancel_requested}, debounce=False)
+            info(f"생성 작업 종료: {job.job_id} {job.timings()}")
+
+    @staticmethod
+    def _generation_batch_key(job: GenerationJob):
+        """묶어서 실행할 수 있는 작업의 키 (프롬프트/시드만 다른 txt2img 단일 이미지 작업). 묶을 수 없으면 None
+        모델/LoRA/VAE는 작업이 아닌 실행 시점의 파이프라인 상태이므로 키에 넣지 않음"""
+        params = job.params
+        if job.mode != 'txt2img' or getattr(params, 'batch_size', 1) != 1:
+            return None
+        return (params.width, params.height, params.steps, params.cfg_scale, params.sampler, params.scheduler,
+                getattr(params, 'clip_skip', 1))
+
+    async def _run_generation_batch(self, jobs: List[GenerationJob]) -> List[Any]:
+        """대기열 작업자: 묶인 작업들을 한 번에 생성한 뒤 작업별로 저장"""
+        if not self.model_loader.get_current_pipeline():
+            raise RuntimeError('모델이 로드되어 있지 않습니다')
+        process_emoji(f"묶음 생성 시작: {', '.join(job.job_id for job in jobs)}")
+        try:
+            await self.model_loader.prepare_loras_for_generation()
+            pipeline = self.model_loader.get_current_pipeline()
+            strategy = BasicGenerationStrategy(pipeline, self.device, state=self, **self._embedding_cache_options())
+            params_dicts = [self._build_params_dict(job.params) for job in jobs]
+            for job, params_dict in zip(jobs, params_dicts):
+                self._notify('generation_started', {'mode': job.mode, 'params': params_dict})
             
+            results = await strategy.execute_batch(
+                params_dicts, self.get('current_model_info', {}),
+                cancel_checks=[(lambda job=job: job.cancel_requested) for job in jobs]
+            )
+            for job, params_dict, result in zip(jobs, params_dicts, results):
+                job.mark_generated()
+                await self._handle_generation_result(result, job.params, params_dict, job)
+            return results
         finally:
-            # 생성 상태 해제
-            self.set('is_generating', False)
-            self._generation_in_progress = False
-            info(r"이미지 생성 프로세스 종료")
+            for job in jobs:
+                self._notify('generation_finished', {'job_id': job.job_id, 'cancelled': job.cancel_requested}, debounce=False)
+            info(f"묶음 생성 종료: {[(job.job_id, job.timings()) for job in jobs]}")
+
+    def _on_generation_queue_changed(self, snapshot: Dict[str, Any]):
+        """대기열 변경 → is_generating 상태 + UI용 대기열 이벤트"""
+        is_generating = snapshot['running'] > 0
+        if self.get('is_generating') != is_generating:
+            self.set('is_generating', is_generating)
+        self._notify('generation_queue_changed', snapshot, debounce=False)
+
+    def _next_repeat_params(self, job: GenerationJob) -> Optional[GenerationParams]:
+        """무한 생성: 현재 파라미터로 다시 등록 (시드 고정이 아니면 새 시드)"""
+        if not self.get('infinite_mode'):
+            return None
+        params = self._snapshot_params(self.get('current_params') or job.params)
+        if not getattr(params, 'seed_pinned', False):
+            params.seed = random.randint(0, 2**32 - 1)
+        return params
+
+    def get_generation_queue(self) -> Dict[str, Any]:
+        """대기열 상태 (대기/실행 개수 + 작업 요약)"""
+        return self.generation_queue.snapshot()
 
-    async def _execute_generation(self, pipeline, params: GenerationParams, current_mode: str):
-        """실제 생성 로직을 수행하는 내부 메서드"""
-        strategy = BasicGenerationStrategy(pipeline, self.device, state=self)
+    def get_generation_stats(self) -> Dict[str, Any]:
+        """최근 생성 작업의 평균 대기/실행/저장 시간"""
+        return self.generation_queue.get_stats()
+
+    def cancel_generation_job(self, job_id: str) -> bool:
+        """작업 하나 취소 (대기 중이면 제거, 실행 중이면 다음 스텝에서 중단)"""
+        return self.generation_queue.cancel(job_id)
+
+    def move_generation_job(self, job_id: str, index: int) -> bool:
+        """대기 중인 작업 순서 변경"""
+        return self.generation_queue.move(job_id, index)
+
+    async def _execute_generation(self, pipeline, params: GenerationParams, current_mode: str,
+                                  job: Optional[GenerationJob] = None):
+        """실제 생성 로직을 수행하는 내부 메서드 (job이 있으면 취소 확인 + 지연 시간 기록)"""
+        cancel_check = (lambda: job.cancel_requested) if job is not None else None
+        strategy = BasicGenerationStrategy(pipeline, self.device, state=self, cancel_check=cancel_check,
+                                           **self._embedding_cache_options())
         
-        # [정책] 오직 current_params에서만 생성 파라미터 수집
-        params_dict = {
-            'prompt': params.prompt,
-            'negative_prompt': params.negative_prompt,
-            'width': params.width,
-            'height': params.height,
-            'steps': params.steps,
-            'cfg_scale': params.cfg_scale,
-            'seed': params.seed,  # 처리된 시드 사용
-            'sampler': params.sampler,
-            'scheduler': params.scheduler,
-            'batch_size': params.batch_size,
-            'clip_skip': getattr(params, 'clip_skip', 1),
-        }
-        # [방어] 외부 상태가 params_dict에 섞이면 경고
-        for forbidden in ['current_model_info', 'current_loras', 'current_vae_path', 'preview', 'preview_image']:
-            if forbidden in params_dict:
-                warning_emoji(f"경고: 생성 파라미터에 외부 상태({forbidden})가 포함되어 있음. 무시합니다.")
-                params_dict.pop(forbidden)
+        params_dict = self._build_params_dict(params)
         
         # 모델 정보는 파이프라인에만 영향, 생성 파라미터에는 직접 포함하지 않음
         model_info = self.get('current_model_info', {})
@@ -514,6 +886,45 @@ class StateManager:
         debug_emoji(r"[디버깅 1단계] 생성 완료 후 이미지 저장 확인")
         info("=" * 80)
         
+        if job is not None:
+            job.mark_generated()
+        
+        return await self._handle_generation_result(result, params, params_dict, job)
+
+    def _embedding_cache_options(self) -> Dict[str, Any]:
+        """생성 전략용 프롬프트 임베딩 캐시 + 현재 텍스트 인코더 지문"""
+        return {
+            'embedding_cache': self.model_loader.prompt_embedding_cache,
+            'embedding_fingerprint': self.model_loader.text_encoder_fingerprint(),
+        }
+
+    @staticmethod
+    def _build_params_dict(params: GenerationParams) -> Dict[str, Any]:
+        """생성 파라미터 스냅샷 → 생성 전략 입력"""
+        # [정책] 오직 current_params에서만 생성 파라미터 수집
+        params_dict = {
+            'prompt': params.prompt,
+            'negative_prompt': params.negative_prompt,
+            'width': params.width,
+            'height': params.height,
+            'steps': params.steps,
+            'cfg_scale': params.cfg_scale,
+            'seed': params.seed,  # 처리된 시드 사용
+            'sampler': params.sampler,
+            'scheduler': params.scheduler,
+            'batch_size': params.batch_size,
+            'clip_skip': getattr(params, 'clip_skip', 1),
+        }
+        # [방어] 외부 상태가 params_dict에 섞이면 경고
+        for forbidden in ['current_model_info', 'current_loras', 'current_vae_path', 'preview', 'preview_image']:
+            if forbidden in params_dict:
+                warning_emoji(f"경고: 생성 파라미터에 외부 상태({forbidden})가 포함되어 있음. 무시합니다.")
+                params_dict.pop(forbidden)
+        return params_dict
+
+    async def _handle_generation_result(self, result, params: GenerationParams, params_dict: Dict[str, Any],
+                                        job: Optional[GenerationJob] = None):
+        """생성 결과 반영: 이미지 상태 저장 + 이미지별 후처리 + 완료/실패 알림"""
         if result.success and result.images:
             success(f"생성 성공: {len(result.images)}개 이미지")
             info(f"   - result.images 타입: {type(result.images)}")
@@ -541,6 +952,9 @@ class StateManager:
             
             self._notify_user(f'{len(result.images)}개 이미지 생성 완료!', 'positive')
             return result
+        elif job is not None and job.cancel_requested:
+            info(f"🛑 생성 작업 취소됨: {job.job_id}")
+            return result
         else:
             error_msg = ', '.join(result.errors) if result.errors else '알 수 없는 오류'
             failure(f"생성 실패: {error_msg}")
@@ -613,7 +1027,8 @@ class StateManager:
         try:
             # 도메인 서비스를 사용하여 이미지 저장
             model_name = self.get('current_model_info')['name']
-            save_result = await self.image_saver.save_generated_image(image, params, seed, model_name)
+            model_hash = self.get_model_hash(self.get('current_model_info').get('path'))
+            save_result = await self.image_saver.save_generated_image(image, params, seed, model_name, model_hash)
             
             # 이벤트 발생
             self._notify('image_generated', {
@@ -629,6 +1044,7 @@ class StateManager:
                 thumbnail_path=save_result['thumbnail_path'],
                 params=params,
                 model=model_name,
+                model_hash=model_hash,
                 vae=self.get('current_vae_path'),
                 loras=self.get('current_loras', [])
             )
@@ -661,60 +1077,30 @@ class StateManager:
         return pnginfo
 
     async def start_infinite_generation(self):
-        """무한 생성 모드 시작"""
+        """무한 생성 모드 시작 (대기열에 반복 작업 등록, 완료될 때마다 다시 등록)"""
         if not self.model_loader.get_current_pipeline():
             self._notify_user('모델을 먼저 로드해주세요.', 'warning')
             return
         
         self.set('infinite_mode', True)
+        params = self._snapshot_params(self.get('current_params'))
+        current_mode = self.get('current_mode', 'txt2img')
+        init_image = self.get('init_image') if current_mode != 'txt2img' else None
+        self.generation_queue.submit(params, current_mode, self.REPEAT_PRIORITY, init_image, repeat=True)
         self._notify_user('무한 생성 모드가 시작되었습니다.', 'info')
-        asyncio.create_task(self._infinite_generation_loop())
-
-    async def _infinite_generation_loop(self):
-        """무한 생성 루프"""
-        while self.get('infinite_mode') and not self.stop_generation_flag.is_set():
-            try:
-                await self._generate_single_image()
-                await asyncio.sleep(2)  # 2초 대기
-            except Exception as e:
-                failure(f"무한 생성 중 오류: {e}")
-                await asyncio.sleep(5)  # 오류 시 5초 대기
-
-    async def _generate_single_image(self):
-        """단일 이미지 생성 (무한 모드용)"""
-        if not self.model_loader.get_current_pipeline():
-            return
-        
-        params = self.get('current_params')
-        
-        def _generate():
-            return self.model_loader.get_current_pipeline()(
-                prompt=params.prompt,
-                negative_prompt=params.negative_prompt,
-                width=params.width,
-                height=params.height,
-                num_inference_steps=params.steps,
-                guidance_scale=params.cfg_scale,
-                generator=torch.Generator(device=self.device).manual_seed(params.seed)
-            )
-        
-        try:
-            result = await asyncio.to_thread(_generate)
-            if result.images:
-                await self.finish_generation(result.images[0], params, params.seed)
-        except Exception as e:
-            failure(f"단일 이미지 생성 실패: {e}")
 
     async def stop_infinite_generation(self):
-        """무한 생성 모드 중지"""
+        """무한 생성 모드 중지 (실행 중인 작업은 끝까지, 대기 중인 반복 작업은 취소)"""
         self.set('infinite_mode', False)
+        self.generation_queue.stop_repeating()
         self._notify_user('무한 생성 모드가 중지되었습니다.', 'info')
 
     async def stop_generation(self):
-        """생성 중지"""
+        """생성 중지 (실행 중인 작업 중단 + 대기열 비우기)"""
         self.stop_generation_flag.set()
-        self.set('is_generating', False)
-        self._notify_user('생성이 중지되었습니다.', 'info')
+        self.set('infinite_mode', False)
+        cancelled = self.generation_queue.cancel_all()
+        self._notify_user(f'생성이 중지되었습니다. (작업 {cancelled}개 취소)', 'info')
 
     def apply_params_from_metadata(self, model_info: Dict[str, Any], include_prompts: bool = False):
         """메타데이터에서 파라미터 적용 (더 이상 자동으로 호출되지 않음)"""
@@ -800,9 +1186,12 @@ class StateManager:
                 if loras:
                     self.set('current_loras', loras)
                 
-                # 모델 복원 (가능한 경우)
+                # 모델 복원 (해시 우선 - 이름이 같은 다른 파일이나 이동된 파일도 정확히 찾음)
+                model_info = self.find_model_by_hash(item.get('model_hash'))
                 model_name = item.get('model')
-                if model_name:
+                if model_info is not None:
+                    asyncio.create_task(self.select_model(model_info))
+                elif model_name:
                     available_checkpoints = self.get('available_checkpoints', {})
                     for folder_models in available_checkpoints.values():
                         for model_info in folder_models:
@@ -843,8 +1232,19 @@ class StateManager:
     async def cleanup(self):
         """리소스 정리"""
         try:
-            # 모델 언로드
+            # 생성 대기열 정리 (대기 중인 작업 취소, 작업자 종료)
+            await self.generation_queue.shutdown()
+            
+            # 모델 폴더 감시 / 해시 계산 / 썸네일 생성 중지
+            await self._stop_model_watcher()
+            await self._stop_model_hasher()
+            if self.thumbnail_cache is not None:
+                self.thumbnail_cache.shutdown()
+            
+            # 모델 언로드 (진행 중인 프리페치 포함)
             self.model_loader.unload_model()
+            if self.model_loader.prefetcher is not None:
+                self.model_loader.prefetcher.shutdown()
             
             # CUDA 캐시 정리
             if torch.cuda.is_available():
@@ -1062,18 +1462,23 @@ class StateManager:
             except Exception as e:
                 failure(f"이벤트 '{event}' 구독 해제 중 예상치 못한 오류: {e}")
 
-    def _notify(self, event: str, data: Any = None):
-        """이벤트 발생 (중복 방지)"""
+    def _notify(self, event: str, data: Any = None, debounce: bool = True):
+        """이벤트 발생 (중복 방지)
+
+        debounce=False는 연속된 데이터 조각(스캔 배치 등)처럼
+        매번 다른 내용을 전달하는 이벤트에 사용합니다.
+        """
         if event in self._observers:
             # 중복 이벤트 방지를 위한 디바운싱
-            current_time = time.time()
-            if hasattr(self, '_last_event_time') and event in self._last_event_time:
-                if current_time - self._last_event_time[event] < 0.1:  # 100ms 내 중복 방지
-                    return
-            
-            if not hasattr(self, '_last_event_time'):
-                self._last_event_time = {}
-            self._last_event_time[event] = current_time
+            if debounce:
+                current_time = time.time()
+                if hasattr(self, '_last_event_time') and event in self._last_event_time:
+                    if current_time - self._last_event_time[event] < 0.1:  # 100ms 내 중복 방지
+                        return
+                
+                if not hasattr(self, '_last_event_time'):
+                    self._last_event_time = {}
+                self._last_event_time[event] = current_time
             
             for callback in self._observers[event]:
                 try:
@@ -1250,7 +1655,8 @@ class StateManager:
     async def load_lora(self, lora_info: Dict[str, Any], weight: float = 1.0) -> bool:
         """LoRA 로드"""
         try:
-            success = await self.model_loader.load_lora(lora_info, weight)
+            async with self._pipeline_change():
+                success = await self.model_loader.load_lora(lora_info, weight)
             if success:
                 # 로드된 LoRA 목록 업데이트
                 loaded_loras = self.model_loader.get_loaded_loras()
@@ -1266,10 +1672,23 @@ class StateManager:
             self._notify_user(f"LoRA 로드 오류: {str(e)}", 'negative')
             return False
     
+    async def set_lora_weight(self, lora_name: str, weight: float) -> bool:
+        """로드된 LoRA 가중치 변경 (파일을 다시 읽지 않음)"""
+        try:
+            async with self._pipeline_change():
+                updated = await self.model_loader.set_lora_weight(lora_name, weight)
+            if updated:
+                self.set('loaded_loras', self.model_loader.get_loaded_loras())
+            return updated
+        except Exception as e:
+            failure(f"LoRA 가중치 변경 오류: {e}")
+            return False
+
     async def unload_lora(self, lora_name: str) -> bool:
         """특정 LoRA 언로드"""
         try:
-            success = await self.model_loader.unload_lora(lora_name)
+            async with self._pipeline_change():
+                success = await self.model_loader.unload_lora(lora_name)
             if success:
                 # 로드된 LoRA 목록 업데이트
                 loaded_loras = self.model_loader.get_loaded_loras()
@@ -1288,7 +1707,8 @@ class StateManager:
     async def unload_all_loras(self) -> bool:
         """모든 LoRA 언로드"""
         try:
-            success = await self.model_loader.unload_all_loras()
+            async with self._pipeline_change():
+                success = await self.model_loader.unload_all_loras()
             if success:
                 # 로드된 LoRA 목록 업데이트
                 loaded_loras = self.model_loader.get_loaded_loras()
@@ -1308,6 +1728,10 @@ class StateManager:
         """로드된 LoRA 목록 반환"""
         return self.model_loader.get_loaded_loras()
     
+    def get_lora_cache_stats(self) -> Dict[str, Any]:
+        """LoRA state dict 캐시 적중/실패 및 크기"""
+        return self.model_loader.get_lora_cache_stats()
+    
     # 워크플로우 기반 이미지 관리 메서드들
     def set_mode_image(self, mode: str, image):
         """특정 모드의 이미지 설정"""
@@ -26,6 +26,7 @@ class HistoryItem:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     timestamp: datetime = field(default_factory=datetime.now)
     vae: Optional[str] = None
+    model_hash: Optional[str] = None  # 모델 파일 해시 (경로/이름이 바뀌어도 복원 가능)
     loras: List[Dict[str, Any]] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -36,6 +37,7 @@ class HistoryItem:
             'thumbnail_path': self.thumbnail_path,
             'params': self.params.to_dict(),
             'model': self.model,
+            'model_hash': self.model_hash,
             'timestamp': self.timestamp.isoformat(),
             'vae': self.vae,
             'loras': self.loras
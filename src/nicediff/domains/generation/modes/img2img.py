@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 from PIL import Image
 
 from ..services.advanced_encoder import AdvancedTextEncoder
+from ..services.generation_queue import interrupt_callback
 
 
 @dataclass
@@ -66,6 +67,9 @@ class Img2ImgMode:
     def __init__(self, pipeline: Any, device: str):
         self.pipeline = pipeline
         self.device = device
+        self.cancel_check = None  # 생성 작업 취소 확인 (대기열 작업자가 설정, 스텝마다 확인)
+        self.embedding_cache = None  # 프롬프트 임베딩 캐시 (생성 전략이 설정)
+        self.embedding_fingerprint = None  # 텍스트 인코더 지문 (모델/LoRA/토크나이저)
     
     def _encode_image(self, input_image: Image.Image) -> torch.Tensor:
         """VAE 인코딩 (단순화 버전)"""
@@ -135,18 +139,7 @@ class Img2ImgMode:
         if hasattr(self.pipeline.scheduler, 'beta_end'):
             self.pipeline.scheduler.beta_end = 0.012
         
-        # SD15에서 더 선명한 결과를 위한 설정
-        if hasattr(self.pipeline, 'enable_attention_slicing'):
-            self.pipeline.enable_attention_slicing(1)
-        if hasattr(self.pipeline, 'enable_vae_slicing'):
-            self.pipeline.enable_vae_slicing()
-        
-        # xformers는 선택적 기능이므로 안전하게 처리
-        try:
-            if hasattr(self.pipeline, 'enable_xformers_memory_efficient_attention'):
-                self.pipeline.enable_xformers_memory_efficient_attention()
-        except ModuleNotFoundError:
-            pass  # 조용히 무시
+        # 어텐션/VAE 슬라이싱, xformers는 로드 시 실행 프로필(ExecutionProfile)로 적용됨
     
     def _validate_scheduler_application(self, expected_sampler: str, expected_scheduler: str):
         """스케줄러 적용 검증"""
@@ -227,7 +220,10 @@ class Img2ImgMode:
         encoder = AdvancedTextEncoder(
             self.pipeline, 
             weight_mode=weight_mode,
-            use_custom_tokenizer=use_custom
+            use_custom_tokenizer=use_custom,
+            embedding_cache=self.embedding_cache,
+            cache_fingerprint=self.embedding_fingerprint,
+            clip_skip=params.clip_skip
         )
         
         # 프롬프트 인코딩 (77토큰 제한 없음, SDXL 지원)
@@ -310,6 +306,9 @@ class Img2ImgMode:
                 else:
                     info(r"   - SD15 모델: 기본 임베딩만 사용")
                 
+                # 대기열 작업 취소 시 다음 스텝에서 중단
+                if self.cancel_check is not None:
+                    pipeline_params['callback_on_step_end'] = interrupt_callback(self.cancel_check)
                 result = self.pipeline(**pipeline_params)
                 
                 info(r"   ✅ 파이프라인 호출 성공")
@@ -18,6 +18,7 @@ if TYPE_CHECKING:
 
 from ..services.scheduler_manager import SchedulerManager
 from ..services.advanced_encoder import AdvancedTextEncoder
+from ..services.generation_queue import interrupt_callback
 
 
 @dataclass
@@ -56,6 +57,9 @@ class Txt2ImgMode:
     def __init__(self, pipeline: Any, device: str):
         self.pipeline = pipeline
         self.device = device
+        self.cancel_check = None  # 생성 작업 취소 확인 (대기열 작업자가 설정, 스텝마다 확인)
+        self.embedding_cache = None  # 프롬프트 임베딩 캐시 (생성 전략이 설정)
+        self.embedding_fingerprint = None  # 텍스트 인코더 지문 (모델/LoRA/토크나이저)
     
     def _truncate_prompt_with_tokenizer(self, text: str, max_tokens: int, tokenizer) -> str:
         """토크나이저를 사용하여 프롬프트 길이 제한"""
@@ -114,38 +118,10 @@ class Txt2ImgMode:
         if hasattr(self.pipeline.scheduler, 'set_timesteps'):
             self.pipeline.scheduler.set_timesteps(params.steps, device=self.device)
         
-        # 3. 메모리 최적화 (더 나은 품질을 위해)
-        if hasattr(self.pipeline, 'enable_attention_slicing'):
-            self.pipeline.enable_attention_slicing(1)
-        if hasattr(self.pipeline, 'enable_vae_slicing'):
-            self.pipeline.enable_vae_slicing()
+        # 메모리/어텐션/정밀도 설정은 로드 시 실행 프로필(ExecutionProfile)로 적용됨
+        # (생성마다 fp16 변환/CPU 오프로드를 다시 걸면 CPU 프로필의 fp32 실행이 깨짐)
         
-        # 4. PyTorch 2.0+ SDPA 최적화
-        if hasattr(self.pipeline, 'enable_model_cpu_offload'):
-            self.pipeline.enable_model_cpu_offload()
-        
-        # 5. xformers 메모리 효율적 어텐션 (선택적)
-        try:
-            if hasattr(self.pipeline, 'enable_xformers_memory_efficient_attention'):
-                self.pipeline.enable_xformers_memory_efficient_attention()
-                success(r"xformers 메모리 효율적 어텐션 활성화")
-        except (ModuleNotFoundError, AttributeError) as e:
-            warning_emoji(f"xformers 미사용: {e}")
-            success(r"PyTorch 2.0+ SDPA 사용 중")
-        
-        # 6. 모델 정밀도 최적화
-        if hasattr(self.pipeline, 'text_encoder'):
-            self.pipeline.text_encoder = self.pipeline.text_encoder.to(torch.float16)
-        
-        if hasattr(self.pipeline, 'vae'):
-            self.pipeline.vae = self.pipeline.vae.to(torch.float16)
-        
-        # 7. SD15 특화 품질 개선 설정
-        if hasattr(self.pipeline, 'unet'):
-            # UNet을 float16으로 변환하여 메모리 효율성과 속도 향상
-            self.pipeline.unet = self.pipeline.unet.to(torch.float16)
-        
-        # 8. 추가 품질 개선 설정
+        # 3. 추가 품질 개선 설정
         if hasattr(self.pipeline.scheduler, 'config'):
             # 더 정밀한 노이즈 스케줄링
             if hasattr(self.pipeline.scheduler.config, 'timestep_spacing'):
@@ -157,6 +133,32 @@ class Txt2ImgMode:
         
         success(r"SD15 품질 최적화 완료")
     
+    def _extra_pipeline_params(self, params: Txt2ImgParams) -> dict:
+        """파이프라인 호출 공통 추가 파라미터"""
+        extra_params: dict = {
+            'output_type': 'pil',  # PIL 이미지로 직접 반환
+        }
+        
+        # SD15에서만 특별한 최적화 적용
+        if params.model_type == 'SD15':
+            extra_params['eta'] = 1.0  # DDIM 스케줄러에서 사용
+            
+            # guidance_rescale은 특정 스케줄러에서만 사용
+            if params.scheduler in ['karras', 'exponential']:
+                extra_params['guidance_rescale'] = 0.7
+        return extra_params
+    
+    def _pipeline_device(self):
+        """생성기를 만들 디바이스 (파이프라인 컴포넌트 기준)"""
+        for name in ('unet', 'text_encoder'):
+            component = getattr(self.pipeline, name, None)
+            if component is not None and hasattr(component, 'parameters'):
+                try:
+                    return next(component.parameters()).device
+                except StopIteration:
+                    continue
+        return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    
     def _validate_scheduler_application(self, expected_sampler: str, expected_scheduler: str):
         """스케줄러 적용 검증"""
         try:
@@ -205,7 +207,10 @@ class Txt2ImgMode:
         encoder = AdvancedTextEncoder(
             self.pipeline, 
             weight_mode=weight_mode,
-            use_custom_tokenizer=use_custom
+            use_custom_tokenizer=use_custom,
+            embedding_cache=self.embedding_cache,
+            cache_fingerprint=self.embedding_fingerprint,
+            clip_skip=params.clip_skip
         )
         
         # 프롬프트 인코딩 (77토큰 제한 없음, SDXL 지원)
@@ -289,18 +294,8 @@ class Txt2ImgMode:
             
             info(f"🔧 Generator 설정: device={pipeline_device}, seed={params.seed}")
             
-            # 기본 파라미터
-            extra_params: dict = {
-                'output_type': 'pil',  # PIL 이미지로 직접 반환
-            }
-            
-            # SD15에서만 특별한 최적화 적용
-            if params.model_type == 'SD15':
-                extra_params['eta'] = 1.0  # DDIM 스케줄러에서 사용
-                
-                # guidance_rescale은 특정 스케줄러에서만 사용
-                if params.scheduler in ['karras', 'exponential']:
-                    extra_params['guidance_rescale'] = 0.7
+            # 기본 파라미터 + SD15 전용 설정
+            extra_params = self._extra_pipeline_params(params)
             
             # 실제 파이프라인 호출 파라미터 로깅 (고급 인코더 사용, SDXL 지원)
             pipeline_params = {
@@ -332,6 +327,9 @@ class Txt2ImgMode:
             info(f"   - Extra: {extra_params}")
             
             try:
+                # 대기열 작업 취소 시 다음 스텝에서 중단
+                if self.cancel_check is not None:
+                    pipeline_params['callback_on_step_end'] = interrupt_callback(self.cancel_check)
                 result = self.pipeline(**pipeline_params)
                 
                 # 파이프라인 결과에서 images 반환
@@ -365,3 +363,92 @@ class Txt2ImgMode:
                 success(f"생성된 이미지 {i+1}: {type(image)}")
         
         return generated_images
+    
+    async def generate_batch(self, params_list: List[Txt2ImgParams]) -> List[List[Any]]:
+        """여러 작업을 한 번의 파이프라인 호출로 생성 (결과는 params_list 순서의 작업별 이미지 리스트)
+        
+        크기/스텝/CFG/샘플러/스케줄러/CLIP Skip이 같고 batch_size가 1인 작업만 넘겨야 함.
+        프롬프트 임베딩은 한 번에 인코딩해 이어 붙이고, 생성기는 샘플마다 하나씩 넘겨
+        같은 시드면 단독 생성과 같은 초기 노이즈를 사용. 긴 프롬프트(청크 수가 다른 임베딩)는
+        길이별로 나누어 호출. 실패한 묶음의 작업은 빈 리스트
+        """
+        first = params_list[0]
+        canvas_emoji(f"Txt2Img 묶음 생성 시작 - {len(params_list)}개 작업, Seeds: {[p.seed for p in params_list]}")
+        
+        SchedulerManager.apply_scheduler_to_pipeline(self.pipeline, first.sampler, first.scheduler)
+        if first.clip_skip > 1:
+            SchedulerManager.apply_clip_skip_to_pipeline(self.pipeline, first.clip_skip)
+        
+        encoder = AdvancedTextEncoder(
+            self.pipeline,
+            weight_mode=getattr(first, 'weight_interpretation', 'A1111'),
+            use_custom_tokenizer=getattr(first, 'use_custom_tokenizer', True),
+            embedding_cache=self.embedding_cache,
+            cache_fingerprint=self.embedding_fingerprint,
+            clip_skip=first.clip_skip
+        )
+        # 모든 작업의 긍정/부정 프롬프트를 텍스트 인코더별 forward 한 번으로 인코딩 (캐시 적중분 제외)
+        encoded = encoder.encode_prompts_with_pooled([(p.prompt, p.negative_prompt) for p in params_list])
+        
+        self._apply_sd15_optimizations(first)
+        
+        # 임베딩 길이(청크 수)가 같은 작업끼리 한 번에 호출
+        groups: Dict[tuple, List[int]] = {}
+        for index, embeds in enumerate(encoded):
+            shapes = tuple(tuple(e.shape) if e is not None else None for e in embeds)
+            groups.setdefault(shapes, []).append(index)
+        
+        def _generate(indices: List[int]) -> List[Any]:
+            device = self._pipeline_device()
+            generators = []
+            for index in indices:
+                generator = torch.Generator(device=device)
+                if params_list[index].seed > 0:
+                    generator.manual_seed(params_list[index].seed)
+                else:
+                    generator.seed()  # 시드 미지정 작업끼리 같은 노이즈를 쓰지 않도록
+                generators.append(generator)
+            
+            def stack(slot: int):
+                tensors = [encoded[index][slot] for index in indices]
+                return None if tensors[0] is None else torch.cat(tensors, dim=0)
+            
+            pipeline_params = {
+                'prompt_embeds': stack(0),
+                'negative_prompt_embeds': stack(1),
+                'height': first.height,
+                'width': first.width,
+                'num_inference_steps': first.steps,
+                'guidance_scale': first.cfg_scale,
+                'generator': generators,
+                'num_images_per_prompt': 1,
+                **self._extra_pipeline_params(first)
+            }
+            pooled_prompt_embeds = stack(2)
+            if pooled_prompt_embeds is not None:
+                pipeline_params['pooled_prompt_embeds'] = pooled_prompt_embeds
+                pipeline_params['negative_pooled_prompt_embeds'] = stack(3)
+            if self.cancel_check is not None:
+                pipeline_params['callback_on_step_end'] = interrupt_callback(self.cancel_check)
+            
+            info(f"🚀 묶음 파이프라인 호출 - Batch: {len(indices)}, Size: {first.width}x{first.height}, Steps: {first.steps}")
+            try:
+                result = self.pipeline(**pipeline_params)
+                return list(result.images) if hasattr(result, 'images') else list(result)
+            except Exception as e:
+                failure(f"묶음 파이프라인 호출 중 오류: {e}")
+                import traceback
+                traceback.print_exc()
+                return []
+        
+        results: List[List[Any]] = [[] for _ in params_list]
+        for indices in groups.values():
+            images = await asyncio.to_thread(_generate, indices)
+            if len(images) != len(indices):
+                failure(f"묶음 생성 결과 개수 불일치: {len(images)} != {len(indices)}")
+                continue
+            for index, image in zip(indices, images):
+                results[index] = [image]
+        
+        success(f"묶음 생성 완료: {sum(len(images) for images in results)}/{len(params_list)}개 이미지")
+        return results
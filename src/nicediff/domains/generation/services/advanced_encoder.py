@@ -18,12 +18,17 @@ from math import gcd
 class AdvancedTextEncoder:
     """ComfyUI 스타일 고급 텍스트 인코딩"""
     
-    def __init__(self, pipeline, weight_mode="A1111", use_custom_tokenizer=True):
+    def __init__(self, pipeline, weight_mode="A1111", use_custom_tokenizer=True,
+                 embedding_cache=None, cache_fingerprint=None, clip_skip: int = 1):
         self.pipeline = pipeline
         self.weight_mode = weight_mode  # "A1111" 또는 "comfy++"
         self.use_custom_tokenizer = use_custom_tokenizer
         self.tokenizer = pipeline.tokenizer
         self.text_encoder = pipeline.text_encoder
+        # 프롬프트 임베딩 캐시 (지문이 없으면 사용하지 않음: 모델/LoRA 상태를 알 수 없는 호출)
+        self.embedding_cache = embedding_cache if cache_fingerprint is not None else None
+        self.cache_fingerprint = cache_fingerprint
+        self.clip_skip = clip_skip
         
     def parse_prompt_weights(self, text: str) -> List[Tuple[str, float, int]]:
         """A1111 스타일 가중치 파싱: (word:1.2), ((word)), [word]"""
@@ -137,53 +142,77 @@ class AdvancedTextEncoder:
         return weights
     
     def from_zero(self, weights, base_emb):
-        """가중치를 임베딩에 적용 (A1111 방식)"""
+        """가중치를 임베딩에 적용 (A1111 방식). weights는 행마다 토큰 가중치 리스트"""
         weight_tensor = torch.tensor(weights, dtype=base_emb.dtype, device=base_emb.device)
-        weight_tensor = weight_tensor.reshape(1, -1, 1).expand(base_emb.shape)
+        weight_tensor = weight_tensor.reshape(base_emb.shape[0], -1, 1).expand(base_emb.shape)
         return base_emb * weight_tensor
     
     def encode_prompt(self, prompt: str, negative_prompt: str = "") -> Tuple[torch.Tensor, torch.Tensor]:
         """프롬프트 인코딩 (메인 함수)"""
-        
-        # 긍정 프롬프트 처리
-        pos_tokenized = self.tokenize_with_weights(prompt)
-        pos_embeddings = self._encode_tokens(pos_tokenized)
-        
-        # 부정 프롬프트 처리
-        if negative_prompt:
-            neg_tokenized = self.tokenize_with_weights(negative_prompt)
-            neg_embeddings = self._encode_tokens(neg_tokenized)
-        else:
-            # 빈 프롬프트 임베딩
-            empty_tokens = self.tokenizer.encode("", add_special_tokens=True)
-            empty_input = torch.tensor([empty_tokens], device=self.text_encoder.device)
-            with torch.no_grad():
-                neg_embeddings = self.text_encoder(empty_input)[0]
-        
-        return pos_embeddings, neg_embeddings
+        return self.encode_prompts([(prompt, negative_prompt)])[0]
+    
+    def encode_prompts(self, pairs: List[Tuple[str, str]]) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+        """(긍정, 부정) 프롬프트 쌍 여러 개를 첫 번째 텍스트 인코더 forward 한 번으로 인코딩"""
+        prompt_rows = []
+        for prompt, negative_prompt in pairs:
+            prompt_rows.append([self._pad_tokens(self.tokenize_with_weights(prompt))])
+            # 빈 부정 프롬프트도 같은 길이로 패딩 (CLIP은 causal 어텐션이라 앞쪽 토큰 임베딩은 패딩과 무관)
+            prompt_rows.append([self._pad_tokens(self.tokenize_with_weights(negative_prompt))] if negative_prompt
+                               else [self._pad_tokens(self._empty_tokenized())])
+        embeddings = self._encode_prompt_rows(prompt_rows)
+        return [(embeddings[i], embeddings[i + 1]) for i in range(0, len(embeddings), 2)]
+    
+    def _empty_tokenized(self) -> Dict[str, List]:
+        tokens = self.tokenizer.encode("", add_special_tokens=True)
+        return {'tokens': [tokens], 'weights': [[1.0] * len(tokens)], 'word_ids': [[0] * len(tokens)]}
     
     def encode_prompt_with_pooled(self, prompt: str, negative_prompt: str = "") -> Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+        """SDXL용 프롬프트 인코딩 (pooled_prompt_embeds 포함). 같은 프롬프트/설정이면 캐시된 임베딩 반환"""
+        return self.encode_prompts_with_pooled([(prompt, negative_prompt)])[0]
+    
+    def encode_prompts_with_pooled(self, pairs: List[Tuple[str, str]]) -> List[Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]]:
+        """(긍정, 부정) 프롬프트 쌍 여러 개 인코딩. 캐시에 없는 쌍만 텍스트 인코더별 forward 한 번으로 묶어 실행"""
+        results: List[Any] = [None] * len(pairs)
+        keys: List[Any] = [None] * len(pairs)
+        if self.embedding_cache is not None:
+            for index, (prompt, negative_prompt) in enumerate(pairs):
+                keys[index] = self.embedding_cache.make_key(self.cache_fingerprint, prompt, negative_prompt,
+                                                            self.weight_mode, self.use_custom_tokenizer, self.clip_skip)
+                results[index] = self.embedding_cache.get(keys[index])
+            if all(result is not None for result in results):
+                debug_emoji(r"프롬프트 임베딩 캐시 적중 - 텍스트 인코더 생략")
+                return results
+        
+        missing = [index for index, result in enumerate(results) if result is None]
+        encoded = self._encode_prompts_with_pooled([pairs[index] for index in missing])
+        for index, embeds in zip(missing, encoded):
+            results[index] = embeds
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(keys[index], embeds)
+        return results
+    
+    def _encode_prompts_with_pooled(self, pairs: List[Tuple[str, str]]) -> List[Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]]:
         """SDXL용 프롬프트 인코딩 (pooled_prompt_embeds 포함)"""
         
+        # 첫 번째 텍스트 인코더 - 기본 임베딩 (모든 쌍을 한 번에)
+        embeds_1 = self.encode_prompts(pairs)
+        
         # SDXL 모델인지 확인
         if not hasattr(self.pipeline, 'text_encoder_2'):
             # SD15 모델인 경우 기본 인코딩 사용
-            pos_embeds, neg_embeds = self.encode_prompt(prompt, negative_prompt)
-            return pos_embeds, neg_embeds, None, None
+            return [(pos_embeds, neg_embeds, None, None) for pos_embeds, neg_embeds in embeds_1]
         
         # SDXL 모델인 경우 두 개의 텍스트 인코더 사용
         info(r"📝 SDXL 모델 감지 - 두 개의 텍스트 인코더 사용")
         
-        # 첫 번째 텍스트 인코더 (OpenCLIP) - 기본 임베딩
-        pos_embeds_1, neg_embeds_1 = self.encode_prompt(prompt, negative_prompt)
-        
         # 두 번째 텍스트 인코더 (CLIP) - pooled_prompt_embeds 생성
         text_encoder_2 = self.pipeline.text_encoder_2
         tokenizer_2 = self.pipeline.tokenizer_2
         
-        # 긍정 프롬프트 두 번째 인코더 임베딩
-        pos_tokens_2 = tokenizer_2(
-            prompt,
+        # 긍정/부정 프롬프트를 [긍정1, 부정1, 긍정2, 부정2, ...] 순서로 한 번에 인코딩 (빈 부정 프롬프트는 "")
+        texts = [text for prompt, negative_prompt in pairs for text in (prompt, negative_prompt or "")]
+        tokens_2 = tokenizer_2(
+            texts,
             padding="max_length",
             max_length=tokenizer_2.model_max_length,
             truncation=True,
@@ -191,55 +220,34 @@ class AdvancedTextEncoder:
         ).input_ids.to(text_encoder_2.device)
         
         with torch.no_grad():
-            pos_output_2 = text_encoder_2(pos_tokens_2, output_hidden_states=True)
-            pos_embeds_2 = pos_output_2.hidden_states[-2]  # 마지막에서 두 번째 레이어
-            pos_pooled = pos_output_2[0]  # pooled output
-        
-        # 부정 프롬프트 두 번째 인코더 임베딩
-        if negative_prompt:
-            neg_tokens_2 = tokenizer_2(
-                negative_prompt,
-                padding="max_length",
-                max_length=tokenizer_2.model_max_length,
-                truncation=True,
-                return_tensors="pt"
-            ).input_ids.to(text_encoder_2.device)
-        else:
-            neg_tokens_2 = tokenizer_2(
-                "",
-                padding="max_length",
-                max_length=tokenizer_2.model_max_length,
-                truncation=True,
-                return_tensors="pt"
-            ).input_ids.to(text_encoder_2.device)
-        
-        with torch.no_grad():
-            neg_output_2 = text_encoder_2(neg_tokens_2, output_hidden_states=True)
-            neg_embeds_2 = neg_output_2.hidden_states[-2]  # 마지막에서 두 번째 레이어
-            neg_pooled = neg_output_2[0]  # pooled output
-        
-        # SDXL에서는 두 인코더의 임베딩을 연결해야 함
-        # 첫 번째 인코더: 768 차원, 두 번째 인코더: 1280 차원
-        # 연결하면 2048 차원이 됨
-        pos_embeds = torch.cat([pos_embeds_1, pos_embeds_2], dim=-1)
-        neg_embeds = torch.cat([neg_embeds_1, neg_embeds_2], dim=-1)
+            output_2 = text_encoder_2(tokens_2, output_hidden_states=True)
+            hidden_2 = output_2.hidden_states[-2]  # 마지막에서 두 번째 레이어
+            pooled_2 = output_2[0]  # pooled output
+        
+        results = []
+        for index, (pos_embeds_1, neg_embeds_1) in enumerate(embeds_1):
+            pos, neg = 2 * index, 2 * index + 1
+            # SDXL에서는 두 인코더의 임베딩을 연결해야 함
+            # 첫 번째 인코더: 768 차원, 두 번째 인코더: 1280 차원
+            # 연결하면 2048 차원이 됨
+            pos_embeds = torch.cat([pos_embeds_1, hidden_2[pos:pos + 1]], dim=-1)
+            neg_embeds = torch.cat([neg_embeds_1, hidden_2[neg:neg + 1]], dim=-1)
+            results.append((pos_embeds, neg_embeds, pooled_2[pos:pos + 1], pooled_2[neg:neg + 1]))
         
         success(r"SDXL 임베딩 연결 완료:")
-        info(f"   - 첫 번째 인코더: {pos_embeds_1.shape}")
-        info(f"   - 두 번째 인코더: {pos_embeds_2.shape}")
-        info(f"   - 연결 결과: {pos_embeds.shape}")
+        info(f"   - 첫 번째 인코더: {embeds_1[0][0].shape}")
+        info(f"   - 두 번째 인코더: {hidden_2[:1].shape}")
+        info(f"   - 연결 결과: {results[0][0].shape}")
         
-        return pos_embeds, neg_embeds, pos_pooled, neg_pooled
+        return results
     
-    def _encode_tokens(self, tokenized_data: Dict[str, List]) -> torch.Tensor:
-        """토큰을 임베딩으로 변환"""
+    def _pad_tokens(self, tokenized_data: Dict[str, List]) -> Tuple[List[int], List[float], List[int]]:
+        """토큰/가중치/단어 ID를 첫 번째 인코더 입력 길이(77)로 자르거나 패딩한 한 행"""
         
-        tokens = tokenized_data['tokens'][0]
-        weights = tokenized_data['weights'][0]
-        word_ids = tokenized_data['word_ids'][0]
+        tokens = list(tokenized_data['tokens'][0])
+        weights = list(tokenized_data['weights'][0])
+        word_ids = list(tokenized_data['word_ids'][0])
         
-        # SDXL 모델인지 확인하여 토큰 제한 결정
-        is_sdxl = hasattr(self.pipeline, 'text_encoder_2')
         max_length = 77  # SDXL과 SD15 모두 첫 번째 인코더는 77토큰 제한
         
         # 토큰 길이를 정확히 77로 제한 (SDXL 모델에서 차원 불일치 방지)
@@ -255,23 +263,16 @@ class AdvancedTextEncoder:
             weights.append(1.0)
             word_ids.append(0)
         
-        # 기본 임베딩 생성
-        token_tensor = torch.tensor([tokens], device=self.text_encoder.device)
-        with torch.no_grad():
-            base_embeddings = self.text_encoder(token_tensor)[0]
-        
-        # 가중치 적용
-        if self.weight_mode == "A1111":
-            return self._apply_a1111_weights(base_embeddings, weights, word_ids)
-        elif self.weight_mode == "comfy++":
-            return self._apply_comfy_weights(base_embeddings, weights, word_ids)
-        else:
-            return base_embeddings
+        return tokens, weights, word_ids
     
-    def _encode_long_prompt(self, tokens: List[int], weights: List[float], word_ids: List[int], chunk_size: int) -> torch.Tensor:
-        """긴 프롬프트 청킹 처리"""
-        
-        chunks = []
+    def _encode_tokens(self, tokenized_data: Dict[str, List]) -> torch.Tensor:
+        """토큰을 임베딩으로 변환"""
+        return self._encode_prompt_rows([[self._pad_tokens(tokenized_data)]])[0]
+    
+    def _chunk_rows(self, tokens: List[int], weights: List[float], word_ids: List[int],
+                    chunk_size: int) -> List[Tuple[List[int], List[float], List[int]]]:
+        """긴 프롬프트를 특수 토큰 포함 chunk_size 길이의 행들로 분할"""
+        rows = []
         for i in range(0, len(tokens), chunk_size-2):  # 특수 토큰 공간 확보
             chunk_tokens = tokens[i:i+chunk_size-2]
             chunk_weights = weights[i:i+chunk_size-2]
@@ -288,51 +289,63 @@ class AdvancedTextEncoder:
                 full_weights.append(1.0)
                 full_word_ids.append(0)
             
-            # 인코딩
-            token_tensor = torch.tensor([full_tokens], device=self.text_encoder.device)
-            with torch.no_grad():
-                chunk_emb = self.text_encoder(token_tensor)[0]
-            
-            # 가중치 적용
-            if self.weight_mode == "A1111":
-                chunk_emb = self._apply_a1111_weights(chunk_emb, full_weights, full_word_ids)
-            elif self.weight_mode == "comfy++":
-                chunk_emb = self._apply_comfy_weights(chunk_emb, full_weights, full_word_ids)
-            
-            chunks.append(chunk_emb)
-        
-        # 청크 병합 (평균)
-        if len(chunks) == 1:
-            return chunks[0]
-        else:
-            return torch.mean(torch.stack(chunks), dim=0)
+            rows.append((full_tokens, full_weights, full_word_ids))
+        return rows
+    
+    def _encode_long_prompt(self, tokens: List[int], weights: List[float], word_ids: List[int], chunk_size: int) -> torch.Tensor:
+        """긴 프롬프트 청킹 처리 (모든 청크를 forward 한 번으로 인코딩 후 평균)"""
+        return self._encode_prompt_rows([self._chunk_rows(tokens, weights, word_ids, chunk_size)])[0]
     
-    def _apply_a1111_weights(self, embeddings: torch.Tensor, weights: List[float], word_ids: List[int]) -> torch.Tensor:
-        """A1111 스타일 가중치 적용"""
-        weighted_emb = self.from_zero([weights], embeddings)
+    def _encode_prompt_rows(self, prompt_rows: List[List[Tuple[List[int], List[float], List[int]]]]) -> List[torch.Tensor]:
+        """프롬프트별 행(청크) 목록을 모두 이어 붙여 텍스트 인코더 forward 한 번 + 행별 가중치 적용
+        프롬프트마다 청크가 여러 개면 평균으로 병합. 프롬프트 순서대로 (1, 길이, 차원) 텐서 반환"""
+        rows = [row for chunk_rows in prompt_rows for row in chunk_rows]
+        token_tensor = torch.tensor([tokens for tokens, _, _ in rows], device=self.text_encoder.device)
+        with torch.no_grad():
+            base_embeddings = self.text_encoder(token_tensor)[0]
+        embeddings = self._apply_weights(base_embeddings, [row[1] for row in rows], [row[2] for row in rows])
+        
+        results = []
+        offset = 0
+        for chunk_rows in prompt_rows:
+            chunks = embeddings[offset:offset + len(chunk_rows)]
+            offset += len(chunk_rows)
+            # 청크 병합 (평균)
+            results.append(chunks if len(chunk_rows) == 1 else chunks.mean(dim=0, keepdim=True))
+        return results
+    
+    def _apply_weights(self, embeddings: torch.Tensor, weights: List[List[float]], word_ids: List[List[int]]) -> torch.Tensor:
+        """weight_mode에 따라 행별 가중치 적용"""
+        if self.weight_mode == "A1111":
+            return self._apply_a1111_weights(embeddings, weights, word_ids)
+        elif self.weight_mode == "comfy++":
+            return self._apply_comfy_weights(embeddings, weights, word_ids)
+        return embeddings
+    
+    def _apply_a1111_weights(self, embeddings: torch.Tensor, weights: List[List[float]], word_ids: List[List[int]]) -> torch.Tensor:
+        """A1111 스타일 가중치 적용 (행마다 정규화)"""
+        weighted_emb = self.from_zero(weights, embeddings)
         
         # A1111 정규화
-        norm_base = torch.linalg.norm(embeddings)
-        norm_weighted = torch.linalg.norm(weighted_emb)
-        
-        if norm_weighted > 0:
-            embeddings_final = (norm_base / norm_weighted) * weighted_emb
-        else:
-            embeddings_final = weighted_emb
+        norm_base = torch.linalg.vector_norm(embeddings, dim=(1, 2), keepdim=True)
+        norm_weighted = torch.linalg.vector_norm(weighted_emb, dim=(1, 2), keepdim=True)
+        scale = torch.where(norm_weighted > 0, norm_base / norm_weighted, torch.ones_like(norm_weighted))
         
-        return embeddings_final
+        return scale * weighted_emb
     
-    def _apply_comfy_weights(self, embeddings: torch.Tensor, weights: List[float], word_ids: List[int]) -> torch.Tensor:
-        """ComfyUI++ 스타일 가중치 적용 (고급)"""
+    def _apply_comfy_weights(self, embeddings: torch.Tensor, weights: List[List[float]], word_ids: List[List[int]]) -> torch.Tensor:
+        """ComfyUI++ 스타일 가중치 적용 (고급, 행마다 분포 복원)"""
         
-        # 길이별 가중치 분배
-        weights_normalized = self.divide_length([word_ids], [weights])[0]
+        # 길이별 가중치 분배 (단어 길이는 행마다 따로 셈)
+        weights_normalized = [self.divide_length([ids], [row])[0] for row, ids in zip(weights, word_ids)]
         
         # 가중치 적용
-        weighted_emb = self.from_zero([weights_normalized], embeddings)
+        weighted_emb = self.from_zero(weights_normalized, embeddings)
         
         # 분포 복원
-        fixed_std = (embeddings.std() / weighted_emb.std()) * (weighted_emb - weighted_emb.mean())
-        embeddings_final = fixed_std + (embeddings.mean() - fixed_std.mean())
+        dims = (1, 2)
+        fixed_std = (embeddings.std(dim=dims, keepdim=True) / weighted_emb.std(dim=dims, keepdim=True)) * (
+            weighted_emb - weighted_emb.mean(dim=dims, keepdim=True))
+        embeddings_final = fixed_std + (embeddings.mean(dim=dims, keepdim=True) - fixed_std.mean(dim=dims, keepdim=True))
         
-        return embeddings_final 
\ No newline at end of file
+        return embeddings_final
@@ -0,0 +1,112 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+파이프라인 구성 요소 공유 도메인 서비스
+로드한 체크포인트의 텍스트 인코더/VAE 가중치를 텐서 단위로 해시하여
+바이트 단위로 같은 구성 요소는 캐시된 파이프라인끼리 하나의 모듈을 참조 횟수로 공유하는 서비스
+"""
+
+import copy
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Iterable
+
+import torch
+
+
+class ComponentRegistry:
+    """가중치 지문 → 공유 모듈 (참조 횟수 관리)"""
+
+    SHARED_COMPONENTS = ('text_encoder', 'text_encoder_2', 'vae')
+    LORA_COMPONENTS = ('text_encoder', 'text_encoder_2')  # LoRA가 수정할 수 있는 공유 대상
+
+    def __init__(self, component_names: Iterable[str] = SHARED_COMPONENTS):
+        self.component_names = tuple(component_names)
+        self._entries: Dict[str, Dict[str, Any]] = {}  # 지문 → {'module', 'refs', 'bytes'}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    # --- 지문 ---
+    @staticmethod
+    def fingerprint(module: torch.nn.Module) -> str:
+        """구성 요소 지문 (클래스 + 텐서별 이름/dtype/shape/내용 해시)"""
+        digest = hashlib.blake2b(type(module).__name__.encode('utf-8'), digest_size=20)
+        for name, tensor in sorted(module.state_dict().items()):
+            tensor = tensor.detach()
+            digest.update(f"{name}|{tensor.dtype}|{tuple(tensor.shape)}".encode('utf-8'))
+            if tensor.device.type != 'cpu':
+                tensor = tensor.cpu()
+            tensor_digest = hashlib.blake2b(tensor.contiguous().reshape(-1).view(torch.uint8).numpy(), digest_size=16)
+            digest.update(tensor_digest.digest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _module_bytes(module: torch.nn.Module) -> int:
+        return sum(tensor.numel() * tensor.element_size() for tensor in module.state_dict().values())
+
+    # --- 공유 ---
+    def share(self, pipeline: Any) -> Dict[str, str]:
+        """파이프라인의 공유 대상 구성 요소를 등록하고, 같은 지문이 이미 있으면 그 모듈로 교체.
+        {구성 요소 이름: 지문} 반환 (release_all에 그대로 전달)"""
+        shared: Dict[str, str] = {}
+        for name in self.component_names:
+            module = getattr(pipeline, name, None)
+            if not isinstance(module, torch.nn.Module):
+                continue
+            key = self.fingerprint(module)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = {'module': module, 'refs': 1, 'bytes': self._module_bytes(module), 'name': name}
+                else:
+                    entry['refs'] += 1
+                    self.hits += 1
+                    if entry['module'] is not module:
+                        setattr(pipeline, name, entry['module'])
+                        debug_emoji(f"구성 요소 공유: {name} ({entry['bytes'] / (1024 * 1024):.0f}MB 절약)")
+            shared[name] = key
+        return shared
+
+    def release_all(self, shared: Optional[Dict[str, str]]):
+        """파이프라인이 캐시에서 빠질 때 참조 해제 (마지막 참조면 등록 해제)"""
+        for key in (shared or {}).values():
+            self.release(key)
+
+    def release(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            if entry['refs'] <= 0:
+                del self._entries[key]
+
+    def make_private(self, pipeline: Any, shared: Dict[str, str],
+                     component_names: Iterable[str] = LORA_COMPONENTS) -> Dict[str, str]:
+        """LoRA 적용 등으로 가중치를 바꾸기 전, 다른 파이프라인과 공유 중인 구성 요소를 복사 (copy-on-write).
+        갱신된 {구성 요소 이름: 지문} 반환 (복사한 구성 요소는 공유 대상에서 빠짐)"""
+        shared = dict(shared)
+        for name in component_names:
+            key = shared.get(name)
+            if key is None:
+                continue
+            with self._lock:
+                entry = self._entries.get(key)
+                in_use_elsewhere = entry is not None and entry['refs'] > 1
+            if in_use_elsewhere:
+                setattr(pipeline, name, copy.deepcopy(getattr(pipeline, name)))
+                debug_emoji(f"공유 구성 요소 복사 (수정 전): {name}")
+            self.release(key)
+            del shared[name]
+        return shared
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'components': len(self._entries),
+                'shared': sum(1 for entry in self._entries.values() if entry['refs'] > 1),
+                'hits': self.hits,
+                'saved_mb': sum(entry['bytes'] * (entry['refs'] - 1) for entry in self._entries.values()) / (1024 * 1024),
+            }
@@ -0,0 +1,200 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+변환된 파이프라인 디스크 캐시 도메인 서비스
+from_single_file로 변환한 diffusers 형식 구성 요소를 디스크에 저장해 두고
+다음 로드부터는 키 변환/설정 추론 없이 safetensors에서 바로 읽도록 하는 서비스
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+
+class ConvertedPipelineCache:
+    """체크포인트 SHA-256 + dtype 기준 diffusers 형식 캐시 (용량 상한, LRU 정리)"""
+
+    MARKER_FILENAME = '.nicediff_cache.json'  # 저장이 끝난 항목에만 존재
+    HASH_CHUNK = 1024 * 1024
+
+    def __init__(self, cache_dir: str = 'models/.diffusers_cache', max_size_gb: Optional[float] = 20.0,
+                 sha256_provider: Optional[Callable[[Path], Optional[str]]] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_gb * 1024 ** 3) if max_size_gb else None
+        # 스캔 인덱스에 저장된 해시를 재사용/저장하는 함수 (모델 해시 서비스), 없으면 직접 계산
+        self.sha256_provider = sha256_provider
+        self._hashes: Dict[Tuple[str, int, int], str] = {}  # (경로, 크기, mtime_ns) → sha256
+        self._lock = threading.Lock()
+
+    # --- 키 ---
+    def fingerprint(self, model_path: Path) -> str:
+        """체크포인트 내용 지문 (파일 전체 SHA-256)
+
+        VAE/텍스트 인코더만 다른 변형은 헤더와 크기가 같을 수 있으므로 일부만 읽는 지문은 쓰지 않음.
+        (경로, 크기, mtime_ns)별로 한 번만 계산
+        """
+        model_path = Path(model_path)
+        stat_result = model_path.stat()
+        memo_key = (os.path.abspath(model_path), stat_result.st_size, stat_result.st_mtime_ns)
+        sha256 = self._hashes.get(memo_key)
+        if sha256 is None:
+            if self.sha256_provider is not None:
+                sha256 = self.sha256_provider(model_path)
+            if sha256 is None:
+                sha256 = self.compute_sha256(model_path)
+            self._hashes[memo_key] = sha256
+        return sha256
+
+    @classmethod
+    def compute_sha256(cls, model_path: Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def dtype_name(dtype: Any) -> str:
+        return str(dtype).replace('torch.', '')
+
+    def make_key(self, model_path: Path, pipeline_class: str, dtype: Any) -> str:
+        return f"{self.fingerprint(model_path)}_{pipeline_class}_{self.dtype_name(dtype)}"
+
+    def entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    # --- 조회/저장 ---
+    def lookup(self, key: str) -> Optional[Path]:
+        """완성된 캐시 항목 경로 (없으면 None). 적중 시 LRU 사용 시각 갱신"""
+        marker = self.entry_dir(key) / self.MARKER_FILENAME
+        if not marker.exists():
+            return None
+        try:
+            os.utime(marker, None)
+        except OSError:
+            pass
+        return marker.parent
+
+    def store(self, key: str, pipeline: Any, source_path: Optional[Path] = None) -> Optional[Path]:
+        """파이프라인을 diffusers 형식(safetensors)으로 저장 (임시 폴더에 쓴 뒤 이름 변경)"""
+        target = self.entry_dir(key)
+        if (target / self.MARKER_FILENAME).exists():
+            return target
+
+        tmp_dir = self.cache_dir / f".{key}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+            pipeline.save_pretrained(str(tmp_dir), safe_serialization=True)
+            size_bytes = self._dir_size(tmp_dir)
+            meta = {
+                'key': key,
+                'source': str(source_path) if source_path else None,
+                'pipeline_class': type(pipeline).__name__,
+                'size_bytes': size_bytes,
+                'created': time.time(),
+            }
+            with open(tmp_dir / self.MARKER_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+
+            with self._lock:
+                if target.exists():
+                    shutil.rmtree(target, ignore_errors=True)
+                os.replace(tmp_dir, target)
+            info(f"💾 변환된 파이프라인 캐시 저장: {key} ({size_bytes / 1024 ** 3:.2f}GB, {time.perf_counter() - started:.1f}s)")
+        except Exception as e:
+            warning_emoji(f"변환된 파이프라인 캐시 저장 실패 ({key}): {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+        self.prune(keep=key)
+        return target
+
+    def discard(self, key: str) -> bool:
+        """손상된 항목 등 삭제"""
+        target = self.entry_dir(key)
+        if not target.exists():
+            return False
+        with self._lock:
+            shutil.rmtree(target, ignore_errors=True)
+        return True
+
+    # --- 정리 ---
+    def entries(self) -> List[Dict[str, Any]]:
+        """완성된 항목 목록 (최근 사용 순)"""
+        if not self.cache_dir.exists():
+            return []
+        result = []
+        for entry_dir in self.cache_dir.iterdir():
+            marker = entry_dir / self.MARKER_FILENAME
+            if not marker.is_file():
+                continue
+            try:
+                with open(marker, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['last_used'] = marker.stat().st_mtime
+            except (OSError, json.JSONDecodeError):
+                meta = {'key': entry_dir.name, 'size_bytes': self._dir_size(entry_dir), 'last_used': 0.0}
+            meta['path'] = str(entry_dir)
+            result.append(meta)
+        result.sort(key=lambda meta: meta['last_used'], reverse=True)
+        return result
+
+    def total_size(self) -> int:
+        return sum(meta.get('size_bytes', 0) for meta in self.entries())
+
+    def prune(self, max_size_bytes: Optional[int] = None, keep: Optional[str] = None) -> List[str]:
+        """용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제. 삭제한 키 목록 반환"""
+        limit = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        removed = []
+        with self._lock:
+            self._remove_stale_tmp_dirs()
+            if limit is None:
+                return removed
+            entries = self.entries()
+            total = sum(meta.get('size_bytes', 0) for meta in entries)
+            for meta in reversed(entries):  # 오래된 순
+                if total <= limit:
+                    break
+                if meta['key'] == keep:
+                    continue
+                shutil.rmtree(meta['path'], ignore_errors=True)
+                total -= meta.get('size_bytes', 0)
+                removed.append(meta['key'])
+        if removed:
+            info(f"🗑️ 변환된 파이프라인 캐시 정리: {len(removed)}개 삭제")
+        return removed
+
+    def clear(self) -> int:
+        removed = self.prune(max_size_bytes=0)
+        return len(removed)
+
+    def _remove_stale_tmp_dirs(self, max_age_sec: float = 24 * 3600):
+        """중단된 저장이 남긴 임시 폴더 정리"""
+        if not self.cache_dir.exists():
+            return
+        now = time.time()
+        for entry_dir in self.cache_dir.glob('.*.tmp-*'):
+            try:
+                if now - entry_dir.stat().st_mtime > max_age_sec:
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
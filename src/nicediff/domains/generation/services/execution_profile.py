@@ -0,0 +1,180 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+실행 프로파일 도메인 서비스
+장치별로 파이프라인에 적용할 최적화 설정(dtype, autocast, 어텐션 방식, 오프로드, 스레드 수)을 정의하고
+설정([execution])에 따라 선택하여 적용하는 서비스
+"""
+
+import functools
+import sys
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Optional
+
+import torch
+
+
+@dataclass
+class ExecutionProfile:
+    """파이프라인 실행 최적화 프로파일"""
+    name: str
+    dtype: torch.dtype = torch.float16
+    autocast_dtype: Optional[torch.dtype] = None  # CPU bf16 autocast (UNet/텍스트 인코더에만 적용)
+    channels_last: bool = False
+    attention: str = 'slicing'  # 'slicing' (enable_attention_slicing) | 'sdpa' (PyTorch 2 기본 프로세서)
+    attention_slice: Any = 1
+    vae_slicing: bool = True
+    cpu_offload: bool = True
+    xformers: bool = True
+    num_threads: Optional[int] = None
+    num_interop_threads: Optional[int] = None
+
+    def describe(self) -> Dict[str, Any]:
+        """UI/로그 표시용 요약"""
+        return {
+            'name': self.name,
+            'dtype': str(self.dtype).replace('torch.', ''),
+            'autocast': str(self.autocast_dtype).replace('torch.', '') if self.autocast_dtype else None,
+            'channels_last': self.channels_last,
+            'attention': self.attention if self.attention != 'slicing' else f"slicing({self.attention_slice})",
+            'cpu_offload': self.cpu_offload,
+            'threads': torch.get_num_threads(),
+            'interop_threads': torch.get_num_interop_threads(),
+        }
+
+
+# 기존 GPU 동작 그대로 (fp16, 어텐션 슬라이싱, 모델 CPU 오프로드, xformers 시도)
+CUDA_PROFILE = ExecutionProfile(name='cuda')
+
+# CPU 전용 노드: fp16 행렬곱/오프로드 훅 없이 fp32 + SDPA + channels_last (bf16 지원 CPU면 autocast)
+CPU_PROFILE = ExecutionProfile(
+    name='cpu', dtype=torch.float32, channels_last=True, attention='sdpa',
+    vae_slicing=False, cpu_offload=False, xformers=False,
+)
+
+PROFILES = {'cuda': CUDA_PROFILE, 'cpu': CPU_PROFILE}
+
+_DTYPES = {'float32': torch.float32, 'float16': torch.float16, 'bfloat16': torch.bfloat16}
+
+
+def cpu_supports_bf16() -> bool:
+    """CPU가 bf16 연산을 하드웨어로 지원하는지 (AVX512-BF16 / AMX). 판단할 수 없으면 False"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    flags = set(line.split(':', 1)[1].split())
+                    return bool(flags & {'avx512_bf16', 'amx_bf16'})
+    except OSError:
+        pass
+    return False
+
+
+def resolve_profile(device: str, config: Optional[Dict[str, Any]] = None) -> ExecutionProfile:
+    """[execution] 설정으로 프로파일 선택 (profile = auto면 장치로 결정) 후 개별 항목 덮어쓰기"""
+    config = config or {}
+    name = config.get('profile', 'auto')
+    if name == 'auto':
+        name = 'cpu' if torch.device(device).type == 'cpu' else 'cuda'
+    if name not in PROFILES:
+        warning_emoji(f"알 수 없는 실행 프로파일 '{name}', 장치 기본값 사용")
+        name = 'cpu' if torch.device(device).type == 'cpu' else 'cuda'
+    profile = PROFILES[name]
+
+    overrides: Dict[str, Any] = {}
+    if 'dtype' in config and config['dtype'] in _DTYPES:
+        overrides['dtype'] = _DTYPES[config['dtype']]
+    for key in ('channels_last', 'attention', 'attention_slice', 'vae_slicing', 'cpu_offload', 'xformers',
+                'num_threads', 'num_interop_threads'):
+        if key in config:
+            overrides[key] = config[key]
+
+    # bf16 autocast: 'auto'면 하드웨어 지원 시에만 (fp32 가중치 유지, 연산만 bf16)
+    autocast = config.get('bf16_autocast', 'auto' if name == 'cpu' else False)
+    if autocast == 'auto':
+        autocast = cpu_supports_bf16()
+    if autocast and torch.device(device).type == 'cpu':
+        overrides['autocast_dtype'] = torch.bfloat16
+    return replace(profile, **overrides)
+
+
+def apply_thread_settings(profile: ExecutionProfile):
+    """intra-/inter-op 스레드 수 설정 (inter-op은 병렬 작업 시작 전에만 바꿀 수 있음)"""
+    if profile.num_threads:
+        torch.set_num_threads(int(profile.num_threads))
+    if profile.num_interop_threads:
+        try:
+            torch.set_num_interop_threads(int(profile.num_interop_threads))
+        except RuntimeError as e:
+            warning_emoji(f"inter-op 스레드 수는 시작 시에만 설정 가능 (무시): {e}")
+
+
+def autocast_forward(module: torch.nn.Module, dtype: torch.dtype, output_dtype: Optional[torch.dtype] = None):
+    """모듈 forward를 CPU autocast로 감쌈 (autocast는 스레드 로컬이라 실행 스레드 안에서 켜야 함).
+    output_dtype이 있으면 UNet 출력(sample)을 그 dtype으로 되돌려 스케줄러 계산은 원래 정밀도로 유지"""
+    if getattr(module, '_nicediff_autocast', None) == dtype:
+        return
+    original_forward = module.forward
+
+    @functools.wraps(original_forward)
+    def forward(*args, **kwargs):
+        with torch.autocast('cpu', dtype=dtype):
+            output = original_forward(*args, **kwargs)
+        if output_dtype is not None:
+            if hasattr(output, 'sample'):
+                output.sample = output.sample.to(output_dtype)
+            elif isinstance(output, tuple) and output and isinstance(output[0], torch.Tensor):
+                output = (output[0].to(output_dtype),) + output[1:]
+            elif isinstance(output, torch.Tensor):
+                output = output.to(output_dtype)
+        return output
+
+    module.forward = forward
+    module._nicediff_autocast = dtype
+
+
+def apply_profile(pipeline: Any, profile: ExecutionProfile):
+    """파이프라인에 프로파일 적용 (장치 이동 후 호출)"""
+    if profile.attention == 'slicing':
+        if hasattr(pipeline, 'enable_attention_slicing'):
+            pipeline.enable_attention_slicing(profile.attention_slice)
+    elif hasattr(pipeline, 'disable_attention_slicing'):
+        # PyTorch 2 SDPA 프로세서(기본값) 사용
+        pipeline.disable_attention_slicing()
+
+    if profile.vae_slicing and hasattr(pipeline, 'enable_vae_slicing'):
+        pipeline.enable_vae_slicing()
+
+    if profile.cpu_offload and hasattr(pipeline, 'enable_model_cpu_offload'):
+        pipeline.enable_model_cpu_offload()
+
+    # xformers는 선택적 기능이므로 안전하게 처리
+    if profile.xformers:
+        try:
+            if hasattr(pipeline, 'enable_xformers_memory_efficient_attention'):
+                pipeline.enable_xformers_memory_efficient_attention()
+                success(r"xformers 메모리 효율적 어텐션 활성화")
+        except (ModuleNotFoundError, AttributeError) as e:
+            info_emoji(f"xformers 미사용: {e}")
+
+    if profile.channels_last:
+        for component_name in ('unet', 'vae'):
+            component = getattr(pipeline, component_name, None)
+            if isinstance(component, torch.nn.Module):
+                component.to(memory_format=torch.channels_last)
+
+    if profile.autocast_dtype is not None:
+        unet = getattr(pipeline, 'unet', None)
+        if isinstance(unet, torch.nn.Module):
+            autocast_forward(unet, profile.autocast_dtype, output_dtype=profile.dtype)
+        for component_name in ('text_encoder', 'text_encoder_2'):
+            component = getattr(pipeline, component_name, None)
+            if isinstance(component, torch.nn.Module):
+                autocast_forward(component, profile.autocast_dtype)
+
+    debug_emoji(f"실행 프로파일 적용: {profile.describe()}")
+
@@ -0,0 +1,164 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+LoRA 융합(fuse) 가중치 캐시 도메인 서비스
+활성 LoRA 조합을 UNet/텍스트 인코더 가중치에 직접 더해(fuse) 스텝마다의 어댑터 연산을 없애고,
+계산한 델타 텐서를 (체크포인트, LoRA 조합, 가중치) 키로 보관하여 같은 조합으로 돌아오면 다시 계산하지 않는 서비스
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+import torch
+
+
+class FusedLoraCache:
+    """LoRA 델타 LRU 캐시 + 현재 융합 상태 관리
+
+    - 융합: 대상 가중치의 원본을 CPU에 보관한 뒤 델타를 더하고 어댑터 연산은 끔 (disable_lora)
+    - 해제: 원본을 그대로 복사해 되돌림 (fp16 덧셈/뺄셈 오차가 쌓이지 않음)
+    """
+
+    COMPONENTS = ('unet', 'text_encoder', 'text_encoder_2')
+
+    def __init__(self, max_entries: int = 4, max_mb: Optional[float] = 2048):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        self._entries: "OrderedDict[str, Dict[str, torch.Tensor]]" = OrderedDict()  # 키 → {모듈 경로: 델타(CPU)}
+        self._lock = threading.RLock()
+        # 현재 융합 상태: 파이프라인, 키, {모듈 경로: 원본 가중치(CPU)}
+        self._fused_pipeline: Any = None
+        self._fused_key: Optional[str] = None
+        self._originals: Dict[str, torch.Tensor] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # --- 키 ---
+    @staticmethod
+    def _file_signature(path: str) -> str:
+        try:
+            stat = os.stat(path)
+            return f"{stat.st_size}-{stat.st_mtime_ns}"
+        except OSError:
+            return '0-0'
+
+    @classmethod
+    def make_key(cls, checkpoint_key: str, loras: List[Dict[str, Any]]) -> str:
+        """체크포인트 키 + (정렬된 LoRA 파일 지문, 가중치) 조합"""
+        parts = sorted(
+            f"{os.path.abspath(lora['path'])}@{cls._file_signature(lora['path'])}:{float(lora['weight']):.4f}"
+            for lora in loras
+        )
+        return f"{checkpoint_key}||" + '|'.join(parts)
+
+    @property
+    def fused_key(self) -> Optional[str]:
+        return self._fused_key
+
+    # --- 융합/해제 ---
+    def _lora_layers(self, pipeline: Any):
+        """(모듈 경로, PEFT LoRA 레이어) - 어댑터가 붙은 레이어만"""
+        for component_name in self.COMPONENTS:
+            component = getattr(pipeline, component_name, None)
+            if not isinstance(component, torch.nn.Module):
+                continue
+            for name, module in component.named_modules():
+                if hasattr(module, 'get_delta_weight') and hasattr(module, 'base_layer') and getattr(module, 'lora_A', None):
+                    yield f"{component_name}.{name}", module
+
+    def _compute_deltas(self, pipeline: Any) -> Dict[str, torch.Tensor]:
+        """현재 활성 어댑터/가중치(set_adapters 결과)로 레이어별 델타 합 계산"""
+        deltas: Dict[str, torch.Tensor] = {}
+        with torch.no_grad():
+            for path, layer in self._lora_layers(pipeline):
+                active = [name for name in layer.active_adapters if name in layer.lora_A]
+                if not active:
+                    continue
+                delta = sum(layer.get_delta_weight(name) for name in active)
+                deltas[path] = delta.to(device='cpu', dtype=layer.base_layer.weight.dtype)
+        return deltas
+
+    def fuse(self, pipeline: Any, key: str) -> bool:
+        """키에 해당하는 LoRA 조합을 가중치에 융합 (캐시 적중 시 델타만 더함). 캐시 적중 여부 반환"""
+        with self._lock:
+            if self._fused_pipeline is pipeline and self._fused_key == key:
+                return True
+            self.unfuse()
+
+            deltas = self._entries.get(key)
+            hit = deltas is not None
+            if hit:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                self.misses += 1
+                deltas = self._compute_deltas(pipeline)
+                self._store(key, deltas)
+
+            layers = dict(self._lora_layers(pipeline))
+            with torch.no_grad():
+                for path, delta in deltas.items():
+                    weight = layers[path].base_layer.weight
+                    self._originals[path] = weight.detach().to('cpu', copy=True)
+                    weight.add_(delta.to(device=weight.device, dtype=weight.dtype))
+            pipeline.disable_lora()
+            self._fused_pipeline, self._fused_key = pipeline, key
+            debug_emoji(f"LoRA 융합 ({'캐시 적중' if hit else '새로 계산'}): 레이어 {len(deltas)}개")
+            return hit
+
+    def unfuse(self):
+        """융합 해제 (원본 가중치 복원 후 어댑터 연산 다시 켬)"""
+        with self._lock:
+            pipeline = self._fused_pipeline
+            if pipeline is None:
+                return
+            layers = dict(self._lora_layers(pipeline))
+            with torch.no_grad():
+                for path, original in self._originals.items():
+                    weight = layers[path].base_layer.weight
+                    weight.copy_(original.to(weight.device))
+            pipeline.enable_lora()
+            self._originals = {}
+            self._fused_pipeline, self._fused_key = None, None
+
+    # --- 캐시 관리 ---
+    @staticmethod
+    def _entry_bytes(deltas: Dict[str, torch.Tensor]) -> int:
+        return sum(delta.numel() * delta.element_size() for delta in deltas.values())
+
+    def _store(self, key: str, deltas: Dict[str, torch.Tensor]):
+        self._entries[key] = deltas
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._used_bytes() > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+
+    def _used_bytes(self) -> int:
+        return sum(self._entry_bytes(deltas) for deltas in self._entries.values())
+
+    def forget(self, pipeline: Any):
+        """융합된 파이프라인이 메모리에서 해제될 때 참조만 끊음 (복원할 필요 없음)"""
+        with self._lock:
+            if self._fused_pipeline is pipeline:
+                self._originals = {}
+                self._fused_pipeline, self._fused_key = None, None
+
+    def clear(self):
+        with self._lock:
+            self.unfuse()
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'size_mb': self._used_bytes() / (1024 * 1024),
+                'fused': self._fused_key is not None,
+            }
@@ -0,0 +1,338 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+생성 작업 대기열 도메인 서비스
+생성 요청을 파라미터 스냅샷과 함께 작업으로 등록하고, 파이프라인 작업자가 우선순위 순서로 하나씩 처리하는 서비스.
+작업별 취소/순서 변경, 대기열 변경 알림, 작업별 지연 시간(대기/실행/저장) 기록, 완료 시 재등록(무한 생성)을 지원.
+batch_runner가 있으면 설정이 같은(batch_key가 같은) 대기 작업을 최대 max_batch개까지 묶어 한 번에 실행
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+
+@dataclass(eq=False)
+class GenerationJob:
+    """생성 작업 (params는 등록 시점의 스냅샷이므로 이후 UI 변경에 영향받지 않음)"""
+    job_id: str
+    params: Any
+    mode: str = 'txt2img'
+    priority: int = 0
+    init_image: Any = None
+    repeat: bool = False  # 완료되면 같은 설정으로 다시 등록 (무한 생성)
+    state: str = 'queued'  # queued → running → done | failed | cancelled
+    submitted_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    generated_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Any = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def cancel(self):
+        """취소 요청 (실행 중이면 파이프라인 스텝 콜백에서 확인하여 중단)"""
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def mark_generated(self):
+        """추론이 끝나고 저장/후처리가 시작되는 시점 기록"""
+        self.generated_at = time.perf_counter()
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        """대기/실행(추론)/저장 시간(초). 아직 지나지 않은 구간은 None"""
+        def span(start, end):
+            return round(end - start, 3) if start is not None and end is not None else None
+        generated_at = self.generated_at or self.finished_at
+        return {
+            'queued': span(self.submitted_at, self.started_at),
+            'running': span(self.started_at, generated_at),
+            'saving': span(self.generated_at, self.finished_at),
+            'total': span(self.submitted_at, self.finished_at),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """UI 표시용 요약"""
+        return {
+            'job_id': self.job_id,
+            'mode': self.mode,
+            'state': self.state,
+            'priority': self.priority,
+            'repeat': self.repeat,
+            'prompt': getattr(self.params, 'prompt', '')[:80],
+            'seed': getattr(self.params, 'seed', None),
+            'timings': self.timings(),
+            'error': self.error,
+        }
+
+
+def interrupt_callback(cancel_check: Callable[[], bool]):
+    """diffusers callback_on_step_end용 콜백: 취소 요청이 있으면 파이프라인 루프를 다음 스텝에서 중단"""
+    def callback(pipeline, step, timestep, callback_kwargs):
+        if cancel_check():
+            pipeline._interrupt = True
+        return callback_kwargs
+    return callback
+
+
+class GenerationQueue:
+    """우선순위 대기열 + 작업자 N개 (모든 메서드는 이벤트 루프 스레드에서 호출)
+
+    - 같은 우선순위끼리는 등록 순서(FIFO), 높은 우선순위는 앞에 끼어듦
+    - move()는 대기 순서만 바꾸고 우선순위는 그대로 둠
+    - 작업자는 runner(job)를 await하고, 완료 후 repeat 작업은 on_repeat(job)이 준 파라미터로 다시 등록
+    - 묶음 실행: 맨 앞 작업의 batch_key(job)가 None이 아니면 같은 우선순위에서 키가 같은 대기 작업을 모아
+      batch_runner(jobs)로 실행 (결과는 jobs 순서의 리스트). 모자라면 max_wait초까지 새 작업을 기다림
+    - runner/batch_runner는 pipeline_lock을 잡고 실행 — 파이프라인을 바꾸는 쪽도 같은 락을 잡아야 함
+    """
+
+    def __init__(self, runner: Callable[[GenerationJob], Awaitable[Any]], workers: int = 1,
+                 on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_repeat: Optional[Callable[[GenerationJob], Any]] = None,
+                 history_size: int = 50,
+                 batch_runner: Optional[Callable[[List[GenerationJob]], Awaitable[List[Any]]]] = None,
+                 batch_key: Optional[Callable[[GenerationJob], Any]] = None,
+                 max_batch: int = 1, max_wait: float = 0.0):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.on_change = on_change  # 대기열 변경 알림 (대기/실행 개수 + 작업 요약)
+        self.on_repeat = on_repeat  # repeat 작업 완료 시 다음 파라미터 (None이면 반복 종료)
+        self.batch_runner = batch_runner  # 묶음 실행 (None이면 항상 하나씩)
+        self.batch_key = batch_key  # 묶을 수 있는 작업의 키 (None을 반환하면 묶지 않음)
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)  # 묶음을 채우려고 기다리는 최대 시간(초), 0이면 이미 대기 중인 작업만
+        self._pending: List[GenerationJob] = []
+        self._running: Dict[str, GenerationJob] = {}
+        self._finished: deque = deque(maxlen=history_size)  # 최근 완료 작업 (지연 시간 통계용)
+        self._ids = itertools.count(1)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        # 실행 중인 작업과 모델/VAE/LoRA 변경을 직렬화 (변경은 실행 중인 작업이 끝난 뒤, 다음 작업 전에 적용)
+        self.pipeline_lock = asyncio.Lock()
+
+    # --- 작업자 ---
+    def start(self):
+        """작업자 태스크 시작 (실행 중인 이벤트 루프 필요, 중복 호출 무시)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def shutdown(self):
+        self.cancel_all()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def configure_batching(self, max_batch: int, max_wait: float):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+
+    async def _worker(self, index: int):
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            job = self._pending.pop(0)
+            if job.cancel_requested:
+                continue
+            jobs = await self._collect_batch(job)
+            started_at = time.perf_counter()
+            for job in jobs:
+                job.started_at = started_at
+            self._changed()
+            try:
+                async with self.pipeline_lock:
+                    if len(jobs) == 1:
+                        jobs[0].result = await self.runner(jobs[0])
+                    else:
+                        for job, result in zip(jobs, await self.batch_runner(jobs)):
+                            job.result = result
+                for job in jobs:
+                    job.state = 'cancelled' if job.cancel_requested else 'done'
+            except asyncio.CancelledError:
+                for job in jobs:
+                    job.state = 'cancelled'
+                raise
+            except Exception as e:
+                for job in jobs:
+                    job.state, job.error = 'failed', str(e)
+                failure(f"생성 작업 실패 ({', '.join(job.job_id for job in jobs)}): {e}")
+            finally:
+                finished_at = time.perf_counter()
+                for job in jobs:
+                    job.finished_at = finished_at
+                    self._running.pop(job.job_id, None)
+                    self._finished.append(job)
+                    debug_emoji(f"생성 작업 {job.state} ({job.job_id}): {job.timings()}")
+                self._changed()
+            for job in jobs:
+                self._repeat(job)
+
+    async def _collect_batch(self, first: GenerationJob) -> List[GenerationJob]:
+        """first와 묶을 수 있는 대기 작업 수집 (모은 작업은 바로 실행 중으로 옮겨 취소/조회 가능하게 유지)"""
+        batch = [first]
+        self._start_running(first)
+        key = self.batch_key(first) if self.batch_runner is not None and self.batch_key is not None else None
+        if key is None or self.max_batch <= 1:
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while True:
+            for pending in list(self._pending):
+                if len(batch) >= self.max_batch:
+                    break
+                if pending.priority == first.priority and not pending.cancel_requested and self.batch_key(pending) == key:
+                    self._pending.remove(pending)
+                    self._start_running(pending)
+                    batch.append(pending)
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        if len(batch) > 1:
+            debug_emoji(f"생성 작업 {len(batch)}개 묶음 실행: {', '.join(job.job_id for job in batch)}")
+        return batch
+
+    def _start_running(self, job: GenerationJob):
+        job.state = 'running'
+        self._running[job.job_id] = job
+
+    def _repeat(self, job: GenerationJob):
+        if not job.repeat or job.state != 'done' or self.on_repeat is None:
+            return
+        params = self.on_repeat(job)
+        if params is not None:
+            self.submit(params, job.mode, job.priority, job.init_image, repeat=True)
+
+    # --- 대기열 조작 ---
+    def submit(self, params: Any, mode: str = 'txt2img', priority: int = 0, init_image: Any = None,
+               repeat: bool = False) -> GenerationJob:
+        job = GenerationJob(job_id=f"job-{next(self._ids)}", params=params, mode=mode, priority=priority,
+                            init_image=init_image, repeat=repeat)
+        index = next((i for i, pending in enumerate(self._pending) if pending.priority < priority), len(self._pending))
+        self._pending.insert(index, job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        self._changed()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[GenerationJob]:
+        return self._running.get(job_id) or next((job for job in self._pending if job.job_id == job_id), None)
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중이면 제거, 실행 중이면 중단 요청"""
+        job = self.get_job(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        if job in self._pending:
+            self._pending.remove(job)
+            job.state, job.finished_at = 'cancelled', time.perf_counter()
+            self._finished.append(job)
+        self._changed()
+        return True
+
+    def cancel_all(self) -> int:
+        """대기 중인 작업 제거 + 실행 중인 작업 중단 요청. 취소한 개수 반환"""
+        targets = list(self._pending) + list(self._running.values())
+        for job in targets:
+            job.cancel()
+            if job in self._pending:
+                self._pending.remove(job)
+                job.state, job.finished_at = 'cancelled', time.perf_counter()
+                self._finished.append(job)
+        if targets:
+            self._changed()
+        return len(targets)
+
+    def stop_repeating(self) -> int:
+        """무한 생성 종료: 대기 중인 반복 작업은 취소, 실행 중인 반복 작업은 끝까지 실행하되 다시 등록하지 않음"""
+        stopped = 0
+        for job in list(self._running.values()):
+            if job.repeat:
+                job.repeat = False
+                stopped += 1
+        for job in [job for job in self._pending if job.repeat]:
+            stopped += self.cancel(job.job_id)
+        return stopped
+
+    def move(self, job_id: str, index: int) -> bool:
+        """대기 중인 작업을 index 위치로 이동"""
+        job = next((pending for pending in self._pending if pending.job_id == job_id), None)
+        if job is None:
+            return False
+        self._pending.remove(job)
+        self._pending.insert(max(0, min(index, len(self._pending))), job)
+        self._changed()
+        return True
+
+    def set_priority(self, job_id: str, priority: int) -> bool:
+        """대기 중인 작업의 우선순위 변경 (새 우선순위 기준으로 다시 배치)"""
+        job = next((pending for pending in self._pending if pending.job_id == job_id), None)
+        if job is None:
+            return False
+        self._pending.remove(job)
+        job.priority = priority
+        index = next((i for i, pending in enumerate(self._pending) if pending.priority < priority), len(self._pending))
+        self._pending.insert(index, job)
+        self._changed()
+        return True
+
+    # --- 조회 ---
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'jobs': [job.summary() for job in list(self._running.values()) + self._pending],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """최근 완료 작업의 평균 지연 시간"""
+        done = [job.timings() for job in self._finished if job.state == 'done']
+
+        def mean(key):
+            values = [t[key] for t in done if t[key] is not None]
+            return round(sum(values) / len(values), 3) if values else None
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'completed': len(done),
+            'cancelled': sum(1 for job in self._finished if job.state == 'cancelled'),
+            'failed': sum(1 for job in self._finished if job.state == 'failed'),
+            'mean_queued': mean('queued'),
+            'mean_running': mean('running'),
+            'mean_saving': mean('saving'),
+        }
+
+    def _changed(self):
+        if self.on_change is not None:
+            try:
+                self.on_change(self.snapshot())
+            except Exception as e:
+                warning_emoji(f"대기열 변경 알림 실패: {e}")
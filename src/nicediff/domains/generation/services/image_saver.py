@@ -24,7 +24,8 @@ class ImageSaver:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
     
-    async def save_generated_image(self, image: Image.Image, params: GenerationParams, seed: int, model_name: str) -> dict:
+    async def save_generated_image(self, image: Image.Image, params: GenerationParams, seed: int, model_name: str,
+                                   model_hash: Optional[str] = None) -> dict:
         """생성된 이미지를 저장하고 메타데이터를 포함한 결과를 반환"""
         
         def _save():
@@ -34,7 +35,7 @@ class ImageSaver:
             filepath = self.output_dir / filename
             
             # 메타데이터 생성
-            metadata = self._build_metadata_string(params, seed, model_name)
+            metadata = self._build_metadata_string(params, seed, model_name, model_hash)
             pnginfo = self._create_pnginfo(metadata)
             
             # 이미지 저장
@@ -51,10 +52,12 @@ class ImageSaver:
         
         return await asyncio.to_thread(_save)
     
-    def _build_metadata_string(self, params: GenerationParams, seed: int, model_name: str) -> str:
+    def _build_metadata_string(self, params: GenerationParams, seed: int, model_name: str,
+                               model_hash: Optional[str] = None) -> str:
         """메타데이터 문자열 생성"""
         metadata_parts = [
             f"Model: {model_name}",
+            *([f"Model hash: {model_hash}"] if model_hash else []),
             f"Seed: {seed}",
             f"Steps: {params.steps}",
             f"CFG Scale: {params.cfg_scale}",
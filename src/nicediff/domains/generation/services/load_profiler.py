@@ -0,0 +1,175 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+모델 로드 계측 도메인 서비스
+체크포인트 로드 과정을 이름 붙은 단계(파일 읽기/키 변환, 모듈 생성, dtype 변환, 장치 이동, VAE 자동 선택 등)로 나누어
+단계별 소요 시간과 메모리 사용량을 기록하고, 로드마다 한 줄씩 JSONL 롤링 로그로 남기는 서비스
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import torch
+
+
+def _rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS (psutil이 없으면 None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """프로세스 시작 이후 최대 RSS (Unix만, 단조 증가)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # macOS는 바이트, Linux는 KB
+    except Exception:
+        return None
+
+
+class LoadProfile:
+    """모델 로드 1회의 단계별 기록 (로드 스레드와 이벤트 루프 양쪽에서 기록하므로 잠금 사용)"""
+
+    def __init__(self, model_info: Dict[str, Any]):
+        self.model_name = model_info.get('name', Path(model_info.get('path', '')).name)
+        self.model_path = model_info.get('path', '')
+        self.model_type = model_info.get('model_type', 'SD15')
+        self.phases: List[Dict[str, Any]] = []
+        self.tags: Dict[str, Any] = {}  # cache_hit, prebuilt 등 로드 경로 표시
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._lock = threading.Lock()
+        self._cuda = torch.cuda.is_available()
+
+    @contextmanager
+    def phase(self, name: str):
+        """단계 시간 측정 + 종료 시 메모리 샘플 (CUDA는 단계 내 최대 할당량)"""
+        if self._cuda:
+            torch.cuda.reset_peak_memory_stats()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float, sample_memory: bool = True):
+        """단계 시간 추가. 이미 끝난 하위 계측 결과(MmapWeightLoader.phase_times)는 sample_memory=False로 시간만 기록"""
+        record: Dict[str, Any] = {'name': name, 'seconds': round(seconds, 4)}
+        if sample_memory:
+            record.update(rss_mb=_rss_mb(), peak_rss_mb=_peak_rss_mb())
+            if self._cuda:
+                record['cuda_peak_mb'] = torch.cuda.max_memory_allocated() / (1024 * 1024)
+        with self._lock:
+            self.phases.append(record)
+
+    def tag(self, **tags: Any):
+        with self._lock:
+            self.tags.update(tags)
+
+    def to_dict(self, succeeded: bool = True, error_message: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self.phases)
+            tags = dict(self.tags)
+        try:
+            import diffusers
+            diffusers_version = getattr(diffusers, '__version__', None)
+        except ImportError:
+            diffusers_version = None
+        return {
+            'timestamp': self.started_at,
+            'model': self.model_name,
+            'path': self.model_path,
+            'model_type': self.model_type,
+            'success': succeeded,
+            'error': error_message,
+            'total_seconds': round(time.perf_counter() - self.started, 4),
+            'phases': phases,
+            **tags,
+            'versions': {'torch': torch.__version__, 'diffusers': diffusers_version},
+        }
+
+
+def profile_phase(load_profile: Optional[LoadProfile], name: str):
+    """계측 중이면 단계 측정, 아니면 아무것도 하지 않는 컨텍스트 (프리페치 등 계측 없는 호출용)"""
+    return load_profile.phase(name) if load_profile is not None else nullcontext()
+
+
+class LoadProfiler:
+    """로드 기록 생성 + 최근 N개 롤링 로그 (메모리 + JSONL 파일)"""
+
+    def __init__(self, log_path: Optional[Path] = None, max_entries: int = 200):
+        self.log_path = Path(log_path) if log_path else None
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._file_lines = 0  # 로그 파일 줄 수 (다시 쓸 시점 판단)
+        self._records: List[Dict[str, Any]] = self._read_log()
+
+    def start(self, model_info: Dict[str, Any]) -> LoadProfile:
+        return LoadProfile(model_info)
+
+    def finish(self, profile: LoadProfile, succeeded: bool = True, error_message: Optional[str] = None) -> Dict[str, Any]:
+        """로드 기록 확정 후 롤링 로그에 추가. 기록(dict) 반환"""
+        record = profile.to_dict(succeeded, error_message)
+        with self._lock:
+            self._records.append(record)
+            del self._records[:-self.max_entries]
+            self._write_log(record)
+        summary = ', '.join(f"{phase['name']} {phase['seconds']:.2f}s" for phase in record['phases'])
+        debug_emoji(f"모델 로드 계측 ({record['model']}, {record['total_seconds']:.2f}s): {summary}")
+        return record
+
+    def recent(self, limit: Optional[int] = None, model_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 기록 (최신순). model_path를 주면 해당 모델만"""
+        with self._lock:
+            records = [r for r in self._records if model_path is None or r.get('path') == model_path]
+        records.reverse()
+        return records[:limit] if limit else records
+
+    # --- 롤링 로그 파일 ---
+    def _read_log(self) -> List[Dict[str, Any]]:
+        if self.log_path is None or not self.log_path.exists():
+            return []
+        records = []
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._file_lines += 1
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # 중간에 끊긴 줄은 무시
+        except OSError as e:
+            warning_emoji(f"모델 로드 로그 읽기 실패: {e}")
+        return records[-self.max_entries:]
+
+    def _write_log(self, record: Dict[str, Any]):
+        """한 줄 추가, 최대 개수의 2배를 넘으면 최근 N개로 다시 씀 (매번 전체를 쓰지 않도록)"""
+        if self.log_path is None:
+            return
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file_lines += 1
+            if self._file_lines > self.max_entries * 2:
+                tmp_path = self.log_path.with_suffix(self.log_path.suffix + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for kept in self._records:
+                        f.write(json.dumps(kept, ensure_ascii=False) + '\n')
+                os.replace(tmp_path, self.log_path)
+                self._file_lines = len(self._records)
+        except OSError as e:
+            warning_emoji(f"모델 로드 로그 저장 실패: {e}")
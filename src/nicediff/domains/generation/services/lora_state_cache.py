@@ -0,0 +1,97 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+LoRA state dict 캐시 도메인 서비스
+LoRA 파일을 읽어 kohya 등 외부 형식 키를 diffusers 형식으로 변환한 결과(state dict, network alphas)를
+RAM에 LRU로 보관하여, 가중치 조정/조합 비교 중 같은 LoRA를 다시 읽고 변환하지 않도록 하는 서비스
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+
+class LoraStateCache:
+    """파일 지문 + 아키텍처(파이프라인 클래스, SDXL은 UNet 설정 지문 포함) 기준 LRU
+
+    같은 아키텍처의 체크포인트끼리는 변환 결과가 같으므로 체크포인트를 바꿔도 공유됨.
+    safetensors 텐서는 mmap된 파일을 그대로 참조하므로 캐시가 잡는 실제 메모리는 페이지 캐시와 겹침
+    """
+
+    def __init__(self, max_entries: int = 16, max_mb: Optional[float] = 1024):
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.configure(max_entries, max_mb)
+
+    def configure(self, max_entries: Optional[int] = None, max_mb: Optional[float] = None):
+        if max_entries is not None:
+            self.max_entries = max(1, int(max_entries))
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def cache_key(lora_path: str, architecture: str) -> str:
+        try:
+            stat = os.stat(lora_path)
+            signature = f"{stat.st_size}-{stat.st_mtime_ns}"
+        except OSError:
+            signature = '0-0'
+        return f"{os.path.abspath(lora_path)}|{signature}|{architecture}"
+
+    @staticmethod
+    def _state_bytes(state_dict: Dict[str, Any]) -> int:
+        return sum(getattr(tensor, 'nbytes', 0) for tensor in state_dict.values())
+
+    def get(self, lora_path: str, architecture: str, parse: Callable[[], Tuple[Any, ...]]) -> Tuple[Any, ...]:
+        """parse()가 돌려주는 (state dict, network alphas[, LoRA 메타데이터]) 반환. 없으면 parse()로 읽고 변환하여 보관"""
+        key = self.cache_key(lora_path, architecture)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry['parsed']
+            self.misses += 1
+
+        parsed = tuple(parse())
+        with self._lock:
+            self._entries[key] = {
+                'parsed': parsed,
+                'bytes': self._state_bytes(parsed[0]),
+            }
+            self._evict()
+        return parsed
+
+    def _evict(self):
+        """최대 개수/용량을 넘으면 오래된 항목부터 제거 (방금 넣은 항목은 유지)"""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._used_bytes() > self.max_bytes)
+        ):
+            key, _ = self._entries.popitem(last=False)
+            debug_emoji(f"LoRA state dict 캐시에서 제거: {os.path.basename(key.split('|')[0])}")
+
+    def _used_bytes(self) -> int:
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size_mb': self._used_bytes() / (1024 * 1024),
+            }
@@ -0,0 +1,146 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+메모리 매핑 가중치 로더 도메인 서비스
+diffusers 형식 폴더의 safetensors를 mmap으로 열어 텐서 하나씩 dtype 변환/장치 이동 후
+빈(meta) 모듈에 바로 꽂아 넣어, 로드 중 최대 메모리를 모델 크기 수준으로 제한하는 서비스
+"""
+
+import importlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
+
+import torch
+from accelerate import init_empty_weights
+from safetensors import safe_open
+
+
+class MmapWeightLoader:
+    """safetensors mmap + 텐서 단위 지연 dtype 변환 로더"""
+
+    def __init__(self, dtype: torch.dtype = torch.float16, device: str = 'cpu',
+                 on_phase: Optional[Callable[[str], None]] = None):
+        self.dtype = dtype
+        self.device = device
+        self.on_phase = on_phase  # 단계 시작 알림 (벤치마크/계측용)
+        self.phase_times: Dict[str, float] = {}
+        self._phase_name: Optional[str] = None
+        self._phase_started = 0.0
+
+    # --- 단계 계측 ---
+    def _phase(self, name: Optional[str]):
+        now = time.perf_counter()
+        if self._phase_name is not None:
+            self.phase_times[self._phase_name] = self.phase_times.get(self._phase_name, 0.0) + now - self._phase_started
+        self._phase_name, self._phase_started = name, now
+        if name is not None and self.on_phase is not None:
+            self.on_phase(name)
+
+    # --- 텐서 단위 로드 ---
+    def iter_tensors(self, weights_file: Path) -> Iterator[Tuple[str, torch.Tensor]]:
+        """mmap된 파일에서 텐서를 하나씩 꺼내 dtype 변환 후 반환 (부동소수 텐서만 변환)"""
+        with safe_open(str(weights_file), framework='pt', device='cpu') as f:
+            for key in f.keys():
+                tensor = f.get_tensor(key)
+                if tensor.is_floating_point() and tensor.dtype != self.dtype:
+                    tensor = tensor.to(self.dtype)
+                if self.device != 'cpu':
+                    tensor = tensor.to(self.device)
+                yield key, tensor
+
+    def assign_weights(self, module: torch.nn.Module, weights_files: List[Path]) -> int:
+        """meta 모듈의 파라미터/버퍼를 파일의 텐서로 교체 (복사 없이 할당). 할당한 개수 반환"""
+        assigned = 0
+        for weights_file in weights_files:
+            for key, tensor in self.iter_tensors(weights_file):
+                module_path, _, name = key.rpartition('.')
+                try:
+                    owner = module.get_submodule(module_path) if module_path else module
+                except AttributeError:
+                    continue  # 체크포인트에만 있는 키 (사용하지 않음)
+                if name in owner._parameters:
+                    owner._parameters[name] = torch.nn.Parameter(tensor, requires_grad=False)
+                elif name in owner._buffers:
+                    owner._buffers[name] = tensor
+                else:
+                    continue
+                assigned += 1
+
+        # safetensors 저장 시 제거된 공유(tied) 가중치 복원
+        if hasattr(module, 'tie_weights'):
+            module.tie_weights()
+
+        missing = [name for name, param in module.named_parameters() if param.device.type == 'meta']
+        if missing:
+            raise ValueError(f"{type(module).__name__}: 가중치 누락 {len(missing)}개 (예: {missing[0]})")
+        return assigned
+
+    # --- 파이프라인 로드 ---
+    @staticmethod
+    def _resolve_class(library: str, class_name: str):
+        """model_index.json의 [라이브러리, 클래스] → 클래스 객체"""
+        for module_name in (library, f"diffusers.pipelines.{library}"):
+            try:
+                return getattr(importlib.import_module(module_name), class_name)
+            except (ImportError, AttributeError):
+                continue
+        raise ImportError(f"{library}.{class_name} 클래스를 찾을 수 없습니다")
+
+    def _build_empty_model(self, component_class, component_dir: Path) -> torch.nn.Module:
+        """설정 파일만으로 가중치 없는(meta) 모델 생성"""
+        with init_empty_weights():
+            if hasattr(component_class, 'load_config') and hasattr(component_class, 'from_config'):
+                # diffusers ModelMixin
+                model = component_class.from_config(component_class.load_config(str(component_dir)))
+            else:
+                # transformers PreTrainedModel
+                config = component_class.config_class.from_pretrained(str(component_dir))
+                model = component_class(config)
+        return model
+
+    def load_pipeline(self, pipeline_class, folder: Path):
+        """diffusers 형식 폴더에서 파이프라인 로드 (모델 구성 요소는 mmap 경로, 나머지는 from_pretrained)"""
+        folder = Path(folder)
+        self.phase_times = {}
+        with open(folder / 'model_index.json', 'r', encoding='utf-8') as f:
+            model_index = json.load(f)
+
+        components: Dict[str, Any] = {}
+        models: List[Tuple[str, torch.nn.Module, List[Path]]] = []
+
+        self._phase('skeleton')
+        for name, spec in model_index.items():
+            if name.startswith('_'):
+                continue
+            if not isinstance(spec, list) or len(spec) != 2:
+                components[name] = spec  # requires_safety_checker 등 생성자 설정값
+                continue
+            library, class_name = spec
+            if library is None or class_name is None:
+                components[name] = None
+                continue
+            component_class = self._resolve_class(library, class_name)
+            component_dir = folder / name
+            weights_files = sorted(component_dir.glob('*.safetensors'))
+            if issubclass(component_class, torch.nn.Module) and weights_files:
+                model = self._build_empty_model(component_class, component_dir)
+                models.append((name, model, weights_files))
+                components[name] = model
+            else:
+                # 스케줄러/토크나이저/특징 추출기 등 가벼운 구성 요소
+                components[name] = component_class.from_pretrained(str(folder), subfolder=name)
+
+        self._phase('weights')
+        for name, model, weights_files in models:
+            assigned = self.assign_weights(model, weights_files)
+            model.eval()
+            debug_emoji(f"mmap 로드: {name} ({assigned}개 텐서)")
+
+        self._phase('assemble')
+        pipeline = pipeline_class(**components)
+        self._phase(None)
+        return pipeline
@@ -8,25 +8,202 @@ UI나 StateManager에 의존하지 않는 순수한 비즈니스 로직
 """
 
 import asyncio
+import hashlib
+import json
+import os
+import re
 from typing import Dict, Any, Optional, Union, List
 from pathlib import Path
 
 import torch
 from diffusers import AutoencoderKL
+from diffusers.loaders import StableDiffusionXLLoraLoaderMixin
 from diffusers.pipelines.stable_diffusion.pipeline_stable_diffusion import StableDiffusionPipeline
 from diffusers.pipelines.stable_diffusion_xl.pipeline_stable_diffusion_xl import StableDiffusionXLPipeline
 
+from .pipeline_cache import PipelineCache
+from .converted_pipeline_cache import ConvertedPipelineCache
+from .mmap_loader import MmapWeightLoader
+from .model_prefetcher import ModelPrefetcher
+from .component_registry import ComponentRegistry
+from .vae_registry import VaeRegistry
+from .fused_lora_cache import FusedLoraCache
+from .lora_state_cache import LoraStateCache
+from .prompt_embedding_cache import PromptEmbeddingCache
+from .load_profiler import LoadProfiler, LoadProfile, profile_phase
+from .execution_profile import ExecutionProfile, resolve_profile, apply_profile, apply_thread_settings
+
+try:
+    # load_lora_weights가 쓰는 기본값 (peft/transformers 버전에 따라 결정)
+    from diffusers.loaders.lora_pipeline import _LOW_CPU_MEM_USAGE_DEFAULT_LORA
+except ImportError:
+    _LOW_CPU_MEM_USAGE_DEFAULT_LORA = False
+
 
 class ModelLoader:
     """모델 로딩 서비스"""
     
-    def __init__(self, device: str = "cuda"):
+    def __init__(self, device: str = "cuda", cache_config: Optional[Dict[str, Any]] = None):
         self.device = device
         self.current_pipeline: Optional[Union[StableDiffusionPipeline, StableDiffusionXLPipeline]] = None
+        self.current_cache_key: Optional[str] = None
         self.loaded_loras: List[Dict[str, Any]] = []  # 로드된 LoRA 목록
+        # 바이트 단위로 같은 텍스트 인코더/VAE는 캐시된 파이프라인끼리 공유
+        self.component_registry = ComponentRegistry()
+        self.pipeline_cache = PipelineCache(device, **(cache_config or {}), on_release=self._release_shared_components)
+        self.vae_registry = VaeRegistry(device)  # 외부 VAE LRU ([vae_cache] max_entries)
+        self.fuse_loras = False  # 생성 전 활성 LoRA를 가중치에 융합 ([lora] fuse)
+        self.fused_lora_cache = FusedLoraCache()
+        self.lora_state_cache = LoraStateCache()  # 읽고 변환한 LoRA state dict LRU ([lora] state_cache_*)
+        self.prompt_embedding_cache = PromptEmbeddingCache()  # 텍스트 인코더 출력 LRU ([prompt_cache] 설정)
+        self.converted_cache: Optional[ConvertedPipelineCache] = None  # 선택 기능 ([converted_cache] enabled)
+        self.mmap_loading = False  # diffusers 형식 폴더를 mmap + 텐서 단위 변환으로 로드 ([loading] mmap)
+        self.load_profiler = LoadProfiler()  # 로드 단계별 시간/메모리 롤링 로그 ([loading] profile_log)
+        self.prefetcher: Optional[ModelPrefetcher] = None  # 다음 모델 예측 프리페치 ([prefetch] enabled)
+        self.profile: ExecutionProfile = resolve_profile(device)  # 장치별 최적화 프로파일 ([execution] 설정)
+        self.vae_registry.dtype = self.profile.dtype
+    
+    def configure_cache(self, max_vram_mb: Optional[float] = None, max_ram_mb: Optional[float] = None,
+                        max_entries: Optional[int] = None):
+        """파이프라인 캐시 예산 설정 ([pipeline_cache] 설정)"""
+        self.pipeline_cache.configure(max_vram_mb, max_ram_mb, max_entries)
+    
+    def configure_vae_cache(self, max_entries: Optional[int] = None):
+        """외부 VAE 캐시 크기 설정 ([vae_cache] 설정)"""
+        self.vae_registry.configure(max_entries)
+    
+    def configure_converted_cache(self, enabled: bool = False, cache_dir: str = 'models/.diffusers_cache',
+                                  max_size_gb: Optional[float] = 20.0, sha256_provider=None):
+        """변환된 파이프라인 디스크 캐시 설정 ([converted_cache] 설정). sha256_provider: 저장된 체크포인트 해시 조회"""
+        self.converted_cache = ConvertedPipelineCache(cache_dir, max_size_gb, sha256_provider) if enabled else None
+    
+    def configure_lora(self, fuse: bool = False, fused_cache_entries: int = 4, fused_cache_mb: Optional[float] = 2048,
+                       state_cache_entries: int = 16, state_cache_mb: Optional[float] = 1024):
+        """LoRA 실행 방식 설정 ([lora] 설정). fuse면 생성 전에 융합하고 델타를 캐시"""
+        self.fused_lora_cache.clear()
+        self.fuse_loras = fuse
+        self.fused_lora_cache = FusedLoraCache(fused_cache_entries, fused_cache_mb)
+        self.lora_state_cache.configure(state_cache_entries, state_cache_mb)
+    
+    def configure_prompt_cache(self, max_entries: int = 64, max_mb: Optional[float] = 256):
+        """프롬프트 임베딩 캐시 크기 설정 ([prompt_cache] 설정, max_entries = 0이면 끔)"""
+        self.prompt_embedding_cache.configure(max_entries, max_mb)
+    
+    def text_encoder_fingerprint(self) -> Optional[str]:
+        """프롬프트 임베딩 캐시 키용 텍스트 인코더 지문
+        체크포인트 키 + 토크나이저/텍스트 인코더 객체 + 텍스트 인코더를 바꾸는 LoRA 조합(파일 지문, 가중치)"""
+        if self.current_pipeline is None or self.current_cache_key is None:
+            return None
+        modules = '/'.join(
+            f"{name}:{id(getattr(self.current_pipeline, name, None))}"
+            for name in ('tokenizer', 'tokenizer_2', 'text_encoder', 'text_encoder_2')
+        )
+        loras = [lora for lora in self.loaded_loras if lora.get('text_encoder', True)]
+        return f"{self.fused_lora_cache.make_key(self.current_cache_key, loras)}||{modules}"
+    
+    def configure_loading(self, mmap: bool = False, profile_log: Optional[str] = None, profile_log_entries: int = 200):
+        """가중치 로딩 방식 및 로드 계측 로그 설정 ([loading] 설정)"""
+        self.mmap_loading = mmap
+        self.load_profiler = LoadProfiler(Path(profile_log) if profile_log else None, profile_log_entries)
+        if mmap and self.converted_cache is None:
+            info_emoji(r"mmap 로딩은 diffusers 형식 폴더에 적용됩니다. 단일 파일 체크포인트에도 쓰려면 [converted_cache]를 켜세요.")
+    
+    def configure_execution(self, config: Optional[Dict[str, Any]] = None) -> ExecutionProfile:
+        """실행 프로파일 설정 ([execution] 설정). 이후 새로 로드하는 파이프라인부터 적용"""
+        self.profile = resolve_profile(self.device, config)
+        apply_thread_settings(self.profile)
+        self.vae_registry.dtype = self.profile.dtype
+        info_emoji(f"실행 프로파일: {self.profile.describe()}")
+        return self.profile
+    
+    def configure_prefetch(self, enabled: bool = True, prebuild: bool = False, max_concurrent: int = 1,
+                           hover_delay: float = 0.4, history_path: Optional[str] = None, should_pause=None):
+        """다음 모델 프리페치 설정 ([prefetch] 설정). prebuild면 CPU 파이프라인까지 미리 생성"""
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        self.prefetcher = ModelPrefetcher(
+            build_pipeline=self.build_pipeline, prebuild=prebuild, max_concurrent=max_concurrent,
+            hover_delay=hover_delay, history_path=Path(history_path) if history_path else None,
+            should_pause=should_pause,
+        ) if enabled else None
     
-    async def load_model(self, model_info: Dict[str, Any]) -> Union[StableDiffusionPipeline, StableDiffusionXLPipeline]:
-        """모델을 로드하고 최적화 설정을 적용"""
+    def hint_next_model(self, model_info: Dict[str, Any], reason: str = 'hover'):
+        """UI 힌트(마우스 오버/선택)로 다음 모델 프리페치 (현재/캐시된 모델은 건너뜀)"""
+        if self.prefetcher is None or self.is_cached(model_info):
+            return
+        self.prefetcher.hint(model_info, reason)
+    
+    def _prefetch_predicted(self, model_info: Dict[str, Any]):
+        """사용 기록 갱신 후 이 모델 다음에 쓸 가능성이 높은 모델 예열"""
+        self.prefetcher.record_usage(model_info)
+        predicted = self.prefetcher.predict_next(model_info['path'])
+        if predicted is not None and not self.is_cached(predicted):
+            self.prefetcher.prefetch(predicted, reason='predict')
+    
+    @staticmethod
+    def cache_key(model_info: Dict[str, Any]) -> str:
+        """파일 경로 + mtime 기반 캐시 키 (파일이 바뀌면 다른 키)"""
+        model_path = model_info['path']
+        try:
+            mtime_ns = os.stat(model_path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        return f"{os.path.abspath(model_path)}|{mtime_ns}|{model_info.get('model_type', 'SD15')}"
+    
+    def _release_shared_components(self, entry: Dict[str, Any]):
+        self.component_registry.release_all(entry.get('shared_components'))
+        self.fused_lora_cache.forget(entry.get('pipeline'))
+    
+    def _update_shared_components(self, shared: Dict[str, str]):
+        if self.current_cache_key is not None:
+            self.pipeline_cache.update(self.current_cache_key, shared_components=shared)
+    
+    def _current_shared_components(self) -> Dict[str, str]:
+        entry = self.pipeline_cache.peek(self.current_cache_key) if self.current_cache_key else None
+        return dict(entry.get('shared_components') or {}) if entry else {}
+    
+    def is_cached(self, model_info: Dict[str, Any]) -> bool:
+        return self.cache_key(model_info) in self.pipeline_cache
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {**self.pipeline_cache.get_stats(), 'shared_components': self.component_registry.get_stats(),
+                'vae': self.vae_registry.get_stats(), 'fused_lora': self.fused_lora_cache.get_stats(),
+                'prompt_embeddings': self.prompt_embedding_cache.get_stats()}
+    
+    async def load_model(self, model_info: Dict[str, Any],
+                         load_profile: Optional[LoadProfile] = None) -> Union[StableDiffusionPipeline, StableDiffusionXLPipeline]:
+        """모델을 로드하고 최적화 설정을 적용 (캐시에 있으면 재사용). load_profile이 있으면 단계별로 계측"""
+        key = self.cache_key(model_info)
+        if load_profile is not None:
+            load_profile.tag(execution_profile=self.profile.name, cache_hit=False, prebuilt=False)
+        if key != self.current_cache_key:
+            self.prompt_embedding_cache.invalidate('모델 변경')
+        
+        # 예측이 틀린 다른 모델의 프리페치는 취소 (I/O·메모리 양보)
+        if self.prefetcher is not None:
+            self.prefetcher.cancel_all(except_path=model_info['path'])
+        
+        # 이전 파이프라인은 LoRA 융합을 풀어 원본 가중치 상태로 캐시에 둠
+        with profile_phase(load_profile, 'lora_unfuse'):
+            await asyncio.to_thread(self.fused_lora_cache.unfuse)
+        
+        # 현재 파이프라인의 LoRA 상태를 캐시 항목에 기록 (돌아왔을 때 복원)
+        if self.current_cache_key is not None:
+            self.pipeline_cache.update(self.current_cache_key, loaded_loras=list(self.loaded_loras))
+        
+        # 캐시 적중: CPU로 강등된 경우 장치로 다시 올리는 비용만 발생
+        with profile_phase(load_profile, 'cache_get'):
+            entry = await asyncio.to_thread(self.pipeline_cache.get, key)
+        if entry is not None:
+            if load_profile is not None:
+                load_profile.tag(cache_hit=True)
+            self.current_pipeline = entry['pipeline']
+            self.current_cache_key = key
+            self.loaded_loras = list(entry.get('loaded_loras', []))
+            success(f"파이프라인 캐시 적중: {model_info.get('name', key)}")
+            if self.prefetcher is not None:
+                self._prefetch_predicted(model_info)
+            return self.current_pipeline
         
         def _load():
             model_path = model_info['path']
@@ -34,66 +211,124 @@ class ModelLoader:
             
             debug_emoji(f"모델 타입: {model_type}, 경로: {model_path}")
             
-            if model_type == 'SDXL':
-                pipeline = StableDiffusionXLPipeline.from_single_file(
-                    model_path,
-                    torch_dtype=torch.float16,
-                    use_safetensors=True
-                )
+            # 프리페치에서 미리 만든 CPU 파이프라인이 있으면 장치 이동만 남음
+            pipeline = self.prefetcher.take_prebuilt(model_path) if self.prefetcher is not None else None
+            if pipeline is not None:
+                success(f"프리페치된 파이프라인 사용: {Path(model_path).name}")
+                if load_profile is not None:
+                    load_profile.tag(prebuilt=True)
             else:
-                pipeline = StableDiffusionPipeline.from_single_file(
-                    model_path,
-                    torch_dtype=torch.float16,
-                    use_safetensors=True
-                )
+                pipeline = self.build_pipeline(model_path, model_type, load_profile=load_profile)
+            
+            # 장치 이동 전(CPU 텐서)에 지문을 계산하여 같은 구성 요소는 기존 모듈로 교체
+            with profile_phase(load_profile, 'share_components'):
+                shared = self.component_registry.share(pipeline)
+            
+            # 올리기 전에 이전 파이프라인들을 예산에 맞게 CPU로 강등 (이전 + 새 모델이 동시에 VRAM에 있지 않도록)
+            with profile_phase(load_profile, 'cache_reserve'):
+                self.pipeline_cache.reserve(pipeline)
             
             # GPU로 이동
-            pipeline = pipeline.to(self.device)
+            with profile_phase(load_profile, 'device_move'):
+                pipeline = pipeline.to(self.device)
             
             # 최적화 설정 적용
-            self._apply_optimizations(pipeline, model_type)
+            self._apply_optimizations(pipeline, model_type, load_profile)
             
-            return pipeline
+            return pipeline, shared
         
-        self.current_pipeline = await asyncio.to_thread(_load)
+        try:
+            pipeline, shared = await asyncio.to_thread(_load)
+        except Exception:
+            # 자리를 비우려고 강등했던 현재 파이프라인을 장치로 되돌림
+            if self.current_cache_key is not None:
+                await asyncio.to_thread(self.pipeline_cache.get, self.current_cache_key)
+            raise
+        self.current_pipeline = pipeline
+        self.current_cache_key = key
         # 모델 로드 시 기존 LoRA 목록 초기화
         self.loaded_loras = []
+        # 등록과 동시에 예산을 넘는 이전 파이프라인은 CPU로 강등/제거
+        with profile_phase(load_profile, 'cache_put'):
+            await asyncio.to_thread(self.pipeline_cache.put, key, pipeline, name=model_info.get('name', key), loaded_loras=[],
+                                    shared_components=shared)
+        if self.prefetcher is not None:
+            self._prefetch_predicted(model_info)
         return self.current_pipeline
     
-    def _apply_optimizations(self, pipeline: Union[StableDiffusionPipeline, StableDiffusionXLPipeline], model_type: str):
-        """모델 최적화 설정 적용"""
-        
-        # SD15에서 더 나은 품질을 위한 설정
-        if hasattr(pipeline, 'enable_attention_slicing'):
-            pipeline.enable_attention_slicing(1)
-        if hasattr(pipeline, 'enable_vae_slicing'):
-            pipeline.enable_vae_slicing()
+    def build_pipeline(self, model_path: str, model_type: str, dtype: Optional[torch.dtype] = None,
+                       load_profile: Optional[LoadProfile] = None) -> Union[StableDiffusionPipeline, StableDiffusionXLPipeline]:
+        """체크포인트 파일로 CPU 파이프라인 생성 (변환 캐시가 있으면 diffusers 형식에서 바로 로드). dtype 기본값은 실행 프로파일"""
+        dtype = dtype or self.profile.dtype
+        pipeline_class = StableDiffusionXLPipeline if model_type == 'SDXL' else StableDiffusionPipeline
+        converted_cache = self.converted_cache
+        key = None
+        if converted_cache is not None:
+            try:
+                with profile_phase(load_profile, 'converted_cache_lookup'):
+                    key = converted_cache.make_key(Path(model_path), pipeline_class.__name__, dtype)
+                    cached_dir = converted_cache.lookup(key)
+            except OSError as e:
+                warning_emoji(f"변환 캐시 키 계산 실패: {e}")
+                cached_dir = None
+            
+            if cached_dir is not None:
+                try:
+                    # 키 변환/설정 추론 없이 safetensors에서 바로 로드
+                    if self.mmap_loading:
+                        mmap_loader = MmapWeightLoader(dtype)
+                        pipeline = mmap_loader.load_pipeline(pipeline_class, cached_dir)
+                        if load_profile is not None:
+                            # 모듈 생성(skeleton) / 파일 읽기+dtype 변환(weights) / 조립(assemble)
+                            for phase_name, seconds in mmap_loader.phase_times.items():
+                                load_profile.add_phase(f"mmap_{phase_name}", seconds, sample_memory=False)
+                            load_profile.tag(loader='mmap')
+                    else:
+                        with profile_phase(load_profile, 'from_pretrained'):
+                            pipeline = pipeline_class.from_pretrained(str(cached_dir), torch_dtype=dtype, use_safetensors=True)
+                        if load_profile is not None:
+                            load_profile.tag(loader='converted')
+                    success(f"변환 캐시에서 로드: {Path(model_path).name}")
+                    return pipeline
+                except Exception as e:
+                    warning_emoji(f"변환 캐시 로드 실패, 원본에서 다시 변환: {e}")
+                    converted_cache.discard(key)
         
-        # PyTorch 2.0+ SDPA 최적화 (xformers 대신 사용)
-        if hasattr(pipeline, 'enable_model_cpu_offload'):
-            pipeline.enable_model_cpu_offload()
+        # 파일 읽기 + 키 변환 + 모듈 생성 + dtype 변환이 diffusers 내부에서 한 번에 일어남
+        with profile_phase(load_profile, 'single_file_load'):
+            pipeline = pipeline_class.from_single_file(
+                model_path,
+                torch_dtype=dtype,
+                use_safetensors=True
+            )
+        if load_profile is not None:
+            load_profile.tag(loader='single_file')
         
-        # xformers는 선택적 기능이므로 안전하게 처리
-        try:
-            if hasattr(pipeline, 'enable_xformers_memory_efficient_attention'):
-                pipeline.enable_xformers_memory_efficient_attention()
-                success(r"xformers 메모리 효율적 어텐션 활성화")
-        except (ModuleNotFoundError, AttributeError) as e:
-            info_emoji(f"xformers 미사용: {e}")
+        # 장치 이동/최적화 전 상태로 저장 (다음 로드부터 빠른 경로)
+        if converted_cache is not None and key is not None:
+            with profile_phase(load_profile, 'converted_cache_store'):
+                converted_cache.store(key, pipeline, source_path=Path(model_path))
+        return pipeline
+    
+    def _apply_optimizations(self, pipeline: Union[StableDiffusionPipeline, StableDiffusionXLPipeline], model_type: str,
+                             load_profile: Optional[LoadProfile] = None):
+        """모델 최적화 설정 적용 (어텐션/오프로드/xformers/channels_last/autocast는 실행 프로파일에 따름)"""
+        with profile_phase(load_profile, 'optimizations'):
+            apply_profile(pipeline, self.profile)
         
-        # SD15 전용 최적화
+        # SD15 전용 최적화 (텍스트 인코더/VAE dtype 변환 포함)
         if model_type == 'SD15':
-            self._apply_sd15_optimizations(pipeline)
+            with profile_phase(load_profile, 'sd15_dtype_cast'):
+                self._apply_sd15_optimizations(pipeline)
     
     def _apply_sd15_optimizations(self, pipeline: StableDiffusionPipeline):
         """SD15 모델 전용 최적화"""
-        # Text Encoder를 float16으로 변환
-        if hasattr(pipeline, 'text_encoder') and pipeline.text_encoder is not None:
-            pipeline.text_encoder = pipeline.text_encoder.to(torch.float16)
-        
-        # VAE를 float16으로 변환
-        if hasattr(pipeline, 'vae') and pipeline.vae is not None:
-            pipeline.vae = pipeline.vae.to(torch.float16)
+        # Text Encoder / VAE를 프로파일 dtype으로 변환 (이미 같은 dtype이면 전체 복사를 피하기 위해 건너뜀)
+        dtype = self.profile.dtype
+        for component_name in ('text_encoder', 'vae'):
+            component = getattr(pipeline, component_name, None)
+            if component is not None and component.dtype != dtype:
+                setattr(pipeline, component_name, component.to(dtype))
         
         # SD15에서 더 나은 품질을 위한 스케줄러 설정
         if hasattr(pipeline.scheduler, 'config'):
@@ -103,96 +338,195 @@ class ModelLoader:
         info(r"🔧 SD15 최적화 설정 적용 완료")
     
     async def load_vae(self, vae_path: str) -> bool:
-        """VAE 로드 (단순화)"""
+        """VAE 적용 (레지스트리에 있으면 디스크 I/O 없이 참조만 교체)"""
         try:
-            vae_model = AutoencoderKL.from_pretrained(vae_path, torch_dtype=torch.float16)
-            self.current_pipeline.vae = vae_model.to(self.device)
+            model_type = 'SDXL' if isinstance(self.current_pipeline, StableDiffusionXLPipeline) else 'SD15'
+            vae_model = await asyncio.to_thread(self.vae_registry.get, vae_path, model_type)
+            self._set_vae(vae_model)
             return True
         except Exception as e:
             info(f"VAE 로드 실패: {e}")
             return False
     
+    def restore_baked_vae(self) -> bool:
+        """체크포인트 내장 VAE로 되돌리기 (교체 전에 보관해 둔 모듈, 다시 로드하지 않음)"""
+        entry = self.pipeline_cache.peek(self.current_cache_key) if self.current_cache_key else None
+        if not entry or entry.get('baked_vae') is None:
+            return False
+        self._set_vae(entry['baked_vae'])
+        return True
+    
+    def _set_vae(self, vae_model: AutoencoderKL):
+        # 처음 교체할 때 내장 VAE를 캐시 항목에 보관 (공유 구성 요소 참조도 그대로 유지)
+        entry = self.pipeline_cache.peek(self.current_cache_key) if self.current_cache_key else None
+        if entry is not None and entry.get('baked_vae') is None:
+            self.pipeline_cache.update(self.current_cache_key, baked_vae=self.current_pipeline.vae)
+        if self.current_pipeline.vae is vae_model:
+            return
+        self.current_pipeline.vae = vae_model.to(self.device)
+        if self.current_cache_key is not None:
+            self.pipeline_cache.refresh_size(self.current_cache_key)
+    
+    def _adapter_name(self, lora_path: str) -> str:
+        """PEFT 어댑터 이름 (파일명 기반, '.' 등 모듈 경로에 쓸 수 없는 문자는 '_'로, 다른 폴더의 같은 이름은 번호 추가)"""
+        base_name = re.sub(r'\W', '_', Path(lora_path).stem)
+        used_names = {lora['adapter_name'] for lora in self.loaded_loras}
+        adapter_name, index = base_name, 2
+        while adapter_name in used_names:
+            adapter_name, index = f"{base_name}_{index}", index + 1
+        return adapter_name
+    
+    def _find_loaded_lora(self, lora_name: str) -> Optional[Dict[str, Any]]:
+        """어댑터 이름/경로가 정확히 같은 항목 우선, 없으면 파일명(같은 이름이 여럿이면 먼저 로드된 것)"""
+        for loaded_lora in self.loaded_loras:
+            if lora_name in (loaded_lora['adapter_name'], loaded_lora['path']):
+                return loaded_lora
+        for loaded_lora in self.loaded_loras:
+            if lora_name == loaded_lora['name']:
+                return loaded_lora
+        return None
+    
+    def _load_lora_adapter(self, lora_path: str, adapter_name: str) -> bool:
+        """LoRA 파일을 어댑터로 추가 (읽기/키 변환 결과는 같은 아키텍처끼리 캐시에서 재사용)
+        텍스트 인코더 가중치를 포함하는지 반환 (알 수 없으면 True)"""
+        pipeline = self.current_pipeline
+        if not (hasattr(pipeline, 'lora_state_dict') and hasattr(pipeline, 'load_lora_into_unet')):
+            pipeline.load_lora_weights(lora_path, adapter_name=adapter_name)
+            return True
+        
+        # SDXL은 load_lora_weights처럼 unet_config를 넘겨 SGM 형식 kohya 키(lora_unet_input_blocks_*)를
+        # diffusers 블록 이름으로 재매핑. 재매핑 결과가 UNet 구조에 따라 다르므로 설정 지문도 캐시 키에 포함
+        architecture = type(pipeline).__name__
+        parse_kwargs = {'return_lora_metadata': True}
+        if isinstance(pipeline, StableDiffusionXLLoraLoaderMixin):
+            unet_config = pipeline.unet.config
+            parse_kwargs['unet_config'] = unet_config
+            config_json = json.dumps(dict(unet_config), sort_keys=True, default=str)
+            architecture += f"|unet:{hashlib.sha1(config_json.encode('utf-8')).hexdigest()[:12]}"
+        
+        state_dict, network_alphas, metadata = self.lora_state_cache.get(
+            lora_path, architecture, lambda: pipeline.lora_state_dict(lora_path, **parse_kwargs)
+        )
+        if not all('lora' in key for key in state_dict):
+            raise ValueError("Invalid LoRA checkpoint.")
+        
+        # load_lora_weights와 같은 순서/인자 (캐시된 dict는 복사해서 넘김)
+        pipeline.load_lora_into_unet(
+            dict(state_dict), network_alphas=dict(network_alphas) if network_alphas else network_alphas,
+            unet=pipeline.unet, adapter_name=adapter_name, metadata=metadata, _pipeline=pipeline,
+            low_cpu_mem_usage=_LOW_CPU_MEM_USAGE_DEFAULT_LORA,
+        )
+        for component_name in ('text_encoder', 'text_encoder_2'):
+            text_encoder = getattr(pipeline, component_name, None)
+            if text_encoder is None:
+                continue
+            pipeline.load_lora_into_text_encoder(
+                dict(state_dict), network_alphas=dict(network_alphas) if network_alphas else network_alphas,
+                text_encoder=text_encoder, prefix=component_name, lora_scale=pipeline.lora_scale,
+                adapter_name=adapter_name, metadata=metadata, _pipeline=pipeline,
+                low_cpu_mem_usage=_LOW_CPU_MEM_USAGE_DEFAULT_LORA,
+            )
+        return any(key.startswith('text_encoder') for key in state_dict)
+    
+    def get_lora_cache_stats(self) -> Dict[str, Any]:
+        return self.lora_state_cache.get_stats()
+    
+    def _apply_adapter_weights(self):
+        """로드된 어댑터들의 활성화/가중치를 한 번에 설정 (파일 I/O 없음)"""
+        self.fused_lora_cache.unfuse()
+        if self.loaded_loras:
+            self.current_pipeline.set_adapters(
+                [lora['adapter_name'] for lora in self.loaded_loras],
+                adapter_weights=[lora['weight'] for lora in self.loaded_loras],
+            )
+    
+    def _invalidate_prompt_cache_for(self, lora: Dict[str, Any], reason: str):
+        """텍스트 인코더를 바꾸는 LoRA가 바뀌면 프롬프트 임베딩 캐시 무효화 (UNet 전용 LoRA는 영향 없음)"""
+        if lora.get('text_encoder', True):
+            self.prompt_embedding_cache.invalidate(reason)
+    
     async def load_lora(self, lora_info: Dict[str, Any], weight: float = 1.0) -> bool:
-        """LoRA 로드"""
+        """LoRA를 자신의 어댑터 이름으로 추가 (이미 로드된 LoRA면 가중치만 변경)"""
         if not self.current_pipeline:
             failure(r"모델이 로드되지 않았습니다.")
             return False
         
-        try:
-            lora_path = lora_info['path']
-            lora_name = Path(lora_path).stem
-            
-            def _load_lora():
-                try:
-                    # 기존 LoRA가 있으면 먼저 언로드
-                    if hasattr(self.current_pipeline, 'unload_lora_weights'):
-                        self.current_pipeline.unload_lora_weights()
-                    
-                    # LoRA 로드 (더 안전한 방식)
-                    if hasattr(self.current_pipeline, 'load_lora_weights'):
-                        self.current_pipeline.load_lora_weights(
-                            lora_path,
-                            adapter_name=lora_name,
-                            weight=weight
-                        )
-                    else:
-                        # diffusers 버전에 따라 다른 방식 시도
-                        from diffusers.loaders import LoraLoaderMixin
-                        if hasattr(self.current_pipeline, 'load_attn_procs'):
-                            # 이전 버전 호환성
-                            self.current_pipeline.load_attn_procs(lora_path)
-                        else:
-                            failure(r"LoRA 로딩 방식을 찾을 수 없습니다.")
-                            return False
-                    
-                    return True
-                except Exception as e:
-                    failure(f"LoRA 로딩 중 오류: {e}")
-                    return False
-            
-            success = await asyncio.to_thread(_load_lora)
+        lora_path = lora_info['path']
+        if self._find_loaded_lora(lora_path) is not None:
+            return await self.set_lora_weight(lora_path, weight)
+        
+        lora_name = Path(lora_path).stem
+        adapter_name = self._adapter_name(lora_path)
+        
+        def _load_lora():
+            # 다른 파이프라인과 공유 중인 텍스트 인코더는 LoRA가 수정하기 전에 복사
+            shared = self._current_shared_components()
+            if shared:
+                self._update_shared_components(self.component_registry.make_private(self.current_pipeline, shared))
             
-            if success:
-                # 로드된 LoRA 정보 저장
-                loaded_lora = {
-                    'name': lora_name,
-                    'path': lora_path,
-                    'weight': weight,
-                    'info': lora_info
-                }
-                self.loaded_loras.append(loaded_lora)
-                success(f"LoRA 로드 완료: {lora_name} (weight: {weight})")
-                return True
-            else:
-                failure(f"LoRA 로드 실패: {lora_name}")
-                return False
-                
+            # 기존 어댑터는 그대로 두고 새 어댑터만 추가 (융합 상태면 먼저 해제)
+            self.fused_lora_cache.unfuse()
+            affects_text_encoder = self._load_lora_adapter(lora_path, adapter_name)
+            self.loaded_loras.append({
+                'name': lora_name,
+                'adapter_name': adapter_name,
+                'path': lora_path,
+                'weight': weight,
+                'info': lora_info,
+                'text_encoder': affects_text_encoder  # 프롬프트 임베딩이 달라지는 LoRA인지
+            })
+            try:
+                self._apply_adapter_weights()
+            except Exception:
+                # 가중치 설정에 실패한 어댑터는 남기지 않음
+                self.loaded_loras.pop()
+                self.current_pipeline.delete_adapters(adapter_name)
+                raise
+        
+        try:
+            await asyncio.to_thread(_load_lora)
+            self._invalidate_prompt_cache_for(self.loaded_loras[-1], 'LoRA 추가')
+            success(f"LoRA 로드 완료: {lora_name} (weight: {weight}, 어댑터 {len(self.loaded_loras)}개)")
+            return True
+        except Exception as e:
+            failure(f"LoRA 로드 오류 ({lora_name}): {e}")
+            return False
+    
+    async def set_lora_weight(self, lora_name: str, weight: float) -> bool:
+        """로드된 LoRA의 가중치 변경 (set_adapters만 호출, 파일을 다시 읽지 않음)"""
+        loaded_lora = self._find_loaded_lora(lora_name)
+        if not self.current_pipeline or loaded_lora is None:
+            return False
+        
+        previous_weight = loaded_lora['weight']
+        loaded_lora['weight'] = weight
+        try:
+            await asyncio.to_thread(self._apply_adapter_weights)
+            self._invalidate_prompt_cache_for(loaded_lora, 'LoRA 가중치 변경')
+            debug_emoji(f"LoRA 가중치 변경: {loaded_lora['name']} {previous_weight} → {weight}")
+            return True
         except Exception as e:
-            failure(f"LoRA 로드 오류: {e}")
+            loaded_lora['weight'] = previous_weight
+            failure(f"LoRA 가중치 변경 오류: {e}")
             return False
     
     async def unload_lora(self, lora_name: str) -> bool:
-        """특정 LoRA 언로드"""
-        if not self.current_pipeline:
+        """특정 LoRA 어댑터만 제거 (나머지 어댑터와 가중치는 유지)"""
+        loaded_lora = self._find_loaded_lora(lora_name)
+        if not self.current_pipeline or loaded_lora is None:
             return False
         
+        def _unload_lora():
+            self.fused_lora_cache.unfuse()
+            self.current_pipeline.delete_adapters(loaded_lora['adapter_name'])
+            self.loaded_loras.remove(loaded_lora)
+            self._apply_adapter_weights()
+        
         try:
-            def _unload_lora():
-                # LoRA 언로드
-                self.current_pipeline.unload_lora_weights()
-                return True
-            
-            success = await asyncio.to_thread(_unload_lora)
-            
-            if success:
-                # 로드된 LoRA 목록에서 제거
-                self.loaded_loras = [lora for lora in self.loaded_loras if lora['name'] != lora_name]
-                success(f"LoRA 언로드 완료: {lora_name}")
-                return True
-            else:
-                failure(f"LoRA 언로드 실패: {lora_name}")
-                return False
-                
+            await asyncio.to_thread(_unload_lora)
+            self._invalidate_prompt_cache_for(loaded_lora, 'LoRA 제거')
+            success(f"LoRA 언로드 완료: {loaded_lora['name']}")
+            return True
         except Exception as e:
             failure(f"LoRA 언로드 오류: {e}")
             return False
@@ -203,35 +537,50 @@ class ModelLoader:
             return False
         
         try:
-            def _unload_all_loras():
-                # 모든 LoRA 언로드
-                self.current_pipeline.unload_lora_weights()
-                return True
-            
-            success = await asyncio.to_thread(_unload_all_loras)
-            
-            if success:
-                self.loaded_loras = []
-                success(r"모든 LoRA 언로드 완료")
-                return True
-            else:
-                failure(r"모든 LoRA 언로드 실패")
-                return False
-                
+            await asyncio.to_thread(self.fused_lora_cache.unfuse)
+            await asyncio.to_thread(self.current_pipeline.unload_lora_weights)
+            if any(lora.get('text_encoder', True) for lora in self.loaded_loras):
+                self.prompt_embedding_cache.invalidate('LoRA 전체 제거')
+            self.loaded_loras = []
+            success(r"모든 LoRA 언로드 완료")
+            return True
         except Exception as e:
             failure(f"모든 LoRA 언로드 오류: {e}")
             return False
     
+    async def prepare_loras_for_generation(self):
+        """[lora] fuse 모드에서 생성 직전 활성 LoRA 조합을 융합 (같은 조합이면 캐시된 델타 재사용)"""
+        if not self.fuse_loras or not self.loaded_loras or not self.current_pipeline or self.current_cache_key is None:
+            return
+        key = self.fused_lora_cache.make_key(self.current_cache_key, self.loaded_loras)
+        if self.fused_lora_cache.fused_key == key:
+            return
+        try:
+            await asyncio.to_thread(self.fused_lora_cache.fuse, self.current_pipeline, key)
+        except Exception as e:
+            # 융합 실패 시 어댑터 연산으로 그대로 생성
+            warning_emoji(f"LoRA 융합 실패, 비융합 실행: {e}")
+            await asyncio.to_thread(self.fused_lora_cache.unfuse)
+    
     def get_loaded_loras(self) -> List[Dict[str, Any]]:
         """로드된 LoRA 목록 반환"""
         return self.loaded_loras.copy()
     
-    def unload_model(self):
-        """모델 언로드"""
+    def unload_model(self, keep_cached: bool = False):
+        """모델 언로드 (keep_cached=True면 현재 파이프라인은 캐시에 남겨 둠)"""
+        if not keep_cached:
+            self.pipeline_cache.clear()
+            self.vae_registry.clear()
+            self.fused_lora_cache.clear()
+            self.lora_state_cache.clear()
+            self.prompt_embedding_cache.clear()
+            if self.prefetcher is not None:
+                self.prefetcher.cancel_all()
         if self.current_pipeline:
             # GPU 메모리에서 제거
             del self.current_pipeline
             self.current_pipeline = None
+            self.current_cache_key = None
             
             # LoRA 목록 초기화
             self.loaded_loras = []
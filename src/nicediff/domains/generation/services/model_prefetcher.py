@@ -0,0 +1,282 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+다음 모델 예측 프리페치 도메인 서비스
+마우스 오버/선택 이벤트와 사용 기록으로 다음에 로드할 체크포인트를 예측하여
+낮은 I/O 우선순위로 OS 페이지 캐시를 미리 채우고, 선택적으로 CPU 파이프라인을 미리 만들어 두는 서비스
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List
+
+
+class PrefetchJob:
+    """프리페치 작업 하나 (취소 가능)"""
+
+    def __init__(self, model_info: Dict[str, Any], reason: str):
+        self.model_info = model_info
+        self.path = model_info['path']
+        self.reason = reason
+        self.state = 'queued'  # queued → warming → building → done / cancelled / failed
+        self.bytes_read = 0
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.state = 'cancelled'
+
+
+class ModelPrefetcher:
+    """페이지 캐시 예열 + (선택) CPU 파이프라인 사전 생성, 동시 작업 수 상한과 취소 지원"""
+
+    def __init__(self, build_pipeline: Optional[Callable[[str, str], Any]] = None, prebuild: bool = False,
+                 max_concurrent: int = 1, hover_delay: float = 0.4, chunk_size: int = 8 * 1024 * 1024,
+                 history_path: Optional[Path] = None, max_history: int = 200,
+                 should_pause: Optional[Callable[[], bool]] = None):
+        self.build_pipeline = build_pipeline  # (model_path, model_type) → CPU 파이프라인
+        self.prebuild = prebuild and build_pipeline is not None
+        self.max_concurrent = max(1, max_concurrent)
+        self.hover_delay = hover_delay
+        self.chunk_size = chunk_size
+        self.history_path = Path(history_path) if history_path else None
+        self.max_history = max_history
+        self.should_pause = should_pause  # 생성 중 등에는 시작을 미룸
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='prefetch')
+        self._jobs: "OrderedDict[str, PrefetchJob]" = OrderedDict()  # 진행 중인 작업 (오래된 순)
+        self._prebuilt: Dict[str, Any] = {}  # 경로 → 미리 만든 CPU 파이프라인 (최대 1개)
+        self._hover_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+        # 사용 기록: 최근 사용 순서와 (이전 모델 → 다음 모델) 전이 횟수
+        self._history: List[Dict[str, Any]] = []
+        self._transitions: Dict[str, Dict[str, int]] = {}
+        self.stats = {'hints': 0, 'started': 0, 'cancelled': 0, 'warmed_bytes': 0, 'prebuilt': 0, 'prebuilt_used': 0}
+        self._load_history()
+
+    # --- 힌트/예측 ---
+    def hint(self, model_info: Dict[str, Any], reason: str = 'hover'):
+        """UI 이벤트 힌트. hover는 잠시 머무를 때만, select는 즉시 프리페치"""
+        if not model_info or not model_info.get('path'):
+            return
+        self.stats['hints'] += 1
+        with self._lock:
+            if self._hover_timer is not None:
+                self._hover_timer.cancel()
+                self._hover_timer = None
+            if reason == 'hover' and self.hover_delay > 0:
+                self._hover_timer = threading.Timer(self.hover_delay, self.prefetch, args=(model_info, reason))
+                self._hover_timer.daemon = True
+                self._hover_timer.start()
+                return
+        self.prefetch(model_info, reason)
+
+    def predict_next(self, current_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """현재 모델 다음에 쓸 가능성이 가장 높은 모델 (전이 횟수 → 최근 사용 순)"""
+        with self._lock:
+            infos = {entry['path']: entry for entry in self._history}
+            successors = self._transitions.get(current_path or '', {})
+            for path, _ in sorted(successors.items(), key=lambda item: -item[1]):
+                if path != current_path and path in infos and os.path.exists(path):
+                    return infos[path]
+            for entry in reversed(self._history):
+                if entry['path'] != current_path and os.path.exists(entry['path']):
+                    return entry
+        return None
+
+    def record_usage(self, model_info: Dict[str, Any]):
+        """모델 로드 기록 (이전 모델 → 이번 모델 전이 포함)"""
+        path = model_info['path']
+        entry = {'path': path, 'name': model_info.get('name', Path(path).stem),
+                 'model_type': model_info.get('model_type', 'SD15')}
+        with self._lock:
+            if self._history and self._history[-1]['path'] != path:
+                previous = self._history[-1]['path']
+                successors = self._transitions.setdefault(previous, {})
+                successors[path] = successors.get(path, 0) + 1
+            self._history = [item for item in self._history if item['path'] != path] + [entry]
+            self._history = self._history[-self.max_history:]
+        self._save_history()
+
+    # --- 작업 관리 ---
+    def prefetch(self, model_info: Dict[str, Any], reason: str = 'predict') -> Optional[PrefetchJob]:
+        """프리페치 시작 (상한을 넘으면 가장 오래된 작업 취소). 이미 진행 중이거나 준비됐으면 None"""
+        path = model_info['path']
+        with self._lock:
+            if path in self._prebuilt:
+                return None
+            job = self._jobs.get(path)
+            if job is not None and not job.cancelled:
+                return None
+
+            # 예측이 바뀌었으면 오래된 작업부터 취소
+            while len(self._jobs) >= self.max_concurrent:
+                _, old_job = self._jobs.popitem(last=False)
+                self._cancel_job(old_job)
+
+            job = PrefetchJob(model_info, reason)
+            self._jobs[path] = job
+            job.future = self._executor.submit(self._run, job)
+            self.stats['started'] += 1
+        debug_emoji(f"모델 프리페치 시작 ({reason}): {model_info.get('name', path)}")
+        return job
+
+    def cancel_all(self, except_path: Optional[str] = None):
+        """예측이 틀렸을 때 다른 모델의 프리페치 취소 및 미리 만든 파이프라인 해제"""
+        with self._lock:
+            if self._hover_timer is not None:
+                self._hover_timer.cancel()
+                self._hover_timer = None
+            for path in [path for path in self._jobs if path != except_path]:
+                self._cancel_job(self._jobs.pop(path))
+            for path in [path for path in self._prebuilt if path != except_path]:
+                del self._prebuilt[path]
+
+    def _cancel_job(self, job: PrefetchJob):
+        job.cancel()
+        self.stats['cancelled'] += 1
+        debug_emoji(f"모델 프리페치 취소: {Path(job.path).name}")
+
+    def take_prebuilt(self, model_path: str) -> Optional[Any]:
+        """미리 만든 CPU 파이프라인 가져가기 (진행 중인 사전 생성이면 끝날 때까지 대기)
+
+        아직 대기/예열 단계인 작업은 취소 (호출한 쪽이 바로 직접 만들므로, 두고 두면 같은 파이프라인이 RAM에 두 벌 생김)
+        """
+        with self._lock:
+            job = self._jobs.get(model_path)
+            if job is not None and job.state in ('queued', 'warming'):
+                self._cancel_job(self._jobs.pop(model_path))
+                job = None
+        if job is not None and job.state == 'building' and job.future is not None:
+            try:
+                job.future.result()
+            except Exception:
+                pass
+        with self._lock:
+            pipeline = self._prebuilt.pop(model_path, None)
+        if pipeline is not None:
+            self.stats['prebuilt_used'] += 1
+        return pipeline
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'jobs': [{'path': job.path, 'state': job.state, 'reason': job.reason, 'bytes_read': job.bytes_read}
+                         for job in self._jobs.values()],
+                'prebuilt': list(self._prebuilt),
+            }
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- 작업 실행 ---
+    def _run(self, job: PrefetchJob):
+        try:
+            self._lower_thread_priority()
+            while self.should_pause is not None and self.should_pause() and not job.cancelled:
+                time.sleep(0.5)
+            if job.cancelled:
+                return
+
+            job.state = 'warming'
+            self._warm_page_cache(job)
+            if job.cancelled:
+                return
+
+            if self.prebuild:
+                # take_prebuilt가 취소할지 기다릴지 상태를 보고 정하므로 lock 안에서 전환
+                with self._lock:
+                    if job.cancelled:
+                        return
+                    job.state = 'building'
+                pipeline = self.build_pipeline(job.path, job.model_info.get('model_type', 'SD15'))
+                with self._lock:
+                    # 생성 도중 예측이 바뀌었으면 버림
+                    if not job.cancelled:
+                        self._prebuilt.clear()
+                        self._prebuilt[job.path] = pipeline
+                        self.stats['prebuilt'] += 1
+            job.state = 'done'
+        except Exception as e:
+            job.state = 'failed'
+            warning_emoji(f"모델 프리페치 실패 ({Path(job.path).name}): {e}")
+        finally:
+            if job.cancelled:
+                job.state = 'cancelled'
+            with self._lock:
+                if self._jobs.get(job.path) is job:
+                    del self._jobs[job.path]
+
+    def _warm_page_cache(self, job: PrefetchJob):
+        """파일을 순차로 읽어 OS 페이지 캐시에 올림 (버퍼 하나만 재사용, 취소 시 중단)"""
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        with open(job.path, 'rb', buffering=0) as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            while not job.cancelled:
+                read = f.readinto(view)
+                if not read:
+                    break
+                job.bytes_read += read
+        self.stats['warmed_bytes'] += job.bytes_read
+
+    @staticmethod
+    def _lower_thread_priority():
+        """현재 워커 스레드의 I/O·CPU 우선순위 낮추기 (Linux만, 실패해도 무시)"""
+        if not sys.platform.startswith('linux'):
+            return
+        thread_id = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, thread_id, 10)
+        except (OSError, AttributeError):
+            pass
+        try:
+            import psutil
+            psutil.Process(thread_id).ionice(psutil.IOPRIO_CLASS_IDLE)
+        except Exception:
+            pass
+
+    # --- 기록 저장 ---
+    def _load_history(self):
+        if self.history_path is None or not self.history_path.exists():
+            return
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._history = data.get('history', [])[-self.max_history:]
+            self._transitions = data.get('transitions', {})
+        except (OSError, json.JSONDecodeError) as e:
+            warning_emoji(f"모델 사용 기록 로드 실패 (무시): {e}")
+
+    def _save_history(self):
+        if self.history_path is None:
+            return
+        with self._lock:
+            payload = {'history': self._history, 'transitions': self._transitions}
+        tmp_path = self.history_path.with_suffix('.tmp')
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.history_path)
+        except OSError as e:
+            warning_emoji(f"모델 사용 기록 저장 실패: {e}")
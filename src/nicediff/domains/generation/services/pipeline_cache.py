@@ -0,0 +1,298 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+파이프라인 LRU 캐시 도메인 서비스
+로드한 체크포인트 파이프라인을 VRAM/RAM 예산 안에서 보관하여
+이전에 쓰던 모델로 돌아갈 때 다시 로드하지 않도록 하는 서비스
+"""
+
+import gc
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+import torch
+
+
+class PipelineCache:
+    """예산 기반 파이프라인 LRU 캐시
+
+    - 가장 최근 항목(현재 파이프라인)은 항상 장치에 유지
+    - 장치(VRAM) 예산을 넘으면 오래된 항목부터 CPU RAM으로 강등
+    - RAM 예산(또는 최대 개수)을 넘으면 오래된 항목부터 제거
+    CPU 전용 환경에서는 장치와 RAM이 같으므로 RAM 예산만 적용
+    여러 파이프라인이 공유하는 구성 요소(ComponentRegistry)는 메모리 사용량에 한 번만 계산
+    """
+
+    def __init__(self, device: str = "cuda", max_vram_mb: Optional[float] = None,
+                 max_ram_mb: Optional[float] = None, max_entries: int = 3,
+                 on_release: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.device = device
+        self.on_release = on_release  # 항목이 캐시에서 빠질 때 호출 (공유 구성 요소 참조 해제 등)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.demotions = 0
+        self.evictions = 0
+        self.configure(max_vram_mb, max_ram_mb, max_entries)
+
+    def configure(self, max_vram_mb: Optional[float] = None, max_ram_mb: Optional[float] = None,
+                  max_entries: Optional[int] = None):
+        """예산 설정 (None이면 장치/시스템 메모리의 일부를 자동 사용)"""
+        self.max_vram_bytes = int(max_vram_mb * 1024 * 1024) if max_vram_mb is not None else self._default_vram_budget()
+        self.max_ram_bytes = int(max_ram_mb * 1024 * 1024) if max_ram_mb is not None else self._default_ram_budget()
+        if max_entries is not None:
+            self.max_entries = max(1, int(max_entries))
+        with self._lock:
+            self._enforce_budget()
+
+    @property
+    def _offloads_to_cpu(self) -> bool:
+        """장치가 CPU가 아니어서 강등(장치 → CPU RAM) 단계가 있는지"""
+        return torch.device(self.device).type != 'cpu'
+
+    def _default_vram_budget(self) -> int:
+        # 현재 파이프라인 + 생성 중 활성 메모리를 위해 절반만 캐시에 사용
+        if self._offloads_to_cpu and torch.cuda.is_available():
+            return int(torch.cuda.get_device_properties(torch.device(self.device)).total_memory * 0.5)
+        return 0
+
+    @staticmethod
+    def _default_ram_budget() -> int:
+        try:
+            import psutil
+            return int(psutil.virtual_memory().total * 0.4)
+        except ImportError:
+            return 8 * 1024 ** 3
+
+    # --- 메모리 측정/이동 ---
+    @staticmethod
+    def _modules(pipeline: Any) -> List[torch.nn.Module]:
+        components = getattr(pipeline, 'components', None) or {}
+        return [module for module in components.values() if isinstance(module, torch.nn.Module)]
+
+    @classmethod
+    def measure(cls, *pipelines: Any) -> Tuple[int, int]:
+        """(장치 메모리 바이트, CPU 메모리 바이트) - 파라미터와 버퍼 기준, 공유 텐서는 한 번만 계산"""
+        device_bytes = cpu_bytes = 0
+        seen = set()
+        modules = [module for pipeline in pipelines for module in cls._modules(pipeline)]
+        for module in modules:
+            for tensor in list(module.parameters()) + list(module.buffers()):
+                if id(tensor) in seen:
+                    continue
+                seen.add(id(tensor))
+                size = tensor.numel() * tensor.element_size()
+                if tensor.device.type == 'cpu':
+                    cpu_bytes += size
+                else:
+                    device_bytes += size
+        return device_bytes, cpu_bytes
+
+    def _move(self, entry: Dict[str, Any], device: str, keep: Optional[set] = None):
+        """파이프라인을 장치로 이동 (CPU 오프로드 훅이 걸린 파이프라인은 훅이 관리하므로 그대로 둠)
+
+        keep: 강등 시 장치에 남길 모듈 id (곧 올라갈 새 파이프라인과 공유하는 구성 요소)
+        """
+        pipeline = entry['pipeline']
+        if not entry.get('offload_hooks'):
+            pinned = self._modules_on_device(exclude=entry) | (keep or set()) if device == 'cpu' else set()
+            if pinned.isdisjoint(id(module) for module in self._modules(pipeline)):
+                pipeline.to(device)
+            else:
+                # 장치에 남는 다른 파이프라인과 공유하는 구성 요소는 그대로 두고 나머지만 강등
+                for module in self._modules(pipeline):
+                    if id(module) not in pinned:
+                        module.to(device)
+        entry['device_bytes'], entry['cpu_bytes'] = self.measure(pipeline)
+
+    def _modules_on_device(self, exclude: Optional[Dict[str, Any]] = None) -> set:
+        """장치에 있는 (exclude 외) 항목들이 쓰는 모듈 id"""
+        return {
+            id(module)
+            for entry in self._entries.values()
+            if entry is not exclude and entry['location'] == 'device'
+            for module in self._modules(entry['pipeline'])
+        }
+
+    # --- 조회/등록 ---
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 항목 반환 (CPU로 강등된 항목은 장치로 다시 올림). 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            # 새 현재 파이프라인을 올리기 전에 다른 항목을 먼저 강등해 VRAM 확보
+            self._enforce_budget(incoming_bytes=entry['cpu_bytes'] if entry['location'] == 'cpu' else 0)
+            if entry['location'] == 'cpu':
+                self._move(entry, self.device)
+                entry['location'] = 'device'
+                debug_emoji(f"파이프라인 캐시: CPU → {self.device} 복귀 ({key})")
+            return entry
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """LRU 순서/통계에 영향 없이 항목 조회"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def reserve(self, pipeline: Any) -> int:
+        """새로 만든 CPU 파이프라인을 장치로 올리기 전에 VRAM 확보 (올라갈 바이트 수 반환)
+
+        아직 등록 전이므로 현재 항목을 포함한 모든 항목이 강등 대상.
+        먼저 올리고 put()에서 예산을 맞추면 이전 파이프라인과 새 파이프라인이 동시에 VRAM에 있게 됨
+        """
+        _, incoming_bytes = self.measure(pipeline)
+        keep = {id(module) for module in self._modules(pipeline)}
+        with self._lock:
+            self._demote(list(self._entries), incoming_bytes, keep)
+        return incoming_bytes
+
+    def put(self, key: str, pipeline: Any, **extra: Any) -> Dict[str, Any]:
+        """새로 로드한 파이프라인을 현재 항목으로 등록"""
+        with self._lock:
+            self._entries.pop(key, None)
+            device_bytes, cpu_bytes = self.measure(pipeline)
+            entry = {
+                'pipeline': pipeline,
+                'location': 'device',
+                'device_bytes': device_bytes,
+                'cpu_bytes': cpu_bytes,
+                # enable_model_cpu_offload / sequential offload 훅이 있으면 .to()로 옮기지 않음
+                'offload_hooks': getattr(pipeline, '_offload_gpu_id', None) is not None,
+                **extra,
+            }
+            self._entries[key] = entry
+            self._enforce_budget()
+            return entry
+
+    def update(self, key: str, **extra: Any):
+        """항목의 부가 정보(로드된 LoRA 목록 등) 갱신"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.update(extra)
+
+    def refresh_size(self, key: str):
+        """파이프라인 구성 요소가 바뀐 뒤(VAE 교체 등) 메모리 사용량 다시 측정"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['device_bytes'], entry['cpu_bytes'] = self.measure(entry['pipeline'])
+                self._enforce_budget()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def discard(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._release([entry])
+        return True
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        self._release(entries)
+
+    # --- 예산 관리 ---
+    def _enforce_budget(self, incoming_bytes: int = 0):
+        """가장 최근 항목을 제외하고 예산을 넘는 항목을 강등/제거
+
+        incoming_bytes: CPU에서 장치로 곧 올라갈 현재 항목의 크기 (VRAM에는 더하고 RAM에서는 뺌)
+        """
+        if not self._entries:
+            return
+        current_key = next(reversed(self._entries))
+        candidates = [key for key in self._entries if key != current_key]  # 오래된 순
+
+        self._demote(candidates, incoming_bytes)
+
+        for key in candidates:
+            if key not in self._entries:
+                continue
+            over_ram = self._used_ram_bytes() - incoming_bytes > self.max_ram_bytes
+            over_count = len(self._entries) > self.max_entries
+            if not over_ram and not over_count:
+                break
+            self._evict(key)
+
+    def _demote(self, candidates: List[str], incoming_bytes: int, keep: Optional[set] = None):
+        """장치 예산을 넘는 동안 candidates(오래된 순)를 CPU로 강등 (lock 보유 상태에서 호출)"""
+        if not self._offloads_to_cpu:
+            return
+        for key in candidates:
+            if self._used_device_bytes() + incoming_bytes <= self.max_vram_bytes:
+                break
+            entry = self._entries[key]
+            if entry['location'] == 'device' and entry['device_bytes'] > 0:
+                try:
+                    self._move(entry, 'cpu', keep)
+                    entry['location'] = 'cpu'
+                    self.demotions += 1
+                    debug_emoji(f"파이프라인 캐시: {key} → CPU 강등")
+                except Exception as e:
+                    warning_emoji(f"파이프라인 CPU 강등 실패, 캐시에서 제거 ({key}): {e}")
+                    self._evict(key)
+
+    def _evict(self, key: str):
+        entry = self._entries.pop(key)
+        self.evictions += 1
+        info(f"🗑️ 파이프라인 캐시에서 제거: {entry.get('name', key)}")
+        self._release([entry])
+
+    def _release(self, entries: List[Dict[str, Any]]):
+        for entry in entries:
+            if self.on_release is not None:
+                try:
+                    self.on_release(entry)
+                except Exception as e:
+                    warning_emoji(f"파이프라인 캐시 해제 처리 실패: {e}")
+            entry.pop('pipeline', None)
+        entries.clear()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _used_bytes(self) -> Tuple[int, int]:
+        return self.measure(*(entry['pipeline'] for entry in self._entries.values()))
+
+    def _used_device_bytes(self) -> int:
+        return self._used_bytes()[0]
+
+    def _used_ram_bytes(self) -> int:
+        device_bytes, cpu_bytes = self._used_bytes()
+        return cpu_bytes if self._offloads_to_cpu else device_bytes + cpu_bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'demotions': self.demotions,
+                'evictions': self.evictions,
+                'vram_mb': self._used_device_bytes() / (1024 * 1024),
+                'ram_mb': self._used_ram_bytes() / (1024 * 1024),
+                'max_vram_mb': self.max_vram_bytes / (1024 * 1024),
+                'max_ram_mb': self.max_ram_bytes / (1024 * 1024),
+                'models': [
+                    {'key': key, 'name': entry.get('name', key), 'location': entry['location'],
+                     'size_mb': (entry['device_bytes'] + entry['cpu_bytes']) / (1024 * 1024)}
+                    for key, entry in self._entries.items()
+                ],
+            }
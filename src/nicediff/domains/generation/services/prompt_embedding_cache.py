@@ -0,0 +1,105 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+프롬프트 임베딩 캐시 도메인 서비스
+텍스트 인코더 출력(prompt_embeds, negative_prompt_embeds, pooled 임베딩)을 RAM/VRAM에 LRU로 보관하여
+시드만 바꾸는 반복 생성(무한 생성, 시드 탐색)에서 CLIP 텍스트 인코더를 다시 실행하지 않도록 하는 서비스
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+class PromptEmbeddingCache:
+    """텍스트 인코더 지문 + 프롬프트/인코딩 설정 기준 LRU (용량 상한은 텐서 바이트 합계)
+
+    지문(fingerprint)은 체크포인트, 토크나이저/텍스트 인코더 객체, 텍스트 인코더에 영향을 주는 LoRA 조합을 담으므로
+    이 중 하나가 바뀌면 이전 항목은 키가 맞지 않아 쓰이지 않음. 메모리를 바로 돌려주도록 바뀌는 시점에 invalidate()도 호출
+    """
+
+    def __init__(self, max_entries: int = 64, max_mb: Optional[float] = 256):
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.configure(max_entries, max_mb)
+
+    def configure(self, max_entries: Optional[int] = None, max_mb: Optional[float] = None):
+        if max_entries is not None:
+            self.max_entries = max(0, int(max_entries))  # 0이면 캐시 끔
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        with self._lock:
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(fingerprint: Any, prompt: str, negative_prompt: str, weight_mode: str,
+                 use_custom_tokenizer: bool, clip_skip: int = 1) -> tuple:
+        return (fingerprint, prompt, negative_prompt, weight_mode, bool(use_custom_tokenizer), int(clip_skip or 1))
+
+    @staticmethod
+    def _embeds_bytes(embeds: Tuple[Any, ...]) -> int:
+        return sum(tensor.element_size() * tensor.nelement() for tensor in embeds if tensor is not None)
+
+    def get(self, key: tuple) -> Optional[Tuple[Any, ...]]:
+        """(prompt_embeds, negative_prompt_embeds, pooled, negative_pooled) 또는 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry['embeds']
+
+    def put(self, key: tuple, embeds: Tuple[Any, ...]):
+        if not self.enabled:
+            return
+        size = self._embeds_bytes(embeds)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # 한 항목이 상한보다 크면 보관하지 않음
+        with self._lock:
+            self._entries[key] = {'embeds': embeds, 'bytes': size}
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        """최대 개수/용량을 넘으면 오래된 항목부터 제거"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._used_bytes() > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+
+    def _used_bytes(self) -> int:
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def invalidate(self, reason: str = ''):
+        """모델/LoRA/토크나이저 변경 시 전체 무효화"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        if count:
+            debug_emoji(f"프롬프트 임베딩 캐시 무효화 ({reason}): {count}개 제거")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size_mb': self._used_bytes() / (1024 * 1024),
+            }
@@ -4,9 +4,16 @@ from ....core.logger import (
 )
 """
 스케줄러/샘플러 관리 도메인 서비스
-UI나 StateManager에 의존하지 않는 순수한 비즈니스 로직
+UI나 StateManager에 의존하지 않는 순수한 비즈니스 로직.
+설정을 마친 스케줄러 인스턴스와 set_timesteps 결과(timestep/sigma 표)는 캐시하여 같은 설정의 반복 생성에서 재사용
 """
 
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Union
 
 import torch
@@ -79,7 +86,8 @@ class SchedulerManager:
             'karras_rho': 7.0
         },
         'exponential': {
-            'use_karras_sigmas': False
+            'use_karras_sigmas': False,
+            'use_exponential_sigmas': True
         },
         'sgm_uniform': {
             'use_karras_sigmas': False
@@ -92,9 +100,103 @@ class SchedulerManager:
         }
     }
     
+    SCHEDULER_CACHE_SIZE = 32  # 설정된 스케줄러 인스턴스 LRU
+    TIMESTEP_CACHE_SIZE = 64  # set_timesteps 결과 LRU
+    _scheduler_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+    _timestep_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_stats = {'scheduler_hits': 0, 'scheduler_misses': 0, 'timestep_hits': 0, 'timestep_misses': 0}
+    
+    @staticmethod
+    def _base_config(pipeline) -> Dict[str, Any]:
+        """모델 원래의 스케줄러 설정 (처음 적용할 때 파이프라인에 보관, 이전 샘플러의 설정이 섞이지 않도록)"""
+        base_config = getattr(pipeline, '_nicediff_base_scheduler_config', None)
+        if base_config is None:
+            base_config = dict(pipeline.scheduler.config)
+            pipeline._nicediff_base_scheduler_config = base_config
+        return base_config
+    
+    @staticmethod
+    def _config_hash(config: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    
+    @staticmethod
+    def _supported_overrides(scheduler_class, config_overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """스케줄러 클래스가 받는 설정만 (예: DDIM은 use_karras_sigmas 없음, karras_rho는 diffusers 설정이 아님)"""
+        parameters = inspect.signature(scheduler_class.__init__).parameters
+        return {key: value for key, value in config_overrides.items() if key in parameters}
+    
+    @classmethod
+    def _get_scheduler(cls, pipeline, scheduler_class, config_overrides: Dict[str, Any]):
+        """(스케줄러 클래스, 설정 오버라이드, 모델 설정 해시) 기준으로 캐시된 스케줄러 반환, 없으면 생성"""
+        base_config = cls._base_config(pipeline)
+        overrides = cls._supported_overrides(scheduler_class, config_overrides)
+        key = (scheduler_class.__name__, tuple(sorted(overrides.items())), cls._config_hash(base_config))
+        with cls._cache_lock:
+            scheduler = cls._scheduler_cache.get(key)
+            if scheduler is not None:
+                cls._scheduler_cache.move_to_end(key)
+                cls._cache_stats['scheduler_hits'] += 1
+                return scheduler, overrides
+            cls._cache_stats['scheduler_misses'] += 1
+        
+        # 오버라이드는 키워드로 전달 (FrozenDict에 setattr하면 from_config가 읽는 항목은 바뀌지 않고,
+        # dict로 병합해도 _use_default_values에 있는 항목은 from_config가 버림)
+        scheduler = scheduler_class.from_config(base_config, **overrides)
+        cls._memoize_set_timesteps(scheduler, key)
+        with cls._cache_lock:
+            cls._scheduler_cache[key] = scheduler
+            while len(cls._scheduler_cache) > cls.SCHEDULER_CACHE_SIZE:
+                cls._scheduler_cache.popitem(last=False)
+        return scheduler, overrides
+    
+    @classmethod
+    def _memoize_set_timesteps(cls, scheduler, scheduler_key: tuple):
+        """set_timesteps 결과(timesteps, sigmas 등 스케줄러 상태)를 스텝 수/디바이스/현재 설정별로 저장해 두고 재사용
+        직후 상태 전체를 복원하므로 step 진행 상태(step_index, 멀티스텝 출력 목록)도 함께 초기화됨"""
+        original = scheduler.set_timesteps
+        
+        @functools.wraps(original)
+        def set_timesteps(num_inference_steps=None, device=None, **kwargs):
+            if kwargs or num_inference_steps is None:
+                return original(num_inference_steps, device=device, **kwargs)  # 사용자 지정 timesteps/sigmas
+            # SD15 최적화처럼 config 속성을 직접 바꾸는 경우가 있어 현재 설정 값도 키에 포함
+            config_state = repr(sorted((k, repr(v)) for k, v in vars(scheduler.config).items()))
+            key = scheduler_key + (int(num_inference_steps), str(device), config_state)
+            with cls._cache_lock:
+                state = cls._timestep_cache.get(key)
+                if state is not None:
+                    cls._timestep_cache.move_to_end(key)
+                    cls._cache_stats['timestep_hits'] += 1
+            if state is None:
+                original(num_inference_steps, device=device)
+                state = {name: value for name, value in vars(scheduler).items() if name != 'set_timesteps'}
+                with cls._cache_lock:
+                    cls._cache_stats['timestep_misses'] += 1
+                    cls._timestep_cache[key] = state
+                    while len(cls._timestep_cache) > cls.TIMESTEP_CACHE_SIZE:
+                        cls._timestep_cache.popitem(last=False)
+            # 리스트/딕셔너리는 step 중에 바뀌므로 복사해서 복원 (텐서와 FrozenDict 설정은 읽기만 하므로 공유)
+            for name, value in state.items():
+                setattr(scheduler, name, list(value) if type(value) is list
+                        else dict(value) if type(value) is dict else value)
+        
+        scheduler.set_timesteps = set_timesteps
+    
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._scheduler_cache.clear()
+            cls._timestep_cache.clear()
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        with cls._cache_lock:
+            return {'schedulers': len(cls._scheduler_cache), 'timesteps': len(cls._timestep_cache), **cls._cache_stats}
+    
     @classmethod
     def apply_scheduler_to_pipeline(cls, pipeline, sampler_name: str, scheduler_type: str):
-        """스케줄러 적용 + 검증 강화"""
+        """스케줄러 적용 + 검증 강화 (같은 샘플러/스케줄 설정이면 캐시된 스케줄러를 그대로 사용)"""
         
         # 1. 입력 검증
         if not sampler_name or not scheduler_type:
@@ -112,19 +214,13 @@ class SchedulerManager:
         # 3. 스케줄러 설정
         config_overrides = cls.SCHEDULER_CONFIG.get(scheduler_type.lower(), {})
         
-        # 4. 스케줄러 생성 및 적용
+        # 4. 스케줄러 생성(또는 캐시 재사용) 및 적용
         try:
             if hasattr(pipeline, 'scheduler') and pipeline.scheduler is not None:
-                # 기존 설정 기반으로 새 스케줄러 생성
-                base_config = pipeline.scheduler.config.copy()
-                
-                # 설정 병합
-                for key, value in config_overrides.items():
-                    if hasattr(base_config, key):
-                        setattr(base_config, key, value)
-                
-                # 새 스케줄러 생성
-                new_scheduler = scheduler_class.from_config(base_config)
+                new_scheduler, applied = cls._get_scheduler(pipeline, scheduler_class, config_overrides)
+                if pipeline.scheduler is new_scheduler:
+                    debug_emoji(f"스케줄러 재사용: {scheduler_class.__name__} ({scheduler_type})")
+                    return True
                 
                 # 파이프라인에 적용
                 old_scheduler_name = pipeline.scheduler.__class__.__name__
@@ -137,7 +233,7 @@ class SchedulerManager:
                     success(f"스케줄러 적용 성공: {old_scheduler_name} → {new_scheduler_name}")
                     info(f"   - 샘플러: {sampler_name}")
                     info(f"   - 타입: {scheduler_type}")
-                    info(f"   - 설정: {config_overrides}")
+                    info(f"   - 설정: {applied}")
                     return True
                 else:
                     failure(f"스케줄러 적용 실패: {new_scheduler_name} != {scheduler_class.__name__}")
@@ -0,0 +1,111 @@
+from ....core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+VAE 레지스트리 도메인 서비스
+스캐너가 찾은 단일 파일(.safetensors/.pt/.ckpt) VAE를 직접 로드하고
+로드한 AutoencoderKL 모듈을 LRU로 보관하여 VAE 전환을 디스크 I/O 없는 참조 교체로 만드는 서비스
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import torch
+from diffusers import AutoencoderKL
+
+
+class VaeRegistry:
+    """경로 + mtime 기준 AutoencoderKL LRU 캐시"""
+
+    SINGLE_FILE_SUFFIXES = ('.safetensors', '.pt', '.ckpt', '.bin')
+    SDXL_SCALING_FACTOR = 0.13025  # 단일 파일에는 설정이 없어 SD15 값(0.18215)으로 추론됨
+
+    def __init__(self, device: str = "cuda", max_entries: int = 4, dtype: torch.dtype = torch.float16):
+        self.device = device
+        self.max_entries = max(1, max_entries)
+        self.dtype = dtype
+        self._entries: "OrderedDict[str, AutoencoderKL]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_entries: Optional[int] = None):
+        if max_entries is not None:
+            self.max_entries = max(1, int(max_entries))
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def cache_key(vae_path: str, model_type: str = 'SD15') -> str:
+        """파일 경로 + mtime 기반 키 (파일이 바뀌면 다른 키, SDXL은 scaling_factor가 달라 별도)"""
+        try:
+            mtime_ns = os.stat(vae_path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        return f"{os.path.abspath(vae_path)}|{mtime_ns}|{model_type}"
+
+    def get(self, vae_path: str, model_type: str = 'SD15') -> AutoencoderKL:
+        """VAE 모듈 반환 (캐시에 있으면 로드 없이 같은 모듈)"""
+        key = self.cache_key(vae_path, model_type)
+        with self._lock:
+            vae = self._entries.get(key)
+            if vae is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                debug_emoji(f"VAE 캐시 적중: {Path(vae_path).name}")
+                return vae
+            self.misses += 1
+
+        vae = self._load(vae_path, model_type)
+        with self._lock:
+            self._entries[key] = vae
+            self._evict()
+        return vae
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _load(self, vae_path: str, model_type: str) -> AutoencoderKL:
+        """단일 파일이면 from_single_file, diffusers 폴더면 from_pretrained"""
+        path = Path(vae_path)
+        if path.is_file() and path.suffix.lower() in self.SINGLE_FILE_SUFFIXES:
+            vae = AutoencoderKL.from_single_file(str(path), torch_dtype=self.dtype)
+            if model_type == 'SDXL':
+                vae.register_to_config(scaling_factor=self.SDXL_SCALING_FACTOR)
+        else:
+            vae = AutoencoderKL.from_pretrained(str(path), torch_dtype=self.dtype)
+        vae.eval()
+        info(f"🎨 VAE 로드: {path.name}")
+        return vae.to(self.device)
+
+    def _evict(self):
+        removed = False
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            debug_emoji(f"VAE 캐시에서 제거: {key.split('|')[0]}")
+            removed = True
+        if removed:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -8,7 +8,7 @@ from ....core.logger import (
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field
 
 from ..modes.txt2img import Txt2ImgMode, Txt2ImgParams
@@ -37,15 +37,24 @@ class GenerationStrategyResult:
 class BasicGenerationStrategy:
     """기본 생성 전략"""
     
-    def __init__(self, pipeline, device: str, output_dir: str = "outputs", state=None):
+    def __init__(self, pipeline, device: str, output_dir: str = "outputs", state=None,
+                 cancel_check: Optional[Callable[[], bool]] = None,
+                 embedding_cache=None, embedding_fingerprint: Optional[str] = None):
         self.pipeline = pipeline
         self.device = device
         self.output_dir = output_dir
         self.state = state  # StateManager 참조 추가
+        self.cancel_check = cancel_check  # 생성 작업 취소 확인 (취소되면 스텝 루프 중단, 후처리 생략)
         
         # 도메인 컴포넌트들 초기화
         self.txt2img_mode = Txt2ImgMode(pipeline, device)
         self.img2img_mode = Img2ImgMode(pipeline, device)  # i2i 모드 추가
+        self.txt2img_mode.cancel_check = cancel_check
+        self.img2img_mode.cancel_check = cancel_check
+        # 프롬프트 임베딩 캐시 (지문은 모델/LoRA/토크나이저 상태, 바뀌면 다른 키)
+        for mode in (self.txt2img_mode, self.img2img_mode):
+            mode.embedding_cache = embedding_cache
+            mode.embedding_fingerprint = embedding_fingerprint
         self.pre_processor = PreProcessor()
         self.post_processor = PostProcessor(output_dir)
     
@@ -129,69 +138,22 @@ class BasicGenerationStrategy:
                 generated_images = await self.img2img_mode.generate(img2img_params)
             else:
                 # txt2img 모드: Txt2Img 파라미터 변환
-                txt2img_params = Txt2ImgParams(
-                    prompt=pre_result.prompt,
-                    negative_prompt=pre_result.negative_prompt,
-                    width=pre_result.width,
-                    height=pre_result.height,
-                    steps=pre_result.steps,
-                    cfg_scale=pre_result.cfg_scale,
-                    seed=pre_result.seed,
-                    sampler=params.get('sampler', 'dpmpp_2m'),
-                    scheduler=params.get('scheduler', 'karras'),
-                    batch_size=params.get('batch_size', 1),
-                    model_type=model_info.get('model_type', 'SD15'),
-                    clip_skip=params.get('clip_skip', 1)  # CLIP Skip 추가
-                )
+                txt2img_params = self._build_txt2img_params(pre_result, params, model_info)
                 
                 # 이미지 생성 (txt2img)
                 generated_images = await self.txt2img_mode.generate(txt2img_params)
             
+            if self.cancel_check is not None and self.cancel_check():
+                result.errors = ["생성이 취소되었습니다."]
+                info(r"🛑 생성 취소됨 - 후처리 생략")
+                return result
+            
             if generated_images is None or len(generated_images) == 0:
                 result.errors = ["이미지 생성에 실패했습니다."]
                 failure(r"이미지 생성 실패")
                 return result
             
-            result.images = generated_images
-            success(f"생성 완료: {len(generated_images)}개 이미지")
-            
-            # 3. 후처리 단계
-            info(r"💾 후처리 시작...")
-            
-            # 후처리용 파라미터 준비
-            post_params = {
-                'prompt': pre_result.prompt,
-                'negative_prompt': pre_result.negative_prompt,
-                'width': pre_result.width,
-                'height': pre_result.height,
-                'steps': pre_result.steps,
-                'cfg_scale': pre_result.cfg_scale,
-                'seed': pre_result.seed,
-                'sampler': params.get('sampler', 'dpmpp_2m'),
-                'scheduler': params.get('scheduler', 'karras'),
-                'vae': params.get('vae', 'baked_in'),
-                'loras': params.get('loras', [])
-            }
-            
-            # 이미지 저장 및 메타데이터 추가
-            post_results = self.post_processor.postprocess(
-                generated_images, 
-                post_params, 
-                model_info, 
-                pre_result.seed
-            )
-            
-            result.post_results = post_results
-            
-            # 성공 여부 확인
-            success_count = sum(1 for r in post_results if r.success)
-            if success_count == len(post_results):
-                result.success = True
-                success(f"후처리 완료: {success_count}개 이미지 저장")
-            else:
-                failed_count = len(post_results) - success_count
-                result.errors = [f"{failed_count}개 이미지 저장에 실패했습니다."]
-                warning_emoji(f"후처리 부분 실패: {success_count}개 성공, {failed_count}개 실패")
+            self._postprocess(result, generated_images, pre_result, params, model_info)
             
         except Exception as e:
             result.errors = [f"생성 전략 실행 중 오류: {str(e)}"]
@@ -199,6 +161,118 @@ class BasicGenerationStrategy:
         
         return result
     
+    def _build_txt2img_params(self, pre_result: PreProcessResult, params: Dict[str, Any],
+                              model_info: Dict[str, Any]) -> Txt2ImgParams:
+        """전처리 결과 → Txt2Img 파라미터"""
+        return Txt2ImgParams(
+            prompt=pre_result.prompt,
+            negative_prompt=pre_result.negative_prompt,
+            width=pre_result.width,
+            height=pre_result.height,
+            steps=pre_result.steps,
+            cfg_scale=pre_result.cfg_scale,
+            seed=pre_result.seed,
+            sampler=params.get('sampler', 'dpmpp_2m'),
+            scheduler=params.get('scheduler', 'karras'),
+            batch_size=params.get('batch_size', 1),
+            model_type=model_info.get('model_type', 'SD15'),
+            clip_skip=params.get('clip_skip', 1)  # CLIP Skip 추가
+        )
+    
+    def _postprocess(self, result: GenerationStrategyResult, generated_images: List[Any],
+                     pre_result: PreProcessResult, params: Dict[str, Any], model_info: Dict[str, Any]):
+        """생성된 이미지 저장 + 메타데이터 (result에 결과 기록)"""
+        result.images = generated_images
+        success(f"생성 완료: {len(generated_images)}개 이미지")
+        
+        # 3. 후처리 단계
+        info(r"💾 후처리 시작...")
+        
+        # 후처리용 파라미터 준비
+        post_params = {
+            'prompt': pre_result.prompt,
+            'negative_prompt': pre_result.negative_prompt,
+            'width': pre_result.width,
+            'height': pre_result.height,
+            'steps': pre_result.steps,
+            'cfg_scale': pre_result.cfg_scale,
+            'seed': pre_result.seed,
+            'sampler': params.get('sampler', 'dpmpp_2m'),
+            'scheduler': params.get('scheduler', 'karras'),
+            'vae': params.get('vae', 'baked_in'),
+            'loras': params.get('loras', [])
+        }
+        
+        # 이미지 저장 및 메타데이터 추가
+        post_results = self.post_processor.postprocess(
+            generated_images, 
+            post_params, 
+            model_info, 
+            pre_result.seed
+        )
+        
+        result.post_results = post_results
+        
+        # 성공 여부 확인
+        success_count = sum(1 for r in post_results if r.success)
+        if success_count == len(post_results):
+            result.success = True
+            success(f"후처리 완료: {success_count}개 이미지 저장")
+        else:
+            failed_count = len(post_results) - success_count
+            result.errors = [f"{failed_count}개 이미지 저장에 실패했습니다."]
+            warning_emoji(f"후처리 부분 실패: {success_count}개 성공, {failed_count}개 실패")
+    
+    async def execute_batch(self, params_list: List[Dict[str, Any]], model_info: Dict[str, Any],
+                            cancel_checks: Optional[List[Callable[[], bool]]] = None) -> List[GenerationStrategyResult]:
+        """설정이 같은 txt2img 작업 여러 개를 한 번의 파이프라인 호출로 생성 (결과는 params_list 순서)
+        
+        cancel_checks는 작업별 취소 확인. 취소된 작업은 후처리를 생략하고, 스텝 루프는 모든 작업이 취소되어야 중단
+        """
+        results = [GenerationStrategyResult(success=False) for _ in params_list]
+        cancel_checks = cancel_checks or [lambda: False] * len(params_list)
+        
+        try:
+            info(f"🔧 묶음 전처리 시작... ({len(params_list)}개 작업)")
+            pre_results = []
+            for index, params in enumerate(params_list):
+                pre_result = self.pre_processor.preprocess(
+                    params,
+                    model_info.get('model_type', 'SD15'),
+                    getattr(self.pipeline, 'tokenizer', None)
+                )
+                if pre_result.is_valid:
+                    pre_results.append((index, pre_result))
+                else:
+                    results[index].errors = pre_result.errors
+                    failure(f"전처리 실패: {pre_result.errors}")
+            if not pre_results:
+                return results
+            
+            self.txt2img_mode.cancel_check = lambda: all(check() for check in cancel_checks)
+            batch_images = await self.txt2img_mode.generate_batch([
+                self._build_txt2img_params(pre_result, params_list[index], model_info)
+                for index, pre_result in pre_results
+            ])
+            
+            info(r"💾 묶음 후처리 시작...")
+            for (index, pre_result), generated_images in zip(pre_results, batch_images):
+                result = results[index]
+                if cancel_checks[index]():
+                    result.errors = ["생성이 취소되었습니다."]
+                elif not generated_images:
+                    result.errors = ["이미지 생성에 실패했습니다."]
+                else:
+                    self._postprocess(result, generated_images, pre_result, params_list[index], model_info)
+            
+        except Exception as e:
+            for result in results:
+                if not result.success and not result.errors:
+                    result.errors = [f"생성 전략 실행 중 오류: {str(e)}"]
+            failure(f"묶음 생성 전략 실행 중 오류: {e}")
+        
+        return results
+    
     def cleanup(self):
         """정리 작업"""
         try:
@@ -0,0 +1,145 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+텐서 키 기반 모델 아키텍처 감지
+safetensors 헤더의 텐서 이름/shape만 보고 체크포인트와 LoRA의 계열을 판별
+(가중치 바이트는 읽지 않음)
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+
+
+class ArchitectureDetector:
+    """헤더의 텐서 키 접두사와 shape로 SD1.x / SD2.x / SDXL / SD3 / FLUX 판별"""
+
+    # UNet cross-attention(attn2.to_k) 입력 차원 = 텍스트 인코더 context 차원
+    CONTEXT_DIM_ARCHITECTURES = {
+        768: ('SD15', 'sd_v1'),
+        1024: ('SD15', 'sd_v2'),  # SD2.x는 SD1.x와 같은 파이프라인 클래스로 로드
+        1280: ('SDXL', 'sdxl_refiner'),
+        2048: ('SDXL', 'sdxl_base'),
+    }
+
+    @staticmethod
+    def detect(header: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """헤더(텐서 정보 dict)로 아키텍처 판별. 판별 불가하면 None.
+
+        Returns: {'model_type', 'base_model', 'kind': 'checkpoint'|'lora', 'evidence', ...}
+        """
+        keys = [key for key in header if key != '__metadata__']
+        if not keys:
+            return None
+
+        if ArchitectureDetector._is_lora(keys):
+            result = ArchitectureDetector._detect_lora(header, keys)
+            kind = 'lora'
+        else:
+            result = ArchitectureDetector._detect_checkpoint(header, keys)
+            kind = 'checkpoint'
+
+        if result is not None:
+            result['kind'] = kind
+        return result
+
+    @staticmethod
+    def _is_lora(keys: List[str]) -> bool:
+        markers = ('lora_down', 'lora_up', 'lora.down', 'lora.up', 'lora_A', 'lora_B', 'hada_w1', 'lokr_w1')
+        return any(marker in key for key in keys[:256] for marker in markers)
+
+    @staticmethod
+    def _result(model_type: str, base_model: str, evidence: str, **extra: Any) -> Dict[str, Any]:
+        return {'model_type': model_type, 'base_model': base_model, 'evidence': evidence, **extra}
+
+    @staticmethod
+    def _shape(header: Dict[str, Any], key: str) -> Optional[List[int]]:
+        entry = header.get(key)
+        if isinstance(entry, dict) and isinstance(entry.get('shape'), list):
+            return entry['shape']
+        return None
+
+    @staticmethod
+    def _find_context_dim(header: Dict[str, Any], keys: List[str]) -> Optional[Tuple[int, str]]:
+        """attn2 to_k 가중치(또는 LoRA down 가중치)의 입력 차원 탐색"""
+        for key in keys:
+            normalized = key.replace('_', '.')
+            if 'attn2.to.k' not in normalized:
+                continue
+            # LoRA up / alpha / bias 등은 입력 차원을 담고 있지 않음
+            if key.endswith(('alpha', 'bias')) or any(m in key for m in ('lora_up', 'lora.up', 'lora_B', 'hada_w1_a', 'hada_w2_a', 'lokr_')):
+                continue
+            shape = ArchitectureDetector._shape(header, key)
+            if shape and len(shape) >= 2 and shape[1] in ArchitectureDetector.CONTEXT_DIM_ARCHITECTURES:
+                return shape[1], key
+        return None
+
+    @staticmethod
+    def _detect_checkpoint(header: Dict[str, Any], keys: List[str]) -> Optional[Dict[str, Any]]:
+        """단일 파일 체크포인트 (LDM/원본 형식 및 diffusers UNet 형식)"""
+        def has_prefix(*prefixes: str) -> bool:
+            return any(key.startswith(prefixes) for key in keys)
+
+        if has_prefix('model.diffusion_model.joint_blocks.', 'joint_blocks.'):
+            return ArchitectureDetector._result('SD3', 'sd3', 'joint_blocks')
+        if has_prefix('model.diffusion_model.double_blocks.', 'double_blocks.'):
+            return ArchitectureDetector._result('FLUX', 'flux', 'double_blocks')
+
+        # 인페인팅 모델은 UNet 입력 채널이 9
+        inpaint = False
+        for conv_in_key in ('model.diffusion_model.input_blocks.0.0.weight', 'conv_in.weight'):
+            shape = ArchitectureDetector._shape(header, conv_in_key)
+            if shape and len(shape) >= 2:
+                inpaint = shape[1] == 9
+                break
+
+        if has_prefix('conditioner.embedders.1.model.'):
+            return ArchitectureDetector._result('SDXL', 'sdxl_base', 'conditioner.embedders.1', inpaint=inpaint)
+
+        context = ArchitectureDetector._find_context_dim(header, keys)
+        if context is not None:
+            context_dim, key = context
+            model_type, base_model = ArchitectureDetector.CONTEXT_DIM_ARCHITECTURES[context_dim]
+            return ArchitectureDetector._result(model_type, base_model, f'{key} context_dim={context_dim}',
+                                                context_dim=context_dim, inpaint=inpaint)
+
+        # UNet 키가 없는(텍스트 인코더 전용 등) 경우 인코더 접두사로 추정
+        if has_prefix('conditioner.embedders.0.model.'):
+            return ArchitectureDetector._result('SDXL', 'sdxl_refiner', 'conditioner.embedders.0.model')
+        if has_prefix('label_emb.', 'model.diffusion_model.label_emb.', 'add_embedding.'):
+            return ArchitectureDetector._result('SDXL', 'sdxl_base', 'label_emb')
+        if has_prefix('cond_stage_model.model.transformer.'):
+            return ArchitectureDetector._result('SD15', 'sd_v2', 'cond_stage_model.model (OpenCLIP)')
+        if has_prefix('cond_stage_model.transformer.'):
+            return ArchitectureDetector._result('SD15', 'sd_v1', 'cond_stage_model.transformer (CLIP-L)')
+        return None
+
+    @staticmethod
+    def _detect_lora(header: Dict[str, Any], keys: List[str]) -> Optional[Dict[str, Any]]:
+        """LoRA / LyCORIS (kohya 및 diffusers/peft 형식)"""
+        def has_prefix(*prefixes: str) -> bool:
+            return any(key.startswith(prefixes) for key in keys)
+
+        if has_prefix('lora_unet_double_blocks_', 'lora_unet_single_blocks_',
+                      'transformer.single_transformer_blocks.', 'single_transformer_blocks.'):
+            return ArchitectureDetector._result('FLUX', 'flux', 'single/double blocks')
+        if has_prefix('lora_unet_joint_blocks_', 'transformer.transformer_blocks.', 'lora_transformer_'):
+            return ArchitectureDetector._result('SD3', 'sd3', 'transformer blocks')
+
+        # cross-attention 입력 차원이 가장 확실한 근거
+        context = ArchitectureDetector._find_context_dim(header, keys)
+        if context is not None:
+            context_dim, key = context
+            model_type, base_model = ArchitectureDetector.CONTEXT_DIM_ARCHITECTURES[context_dim]
+            return ArchitectureDetector._result(model_type, base_model, f'{key} context_dim={context_dim}',
+                                                context_dim=context_dim)
+
+        # 텍스트 인코더가 두 개면 SDXL
+        if has_prefix('lora_te1_', 'lora_te2_', 'text_encoder_2.', 'te2.'):
+            return ArchitectureDetector._result('SDXL', 'sdxl_base', 'two text encoders')
+        # SDXL kohya LoRA는 LDM 블록 이름을, SD1.x는 diffusers 블록 이름을 사용
+        if has_prefix('lora_unet_input_blocks_', 'lora_unet_middle_block_', 'lora_unet_output_blocks_'):
+            return ArchitectureDetector._result('SDXL', 'sdxl_base', 'lora_unet_*_blocks (LDM naming)')
+        if has_prefix('lora_te_', 'lora_unet_down_blocks_', 'lora_unet_up_blocks_', 'lora_unet_mid_block_'):
+            return ArchitectureDetector._result('SD15', 'sd_v1', 'lora_unet_down_blocks (diffusers naming)')
+        return None
@@ -1,17 +1,245 @@
 # 파일 경로: src/nicediff/services/metadata_parser.py (수정 제안)
 
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List
+from collections import OrderedDict
 from PIL import Image
+import codecs
 import json
+import os
 import re
 import struct # struct는 내장 모듈이므로 pip 설치 불필요 (오류가 났던 부분)
+import threading
+from .architecture_detector import ArchitectureDetector
 from ..core.logger import (
     debug, info, warning, error, success, failure, warning_emoji, 
     info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
 )
 
+
+class BoundedHeaderReader:
+    """safetensors 헤더 JSON 스트리밍 파서 (메모리 상한).
+
+    헤더 길이 필드가 비정상적으로 큰 파일도 전체를 한 번에 메모리에 올리지 않고
+    최상위 항목 단위로 청크를 읽어 파싱합니다. 상한을 넘는 단일 값은 건너뜁니다.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024, max_value_bytes: int = 16 * 1024 * 1024):
+        self.chunk_size = chunk_size
+        self.max_value_bytes = max_value_bytes
+        self._decoder = json.JSONDecoder()
+
+    def read(self, f, header_size: int) -> Tuple[Dict[str, Any], int]:
+        """열린 파일(8바이트 길이 필드 다음 위치)에서 헤더 dict와 보관한 문자 수를 반환"""
+        state = {'buffer': '', 'pos': 0, 'remaining': header_size}
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        header: Dict[str, Any] = {}
+        kept = 0
+
+        def fill(min_size: int = 0) -> bool:
+            """버퍼에 청크 추가 (기존 미처리 길이만큼 키워서 재파싱 비용을 선형으로 유지)"""
+            if state['remaining'] <= 0:
+                return False
+            unread = len(state['buffer']) - state['pos']
+            size = min(state['remaining'], max(self.chunk_size, unread, min_size))
+            chunk = f.read(size)
+            if not chunk:
+                state['remaining'] = 0
+                return False
+            state['remaining'] -= len(chunk)
+            state['buffer'] = state['buffer'][state['pos']:] + text_decoder.decode(chunk, final=state['remaining'] <= 0)
+            state['pos'] = 0
+            return True
+
+        def peek() -> str:
+            while True:
+                buffer, pos = state['buffer'], state['pos']
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                state['pos'] = pos
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ''
+
+        def decode_value():
+            """값 하나 디코드 → (값, 소비한 문자 수). 상한 초과 시 건너뛰고 (None, None) 반환"""
+            peek()  # raw_decode는 앞쪽 공백을 허용하지 않음
+            while True:
+                buffer, pos = state['buffer'], state['pos']
+                try:
+                    value, end = self._decoder.raw_decode(buffer, pos)
+                    # 숫자처럼 버퍼 끝에서 잘렸을 수 있는 값은 더 읽고 다시 확인
+                    if end < len(buffer) or state['remaining'] <= 0:
+                        state['pos'] = end
+                        return value, end - pos
+                except json.JSONDecodeError:
+                    if state['remaining'] <= 0:
+                        raise
+                if len(buffer) - pos > self.max_value_bytes:
+                    skip_value()
+                    return None, None
+                fill()
+
+        def skip_value():
+            """문자열/중첩 깊이만 추적하며 값 하나를 건너뜀 (메모리 보관 없음)"""
+            depth, in_string, escaped = 0, False, False
+            while True:
+                buffer, pos = state['buffer'], state['pos']
+                while pos < len(buffer):
+                    char = buffer[pos]
+                    pos += 1
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == '\\':
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                            if depth == 0:
+                                state['pos'] = pos
+                                return
+                    elif depth == 0 and char in ',}':
+                        # 최상위 숫자/리터럴 값의 끝
+                        state['pos'] = pos - 1
+                        return
+                    elif char == '"':
+                        in_string = True
+                    elif char in '{[':
+                        depth += 1
+                    elif char in '}]':
+                        depth -= 1
+                        if depth == 0:
+                            state['pos'] = pos
+                            return
+                state['pos'] = pos
+                if not fill(self.chunk_size):
+                    raise ValueError("safetensors 헤더가 중간에 끝났습니다")
+
+        def expect(char: str):
+            if peek() != char:
+                raise ValueError(f"safetensors 헤더 형식 오류: '{char}' 필요")
+            state['pos'] += 1
+
+        expect('{')
+        while True:
+            char = peek()
+            if char == '}':
+                break
+            if char == ',':
+                state['pos'] += 1
+                continue
+            key, _ = decode_value()
+            if not isinstance(key, str):
+                raise ValueError("safetensors 헤더 형식 오류: 키가 문자열이 아님")
+            expect(':')
+            value, consumed = decode_value()
+            if consumed is not None:
+                header[key] = value
+                kept += consumed
+            else:
+                warning_emoji(f"safetensors 헤더 항목이 너무 커서 건너뜀: {str(key)[:64]}")
+        return header, kept
+
+
+class SafetensorsHeaderCache:
+    """safetensors 헤더 JSON 메모이제이션 (path + mtime 기준, LRU 제한)"""
+
+    # 이보다 큰 헤더는 한 번에 읽지 않고 스트리밍 파서로 처리
+    MAX_INLINE_HEADER_BYTES = 16 * 1024 * 1024
+    # 스트리밍 파싱 시 보관하는 단일 항목의 최대 크기
+    STREAM_MAX_VALUE_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 원본 헤더 바이트 합계 기준
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_header(self, model_path: Path) -> Dict[str, Any]:
+        """파일당 한 번만 헤더를 읽고 파싱 (파일이 바뀌면 다시 읽음)"""
+        model_path = Path(model_path)
+        stat_result = model_path.stat()
+        key = str(model_path)
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        header, header_size = self._read_header(model_path)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            self._entries[key] = (signature, header, header_size)
+            self._total_bytes += header_size
+            self._evict()
+        return header
+
+    @classmethod
+    def _read_header(cls, model_path: Path) -> Tuple[Dict[str, Any], int]:
+        """8바이트 길이 + JSON 헤더 읽기 (가중치 바이트는 읽지 않음)"""
+        with open(model_path, 'rb') as f:
+            header_size_bytes = f.read(8)
+            if len(header_size_bytes) < 8:
+                return {}, 0
+            header_size = struct.unpack('<Q', header_size_bytes)[0]
+            if header_size == 0:
+                return {}, 0
+
+            # 손상된 길이 필드 (파일 크기보다 큼)
+            file_size = os.fstat(f.fileno()).st_size
+            if header_size > file_size - 8:
+                raise ValueError(f"잘못된 safetensors 헤더 길이: {header_size} (파일 {file_size} bytes)")
+
+            if header_size > cls.MAX_INLINE_HEADER_BYTES:
+                warning_emoji(f"비정상적으로 큰 safetensors 헤더 ({header_size / 1024 / 1024:.1f}MB) - 스트리밍 파싱: {model_path.name}")
+                return BoundedHeaderReader(max_value_bytes=cls.STREAM_MAX_VALUE_BYTES).read(f, header_size)
+
+            json_data = f.read(header_size)
+        return json.loads(json_data), header_size
+
+    def _evict(self):
+        """LRU 순서로 한도를 넘는 항목 제거 (lock 보유 상태에서 호출)"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+
+    def invalidate(self, model_path: Optional[Path] = None):
+        """특정 파일 또는 전체 캐시 무효화"""
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            previous = self._entries.pop(str(model_path), None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
 class MetadataParser:
+    # 모든 메타데이터 접근자가 공유하는 헤더 캐시
+    header_cache = SafetensorsHeaderCache()
+
     @staticmethod
     def normalize_sampler_name(name: str) -> str:
         """샘플러 이름을 내부 표준 문자열로 정규화"""
@@ -192,6 +420,7 @@ class MetadataParser:
                 'seed': r'Seed:\s*(\d+)',
                 'size': r'Size:\s*(\d+x\d+)',
                 'model': r'Model:\s*([^,]+)',
+                'model_hash': r'Model hash:\s*([0-9a-fA-F]+)',
             }
             for key, pattern in patterns.items():
                 match = re.search(pattern, param_text, re.IGNORECASE)
@@ -217,52 +446,53 @@ class MetadataParser:
                             result['parameters'][key] = value_str
         return result
     
+    @staticmethod
+    def read_safetensors_header(model_path: Path) -> Dict[str, Any]:
+        """Safetensors 전체 헤더(텐서 정보 + __metadata__) 조회 - 캐시 공유 객체이므로 수정 금지"""
+        return MetadataParser.header_cache.get_header(model_path)
+
     @staticmethod
     def extract_from_safetensors(model_path: Path) -> Dict[str, Any]:
         """Safetensors 파일에서 __metadata__ 블록 직접 추출 및 워크플로우 프롬프트 파싱"""
         try:
-            with open(model_path, 'rb') as f:
-                header_size_bytes = f.read(8)
-                header_size = struct.unpack('<Q', header_size_bytes)[0]
-                
-                if header_size > 0:
-                    json_data = f.read(header_size)
-                    header_dict = json.loads(json_data)
+            header_dict = MetadataParser.read_safetensors_header(model_path)
+            
+            if header_dict:
+                if '__metadata__' in header_dict:
+                    # 캐시된 헤더를 오염시키지 않도록 복사본을 사용
+                    metadata = dict(header_dict['__metadata__'])
+                    
+                    # 상세 디버깅
+                    #info(r"📋 Safetensors 메타데이터 발견:")
+                    #for key, value in list(metadata.items())[:10]:
+                    #    info(f"   - {key}: {str(value)[:100]}...")
+                    
+                    # 'prompt' 키가 ComfyUI 워크플로우 JSON인지 확인하고 파싱
+                    if 'prompt' in metadata and isinstance(metadata['prompt'], str):
+                        try:
+                            # JSON 문자열일 가능성 확인
+                            prompt_content = json.loads(metadata['prompt'])
+                            # ComfyUI 워크플로우 JSON으로 간주하고 파싱
+                            parsed_prompts = MetadataParser._parse_comfyui_workflow_json(prompt_content)
+                            if parsed_prompts['prompt']:
+                                metadata['prompt'] = parsed_prompts['prompt']
+                            if parsed_prompts['negative_prompt']:
+                                metadata['negative_prompt'] = parsed_prompts['negative_prompt']
+                            # 'parameters'도 워크플로우에서 추출 가능하면 추가
+                            if parsed_prompts['parameters']:
+                                metadata['parameters'] = {**metadata.get('parameters', {}), **parsed_prompts['parameters']}
+                            
+                        except json.JSONDecodeError:
+                            # JSON이 아니면 일반 문자열 프롬프트로 간주
+                            pass
+                        except Exception as e:
+                            info(f"경고: ComfyUI 워크플로우 프롬프트 파싱 오류: {e}")
+                            pass # 파싱 실패해도 원래 메타데이터 사용
+
+                    return metadata
+                else:
+                    info(r"없음")
                     
-                    if '__metadata__' in header_dict:
-                        metadata = header_dict['__metadata__']
-                        
-                        # 상세 디버깅
-                        #info(r"📋 Safetensors 메타데이터 발견:")
-                        #for key, value in list(metadata.items())[:10]:
-                        #    info(f"   - {key}: {str(value)[:100]}...")
-                        
-                        # 'prompt' 키가 ComfyUI 워크플로우 JSON인지 확인하고 파싱
-                        if 'prompt' in metadata and isinstance(metadata['prompt'], str):
-                            try:
-                                # JSON 문자열일 가능성 확인
-                                prompt_content = json.loads(metadata['prompt'])
-                                # ComfyUI 워크플로우 JSON으로 간주하고 파싱
-                                parsed_prompts = MetadataParser._parse_comfyui_workflow_json(prompt_content)
-                                if parsed_prompts['prompt']:
-                                    metadata['prompt'] = parsed_prompts['prompt']
-                                if parsed_prompts['negative_prompt']:
-                                    metadata['negative_prompt'] = parsed_prompts['negative_prompt']
-                                # 'parameters'도 워크플로우에서 추출 가능하면 추가
-                                if parsed_prompts['parameters']:
-                                    metadata['parameters'] = {**metadata.get('parameters', {}), **parsed_prompts['parameters']}
-                                
-                            except json.JSONDecodeError:
-                                # JSON이 아니면 일반 문자열 프롬프트로 간주
-                                pass
-                            except Exception as e:
-                                info(f"경고: ComfyUI 워크플로우 프롬프트 파싱 오류: {e}")
-                                pass # 파싱 실패해도 원래 메타데이터 사용
-
-                        return metadata
-                    else:
-                        info(r"없음")
-                        
         except Exception as e:
             info(f"Safetensors 메타데이터 추출 오류 ({model_path.name}): {e}")
         return {}
@@ -329,16 +559,37 @@ class MetadataParser:
         return extracted
     
     @staticmethod
-    def detect_model_type(model_path: Path) -> Tuple[str, Optional[str]]:
+    def detect_architecture(model_path: Path) -> Optional[Dict[str, Any]]:
+        """텐서 키/shape 기반 아키텍처 판별 (safetensors만, 가중치 바이트는 읽지 않음)"""
+        if model_path.suffix.lower() != '.safetensors':
+            return None
+        try:
+            return ArchitectureDetector.detect(MetadataParser.read_safetensors_header(model_path))
+        except Exception as e:
+            debug_emoji(f"텐서 키 기반 아키텍처 판별 실패 ({model_path.name}): {e}")
+            return None
+
+    @staticmethod
+    def detect_model_type(model_path: Path, metadata: Optional[Dict[str, Any]] = None,
+                          architecture: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[str]]:
         """
         모델 타입을 자동으로 감지합니다.
-        Returns: (model_type, base_model) - 예: ('SDXL', 'sdxl_1_0')
+        텐서 키/shape 판별을 우선하고, 판별 불가할 때만 메타데이터/경로/파일명으로 추측합니다.
+        metadata/architecture가 주어지면 헤더를 다시 읽지 않고 재사용합니다.
+        Returns: (model_type, base_model) - 예: ('SDXL', 'sdxl_base')
         """
         debug_emoji(f"모델 타입 감지 중: {model_path.name}")
         
+        # 0. 텐서 키/shape (가장 확실한 근거)
+        if architecture is None:
+            architecture = MetadataParser.detect_architecture(model_path)
+        if architecture is not None:
+            return architecture['model_type'], architecture['base_model']
+        
         # 1. Safetensors 메타데이터에서 확인
         if model_path.suffix == '.safetensors':
-            metadata = MetadataParser.extract_from_safetensors(model_path) # 수정된 extract_from_safetensors 호출
+            if metadata is None:
+                metadata = MetadataParser.extract_from_safetensors(model_path) # 헤더 캐시 사용
             
             # Civitai 형식 메타데이터
             if 'ss_base_model_version' in metadata:
@@ -419,21 +670,52 @@ class MetadataParser:
                 metadata = MetadataParser.extract_from_safetensors(model_path)
                 model_info['metadata'] = metadata
                 
-                # 모델 타입 감지
-                model_type, _ = MetadataParser.detect_model_type(model_path)
+                # 모델 타입 감지 (이미 읽은 헤더/메타데이터 재사용)
+                architecture = MetadataParser.detect_architecture(model_path)
+                model_type, _ = MetadataParser.detect_model_type(model_path, metadata, architecture)
                 model_info['model_type'] = model_type
+                if architecture is not None:
+                    model_info['architecture'] = architecture
                 
                 # base_model 설정
-                if model_type == 'SDXL':
-                    model_info['base_model'] = 'SDXL'
-                else:
-                    model_info['base_model'] = 'SD1.5'
+                model_info['base_model'] = {'SDXL': 'SDXL', 'SD15': 'SD1.5'}.get(model_type, model_type)
                     
         except Exception as e:
             info(f"모델 정보 추출 실패 ({model_path.name}): {e}")
         
         return model_info
     
+    @staticmethod
+    def extract_lora_keywords(metadata: Dict[str, Any], max_tags: int = 32) -> Tuple[List[str], List[str]]:
+        """LoRA 메타데이터에서 (트리거 워드 목록, 빈도 상위 학습 태그 목록) 추출"""
+        trigger_words = []
+        for key in ('ss_trigger_words', 'modelspec.trigger_phrase', 'trigger_words'):
+            value = metadata.get(key)
+            if isinstance(value, str):
+                trigger_words.extend(word.strip() for word in value.split(',') if word.strip())
+            elif isinstance(value, list):
+                trigger_words.extend(str(word).strip() for word in value if str(word).strip())
+
+        # ss_tag_frequency: {"데이터셋 폴더": {"태그": 횟수, ...}, ...} 형태의 JSON 문자열
+        tag_counts: Dict[str, int] = {}
+        tag_frequency = metadata.get('ss_tag_frequency')
+        if isinstance(tag_frequency, str):
+            try:
+                tag_frequency = json.loads(tag_frequency)
+            except json.JSONDecodeError:
+                tag_frequency = None
+        if isinstance(tag_frequency, dict):
+            for dataset_tags in tag_frequency.values():
+                if not isinstance(dataset_tags, dict):
+                    continue
+                for tag, count in dataset_tags.items():
+                    tag = str(tag).strip()
+                    if tag and isinstance(count, (int, float)):
+                        tag_counts[tag] = tag_counts.get(tag, 0) + int(count)
+        tags = sorted(tag_counts, key=lambda tag: -tag_counts[tag])[:max_tags]
+
+        return list(dict.fromkeys(trigger_words)), tags
+
     @staticmethod
     def get_lora_info(lora_path: Path) -> Dict[str, Any]:
         """LoRA 파일에서 기본 정보 추출"""
@@ -448,8 +730,15 @@ class MetadataParser:
                 metadata = MetadataParser.extract_from_safetensors(lora_path)
                 lora_info['metadata'] = metadata
                 
-                # LoRA 기본 모델 정보 추출
-                if 'ss_base_model_version' in metadata:
+                # 검색용 트리거 워드 / 학습 태그 (PNG 메타데이터로 덮어써져도 유지되도록 별도 키)
+                lora_info['trigger_words'], lora_info['tags'] = MetadataParser.extract_lora_keywords(metadata)
+                
+                # LoRA 기본 모델 정보 추출 (텐서 키/shape 우선, 메타데이터는 보조)
+                architecture = MetadataParser.detect_architecture(lora_path)
+                if architecture is not None:
+                    lora_info['base_model'] = {'SDXL': 'SDXL', 'SD15': 'SD1.5'}.get(architecture['model_type'], architecture['model_type'])
+                    lora_info['architecture'] = architecture
+                elif 'ss_base_model_version' in metadata:
                     base_model = metadata['ss_base_model_version']
                     if 'xl' in base_model.lower() or 'sdxl' in base_model.lower():
                         lora_info['base_model'] = 'SDXL'
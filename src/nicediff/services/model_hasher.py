@@ -0,0 +1,248 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+모델 파일 해시 서비스
+백그라운드 스레드에서 낮은 우선순위로 모델 파일 해시를 계산하고
+스캔 인덱스에 저장하여 파일(mtime)당 한 번만 계산하도록 하는 서비스
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Iterable, List
+
+from .scan_index import ScanIndex
+
+
+class ModelHashService:
+    """모델 해시 계산/조회 서비스 (빠른 부분 해시 + 선택적 전체 SHA-256)"""
+
+    # A1111 구버전 'Model hash': 1MB 지점부터 64KB의 sha256 앞 8자리
+    QUICK_HASH_OFFSET = 0x100000
+    QUICK_HASH_SIZE = 0x10000
+    SAVE_EVERY = 20  # 이 개수만큼 계산할 때마다 인덱스 저장
+
+    def __init__(self, scan_index: ScanIndex, full_hash: bool = False,
+                 max_mb_per_sec: Optional[float] = 64.0, chunk_size: int = 1024 * 1024,
+                 should_pause: Optional[Callable[[], bool]] = None):
+        self.scan_index = scan_index
+        self.full_hash = full_hash
+        self.max_bytes_per_sec = max_mb_per_sec * 1024 * 1024 if max_mb_per_sec else None
+        self.chunk_size = chunk_size
+        self.should_pause = should_pause  # 생성 중 등에는 I/O 양보
+
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: set = set()
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hashed_count = 0
+
+    # --- 해시 계산 ---
+    @classmethod
+    def compute_quick_hash(cls, file_path: Path) -> str:
+        """A1111 방식의 빠른 부분 해시 (64KB만 읽음)"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            f.seek(cls.QUICK_HASH_OFFSET)
+            sha256.update(f.read(cls.QUICK_HASH_SIZE))
+        return sha256.hexdigest()[:8]
+
+    def compute_sha256(self, file_path: Path, throttle: bool = True) -> Optional[str]:
+        """청크 단위 전체 SHA-256 (초당 읽기량 제한, 중지 시 None). throttle=False면 제한/일시정지 없이 읽음"""
+        sha256 = hashlib.sha256()
+        started = time.monotonic()
+        read_bytes = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                if self._stop_event.is_set():
+                    return None
+                if throttle:
+                    self._wait_while_paused()
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                read_bytes += len(chunk)
+
+                if throttle and self.max_bytes_per_sec:
+                    expected = read_bytes / self.max_bytes_per_sec
+                    elapsed = time.monotonic() - started
+                    if expected > elapsed:
+                        time.sleep(expected - elapsed)
+        return sha256.hexdigest()
+
+    def hash_file(self, file_path: Path, full: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """파일 하나의 해시 계산 후 인덱스에 저장. 계산 중 파일이 바뀌면 None"""
+        file_path = Path(file_path)
+        full = self.full_hash if full is None else full
+        signature = ScanIndex.make_signature(file_path)
+
+        hashes = {'mtime_ns': signature['mtime_ns'], 'size': signature['size']}
+        hashes['quick'] = self.compute_quick_hash(file_path)
+        if full:
+            sha256 = self.compute_sha256(file_path)
+            if sha256 is None:
+                return None
+            hashes['sha256'] = sha256
+            hashes['autov2'] = sha256[:10]  # A1111/Civitai 'AutoV2'
+
+        # 계산 도중 파일이 바뀌었으면 버림 (다음 스캔/감시 이벤트에서 다시 계산)
+        if not self._store_hashes(file_path, signature, hashes):
+            return None
+        return hashes
+
+    def ensure_sha256(self, file_path: Path) -> Optional[str]:
+        """전체 SHA-256 (저장된 값이 현재 파일과 맞으면 재사용, 없으면 바로 계산해 인덱스에 저장)
+        모델 로드처럼 결과를 기다리는 호출용이라 속도 제한/일시정지 없이 읽음. 계산 중 파일이 바뀌면 None"""
+        file_path = Path(file_path)
+        hashes = self.get_hashes(file_path)
+        if hashes and hashes.get('sha256'):
+            return hashes['sha256']
+
+        signature = ScanIndex.make_signature(file_path)
+        sha256 = self.compute_sha256(file_path, throttle=False)
+        if sha256 is None or ScanIndex.make_signature(file_path) != signature:
+            return None
+        hashes = {'mtime_ns': signature['mtime_ns'], 'size': signature['size'],
+                  'quick': self.compute_quick_hash(file_path), 'sha256': sha256, 'autov2': sha256[:10]}
+        if self._store_hashes(file_path, signature, hashes):
+            self.scan_index.save()
+        return sha256
+
+    def _store_hashes(self, file_path: Path, signature: Dict[str, Any], hashes: Dict[str, Any]) -> bool:
+        """인덱스 항목이 같은 파일 상태일 때만 저장"""
+        entry = self.scan_index.get_entry(file_path)
+        if entry is None or entry.get('signature') != signature or ScanIndex.make_signature(file_path) != signature:
+            return False
+        self.scan_index.update_extra(file_path, hashes=hashes)
+        self.hashed_count += 1
+        return True
+
+    # --- 조회 ---
+    def get_hashes(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """현재 파일 내용에 대한 저장된 해시 (없거나 오래되었으면 None)"""
+        entry = self.scan_index.get_entry(file_path)
+        if not entry:
+            return None
+        return self._valid_hashes(entry)
+
+    @staticmethod
+    def _valid_hashes(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        hashes = entry.get('hashes')
+        signature = entry.get('signature') or {}
+        if not hashes or hashes.get('mtime_ns') != signature.get('mtime_ns') or hashes.get('size') != signature.get('size'):
+            return None
+        return hashes
+
+    def find_by_hash(self, value: str, model_type: Optional[str] = None) -> Optional[str]:
+        """해시(빠른 해시 / AutoV2 / SHA-256 앞부분)로 모델 경로 찾기"""
+        value = (value or '').strip().lower()
+        if len(value) < 8:
+            return None
+        for file_path, entry in self.scan_index.iter_entries(model_type):
+            hashes = self._valid_hashes(entry)
+            if not hashes:
+                continue
+            if value in (hashes.get('quick'), hashes.get('autov2')) or hashes.get('sha256', '').startswith(value):
+                return file_path
+        return None
+
+    @staticmethod
+    def short_hash(hashes: Optional[Dict[str, Any]]) -> Optional[str]:
+        """기록용 대표 해시 (AutoV2가 있으면 우선)"""
+        if not hashes:
+            return None
+        return hashes.get('autov2') or hashes.get('quick')
+
+    # --- 백그라운드 작업 ---
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._worker, name='model-hasher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.scan_index.save()
+
+    def enqueue(self, paths: Iterable[str]):
+        """해시 계산 대기열에 추가 (이미 대기 중이면 무시)"""
+        with self._pending_lock:
+            for path in paths:
+                path = str(path)
+                if path not in self._pending:
+                    self._pending.add(path)
+                    self._queue.put(path)
+
+    def enqueue_missing(self) -> int:
+        """현재 내용에 대한 해시가 없는(또는 전체 해시가 필요한) 인덱스 항목을 모두 대기열에 추가"""
+        missing = [
+            file_path for file_path, entry in self.scan_index.iter_entries()
+            if not self._has_required_hashes(self._valid_hashes(entry))
+        ]
+        self.enqueue(missing)
+        if missing:
+            info(f"🔑 모델 해시 계산 대기: {len(missing)}개")
+        return len(missing)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """대기열이 빌 때까지 대기 (테스트/벤치마크용)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+    def _has_required_hashes(self, hashes: Optional[Dict[str, Any]]) -> bool:
+        return bool(hashes) and 'quick' in hashes and (not self.full_hash or 'sha256' in hashes)
+
+    def _wait_while_paused(self):
+        while self.should_pause is not None and not self._stop_event.is_set():
+            try:
+                if not self.should_pause():
+                    return
+            except Exception:
+                return
+            time.sleep(0.5)
+
+    def _worker(self):
+        unsaved = 0
+        while not self._stop_event.is_set():
+            try:
+                path = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if unsaved:
+                    self.scan_index.save()
+                    unsaved = 0
+                continue
+            if path is None:
+                break
+
+            try:
+                self._wait_while_paused()
+                if not self._has_required_hashes(self.get_hashes(path)) and os.path.isfile(path):
+                    if self.hash_file(Path(path)) is not None:
+                        unsaved += 1
+            except Exception as e:
+                warning_emoji(f"모델 해시 계산 실패 ({Path(path).name}): {e}")
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(path)
+
+            if unsaved >= self.SAVE_EVERY or (unsaved and self._queue.empty()):
+                self.scan_index.save()
+                unsaved = 0
@@ -2,10 +2,15 @@
 # VAE 스캔 및 PNG 메타데이터 우선순위 수정
 
 import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Tuple, AsyncIterator
 from collections import defaultdict
 from .metadata_parser import MetadataParser
+from .scan_index import ScanIndex
 from ..core.logger import (
     debug, info, warning, error, success, failure, warning_emoji, 
     info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
@@ -14,15 +19,43 @@ from ..core.logger import (
 class ModelScanner:
     """모델 파일 스캐너 (VAE 지원 및 PNG 메타데이터 우선순위 수정)"""
 
-    def __init__(self, paths_config: Dict[str, str]):
+    def __init__(self, paths_config: Dict[str, str], index_path: Optional[Path] = None,
+                 max_workers: Optional[int] = None, batch_size: int = 64):
         # config.toml의 [paths] 섹션을 통째로 받아 경로 Path 객체로 저장
         self.paths_config = {key: Path(value) for key, value in paths_config.items()}
         self.model_extensions = {'.safetensors', '.ckpt', '.pt'}
         self.vae_extensions = {'.safetensors', '.ckpt', '.pt', '.vae.pt'}  # VAE 확장자 추가
         self.metadata_parser = MetadataParser()
 
-    async def scan_all_models(self) -> Dict[str, Any]:
-        """모든 모델 타입을 병렬로 스캔하고 결과를 반환하는 유일한 공개 메서드."""
+        # 증분 스캔용 인덱스 (모델 루트 아래 JSON 파일)
+        scan_paths = [path for key, path in self.paths_config.items() if key != 'outputs']
+        self.scan_index = ScanIndex(index_path) if index_path else ScanIndex.for_paths(scan_paths)
+        self.reparsed_count = 0
+        self._count_lock = threading.Lock()
+
+        # 파일별 메타데이터 추출 병렬도 (I/O 위주이므로 CPU 수보다 여유 있게)
+        self.max_workers = max(1, max_workers or min(16, (os.cpu_count() or 1) + 4))
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # 스트리밍 스캔 배치 크기 (파일 수 기준)
+        self.batch_size = max(1, batch_size)
+        self.last_result: Dict[str, Any] = {}
+
+    def get_cached_models(self) -> Dict[str, Any]:
+        """디스크를 탐색하지 않고 인덱스에서 마지막 스캔 결과를 즉시 재구성"""
+        result = {}
+        for model_type in self.paths_config:
+            if model_type == 'outputs':
+                continue
+            result[model_type] = self.scan_index.build_result(model_type)
+        return result
+
+    async def scan_all_models(self, on_batch: Optional[Callable[[str, Dict[str, List[Dict[str, Any]]]], None]] = None) -> Dict[str, Any]:
+        """모든 모델 타입을 병렬로 스캔하고 결과를 반환하는 공개 메서드.
+
+        on_batch가 주어지면 batch_size개 파일마다 (model_type, {folder: [file_info]})로
+        중간 결과를 전달합니다. 콜백은 스캔 워커 스레드에서 호출됩니다.
+        """
         info(r">>> 통합 모델 스캔 시작 (VAE 지원 포함)...")
         debug_emoji(f"스캔 대상 경로: {self.paths_config}")
         tasks = {}
@@ -35,22 +68,65 @@ class ModelScanner:
                 continue
             
             if model_type == 'vae':
-                tasks[model_type] = self._scan_vae_directory(path)
+                tasks[model_type] = self._scan_vae_directory(path, on_batch)
             else:
-                tasks[model_type] = self._scan_directory(path, model_type)
+                tasks[model_type] = self._scan_directory(path, model_type, on_batch)
             
-        info(f"🚀 스캔 작업 시작: {list(tasks.keys())}")
-        list_of_results = await asyncio.gather(*tasks.values())
+        info(f"🚀 스캔 작업 시작: {list(tasks.keys())} (워커 {self.max_workers}개)")
+        self.reparsed_count = 0
+        # 모든 모델 타입이 하나의 워커 풀을 공유하여 전체 병렬도를 제한
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='model-scan') if self.max_workers > 1 else None
+        try:
+            list_of_results = await asyncio.gather(*tasks.values())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
         result = dict(zip(tasks.keys(), list_of_results))
+        self.last_result = result
+
+        # 변경된 항목이 있을 때만 인덱스 파일 갱신
+        await asyncio.to_thread(self.scan_index.save)
         
-        info(f"<<< 모든 모델 스캔 완료. VAE 발견: {len(result.get('vae', {}))}")
+        info(f"<<< 모든 모델 스캔 완료. VAE 발견: {len(result.get('vae', {}))}, 재파싱: {self.reparsed_count}개")
         info(r"📊 스캔 결과 요약:")
         for model_type, data in result.items():
             total_items = sum(len(items) for items in data.values())
             info(f"   {model_type}: {total_items}개")
         return result
 
-    async def _scan_vae_directory(self, base_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    async def scan_models_stream(self) -> AsyncIterator[Tuple[str, Dict[str, List[Dict[str, Any]]]]]:
+        """스캔 결과를 (model_type, {folder: [file_info]}) 배치 단위로 흘려보내는 비동기 제너레이터.
+
+        모든 배치가 전달된 후 정렬된 전체 결과는 self.last_result에 남습니다.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        def on_batch(model_type: str, batch: Dict[str, List[Dict[str, Any]]]):
+            loop.call_soon_threadsafe(queue.put_nowait, (model_type, batch))
+
+        async def run_scan():
+            try:
+                await self.scan_all_models(on_batch=on_batch)
+            finally:
+                queue.put_nowait(finished)
+
+        scan_task = asyncio.create_task(run_scan())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+            # 스캔 중 발생한 예외 전달
+            await scan_task
+        finally:
+            if not scan_task.done():
+                scan_task.cancel()
+
+    async def _scan_vae_directory(self, base_path: Path, on_batch: Optional[Callable] = None) -> Dict[str, List[Dict[str, Any]]]:
         """VAE 디렉토리 전용 스캔 함수 (하위 폴더 포함)"""
         if not await asyncio.to_thread(base_path.exists):
             await asyncio.to_thread(base_path.mkdir, parents=True, exist_ok=True)
@@ -59,58 +135,21 @@ class ModelScanner:
         def scan_sync():
             """VAE 파일 스캔 (재귀적으로 모든 하위 폴더 탐색)"""
             result = defaultdict(list)
+            seen_paths = set()
             
             info(f"  -> VAE 스캔 시작: {base_path}")
             vae_count = 0
             
-            # 모든 파일을 재귀적으로 탐색
-            for file_path in base_path.rglob('*'):
-                if file_path.is_file():
-                    # VAE 파일 확인 (더 관대한 조건)
-                    file_lower = file_path.name.lower()
-                    suffix_lower = file_path.suffix.lower()
-                    
-                    is_vae_file = (
-                        # 확장자 기반 체크
-                        suffix_lower in {'.safetensors', '.ckpt', '.pt', '.bin'} and
-                        (
-                            # 파일명에 'vae' 포함
-                            'vae' in file_lower or
-                            # 또는 vae 전용 확장자
-                            file_lower.endswith('.vae.pt') or
-                            file_lower.endswith('.vae.safetensors') or
-                            # 또는 VAE 폴더 내의 모든 모델 파일
-                            'vae' in str(file_path.parent).lower()
-                        )
-                    )
-                    
-                    if is_vae_file:
-                        relative_path = file_path.relative_to(base_path)
-                        folder = str(relative_path.parent) if relative_path.parent != Path('.') else 'Root'
-                        
-                        file_info = {
-                            'name': file_path.stem,
-                            'filename': file_path.name,
-                            'path': str(file_path),
-                            'folder': folder,
-                            'size_mb': file_path.stat().st_size / (1024 * 1024),
-                            'type': 'vae',
-                        }
-                        
-                        # VAE 메타데이터 추출 (safetensors인 경우만)
-                        if file_path.suffix.lower() == '.safetensors':
-                            try:
-                                vae_meta = self.metadata_parser.extract_from_safetensors(file_path)
-                                if vae_meta:
-                                    file_info['metadata'] = vae_meta
-                            except Exception as e:
-                                info(f"VAE 메타데이터 추출 실패 ({file_path.name}): {e}")
-                        
-                        result[folder].append(file_info)
-                        vae_count += 1
-                        info(f"    VAE 발견: {file_path.relative_to(base_path)}")
+            # 모든 파일을 재귀적으로 탐색 (메타데이터 추출은 워커 풀에서 병렬 처리)
+            vae_files = (file_path for file_path in base_path.rglob('*') if file_path.is_file() and self._is_vae_file(file_path))
+            for file_path, file_info in self._map_files(vae_files, base_path, 'vae', self._build_vae_info, on_batch):
+                seen_paths.add(str(file_path))
+                result[file_info['folder']].append(file_info)
+                vae_count += 1
+                info(f"    VAE 발견: {file_path.relative_to(base_path)}")
 
             info(f"  -> VAE 스캔 완료: 총 {vae_count}개")
+            self.scan_index.prune('vae', seen_paths, base_path)
 
             # 폴더별 정렬
             for folder_items in result.values():
@@ -120,7 +159,7 @@ class ModelScanner:
         
         return await asyncio.to_thread(scan_sync)
 
-    async def _scan_directory(self, base_path: Path, model_type: str) -> Dict[str, List[Dict[str, Any]]]:
+    async def _scan_directory(self, base_path: Path, model_type: str, on_batch: Optional[Callable] = None) -> Dict[str, List[Dict[str, Any]]]:
         """지정된 디렉토리 하나를 스캔하는 비공개 헬퍼 함수."""
         debug_emoji(f"{model_type} 스캔 시작: {base_path}")
         if not await asyncio.to_thread(base_path.exists):
@@ -131,63 +170,18 @@ class ModelScanner:
         def scan_sync():
             """실제 파일 시스템 I/O를 수행하는 동기 함수"""
             result = defaultdict(list)
+            seen_paths = set()
             info(f"📂 {model_type} 파일 스캔 중: {base_path}")
             
-            for file_path in base_path.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in self.model_extensions:
-                    relative_path = file_path.relative_to(base_path)
-                    folder = str(relative_path.parent) if relative_path.parent != Path('.') else 'Root'
-                    
-                    file_info = {
-                        'name': file_path.stem,
-                        'filename': file_path.name,
-                        'path': str(file_path),
-                        'folder': folder,
-                        'size_mb': file_path.stat().st_size / (1024 * 1024),
-                        'type': model_type,
-                    }
-                    
-                        # model_type에 따라 필요한 메타데이터만 추출하도록 분기
-                    if model_type == 'checkpoints':
-                        # --- [수정된 로직 시작] ---
-                        # 1. 모델 타입 정보는 항상 safetensors 파일에서 직접 추출
-                        model_specific_info = self.metadata_parser.get_model_info(file_path)
-                        file_info.update(model_specific_info)
-
-                        # 2. 생성 파라미터 메타데이터는 오직 이름이 같은 .png 파일에서만 가져옴
-                        png_path = file_path.with_suffix('.png')
-                        if png_path.exists():
-                            # info(f"📷 PNG 메타데이터 발견: {png_path.name}") # 디버깅용
-                            png_metadata = self.metadata_parser.extract_from_png(png_path)
-                            # PNG에서 추출한 메타데이터를 file_info의 'metadata'에 덮어씀
-                            file_info['metadata'] = png_metadata
-                        else:
-                            # PNG 파일이 없으면 메타데이터는 비워둠
-                            file_info['metadata'] = {}
-                            
-                    elif model_type == 'loras':
-                        # --- [LoRA 스캔 로직 개선] ---
-                        info(f"🎯 LoRA 발견: {file_path.relative_to(base_path)}")
-                        # 1. LoRA 메타데이터는 safetensors 파일에서 직접 추출
-                        lora_specific_info = self.metadata_parser.get_lora_info(file_path)
-                        file_info.update(lora_specific_info)
-                        
-                        # 2. 생성 파라미터 메타데이터는 오직 이름이 같은 .png 파일에서만 가져옴
-                        png_path = file_path.with_suffix('.png')
-                        if png_path.exists():
-                            # info(f"📷 LoRA PNG 메타데이터 발견: {png_path.name}") # 디버깅용
-                            png_metadata = self.metadata_parser.extract_from_png(png_path)
-                            # PNG에서 추출한 메타데이터를 file_info의 'metadata'에 덮어씀
-                            file_info['metadata'] = png_metadata
-                        else:
-                            # PNG 파일이 없으면 safetensors 메타데이터 사용
-                            if file_path.suffix.lower() == '.safetensors':
-                                lora_meta = self.metadata_parser.extract_from_safetensors(file_path)
-                                file_info['metadata'] = lora_meta
-                            else:
-                                file_info['metadata'] = {}
-                    
-                    result[folder].append(file_info)
+            model_files = (
+                file_path for file_path in base_path.rglob('*')
+                if file_path.suffix.lower() in self.model_extensions and file_path.is_file()
+            )
+            for file_path, file_info in self._map_files(model_files, base_path, model_type, self._build_model_info, on_batch):
+                seen_paths.add(str(file_path))
+                result[file_info['folder']].append(file_info)
+
+            self.scan_index.prune(model_type, seen_paths, base_path)
 
             # 폴더별 정렬
             for folder_items in result.values():
@@ -195,4 +189,218 @@ class ModelScanner:
             
             return dict(result)
         
-        return await asyncio.to_thread(scan_sync)
\ No newline at end of file
+        return await asyncio.to_thread(scan_sync)
+
+    def watch_targets(self) -> Dict[str, Path]:
+        """파일 감시 대상 (출력 폴더 제외한 model_type → 기준 경로)"""
+        return {model_type: path for model_type, path in self.paths_config.items() if model_type != 'outputs'}
+
+    def classify_path(self, path: Path) -> Optional[Tuple[str, Path, Path]]:
+        """변경된 경로를 (model_type, 기준 경로, 스캔 결과와 같은 형태의 파일 경로)로 변환.
+
+        감시자는 절대 경로를 보고하지만 인덱스 키와 file_info['path']는
+        config의 경로를 기준으로 하므로 같은 형태로 맞춰줍니다.
+        """
+        abs_path = Path(os.path.abspath(path))
+        for model_type, base_path in self.watch_targets().items():
+            try:
+                relative_path = abs_path.relative_to(os.path.abspath(base_path))
+            except ValueError:
+                continue
+            return model_type, base_path, base_path / relative_path
+        return None
+
+    def is_model_file(self, model_type: str, file_path: Path) -> bool:
+        """스캔 대상 모델 파일인지 확인 (스캔 시 필터와 동일한 조건)"""
+        if model_type == 'vae':
+            return self._is_vae_file(file_path)
+        return file_path.suffix.lower() in self.model_extensions
+
+    def apply_file_changes(self, changed_paths: Iterable[Path]) -> Dict[str, Dict[str, Any]]:
+        """변경된 파일만 다시 파싱하여 model_type별 델타를 반환 (동기 함수).
+
+        반환 형식: {model_type: {'added': [file_info], 'modified': [file_info], 'removed': [path]}}
+        미리보기 PNG 변경은 같은 이름의 모델 파일 수정으로 취급합니다.
+        """
+        targets: Dict[str, Tuple[str, Path, Path]] = {}
+        for changed_path in changed_paths:
+            classified = self.classify_path(Path(changed_path))
+            if classified is None:
+                continue
+            model_type, base_path, file_path = classified
+
+            if file_path.suffix.lower() == '.png' and model_type != 'vae':
+                for extension in self.model_extensions:
+                    model_path = file_path.with_suffix(extension)
+                    if self.scan_index.get_entry(model_path) is not None or model_path.is_file():
+                        targets[str(model_path)] = (model_type, base_path, model_path)
+            elif self.is_model_file(model_type, file_path):
+                targets[str(file_path)] = (model_type, base_path, file_path)
+
+        deltas: Dict[str, Dict[str, Any]] = {}
+        for model_type, base_path, file_path in targets.values():
+            delta = deltas.setdefault(model_type, {'added': [], 'modified': [], 'removed': []})
+            previous = self.scan_index.get_entry(file_path)
+            MetadataParser.header_cache.invalidate(file_path)
+
+            if not file_path.is_file():
+                if self.scan_index.remove(file_path):
+                    delta['removed'].append(str(file_path))
+                continue
+
+            builder = self._build_vae_info if model_type == 'vae' else self._build_model_info
+            try:
+                file_info = self._get_or_parse(file_path, base_path, model_type, builder)
+            except Exception as e:
+                # 복사 중인 파일 등은 다음 변경 이벤트에서 다시 시도
+                warning_emoji(f"{model_type} 파일 처리 실패 ({file_path.name}): {e}")
+                continue
+
+            if previous is None:
+                delta['added'].append(file_info)
+            elif previous.get('signature') != self.scan_index.get_entry(file_path).get('signature'):
+                delta['modified'].append(file_info)
+
+        self.scan_index.save()
+        return {model_type: delta for model_type, delta in deltas.items() if any(delta.values())}
+
+    def _map_files(self, files: Iterable[Path], base_path: Path, model_type: str, builder: Callable,
+                   on_batch: Optional[Callable] = None) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """파일별 정보 추출을 batch_size 단위로 워커 풀에서 병렬 실행.
+
+        디렉토리 탐색과 파싱을 겹쳐서 첫 배치가 빨리 나오도록 하며,
+        결과는 입력 순서를 유지하고 실패한 파일은 제외합니다.
+        """
+        def process(file_path: Path):
+            try:
+                return file_path, self._get_or_parse(file_path, base_path, model_type, builder)
+            except Exception as e:
+                warning_emoji(f"{model_type} 파일 처리 실패 ({file_path.name}): {e}")
+                return file_path, None
+
+        files = iter(files)
+        while True:
+            chunk = list(islice(files, self.batch_size))
+            if not chunk:
+                break
+
+            if self._executor is None or len(chunk) < 2:
+                results = [process(file_path) for file_path in chunk]
+            else:
+                results = list(self._executor.map(process, chunk))
+
+            batch = defaultdict(list)
+            for file_path, file_info in results:
+                if file_info is None:
+                    continue
+                batch[file_info['folder']].append(file_info)
+                yield file_path, file_info
+
+            if on_batch is not None and batch:
+                try:
+                    on_batch(model_type, dict(batch))
+                except Exception as e:
+                    warning_emoji(f"스캔 배치 콜백 오류 ({model_type}): {e}")
+
+    def _get_or_parse(self, file_path: Path, base_path: Path, model_type: str, builder) -> Dict[str, Any]:
+        """인덱스의 시그니처(size + mtime)가 같으면 캐시 사용, 아니면 다시 파싱"""
+        stat_result = file_path.stat()
+        signature = ScanIndex.make_signature(file_path, stat_result)
+
+        file_info = self.scan_index.lookup(file_path, model_type, signature)
+        if file_info is None:
+            file_info = builder(file_path, base_path, model_type, stat_result)
+            self.scan_index.store(file_path, model_type, signature, file_info)
+            with self._count_lock:
+                self.reparsed_count += 1
+        # UI가 경로는 같고 내용(메타데이터/미리보기)만 바뀐 카드를 알아볼 수 있도록 시그니처 포함
+        return dict(file_info, signature=signature)
+
+    @staticmethod
+    def _is_vae_file(file_path: Path) -> bool:
+        """VAE 파일 확인 (더 관대한 조건)"""
+        file_lower = file_path.name.lower()
+        suffix_lower = file_path.suffix.lower()
+        return (
+            # 확장자 기반 체크
+            suffix_lower in {'.safetensors', '.ckpt', '.pt', '.bin'} and
+            (
+                # 파일명에 'vae' 포함
+                'vae' in file_lower or
+                # 또는 vae 전용 확장자
+                file_lower.endswith('.vae.pt') or
+                file_lower.endswith('.vae.safetensors') or
+                # 또는 VAE 폴더 내의 모든 모델 파일
+                'vae' in str(file_path.parent).lower()
+            )
+        )
+
+    @staticmethod
+    def _base_file_info(file_path: Path, base_path: Path, model_type: str, stat_result) -> Dict[str, Any]:
+        """모든 모델 타입 공통 기본 정보"""
+        relative_path = file_path.relative_to(base_path)
+        folder = str(relative_path.parent) if relative_path.parent != Path('.') else 'Root'
+        return {
+            'name': file_path.stem,
+            'filename': file_path.name,
+            'path': str(file_path),
+            'folder': folder,
+            'size_mb': stat_result.st_size / (1024 * 1024),
+            'type': model_type,
+        }
+
+    def _build_vae_info(self, file_path: Path, base_path: Path, model_type: str, stat_result) -> Dict[str, Any]:
+        """VAE 파일 하나의 정보 추출"""
+        file_info = self._base_file_info(file_path, base_path, model_type, stat_result)
+        
+        # VAE 메타데이터 추출 (safetensors인 경우만)
+        if file_path.suffix.lower() == '.safetensors':
+            try:
+                vae_meta = self.metadata_parser.extract_from_safetensors(file_path)
+                if vae_meta:
+                    file_info['metadata'] = vae_meta
+            except Exception as e:
+                info(f"VAE 메타데이터 추출 실패 ({file_path.name}): {e}")
+        return file_info
+
+    def _build_model_info(self, file_path: Path, base_path: Path, model_type: str, stat_result) -> Dict[str, Any]:
+        """체크포인트/LoRA 파일 하나의 정보 추출"""
+        file_info = self._base_file_info(file_path, base_path, model_type, stat_result)
+        
+            # model_type에 따라 필요한 메타데이터만 추출하도록 분기
+        if model_type == 'checkpoints':
+            # --- [수정된 로직 시작] ---
+            # 1. 모델 타입 정보는 항상 safetensors 파일에서 직접 추출
+            model_specific_info = self.metadata_parser.get_model_info(file_path)
+            file_info.update(model_specific_info)
+
+            # 2. 생성 파라미터 메타데이터는 오직 이름이 같은 .png 파일에서만 가져옴
+            png_path = file_path.with_suffix('.png')
+            if png_path.exists():
+                # info(f"📷 PNG 메타데이터 발견: {png_path.name}") # 디버깅용
+                png_metadata = self.metadata_parser.extract_from_png(png_path)
+                # PNG에서 추출한 메타데이터를 file_info의 'metadata'에 덮어씀
+                file_info['metadata'] = png_metadata
+            else:
+                # PNG 파일이 없으면 메타데이터는 비워둠
+                file_info['metadata'] = {}
+                
+        elif model_type == 'loras':
+            # --- [LoRA 스캔 로직 개선] ---
+            info(f"🎯 LoRA 발견: {file_path.relative_to(base_path)}")
+            # 1. LoRA 메타데이터는 safetensors 파일에서 직접 추출
+            lora_specific_info = self.metadata_parser.get_lora_info(file_path)
+            file_info.update(lora_specific_info)
+            
+            # 2. 생성 파라미터 메타데이터는 오직 이름이 같은 .png 파일에서만 가져옴
+            png_path = file_path.with_suffix('.png')
+            if png_path.exists():
+                # info(f"📷 LoRA PNG 메타데이터 발견: {png_path.name}") # 디버깅용
+                png_metadata = self.metadata_parser.extract_from_png(png_path)
+                # PNG에서 추출한 메타데이터를 file_info의 'metadata'에 덮어씀
+                file_info['metadata'] = png_metadata
+            else:
+                # PNG 파일이 없으면 get_lora_info에서 이미 읽은 safetensors 메타데이터 사용
+                file_info['metadata'] = lora_specific_info.get('metadata', {})
+        
+        return file_info
@@ -0,0 +1,154 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+모델 폴더 감시 서비스
+파일 추가/삭제/수정을 감지하여 변경된 파일만 다시 파싱하고
+model_type별 델타(added/modified/removed)를 콜백으로 전달
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, Optional, Set, Tuple
+
+# watchfiles가 있으면 OS 알림(inotify 등) 사용, 없으면 stat 폴링으로 대체
+try:
+    from watchfiles import awatch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    awatch = None
+    WATCHFILES_AVAILABLE = False
+
+
+class ModelWatcher:
+    """[paths] 디렉토리를 감시하여 모델 변경 델타를 발생시키는 감시자"""
+
+    # 감시 대상 확장자 (모델 파일 + 미리보기 PNG)
+    WATCH_EXTENSIONS = {'.safetensors', '.ckpt', '.pt', '.bin', '.png'}
+
+    def __init__(self, scanner, on_delta: Callable[[str, Dict[str, Any]], Any],
+                 poll_interval: float = 5.0, debounce_ms: int = 800, force_polling: bool = False):
+        self.scanner = scanner
+        self.on_delta = on_delta
+        self.poll_interval = max(0.05, poll_interval)
+        self.debounce_ms = debounce_ms
+        self.force_polling = force_polling
+
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._poll_lock = asyncio.Lock()
+        self.mode: Optional[str] = None  # 'native' 또는 'polling'
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """감시 시작 (실행 중인 이벤트 루프 필요)"""
+        if self.is_running:
+            return
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """감시 중지"""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+        debug_emoji("모델 폴더 감시 중지")
+
+    async def _run(self):
+        watch_dirs = [str(path) for path in self.scanner.watch_targets().values() if path.is_dir()]
+        if not watch_dirs:
+            warning_emoji("감시할 모델 폴더가 없습니다")
+            return
+
+        if WATCHFILES_AVAILABLE and not self.force_polling:
+            try:
+                self.mode = 'native'
+                info(f"👀 모델 폴더 감시 시작 (OS 알림): {watch_dirs}")
+                await self._watch_native(watch_dirs)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # inotify 한도 초과, 네트워크 드라이브 등 → 폴링으로 대체
+                warning_emoji(f"OS 파일 알림 사용 불가, 폴링으로 전환: {e}")
+
+        self.mode = 'polling'
+        info(f"👀 모델 폴더 감시 시작 (폴링 {self.poll_interval}초): {watch_dirs}")
+        await self._watch_polling()
+
+    async def _watch_native(self, watch_dirs):
+        async for changes in awatch(*watch_dirs, stop_event=self._stop_event, debounce=self.debounce_ms,
+                                    watch_filter=lambda _change, path: self._is_watched(path)):
+            await self._handle_paths({Path(path) for _change, path in changes})
+
+    async def _watch_polling(self):
+        self._snapshot = await asyncio.to_thread(self._take_snapshot)
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            await self.poll_once()
+
+    async def poll_once(self) -> Set[Path]:
+        """스냅샷을 한 번 비교하여 변경을 처리하고 변경된 경로를 반환 (수동 새로고침/테스트용)"""
+        async with self._poll_lock:
+            snapshot = await asyncio.to_thread(self._take_snapshot)
+            previous, self._snapshot = self._snapshot, snapshot
+            changed = {
+                Path(path) for path in previous.keys() | snapshot.keys()
+                if previous.get(path) != snapshot.get(path)
+            }
+            if changed:
+                await self._handle_paths(changed)
+            return changed
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """감시 대상 파일의 (size, mtime_ns) 스냅샷"""
+        snapshot = {}
+        for base_path in self.scanner.watch_targets().values():
+            for root, _dirs, files in os.walk(base_path):
+                for filename in files:
+                    if not self._is_watched(filename):
+                        continue
+                    path = os.path.join(root, filename)
+                    try:
+                        stat_result = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[os.path.abspath(path)] = (stat_result.st_size, stat_result.st_mtime_ns)
+        return snapshot
+
+    def _is_watched(self, path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in self.WATCH_EXTENSIONS
+
+    async def _handle_paths(self, paths: Iterable[Path]):
+        """변경된 경로만 다시 파싱하고 델타 전달"""
+        try:
+            deltas = await asyncio.to_thread(self.scanner.apply_file_changes, list(paths))
+        except Exception as e:
+            warning_emoji(f"모델 변경 처리 실패: {e}")
+            return
+
+        for model_type, delta in deltas.items():
+            info(f"🔄 {model_type} 변경 감지: 추가 {len(delta['added'])}, "
+                 f"수정 {len(delta['modified'])}, 삭제 {len(delta['removed'])}")
+            try:
+                result = self.on_delta(model_type, delta)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                warning_emoji(f"모델 변경 콜백 오류 ({model_type}): {e}")
@@ -0,0 +1,214 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+모델 스캔 인덱스
+path + size + mtime 기반으로 스캔 결과를 디스크에 보관하여
+재스캔 시 변경된 파일만 다시 파싱하도록 하는 서비스
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+
+class ScanIndex:
+    """모델 스캔 결과 영속 인덱스 (JSON 파일, 스레드 안전)"""
+
+    VERSION = 3  # 2: 텐서 키 기반 아키텍처 판별 결과 포함, 3: LoRA 트리거 워드/태그 포함
+    INDEX_FILENAME = '.nicediff_scan_index.json'
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_paths(cls, paths: Iterable[Path]) -> 'ScanIndex':
+        """스캔 대상 경로들의 공통 상위 폴더(모델 루트)에 인덱스를 생성"""
+        return cls(cls.default_index_path(paths))
+
+    @classmethod
+    def default_index_path(cls, paths: Iterable[Path]) -> Path:
+        """모델 루트 아래의 기본 인덱스 파일 경로"""
+        resolved = [str(Path(p).absolute()) for p in paths]
+        if not resolved:
+            return Path('models') / cls.INDEX_FILENAME
+
+        # 단일 경로(예: models/loras)는 상위 폴더를 모델 루트로 간주
+        if len(resolved) == 1:
+            return Path(resolved[0]).parent / cls.INDEX_FILENAME
+
+        try:
+            root = Path(os.path.commonpath(resolved))
+        except ValueError:
+            # 서로 다른 드라이브에 있는 경우
+            root = Path('models')
+        return root / cls.INDEX_FILENAME
+
+    @staticmethod
+    def make_signature(file_path: Path, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """파일 변경 감지용 시그니처 (모델 파일 + 같은 이름의 PNG)"""
+        if stat_result is None:
+            stat_result = file_path.stat()
+
+        png_path = file_path.with_suffix('.png')
+        try:
+            png_stat = png_path.stat()
+            png_signature = [png_stat.st_size, png_stat.st_mtime_ns]
+        except OSError:
+            png_signature = None
+
+        return {
+            'size': stat_result.st_size,
+            'mtime_ns': stat_result.st_mtime_ns,
+            'png': png_signature,
+        }
+
+    # --- 조회/갱신 ---
+    def lookup(self, file_path: Path, model_type: str, signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """시그니처가 일치하는 캐시된 file_info 반환 (없거나 변경되었으면 None)"""
+        key = str(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry.get('model_type') != model_type or entry.get('signature') != signature:
+                return None
+            return dict(entry['info'])
+
+    def get_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """원본 인덱스 엔트리 조회 (복사본)"""
+        with self._lock:
+            entry = self._entries.get(str(file_path))
+            return dict(entry) if entry else None
+
+    def store(self, file_path: Path, model_type: str, signature: Dict[str, Any], file_info: Dict[str, Any]):
+        """파싱 결과를 인덱스에 저장"""
+        key = str(file_path)
+        with self._lock:
+            previous = self._entries.get(key, {})
+            entry = {
+                'model_type': model_type,
+                'signature': signature,
+                'info': dict(file_info),
+            }
+            # 모델 파일 자체가 같으면(미리보기 PNG만 바뀐 경우 포함) 부가 정보(해시 등)는 유지
+            previous_signature = previous.get('signature') or {}
+            if (previous_signature.get('size'), previous_signature.get('mtime_ns')) == (signature['size'], signature['mtime_ns']):
+                for extra_key, extra_value in previous.items():
+                    entry.setdefault(extra_key, extra_value)
+            self._entries[key] = entry
+            self._dirty = True
+
+    def update_extra(self, file_path: Path, **fields: Any) -> bool:
+        """기존 엔트리에 부가 정보 필드 추가 (엔트리가 없으면 False)"""
+        key = str(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.update(fields)
+            self._dirty = True
+            return True
+
+    def remove(self, file_path: Path) -> bool:
+        """엔트리 제거"""
+        with self._lock:
+            if self._entries.pop(str(file_path), None) is not None:
+                self._dirty = True
+                return True
+            return False
+
+    def prune(self, model_type: str, seen_paths: Iterable[str], base_path: Optional[Path] = None) -> int:
+        """이번 스캔에서 발견되지 않은 오래된 엔트리 제거"""
+        seen = set(seen_paths)
+        # 구분자까지 비교 (models/Lora 정리가 models/Lora_old 같은 형제 폴더를 건드리지 않도록)
+        base_prefix = os.path.join(str(base_path), '') if base_path is not None else None
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.get('model_type') == model_type
+                and key not in seen
+                and (base_prefix is None or key.startswith(base_prefix))
+            ]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._dirty = True
+        if stale:
+            info(f"🧹 스캔 인덱스 정리: {model_type} {len(stale)}개 항목 제거")
+        return len(stale)
+
+    def build_result(self, model_type: str) -> Dict[str, List[Dict[str, Any]]]:
+        """디스크 접근 없이 인덱스만으로 스캔 결과 재구성"""
+        result = defaultdict(list)
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.get('model_type') == model_type:
+                    file_info = dict(entry['info'], signature=entry.get('signature'))
+                    result[file_info.get('folder', 'Root')].append(file_info)
+
+        for folder_items in result.values():
+            folder_items.sort(key=lambda x: x['name'].lower())
+        return dict(result)
+
+    def iter_entries(self, model_type: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """(경로, 엔트리 복사본) 목록 (model_type 지정 시 해당 타입만)"""
+        with self._lock:
+            return [
+                (key, dict(entry)) for key, entry in self._entries.items()
+                if model_type is None or entry.get('model_type') == model_type
+            ]
+
+    def model_types(self) -> List[str]:
+        """인덱스에 들어있는 모델 타입 목록"""
+        with self._lock:
+            return sorted({entry.get('model_type') for entry in self._entries.values() if entry.get('model_type')})
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # --- 영속화 ---
+    def load(self):
+        """인덱스 파일 로드 (손상되었거나 버전이 다르면 비움)"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                info_emoji(f"스캔 인덱스 버전 불일치 - 재생성합니다: {self.index_path}")
+                return
+            with self._lock:
+                self._entries = data.get('entries', {})
+            debug_emoji(f"스캔 인덱스 로드: {len(self._entries)}개 항목")
+        except Exception as e:
+            warning_emoji(f"스캔 인덱스 로드 실패 (재생성): {e}")
+            with self._lock:
+                self._entries = {}
+
+    def save(self, force: bool = False) -> bool:
+        """변경 사항이 있으면 원자적으로 저장 (임시 파일 + replace)"""
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            payload = {'version': self.VERSION, 'entries': self._entries}
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.index_path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.index_path)
+                self._dirty = False
+                return True
+            except Exception as e:
+                warning_emoji(f"스캔 인덱스 저장 실패: {e}")
+                return False
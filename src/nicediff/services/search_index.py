@@ -0,0 +1,227 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+모델 검색 인덱스
+스캔 결과(체크포인트/LoRA/VAE)의 이름, 트리거 워드, 학습 태그, 기본 모델, 폴더를
+토큰 단위 역색인으로 만들어 접두사/오타 허용 검색을 제공하는 서비스
+"""
+
+import bisect
+import functools
+import re
+import threading
+from typing import Dict, Any, Optional, List, Iterable, Set
+
+
+class ModelSearchIndex:
+    """메모리 역색인 (토큰 → 경로별 가중치), 스캔 배치/감시 델타로 증분 갱신"""
+
+    # 필드별 가중치 (이름 > 트리거 워드 > 기본 모델 > 태그/폴더)
+    FIELD_WEIGHTS = {'name': 3.0, 'trigger': 2.5, 'base_model': 1.5, 'tag': 1.0, 'folder': 1.0}
+    # 일치 방식별 배율
+    EXACT_MATCH = 1.0
+    PREFIX_MATCH = 0.6
+    FUZZY_MATCH = 0.3
+
+    FUZZY_MIN_LENGTH = 4  # 이보다 짧은 토큰은 오타 허용 검색 안 함 (잡음 방지)
+    FUZZY_MAX_LENGTH = 24
+    MAX_PREFIX_EXPANSIONS = 512  # 한 글자 검색 등에서 접두사 확장 상한
+
+    _TOKEN_RE = re.compile(r'[^\W_]+')
+    _CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+
+    def __init__(self):
+        self._docs: Dict[str, Dict[str, Any]] = {}  # 경로 → {'model_type', 'info', 'tokens'}
+        self._postings: Dict[str, Dict[str, float]] = {}  # 토큰 → {경로: 가중치}
+        self._vocab: List[str] = []  # 정렬된 토큰 목록 (접두사 검색용)
+        self._deletes: Dict[str, Set[str]] = {}  # 한 글자 삭제 변형 → 원래 토큰 (오타 허용 검색용)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # --- 토큰화 ---
+    @classmethod
+    def tokenize(cls, text: Any) -> List[str]:
+        """소문자 토큰 목록 (camelCase는 나눈 토큰과 합친 토큰 모두 포함)"""
+        if not text:
+            return []
+        return list(cls._tokenize_cached(str(text)))
+
+    @classmethod
+    @functools.lru_cache(maxsize=65536)  # 학습 태그/폴더명은 항목 간에 많이 반복됨
+    def _tokenize_cached(cls, text: str) -> tuple:
+        tokens = cls._TOKEN_RE.findall(cls._CAMEL_RE.sub(r'\1 \2', text).lower())
+        for token in cls._TOKEN_RE.findall(text.lower()):
+            if token not in tokens:
+                tokens.append(token)
+        return tuple(tokens)
+
+    @classmethod
+    def _document_tokens(cls, file_info: Dict[str, Any]) -> Dict[str, float]:
+        """모델 정보 하나에서 토큰별 최대 필드 가중치 계산"""
+        fields = [
+            ('name', file_info.get('name')),
+            ('folder', None if file_info.get('folder') == 'Root' else file_info.get('folder')),
+        ]
+        for base_model in (file_info.get('base_model'), file_info.get('model_type')):
+            if base_model:
+                # 'SD1.5' → 'sd1', '5', 'sd15'
+                fields.append(('base_model', base_model))
+                fields.append(('base_model', re.sub(r'[\W_]+', '', str(base_model))))
+        fields.extend(('trigger', word) for word in file_info.get('trigger_words') or [])
+        fields.extend(('tag', tag) for tag in file_info.get('tags') or [])
+
+        tokens: Dict[str, float] = {}
+        for field, text in fields:
+            weight = cls.FIELD_WEIGHTS[field]
+            for token in cls.tokenize(text):
+                if weight > tokens.get(token, 0.0):
+                    tokens[token] = weight
+        return tokens
+
+    @staticmethod
+    def _delete_variants(token: str) -> List[str]:
+        return [token[:i] + token[i + 1:] for i in range(len(token))]
+
+    # --- 갱신 ---
+    def add_items(self, model_type: str, items: Iterable[Dict[str, Any]]):
+        """모델 정보 추가 (같은 경로가 있으면 교체)"""
+        with self._lock:
+            for file_info in items:
+                path = file_info['path']
+                self._remove_path(path)
+                tokens = self._document_tokens(file_info)
+                self._docs[path] = {'model_type': model_type, 'info': file_info, 'tokens': tokens}
+                for token, weight in tokens.items():
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = {}
+                        self._add_vocab(token)
+                    postings[path] = weight
+
+    def remove_paths(self, paths: Iterable[str]):
+        with self._lock:
+            for path in paths:
+                self._remove_path(path)
+
+    def apply_delta(self, model_type: str, delta: Dict[str, Any]):
+        """폴더 감시 델타(added/modified/removed) 반영"""
+        with self._lock:
+            self.remove_paths(delta.get('removed', []))
+            self.add_items(model_type, delta.get('added', []) + delta.get('modified', []))
+
+    def rebuild(self, models_data: Dict[str, Dict[str, List[Dict[str, Any]]]]):
+        """스캔 결과 전체로 인덱스 다시 만들기"""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._vocab.clear()
+            self._deletes.clear()
+            for model_type, folders in models_data.items():
+                for items in folders.values():
+                    self.add_items(model_type, items)
+        debug_emoji(f"모델 검색 인덱스 구축: {len(self._docs)}개 항목, {len(self._vocab)}개 토큰")
+
+    def _remove_path(self, path: str):
+        doc = self._docs.pop(path, None)
+        if doc is None:
+            return
+        for token in doc['tokens']:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(path, None)
+            if not postings:
+                del self._postings[token]
+                self._remove_vocab(token)
+
+    def _add_vocab(self, token: str):
+        bisect.insort(self._vocab, token)
+        if self.FUZZY_MIN_LENGTH <= len(token) <= self.FUZZY_MAX_LENGTH:
+            for variant in self._delete_variants(token):
+                self._deletes.setdefault(variant, set()).add(token)
+
+    def _remove_vocab(self, token: str):
+        position = bisect.bisect_left(self._vocab, token)
+        if position < len(self._vocab) and self._vocab[position] == token:
+            del self._vocab[position]
+        if self.FUZZY_MIN_LENGTH <= len(token) <= self.FUZZY_MAX_LENGTH:
+            for variant in self._delete_variants(token):
+                variants = self._deletes.get(variant)
+                if variants is not None:
+                    variants.discard(token)
+                    if not variants:
+                        del self._deletes[variant]
+
+    # --- 검색 ---
+    def search(self, query: str, model_type: Optional[str] = None, base_model: Optional[str] = None,
+               limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """검색어의 모든 토큰과 (정확/접두사/오타 허용) 일치하는 모델 정보를 점수순으로 반환"""
+        query_tokens = list(dict.fromkeys(self.tokenize(query)))
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            scores: Optional[Dict[str, float]] = None
+            for query_token in query_tokens:
+                token_scores = self._match_token(query_token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {path: score + token_scores[path] for path, score in scores.items() if path in token_scores}
+                if not scores:
+                    return []
+
+            results = []
+            for path, score in scores.items():
+                doc = self._docs[path]
+                if model_type is not None and doc['model_type'] != model_type:
+                    continue
+                if base_model is not None and doc['info'].get('base_model') != base_model:
+                    continue
+                results.append((score, doc['info']))
+
+        results.sort(key=lambda result: (-result[0], result[1].get('name', '').lower()))
+        if limit is not None:
+            results = results[:limit]
+        return [file_info for _, file_info in results]
+
+    def _match_token(self, query_token: str) -> Dict[str, float]:
+        """검색 토큰 하나에 대한 경로별 최고 점수"""
+        token_scores: Dict[str, float] = {}
+
+        def collect(token: str, factor: float):
+            for path, weight in self._postings.get(token, {}).items():
+                score = weight * factor
+                if score > token_scores.get(path, 0.0):
+                    token_scores[path] = score
+
+        collect(query_token, self.EXACT_MATCH)
+
+        # 접두사 일치: 정렬된 토큰 목록에서 이분 탐색
+        position = bisect.bisect_left(self._vocab, query_token)
+        for token in self._vocab[position:position + self.MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(query_token):
+                break
+            if token != query_token:
+                collect(token, self.PREFIX_MATCH)
+
+        # 오타 허용 일치 (편집 거리 1: 삽입/삭제/치환), 한 글자 삭제 변형 대조
+        if self.FUZZY_MIN_LENGTH <= len(query_token) <= self.FUZZY_MAX_LENGTH:
+            candidates = set(self._deletes.get(query_token, ()))
+            for variant in self._delete_variants(query_token):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._deletes.get(variant, ()))
+            candidates.discard(query_token)
+            for token in candidates:
+                collect(token, self.FUZZY_MATCH)
+
+        return token_scores
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._docs), 'tokens': len(self._vocab), 'fuzzy_variants': len(self._deletes)}
@@ -0,0 +1,152 @@
+from ..core.logger import (
+    debug, info, warning, error, success, failure, warning_emoji,
+    info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
+)
+"""
+미리보기 썸네일 캐시
+모델/LoRA 미리보기 PNG를 작은 WebP(또는 JPEG)로 한 번만 변환하여 디스크에 보관하고
+정적 라우트로 제공할 수 있도록 URL과 파일 경로를 관리하는 서비스
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Iterable, Set
+
+from PIL import Image, features
+
+
+class ThumbnailCache:
+    """path + mtime 기준 썸네일 캐시 (워커 풀에서 생성)"""
+
+    ROUTE = '/thumbnails'
+
+    def __init__(self, cache_dir: str = 'models/.thumbnails', max_size: int = 256,
+                 image_format: str = 'webp', quality: int = 80, max_workers: int = 4):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.quality = quality
+
+        # Pillow가 WebP 인코더 없이 빌드된 경우 JPEG로 대체
+        image_format = image_format.lower()
+        if image_format == 'webp' and not features.check('webp'):
+            info_emoji("WebP 인코더가 없어 썸네일을 JPEG로 저장합니다")
+            image_format = 'jpeg'
+        self.image_format = image_format
+        self.extension = '.webp' if image_format == 'webp' else '.jpg'
+        self.media_type = 'image/webp' if image_format == 'webp' else 'image/jpeg'
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='thumbnail')
+        self._sources: Dict[str, str] = {}  # 썸네일 이름 → 원본 경로
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    # --- 이름/URL ---
+    def thumbnail_name(self, source_path: Path, stat_result: Optional[os.stat_result] = None) -> str:
+        """원본 경로 + mtime + 크기 + 썸네일 설정으로 만든 이름 (원본이 바뀌면 이름도 바뀜)"""
+        if stat_result is None:
+            stat_result = os.stat(source_path)
+        key = f"{os.path.abspath(source_path)}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{self.max_size}|{self.quality}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24] + self.extension
+
+    def get_url(self, source_path: Path) -> Optional[str]:
+        """원본 이미지의 썸네일 URL (원본이 없으면 None). 썸네일은 요청 시 또는 미리 생성"""
+        try:
+            name = self.thumbnail_name(source_path)
+        except OSError:
+            return None
+        with self._lock:
+            self._sources[name] = str(source_path)
+        return f"{self.ROUTE}/{name}"
+
+    def path_for(self, name: str) -> Path:
+        return self.cache_dir / name
+
+    # --- 생성 ---
+    def prewarm(self, source_paths: Iterable[Path]) -> Set[str]:
+        """썸네일이 없는 원본을 워커 풀에 제출 (기다리지 않음). 현재 유효한 썸네일 이름 집합 반환"""
+        names = set()
+        submitted = 0
+        for source_path in source_paths:
+            url = self.get_url(source_path)
+            if url is None:
+                continue
+            name = url.rsplit('/', 1)[-1]
+            names.add(name)
+            if not self.path_for(name).exists():
+                self._submit(name)
+                submitted += 1
+        if submitted:
+            info(f"🖼️ 썸네일 생성 대기: {submitted}개")
+        return names
+
+    async def get_or_create(self, name: str) -> Optional[Path]:
+        """썸네일 파일 경로 반환 (없으면 워커 풀에서 생성 후 반환, 알 수 없는 이름이면 None)"""
+        if Path(name).name != name or not name.endswith(self.extension):
+            return None
+        thumbnail_path = self.path_for(name)
+        if thumbnail_path.exists():
+            return thumbnail_path
+        future = self._submit(name)
+        if future is None:
+            return None
+        return await asyncio.wrap_future(future)
+
+    def _submit(self, name: str) -> Optional[Future]:
+        with self._lock:
+            source_path = self._sources.get(name)
+            if source_path is None:
+                return None
+            future = self._inflight.get(name)
+            if future is None:
+                future = self._executor.submit(self._generate, name, source_path)
+                self._inflight[name] = future
+            return future
+
+    def _generate(self, name: str, source_path: str) -> Optional[Path]:
+        """원본을 max_size 이하로 줄여 저장 (임시 파일 + replace)"""
+        thumbnail_path = self.path_for(name)
+        try:
+            if thumbnail_path.exists():
+                return thumbnail_path
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with Image.open(source_path) as img:
+                img.draft('RGB', (self.max_size, self.max_size))  # JPEG 원본은 디코딩 단계에서 축소
+                img.thumbnail((self.max_size, self.max_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+                if self.image_format == 'jpeg' or img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGB')
+                tmp_path = thumbnail_path.with_name(thumbnail_path.name + '.tmp')
+                img.save(tmp_path, format=self.image_format.upper(), quality=self.quality)
+            os.replace(tmp_path, thumbnail_path)
+            return thumbnail_path
+        except Exception as e:
+            warning_emoji(f"썸네일 생성 실패 ({Path(source_path).name}): {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+
+    # --- 정리 ---
+    def prune(self, keep_names: Set[str]) -> int:
+        """현재 원본에 해당하지 않는(원본이 바뀌었거나 삭제된) 썸네일 삭제"""
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for thumbnail_path in self.cache_dir.iterdir():
+            if thumbnail_path.suffix == self.extension and thumbnail_path.name not in keep_names:
+                try:
+                    thumbnail_path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        with self._lock:
+            self._sources = {name: source for name, source in self._sources.items() if name in keep_names}
+        if removed:
+            debug_emoji(f"오래된 썸네일 {removed}개 삭제")
+        return removed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -21,6 +21,14 @@ class LoraPanel:
         self.lora_container = None
         self.no_loras = True
         
+        # 그려진 카드 추적 (스트리밍 배치 추가 및 중복 렌더링 방지용)
+        self._folder_grids: Dict[str, Any] = {}
+        self._rendered_cards: Dict[str, Any] = {}
+        self._rendered_signatures: Dict[str, Any] = {}  # 카드를 그릴 때의 스캔 시그니처 (내용 변경 감지용)
+        self._rendered_loaded_names: List[str] = []
+        self._search_query = ''
+        self.cache_stats_label = None
+        
     async def render(self):
         """컴포넌트 렌더링"""
         with ui.card().classes('w-full h-full p-4 bg-gray-700'):
@@ -28,6 +36,10 @@ class LoraPanel:
             with ui.row().classes('w-full items-center justify-between mb-2'):
                 ui.label('Load LoRA').classes('text-lg font-bold text-cyan-400')
                 
+                # LoRA state dict 캐시 적중/실패
+                self.cache_stats_label = ui.label('').classes('text-xs text-gray-400')
+                self._update_cache_stats()
+                
                 # 버튼들
                 with ui.row().classes('gap-2'):
                     # 폴더 열기 버튼
@@ -42,6 +54,10 @@ class LoraPanel:
                         on_click=self._refresh_lora_panel
                     ).props('flat dense color=white size=sm').tooltip('LoRA 패널 새로고침')
             
+            # 검색 (이름/트리거 워드/학습 태그/기본 모델)
+            ui.input(placeholder='LoRA 검색 (이름, 트리거, 태그)', on_change=lambda e: self._on_search_change(e.value)) \
+                .props('dark outlined dense clearable').classes('w-full mb-2')
+            
             # LoRA 목록 컨테이너
             with ui.scroll_area().classes('w-full h-40'):
                 self.lora_container = ui.column().classes('w-full')
@@ -53,13 +69,29 @@ class LoraPanel:
         # 로드된 LoRA 목록 업데이트 구독
         self.state.subscribe('loaded_loras', self._update_loaded_loras)
         
+        # 스트리밍 스캔 배치 구독 (도착하는 대로 카드 추가)
+        self.state.subscribe('models_batch', self._on_models_batch)
+        
+        # 모델 폴더 감시 델타 구독 (바뀐 카드만 갱신)
+        self.state.subscribe('models_delta', self._on_models_delta)
+        
         # 초기 LoRA 목록 로드
         available_loras = self.state.get('available_loras', {})
         if available_loras:
             await self._update_lora_list(available_loras)
     
+    def _update_cache_stats(self):
+        """LoRA 캐시 통계 표시 갱신"""
+        if self.cache_stats_label is None:
+            return
+        stats = self.state.get_lora_cache_stats()
+        self.cache_stats_label.set_text(
+            f"캐시 {stats['hits']}/{stats['hits'] + stats['misses']} 적중 · {stats['entries']}개 {stats['size_mb']:.0f}MB"
+        )
+    
     async def _update_loaded_loras(self, loaded_loras):
         """로드된 LoRA 목록 업데이트"""
+        self._update_cache_stats()
         # 현재 LoRA 목록을 다시 업데이트하여 로드 상태 반영
         available_loras = self.state.get('available_loras', {})
         await self._update_lora_list(available_loras)
@@ -99,6 +131,21 @@ class LoraPanel:
         
         return 'No trigger'
     
+    def _on_search_change(self, query):
+        """검색어 변경 시 카드 필터링"""
+        self._search_query = (query or '').strip()
+        self._apply_search_filter()
+    
+    def _apply_search_filter(self):
+        """검색 결과에 포함된 LoRA 카드만 표시 (검색어가 없으면 모두 표시)"""
+        if not self._search_query:
+            for card in self._rendered_cards.values():
+                card.set_visibility(True)
+            return
+        matched_paths = {item['path'] for item in self.state.search_models(self._search_query, model_type='loras', limit=None)}
+        for path, card in self._rendered_cards.items():
+            card.set_visibility(path in matched_paths)
+    
     def _on_lora_click(self, lora_info):
         """LoRA 클릭 - 실제 로드"""
         try:
@@ -161,12 +208,100 @@ class LoraPanel:
             ui.notify(f'LoRA 양식 추가 실패: {str(e)}', type='negative')
             failure(f"LoRA 양식 추가 오류: {e}")
     
+    def _current_model_type(self) -> str:
+        """현재 모델 타입 확인 (LoRA 호환성 표시용)"""
+        current_model = self.state.get('current_model')
+        return 'SDXL' if current_model and 'xl' in current_model.lower() else 'SD1.5'
+    
+    def _create_folder_grid(self, folder: str):
+        """폴더 하나의 확장 패널과 카드 그리드를 생성합니다 (현재 컨텍스트 안에)."""
+        with ui.expansion(folder, icon='folder', value=True).classes('w-full').props('header-class="bg-gray-600 text-white"'):
+            grid = ui.grid(columns=2).classes('w-full gap-2 p-2')
+        self._folder_grids[folder] = grid
+        return grid
+    
+    def _add_card(self, lora_info: Dict[str, Any], loaded_lora_names: List[str], model_type: str):
+        """LoRA 카드를 현재 컨텍스트에 그리고 경로/시그니처를 기록합니다."""
+        self._rendered_cards[lora_info['path']] = self._create_lora_card(lora_info, loaded_lora_names, model_type)
+        self._rendered_signatures[lora_info['path']] = lora_info.get('signature')
+    
+    def _remove_card(self, path: str):
+        """그려진 LoRA 카드가 있으면 제거합니다."""
+        card = self._rendered_cards.pop(path, None)
+        self._rendered_signatures.pop(path, None)
+        if card is not None:
+            card.delete()
+    
+    async def _on_models_batch(self, data: Dict[str, Any]):
+        """스트리밍 스캔 배치가 도착하면 새 LoRA 카드는 추가하고, 시그니처가 바뀐 카드는 다시 그립니다."""
+        if not self.lora_container or data.get('model_type') != 'loras':
+            return
+        
+        # 첫 배치라면 빈 상태 안내를 지움
+        if not self._rendered_cards:
+            self.lora_container.clear()
+            self._folder_grids = {}
+        self.no_loras = False
+        
+        model_type = self._current_model_type()
+        loaded_lora_names = [lora['name'] for lora in self.state.get_loaded_loras()]
+        for folder, items in data.get('items', {}).items():
+            new_items = [item for item in items
+                         if item['path'] not in self._rendered_cards
+                         or self._rendered_signatures.get(item['path']) != item.get('signature')]
+            if not new_items:
+                continue
+            grid = self._folder_grids.get(folder)
+            if grid is None:
+                with self.lora_container:
+                    grid = self._create_folder_grid(folder)
+            with grid:
+                for item in new_items:
+                    self._remove_card(item['path'])
+                    self._add_card(item, loaded_lora_names, model_type)
+        if self._search_query:
+            self._apply_search_filter()
+    
+    async def _on_models_delta(self, data: Dict[str, Any]):
+        """폴더 감시 델타: 삭제/수정된 LoRA 카드만 제거하고 추가/수정된 카드만 다시 그립니다."""
+        if not self.lora_container or data.get('model_type') != 'loras':
+            return
+        
+        stale_paths = list(data.get('removed', [])) + [item['path'] for item in data.get('modified', [])]
+        for path in stale_paths:
+            self._remove_card(path)
+        
+        changed_by_folder: Dict[str, List[Dict[str, Any]]] = {}
+        for item in data.get('added', []) + data.get('modified', []):
+            changed_by_folder.setdefault(item['folder'], []).append(item)
+        if changed_by_folder:
+            await self._on_models_batch({'model_type': 'loras', 'items': changed_by_folder})
+        elif not self._rendered_cards:
+            await self._update_lora_list(self.state.get('available_loras', {}))
+    
     async def _update_lora_list(self, loras):
         """LoRA 목록 업데이트 (체크포인트와 동일한 카드 스타일)"""
         if not self.lora_container:
             return
         
+        # 'loras_updated'는 로드된 LoRA 리스트로도 발생하므로 그 경우 전체 목록 사용
+        if not isinstance(loras, dict):
+            loras = self.state.get('available_loras', {})
+        
+        # 로드된 LoRA 목록 가져오기
+        loaded_loras = self.state.get_loaded_loras()
+        loaded_lora_names = [lora['name'] for lora in loaded_loras]
+        
+        # 배치로 이미 모두 그려졌고(경로와 시그니처가 모두 같고) 로드 상태도 같으면 다시 그리지 않음
+        new_signatures = {item['path']: item.get('signature') for items in (loras or {}).values() for item in items}
+        if new_signatures and new_signatures == self._rendered_signatures and loaded_lora_names == self._rendered_loaded_names:
+            return
+        
         self.lora_container.clear()
+        self._folder_grids = {}
+        self._rendered_cards = {}
+        self._rendered_signatures = {}
+        self._rendered_loaded_names = loaded_lora_names
         
         if not loras or all(len(items) == 0 for items in loras.values()):
             # LoRA가 없는 경우
@@ -178,34 +313,36 @@ class LoraPanel:
         self.no_loras = False
         with self.lora_container:
             # 현재 모델 타입 확인
-            current_model = self.state.get('current_model')
-            model_type = 'SDXL' if current_model and 'xl' in current_model.lower() else 'SD1.5'
-            
-            # 로드된 LoRA 목록 가져오기
-            loaded_loras = self.state.get_loaded_loras()
-            loaded_lora_names = [lora['name'] for lora in loaded_loras]
+            model_type = self._current_model_type()
             
             # 폴더별로 그룹화하여 표시
             sorted_folders = sorted(loras.keys(), key=lambda x: (x != 'Root', x.lower()))
             for folder in sorted_folders:
                 items = loras[folder]
                 if items:
-                    with ui.expansion(folder, icon='folder', value=True).classes('w-full').props('header-class="bg-gray-600 text-white"'):
-                        with ui.grid(columns=2).classes('w-full gap-2 p-2'):
-                            for item in items:
-                                self._create_lora_card(item, loaded_lora_names, model_type)
+                    with self._create_folder_grid(folder):
+                        for item in items:
+                            self._add_card(item, loaded_lora_names, model_type)
+            if self._search_query:
+                self._apply_search_filter()
             
             # 로드된 LoRA 목록 표시
             if loaded_loras:
                 ui.label("🔄 로드된 LoRA").classes('text-sm font-bold text-green-400 mt-4 mb-2')
                 for loaded_lora in loaded_loras:
                     with ui.card().classes('w-full bg-green-600 p-2 mb-2'):
-                        ui.label(f"✅ {loaded_lora['name']} (weight: {loaded_lora['weight']})").classes('text-sm font-bold text-white')
+                        ui.label(f"✅ {loaded_lora['name']}").classes('text-sm font-bold text-white').tooltip(loaded_lora['path'])
+                        
+                        # 가중치 슬라이더 (놓을 때만 적용, 파일을 다시 읽지 않음)
+                        # 다른 폴더의 같은 이름 LoRA와 구분되도록 어댑터 이름으로 지정
+                        ui.slider(min=-2.0, max=2.0, step=0.05, value=loaded_lora['weight']) \
+                            .props('label dense color=white') \
+                            .on('change', lambda e, name=loaded_lora['adapter_name']: self._set_lora_weight(name, e.args))
                         
                         # 언로드 버튼
                         ui.button(
                             '언로드',
-                            on_click=lambda e, name=loaded_lora['name']: self._unload_lora(name)
+                            on_click=lambda e, name=loaded_lora['adapter_name']: self._unload_lora(name)
                         ).props('dense size=sm color=red').classes('mt-1')
     
     def _create_lora_card(self, lora_info: Dict[str, Any], loaded_lora_names: List[str], current_model_type: str):
@@ -218,7 +355,7 @@ class LoraPanel:
         # 호환성 체크
         compatible = model_type_info == current_model_type
         
-        with ui.card().tight().classes('hover:shadow-lg transition-shadow w-full cursor-pointer').on('click', lambda m=lora_info: self._on_lora_click(m)).on('dblclick', lambda m=lora_info: self._on_lora_double_click(m)):
+        with ui.card().tight().classes('hover:shadow-lg transition-shadow w-full cursor-pointer').on('click', lambda m=lora_info: self._on_lora_click(m)).on('dblclick', lambda m=lora_info: self._on_lora_double_click(m)) as card:
             with ui.image(self._get_lora_preview_src(lora_info)).classes('w-full h-24 object-cover bg-gray-800 relative'):
                 # LoRA 타입 배지 (우상단)
                 badge_color = {'SDXL': 'bg-purple-600', 'SD1.5': 'bg-blue-600'}.get(model_type_info, 'bg-gray-600')
@@ -241,18 +378,28 @@ class LoraPanel:
                 # 트리거 워드 (썸네일 아래)
                 if trigger_word and trigger_word != 'No trigger':
                     ui.label(trigger_word).classes('text-xs w-full text-center text-purple-300 h-4 truncate').tooltip(trigger_word)
+        return card
     
     def _get_lora_preview_src(self, lora_info: Dict[str, Any]) -> str:
-        """LoRA 썸네일 이미지 소스를 반환합니다."""
+        """LoRA 썸네일 이미지 소스를 반환합니다 (썸네일 캐시 URL)."""
         lora_path = Path(lora_info['path'])
         png_path = lora_path.with_suffix('.png')
         
-        if png_path.exists():
-            return str(png_path)
+        thumbnail_url = self.state.thumbnail_cache.get_url(png_path) if self.state.thumbnail_cache else None
+        if thumbnail_url:
+            return thumbnail_url
         else:
             # 기본 LoRA 아이콘 또는 빈 이미지
             return 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMjAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMzc0MTUxIi8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCwgc2Fucy1zZXJpZiIgZm9udC1zaXplPSIxNCIgZmlsbD0iI2ZmZiIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPkxvUkE8L3RleHQ+PC9zdmc+'
     
+    async def _set_lora_weight(self, lora_name: str, weight):
+        """LoRA 가중치 변경"""
+        try:
+            if not await self.state.set_lora_weight(lora_name, float(weight)):
+                ui.notify(f'LoRA 가중치 변경 실패: {lora_name}', type='negative')
+        except (TypeError, ValueError) as e:
+            failure(f"LoRA 가중치 값 오류: {e}")
+    
     async def _unload_lora(self, lora_name: str):
         """LoRA 언로드"""
         try:
@@ -270,13 +417,8 @@ class LoraPanel:
     async def _refresh_lora_panel(self):
         """LoRA 패널 새로고침"""
         try:
-            # 모델 스캐너를 통해 LoRA 목록 다시 스캔
-            from ..services.model_scanner import ModelScanner
-            paths_config = {'loras': 'models/loras'}
-            scanner = ModelScanner(paths_config)
-            all_models = await scanner.scan_all_models()
-            loras = all_models.get('loras', {})
-            await self._update_lora_list(loras)
+            # 바뀐 파일만 다시 파싱 (전체 재파싱 없음)
+            await self.state.refresh_models()
             ui.notify('LoRA 패널이 새로고침되었습니다', type='positive')
         except Exception as e:
             ui.notify(f'LoRA 패널 새로고침 실패: {str(e)}', type='negative')
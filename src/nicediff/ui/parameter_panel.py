@@ -34,6 +34,7 @@ class ParameterPanel:
         
         # UI 요소 참조
         self.generate_button = None
+        self._queue_depth = 0  # 생성 대기열 깊이 (실행 + 대기)
         self.width_input = None
         self.height_input = None
         self.model_switch = None
@@ -77,6 +78,8 @@ class ParameterPanel:
         # 생성 상태 변경 이벤트 구독
         self.state.subscribe('generation_started', lambda data: self._on_generate_status_change(True))
         self.state.subscribe('generation_finished', lambda data: self._on_generate_status_change(False))
+        # 생성 대기열 깊이 (생성 중에도 버튼으로 작업 추가)
+        self.state.subscribe('generation_queue_changed', self._on_generation_queue_changed)
 
     def _on_generate_status_change(self, is_generating: bool):
         """[최종 수정] 경합 상태 방지를 위한 최종 안전장치(try-except) 추가"""
@@ -88,11 +91,9 @@ class ParameterPanel:
             if not button:
                 return
 
-            # 버튼이 존재할 때만 아래 상태 변경 로직 실행
-            if is_generating:
-                button.props('loading color=orange').set_text('생성 중...').disable()
-            else:
-                button.props('color=blue', remove='loading').set_text('생성').enable()
+            # 버튼이 존재할 때만 아래 상태 변경 로직 실행 (생성 중에도 누르면 대기열에 추가되므로 비활성화하지 않음)
+            button.props('color=orange' if is_generating or self._queue_depth else 'color=blue')
+            button.set_text(self._generate_button_text())
                 
         except Exception as e:
             # 이 핸들러가 호출되었지만, 대상 버튼이 파괴되는 등 알 수 없는 UI 관련 오류 발생 시
@@ -102,6 +103,14 @@ class ParameterPanel:
             #info(f"UI 업데이트 중 안전하게 처리된 오류 (무시 가능): {e}")
             pass
 
+    def _generate_button_text(self) -> str:
+        return f'대기열에 추가 ({self._queue_depth})' if self._queue_depth else '생성'
+
+    def _on_generation_queue_changed(self, snapshot: dict):
+        """대기열 깊이(실행 + 대기)를 생성 버튼에 표시"""
+        self._queue_depth = snapshot.get('running', 0) + snapshot.get('pending', 0)
+        self._on_generate_status_change(snapshot.get('running', 0) > 0)
+
     def _calculate_dimensions(self):
         """선택된 비율과 모델에 따라 이미지 크기 계산 (비율 버튼 클릭 시에만 사용)"""
         current_sd_model = self.state.get('sd_model', 'SD15') 
@@ -190,12 +199,6 @@ class ParameterPanel:
         """생성 버튼 클릭 (중복 클릭 방지 강화)"""
         process_emoji(r"생성 버튼 클릭됨")
         
-        # 중복 클릭 방지 (생성 중이면 즉시 리턴)
-        if self.state.get('is_generating', False):
-            warning_emoji(r"이미 생성 중입니다 - 중복 클릭 무시")
-            ui.notify('이미 생성 중입니다. 잠시 기다려주세요.', type='warning')
-            return
-        
         current_mode = self.state.get('current_mode', 'txt2img')
         debug_emoji(f"현재 모드: {current_mode}")
         
@@ -239,8 +242,11 @@ class ParameterPanel:
         else:
             success(r"txt2img 모드: 이미지 업로드 불필요")
         
-        process_emoji(r"이미지 생성 시작...")
-        await self.state.generate_image()
+        # 생성 중이면 대기열 뒤에 추가 (등록 시점의 파라미터로 생성)
+        process_emoji(r"이미지 생성 요청...")
+        jobs = await self.state.generate_image()
+        if jobs and self.state.get('is_generating', False):
+            ui.notify(f'대기열에 추가되었습니다 ({len(jobs)}개)', type='info')
         success(r"이미지 생성 요청 완료")
 
     def _on_param_change(self, param_name: str, param_type: type):
@@ -412,6 +418,9 @@ class ParameterPanel:
             is_enabled = self.infinite_generation_switch.value
             self.state.set('infinite_generation', is_enabled)
             process_emoji(f"무한 반복 생성: {'활성화' if is_enabled else '비활성화'}")
+            # 끄면 대기 중인 반복 작업 취소 (실행 중인 작업은 끝까지)
+            if not is_enabled and self.state.get('infinite_mode', False):
+                asyncio.create_task(self.state.stop_infinite_generation())
     
     def _handle_size_match_toggle(self):
         """크기 일치 토글 처리"""
@@ -920,9 +929,9 @@ class ParameterPanel:
                     self.generate_button.visible = True
                     success(r"생성 버튼 가시성 복구")
                 
-                # 생성 버튼 텍스트 확인
-                if self.generate_button.text != '생성':
-                    self.generate_button.text = '생성'
+                # 생성 버튼 텍스트 확인 (대기열 깊이 표시 유지)
+                if self.generate_button.text != self._generate_button_text():
+                    self.generate_button.text = self._generate_button_text()
                     success(r"생성 버튼 텍스트 복구")
             
             # @ui.refreshable로 만든 render 함수를 새로고침 (선택적)
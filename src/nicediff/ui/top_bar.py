@@ -3,7 +3,7 @@
 from nicegui import ui
 from typing import Dict, List, Any, Optional
 from pathlib import Path
-import asyncio, json, base64
+import asyncio, json
 from ..core.logger import (
     debug, info, warning, error, success, failure, warning_emoji, 
     info_emoji, debug_emoji, process_emoji, model_emoji, image_emoji, ui_emoji
@@ -22,6 +22,7 @@ class TopBar:
         self.state.subscribe('model_loading_finished', self._on_model_loading_finished)
         self.state.subscribe('generation_started', self._on_generation_started)
         self.state.subscribe('generation_finished', self._on_generation_finished)
+        self.state.subscribe('generation_queue_changed', self._on_generation_queue_changed)
         
         # 사용자 알림 이벤트 구독 추가
         self.state.subscribe('user_notification', self._on_user_notification)
@@ -38,10 +39,22 @@ class TopBar:
         self.params_label: Optional[ui.label] = None
         self.apply_button: Optional[ui.button] = None
         self.main_card: Optional[ui.card] = None
+        self.queue_badge: Optional[ui.badge] = None
+        self.queue_list: Optional[ui.column] = None
+        
+        # 앨범에 이미 그려진 카드 추적 (배치 추가 및 중복 렌더링 방지용)
+        self._folder_grids: Dict[str, ui.grid] = {}
+        self._rendered_cards: Dict[str, ui.card] = {}
+        self._rendered_signatures: Dict[str, Any] = {}  # 카드를 그릴 때의 스캔 시그니처 (내용 변경 감지용)
+        self._search_query = ''
         
         # 애플리케이션의 핵심 이벤트를 여기서 모두 구독합니다.
         self.state.subscribe('available_checkpoints_changed', self._on_models_updated)
         self.state.subscribe('vae_updated', self._on_vae_updated)
+        # 스트리밍 스캔 배치 (도착하는 대로 카드 추가)
+        self.state.subscribe('models_batch', self._on_models_batch)
+        # 모델 폴더 감시 델타 (바뀐 카드만 추가/교체/제거)
+        self.state.subscribe('models_delta', self._on_models_delta)
         # self.state.subscribe('model_selection_changed', self._on_model_selected)  # InferencePage에서 중앙 관리
     
     def _on_user_notification(self, data: Dict[str, Any]):
@@ -69,6 +82,12 @@ class TopBar:
                     self.toggle_button = ui.button(icon='expand_less', on_click=self._toggle_visibility).props('flat round color=white size=sm ml-2')
                     # 체크포인트 새로고침 버튼 추가
                     ui.button(icon='refresh', on_click=self._refresh_checkpoints).props('flat round color=white size=sm ml-1').tooltip('체크포인트 새로고침')
+                    # 실행 프로파일 배지 ([execution] 설정 결과: 장치/dtype/어텐션 방식)
+                    profile = self.state.get_execution_profile()
+                    ui.badge(f"{profile['name'].upper()} · {profile['autocast'] or profile['dtype']}", color='grey') \
+                        .classes('ml-2 text-xs') \
+                        .tooltip(f"어텐션: {profile['attention']}, channels_last: {profile['channels_last']}, "
+                                 f"CPU 오프로드: {profile['cpu_offload']}, 스레드: {profile['threads']}/{profile['interop_threads']}")
                 
                 # 오른쪽: VAE 선택 + 중단 버튼 (반응형) - 파라미터 패널과 정렬
                 with ui.row().classes('items-center gap-2 flex-shrink-0 min-w-0 w-72 justify-end'):
@@ -78,11 +97,20 @@ class TopBar:
                         .classes('w-40 min-w-32 max-w-40') \
                         .on('change', lambda e: asyncio.create_task(self._on_vae_change(e.value)))
                     
+                    # 생성 대기열 (작업별 취소 / 순서 앞으로)
+                    with ui.button(icon='queue').props('flat round color=white size=sm').tooltip('생성 대기열'):
+                        self.queue_badge = ui.badge('0', color='orange').props('floating').classes('text-xs')
+                        self.queue_badge.set_visibility(False)
+                        with ui.menu():
+                            self.queue_list = ui.column().classes('p-2 gap-1 min-w-72')
+                            with self.queue_list:
+                                ui.label('대기 중인 작업이 없습니다').classes('text-sm text-gray-400')
+                    
                     # 중단 버튼 (처음에는 숨김)
                     self.stop_button = ui.button(
                         icon='stop',
                         on_click=self._stop_generation
-                    ).props('round color=red text-color=white size=sm').classes('invisible').tooltip('생성 중단')
+                    ).props('round color=red text-color=white size=sm').classes('invisible').tooltip('생성 중단 (대기열 비우기)')
 
             # 2. 메인 컨텐츠 영역 (토글 가능, 반응형)
             self.content_row = ui.row().classes('w-full p-2 bg-gray-800 gap-2 flex-wrap lg:flex-nowrap')
@@ -90,7 +118,10 @@ class TopBar:
                 # 왼쪽: 모델 앨범 (반응형 너비) - 전체 가로 70%
                 with ui.card().tight().classes('w-full lg:w-7/10 xl:w-7/10 h-64 min-w-0'):
                     with ui.card_section().classes('p-2'):
-                        ui.label('체크포인트 모델').classes('text-sm font-bold text-white mb-2')
+                        with ui.row().classes('w-full items-center justify-between no-wrap'):
+                            ui.label('체크포인트 모델').classes('text-sm font-bold text-white')
+                            ui.input(placeholder='검색', on_change=lambda e: self._on_search_change(e.value)) \
+                                .props('dark outlined dense clearable').classes('w-48')
                     self.album_container = ui.scroll_area().classes('w-full h-52')
                     # 초기 상태 표시
                     with self.album_container:
@@ -111,7 +142,18 @@ class TopBar:
 
     async def _on_models_updated(self, models_by_category: Dict[str, List[Dict[str, Any]]]):
         """모델 목록(checkpoints)이 업데이트되면 앨범 UI를 다시 그립니다."""
+        if self.album_container is None:
+            return
+
+        # 배치로 이미 모두 그려진 목록이면(경로와 시그니처가 모두 같으면) 다시 그리지 않음
+        new_signatures = {model_info['path']: model_info.get('signature') for items in (models_by_category or {}).values() for model_info in items}
+        if new_signatures and new_signatures == self._rendered_signatures:
+            return
+
         self.album_container.clear()
+        self._folder_grids = {}
+        self._rendered_cards = {}
+        self._rendered_signatures = {}
         with self.album_container:
             if not models_by_category:
                 ui.label("체크포인트 모델 없음").classes("m-4 text-center text-gray-500")
@@ -119,10 +161,93 @@ class TopBar:
             
             sorted_folders = sorted(models_by_category.keys(), key=lambda x: (x != 'Root', x.lower()))
             for folder in sorted_folders:
-                with ui.expansion(folder, icon='folder', value=True).classes('w-full').props('header-class="bg-gray-600 text-white"'):
-                    with ui.grid(columns=2).classes('w-full gap-2 p-2'):
-                        for model_info in models_by_category[folder]:
-                            self._create_model_card(model_info)
+                grid = self._create_folder_grid(folder)
+                with grid:
+                    for model_info in models_by_category[folder]:
+                        self._add_card(model_info)
+        if self._search_query:
+            self._apply_search_filter()
+
+    async def _on_models_batch(self, data: Dict[str, Any]):
+        """스트리밍 스캔 배치가 도착하면 새 카드는 추가하고, 시그니처가 바뀐 카드는 다시 그립니다."""
+        if self.album_container is None or data.get('model_type') != 'checkpoints':
+            return
+
+        # 첫 배치라면 '모델 로딩 중...' 안내를 지움
+        if not self._rendered_cards:
+            self.album_container.clear()
+            self._folder_grids = {}
+
+        for folder, items in data.get('items', {}).items():
+            new_items = [item for item in items
+                         if item['path'] not in self._rendered_cards
+                         or self._rendered_signatures.get(item['path']) != item.get('signature')]
+            if not new_items:
+                continue
+            grid = self._folder_grids.get(folder)
+            if grid is None:
+                with self.album_container:
+                    grid = self._create_folder_grid(folder)
+            with grid:
+                for model_info in new_items:
+                    self._remove_card(model_info['path'])
+                    self._add_card(model_info)
+        if self._search_query:
+            self._apply_search_filter()
+
+    async def _on_models_delta(self, data: Dict[str, Any]):
+        """폴더 감시 델타: 삭제/수정된 카드만 제거하고 추가/수정된 카드만 다시 그립니다."""
+        if data.get('model_type') == 'vae':
+            await self._on_vae_updated(self.state.get('available_vae', {}))
+            return
+        if self.album_container is None or data.get('model_type') != 'checkpoints':
+            return
+
+        stale_paths = list(data.get('removed', [])) + [model_info['path'] for model_info in data.get('modified', [])]
+        for path in stale_paths:
+            self._remove_card(path)
+
+        changed_by_folder: Dict[str, List[Dict[str, Any]]] = {}
+        for model_info in data.get('added', []) + data.get('modified', []):
+            changed_by_folder.setdefault(model_info['folder'], []).append(model_info)
+        if changed_by_folder:
+            await self._on_models_batch({'model_type': 'checkpoints', 'items': changed_by_folder})
+        elif not self._rendered_cards:
+            await self._on_models_updated(self.state.get('available_checkpoints', {}))
+
+    def _add_card(self, model_info: Dict[str, Any]):
+        """카드를 현재 컨텍스트에 그리고 경로/시그니처를 기록합니다."""
+        self._rendered_cards[model_info['path']] = self._create_model_card(model_info)
+        self._rendered_signatures[model_info['path']] = model_info.get('signature')
+
+    def _remove_card(self, path: str):
+        """그려진 카드가 있으면 제거합니다."""
+        card = self._rendered_cards.pop(path, None)
+        self._rendered_signatures.pop(path, None)
+        if card is not None:
+            card.delete()
+
+    def _on_search_change(self, query: Optional[str]):
+        """검색어 변경 시 체크포인트 카드 필터링"""
+        self._search_query = (query or '').strip()
+        self._apply_search_filter()
+
+    def _apply_search_filter(self):
+        """검색 결과에 포함된 카드만 표시 (검색어가 없으면 모두 표시)"""
+        if not self._search_query:
+            for card in self._rendered_cards.values():
+                card.set_visibility(True)
+            return
+        matched_paths = {model_info['path'] for model_info in self.state.search_models(self._search_query, model_type='checkpoints', limit=None)}
+        for path, card in self._rendered_cards.items():
+            card.set_visibility(path in matched_paths)
+
+    def _create_folder_grid(self, folder: str) -> ui.grid:
+        """폴더 하나의 확장 패널과 카드 그리드를 생성합니다 (현재 컨텍스트 안에)."""
+        with ui.expansion(folder, icon='folder', value=True).classes('w-full').props('header-class="bg-gray-600 text-white"'):
+            grid = ui.grid(columns=2).classes('w-full gap-2 p-2')
+        self._folder_grids[folder] = grid
+        return grid
 
     async def _on_vae_updated(self, vae_by_category: Dict[str, List[Dict[str, Any]]]):
         """VAE 목록이 업데이트되면 드롭다운 메뉴를 채웁니다."""
@@ -144,7 +269,9 @@ class TopBar:
     # 3. UI 헬퍼 메서드 (UI를 그리거나 업데이트하는 구체적인 로직)
     def _create_model_card(self, model_info: Dict[str, Any]):
         """개별 모델 카드를 생성합니다."""
-        with ui.card().tight().classes('hover:shadow-lg transition-shadow w-full cursor-pointer').on('click', lambda m=model_info: self._handle_model_select(m)):
+        with ui.card().tight().classes('hover:shadow-lg transition-shadow w-full cursor-pointer').on('click', lambda m=model_info: self._handle_model_select(m)) as card:
+            # 마우스를 올려 두면 클릭 전에 백그라운드에서 체크포인트를 미리 읽음
+            card.on('mouseenter', lambda m=model_info: self._handle_model_hover(m))
             with ui.image(self._get_preview_src(model_info)).classes('w-full h-24 object-cover bg-gray-800 relative'):
                 # 모델 타입 배지
                 badge_color = {'SDXL': 'bg-purple-600', 'SD15': 'bg-blue-600'}.get(model_info.get('model_type'), 'bg-gray-600')
@@ -152,6 +279,7 @@ class TopBar:
             
             with ui.card_section().classes('p-1 w-full'):
                 ui.label(model_info['name']).classes('text-xs w-full text-center font-medium h-6 truncate').tooltip(model_info['name'])
+        return card
 
     def _build_metadata_ui_skeleton(self):
         """메타데이터 UI의 뼈대를 생성합니다 (반응형 개선)."""
@@ -251,15 +379,13 @@ class TopBar:
             self.apply_button.visible = False
 
     def _get_preview_src(self, model_info: Dict[str, Any]) -> str:
-        """미리보기 이미지 소스를 반환합니다."""
+        """미리보기 이미지 소스를 반환합니다 (썸네일 캐시 URL - 브라우저 캐시 가능)."""
         preview_path = Path(model_info['path']).with_suffix('.png')
-        if preview_path.exists():
-            try:
-                with open(preview_path, "rb") as f:
-                    b64_str = base64.b64encode(f.read()).decode('utf-8')
-                return f"data:image/png;base64,{b64_str}"
-            except Exception as e:
-                info(f"미리보기 이미지 로드 실패: {e}")
+        thumbnail_cache = self.state.thumbnail_cache
+        if thumbnail_cache is not None:
+            thumbnail_url = thumbnail_cache.get_url(preview_path)
+            if thumbnail_url:
+                return thumbnail_url
         return 'https://placehold.co/256x256/2d3748/e2e8f0?text=No+Preview'
 
     # 4. 사용자 행동 핸들러 (사용자 입력을 받아 StateManager에 전달)
@@ -272,6 +398,12 @@ class TopBar:
         self._update_metadata_ui(model_info)
         await self.state.load_model_pipeline(model_info)
 
+    def _handle_model_hover(self, model_info):
+        """모델 카드에 마우스를 올리면 StateManager에 프리페치 힌트를 전달합니다."""
+        if not isinstance(model_info, dict):
+            return
+        self.state.hint_model(model_info, reason='hover')
+
     async def _on_vae_change(self, vae_value: str):
         """VAE 선택 변경 처리"""
         info(f"VAE 선택됨: {vae_value}")
@@ -327,10 +459,39 @@ class TopBar:
             success(r"생성 완료: 중단 버튼 숨김")
     
     def _stop_generation(self):
-        """생성 중단"""
+        """생성 중단 (실행 중인 작업 중단 + 대기열 비우기)"""
         info(r"🛑 생성 중단 요청")
-        self.state.stop_generation_flag.set()
-        ui.notify('생성이 중단되었습니다', type='warning')
+        asyncio.create_task(self.state.stop_generation())
+    
+    def _on_generation_queue_changed(self, snapshot: Dict[str, Any]):
+        """대기열 배지/목록 갱신"""
+        if not self.queue_badge or not self.queue_list:
+            return
+        depth = snapshot.get('running', 0) + snapshot.get('pending', 0)
+        self.queue_badge.set_text(str(depth))
+        self.queue_badge.set_visibility(depth > 0)
+        
+        self.queue_list.clear()
+        with self.queue_list:
+            jobs = snapshot.get('jobs', [])
+            if not jobs:
+                ui.label('대기 중인 작업이 없습니다').classes('text-sm text-gray-400')
+                return
+            pending_index = 0
+            for job in jobs:
+                running = job['state'] == 'running'
+                with ui.row().classes('w-full items-center no-wrap gap-1'):
+                    ui.icon('play_arrow' if running else ('all_inclusive' if job['repeat'] else 'schedule')) \
+                        .classes('text-green-400' if running else 'text-gray-400')
+                    ui.label(f"{job['prompt'][:32] or '(빈 프롬프트)'} · {job['seed']}").classes('text-xs flex-1 truncate')
+                    if not running:
+                        index = pending_index
+                        ui.button(icon='arrow_upward',
+                                  on_click=lambda _, job_id=job['job_id'], i=index: self.state.move_generation_job(job_id, max(0, i - 1))) \
+                            .props('flat round dense size=xs').tooltip('앞으로')
+                        pending_index += 1
+                    ui.button(icon='close', on_click=lambda _, job_id=job['job_id']: self.state.cancel_generation_job(job_id)) \
+                        .props('flat round dense size=xs color=red').tooltip('취소')
         
         # 로딩 실패 시 알림
         if not data.get('success'):
@@ -454,8 +615,8 @@ class TopBar:
         """체크포인트 새로고침"""
         try:
             ui.notify('체크포인트 스캔 중...', type='info')
-            # StateManager의 모델 스캔 재실행
-            await self.state._scan_models()
+            # 바뀐 파일만 다시 파싱 (전체 재파싱 없음)
+            await self.state.refresh_models()
             ui.notify('체크포인트 새로고침 완료', type='positive')
         except Exception as e:
             failure(f"체크포인트 새로고침 실패: {e}")
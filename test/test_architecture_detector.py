@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""텐서 키 기반 아키텍처 감지 및 스트리밍 헤더 파서 테스트 스크립트"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.architecture_detector import ArchitectureDetector
+from src.nicediff.services.metadata_parser import MetadataParser, SafetensorsHeaderCache
+
+
+def _tensor(*shape):
+    return {'dtype': 'F16', 'shape': list(shape), 'data_offsets': [0, 0]}
+
+
+def _write_header(path: Path, header: dict):
+    """가중치 없이 헤더만 있는 safetensors 파일 생성"""
+    raw = json.dumps(header).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(raw)))
+        f.write(raw)
+
+
+def test_checkpoint_detection():
+    """체크포인트: 인코더 접두사와 UNet context 차원으로 판별"""
+    print("🔍 체크포인트 아키텍처 감지 테스트...")
+    attn2 = 'model.diffusion_model.input_blocks.{}.1.transformer_blocks.0.attn2.to_k.weight'
+
+    sd15 = {
+        'cond_stage_model.transformer.text_model.embeddings.position_ids': _tensor(1, 77),
+        attn2.format(1): _tensor(320, 768),
+        'model.diffusion_model.input_blocks.0.0.weight': _tensor(320, 4, 3, 3),
+    }
+    sd2 = {attn2.format(1): _tensor(320, 1024), 'cond_stage_model.model.transformer.resblocks.0.ln_1.weight': _tensor(1024)}
+    sdxl = {
+        'conditioner.embedders.0.transformer.text_model.embeddings.position_ids': _tensor(1, 77),
+        'conditioner.embedders.1.model.ln_final.weight': _tensor(1280),
+        attn2.format(4): _tensor(640, 2048),
+        'model.diffusion_model.input_blocks.0.0.weight': _tensor(320, 9, 3, 3),
+    }
+    refiner = {'conditioner.embedders.0.model.ln_final.weight': _tensor(1280), attn2.format(4): _tensor(768, 1280)}
+    sd3 = {'model.diffusion_model.joint_blocks.0.x_block.attn.qkv.weight': _tensor(4608, 1536)}
+
+    assert ArchitectureDetector.detect(sd15)['model_type'] == 'SD15'
+    assert ArchitectureDetector.detect(sd15)['base_model'] == 'sd_v1'
+    assert ArchitectureDetector.detect(sd2)['base_model'] == 'sd_v2'
+    result = ArchitectureDetector.detect(sdxl)
+    assert (result['model_type'], result['kind'], result['inpaint']) == ('SDXL', 'checkpoint', True)
+    assert ArchitectureDetector.detect(refiner)['base_model'] == 'sdxl_refiner'
+    assert ArchitectureDetector.detect(sd3)['model_type'] == 'SD3'
+    assert ArchitectureDetector.detect({'__metadata__': {}}) is None
+    print("✅ 체크포인트 아키텍처 감지 테스트 통과")
+
+
+def test_lora_detection():
+    """LoRA: kohya / diffusers 형식의 키와 lora_down shape으로 판별"""
+    print("🔍 LoRA 아키텍처 감지 테스트...")
+    kohya_sd15 = {
+        'lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight': _tensor(16, 768),
+        'lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight': _tensor(320, 16),
+    }
+    kohya_sdxl_unet_only = {
+        'lora_unet_input_blocks_4_1_transformer_blocks_0_attn1_to_q.lora_down.weight': _tensor(8, 640),
+    }
+    kohya_sdxl_te = {'lora_te2_text_model_encoder_layers_0_mlp_fc1.lora_down.weight': _tensor(8, 1280)}
+    peft_sdxl = {
+        'unet.down_blocks.1.attentions.0.transformer_blocks.0.attn2.to_k.lora_A.weight': _tensor(4, 2048),
+        'unet.down_blocks.1.attentions.0.transformer_blocks.0.attn2.to_k.lora_B.weight': _tensor(640, 4),
+    }
+
+    result = ArchitectureDetector.detect(kohya_sd15)
+    assert (result['model_type'], result['kind'], result['context_dim']) == ('SD15', 'lora', 768)
+    assert ArchitectureDetector.detect(kohya_sdxl_unet_only)['model_type'] == 'SDXL'
+    assert ArchitectureDetector.detect(kohya_sdxl_te)['model_type'] == 'SDXL'
+    assert ArchitectureDetector.detect(peft_sdxl)['context_dim'] == 2048
+    print("✅ LoRA 아키텍처 감지 테스트 통과")
+
+
+def test_tensor_keys_override_filename():
+    """파일명/폴더명 키워드보다 텐서 키 판별이 우선하는지 확인"""
+    print("🔍 파일명 추측보다 텐서 키 우선 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        # 'xl'이 들어간 이름이지만 실제로는 SD1.5 LoRA
+        lora_path = Path(tmp) / 'pony_style_xl.safetensors'
+        _write_header(lora_path, {
+            '__metadata__': {'ss_output_name': 'pony_style_xl'},
+            'lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight': _tensor(16, 768),
+        })
+        assert MetadataParser.detect_model_type(lora_path)[0] == 'SD15'
+        assert MetadataParser.get_lora_info(lora_path)['base_model'] == 'SD1.5'
+
+        ckpt_path = Path(tmp) / 'model.safetensors'
+        _write_header(ckpt_path, {'conditioner.embedders.1.model.ln_final.weight': _tensor(1280)})
+        info = MetadataParser.get_model_info(ckpt_path)
+        assert info['model_type'] == 'SDXL' and info['architecture']['evidence'] == 'conditioner.embedders.1'
+    print("✅ 파일명 추측보다 텐서 키 우선 테스트 통과")
+
+
+def test_bounded_header_reader():
+    """상한을 넘는 헤더는 스트리밍으로 읽고, 너무 큰 단일 값은 건너뛰는지 확인"""
+    print("🔍 스트리밍 헤더 파서 테스트...")
+    original_limits = (SafetensorsHeaderCache.MAX_INLINE_HEADER_BYTES, SafetensorsHeaderCache.STREAM_MAX_VALUE_BYTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'huge_header.safetensors'
+        header = {'__metadata__': {'note': 'ünïcode ✓', 'quote': 'a "b" \\ c'}}
+        for i in range(2000):
+            header[f'lora_unet_down_blocks_{i}_attn2_to_k.lora_down.weight'] = _tensor(4, 768)
+        header['zz_padding'] = {'blob': 'x' * 300_000, 'nested': [{'a': '}'}]}
+        header['zzz_number'] = 12345
+        _write_header(path, header)
+
+        try:
+            SafetensorsHeaderCache.MAX_INLINE_HEADER_BYTES = 1024
+            SafetensorsHeaderCache.STREAM_MAX_VALUE_BYTES = 100_000
+            parsed = SafetensorsHeaderCache().get_header(path)
+        finally:
+            SafetensorsHeaderCache.MAX_INLINE_HEADER_BYTES = original_limits[0]
+            SafetensorsHeaderCache.STREAM_MAX_VALUE_BYTES = original_limits[1]
+
+        assert parsed['__metadata__'] == header['__metadata__']
+        assert 'zz_padding' not in parsed  # 100KB 상한을 넘는 값은 건너뜀
+        assert parsed['zzz_number'] == 12345
+        assert len(parsed) == len(header) - 1
+        assert ArchitectureDetector.detect(parsed)['model_type'] == 'SD15'
+
+        # 파일 크기보다 큰 길이 필드는 거부
+        broken = Path(tmp) / 'broken.safetensors'
+        with open(broken, 'wb') as f:
+            f.write(struct.pack('<Q', 10**12))
+            f.write(b'{}')
+        try:
+            SafetensorsHeaderCache().get_header(broken)
+            assert False, "잘못된 헤더 길이가 통과됨"
+        except ValueError:
+            pass
+    print("✅ 스트리밍 헤더 파서 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_checkpoint_detection()
+    test_lora_detection()
+    test_tensor_keys_override_filename()
+    test_bounded_header_reader()
+    print("\n🎉 아키텍처 감지 테스트 성공!")
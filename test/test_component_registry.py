@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""파이프라인 구성 요소 공유 테스트 스크립트 (CPU 전용, 작은 모듈 사용)"""
+
+import copy
+import os
+import sys
+
+import torch
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.component_registry import ComponentRegistry
+from src.nicediff.domains.generation.services.pipeline_cache import PipelineCache
+
+
+class TinyPipeline:
+    """diffusers 파이프라인처럼 components와 to()를 가진 작은 파이프라인"""
+
+    def __init__(self, unet_seed: int, encoder_seed: int = 0):
+        torch.manual_seed(unet_seed)
+        self.unet = torch.nn.Linear(64, 64)
+        torch.manual_seed(encoder_seed)
+        self.text_encoder = torch.nn.Linear(128, 128)
+        self.vae = torch.nn.Linear(128, 8)
+
+    @property
+    def components(self):
+        return {'unet': self.unet, 'text_encoder': self.text_encoder, 'vae': self.vae}
+
+    def to(self, device):
+        for module in self.components.values():
+            module.to(device)
+        return self
+
+
+def test_fingerprint():
+    """같은 가중치는 같은 지문, 값/dtype이 다르면 다른 지문"""
+    print("🔍 구성 요소 지문 테스트...")
+    a, b = TinyPipeline(1), TinyPipeline(2)
+    assert a.text_encoder is not b.text_encoder
+    assert ComponentRegistry.fingerprint(a.text_encoder) == ComponentRegistry.fingerprint(b.text_encoder)
+    assert ComponentRegistry.fingerprint(a.unet) != ComponentRegistry.fingerprint(b.unet)
+    assert ComponentRegistry.fingerprint(a.vae) != ComponentRegistry.fingerprint(copy.deepcopy(a.vae).half())
+    print("✅ 구성 요소 지문 테스트 통과")
+
+
+def test_share_and_release():
+    """같은 구성 요소는 하나의 모듈을 공유, 캐시에서 빠지면 참조 해제, LoRA 전에는 복사"""
+    print("🔍 구성 요소 공유 테스트...")
+    registry = ComponentRegistry()
+    cache = PipelineCache('cpu', max_ram_mb=1024, max_entries=5,
+                          on_release=lambda entry: registry.release_all(entry.get('shared_components')))
+
+    a, b, c = TinyPipeline(1), TinyPipeline(2), TinyPipeline(3, encoder_seed=7)
+    separate_bytes = sum(PipelineCache.measure(a)) * 2
+    for key, pipeline in (('a', a), ('b', b), ('c', c)):
+        cache.put(key, pipeline, shared_components=registry.share(pipeline))
+
+    # a/b는 텍스트 인코더와 VAE를 공유, c는 다른 가중치라 따로 보관
+    assert b.text_encoder is a.text_encoder and b.vae is a.vae
+    assert c.text_encoder is not a.text_encoder
+    stats = registry.get_stats()
+    assert (stats['components'], stats['shared'], stats['hits']) == (4, 2, 2)
+    shared_bytes = (128 * 128 + 128 + 128 * 8 + 8) * 4
+    assert abs(stats['saved_mb'] - shared_bytes / (1024 * 1024)) < 1e-9
+
+    # 공유 텐서는 캐시 메모리 사용량에 한 번만 계산
+    assert sum(PipelineCache.measure(a, b)) == separate_bytes - shared_bytes
+
+    # LoRA 적용 전 공유 중인 텍스트 인코더는 복사 (다른 파이프라인에 영향 없음)
+    shared = registry.make_private(b, cache.peek('b')['shared_components'])
+    assert 'text_encoder' not in shared and b.text_encoder is not a.text_encoder
+    assert torch.equal(b.text_encoder.weight, a.text_encoder.weight)
+    cache.update('b', shared_components=shared)
+    assert registry.get_stats()['shared'] == 1  # VAE만 공유
+
+    # 캐시에서 빠지면 참조 해제, 마지막 참조면 등록 해제
+    cache.discard('a')
+    assert registry.get_stats()['shared'] == 0
+    cache.clear()
+    assert registry.get_stats()['components'] == 0
+    print("✅ 구성 요소 공유 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_fingerprint()
+    test_share_and_release()
+    print("\n🎉 구성 요소 공유 테스트 성공!")
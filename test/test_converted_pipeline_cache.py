@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""변환된 파이프라인 디스크 캐시 테스트 스크립트"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.converted_pipeline_cache import ConvertedPipelineCache
+
+
+class SavablePipeline:
+    """save_pretrained만 흉내 내는 파이프라인 (구성 요소별 폴더에 가중치 파일 작성)"""
+
+    def __init__(self, weight_bytes: int):
+        self.weight_bytes = weight_bytes
+
+    def save_pretrained(self, save_directory: str, safe_serialization: bool = True):
+        assert safe_serialization
+        for component in ('unet', 'vae'):
+            component_dir = Path(save_directory) / component
+            component_dir.mkdir(parents=True)
+            (component_dir / 'diffusion_pytorch_model.safetensors').write_bytes(b'\0' * (self.weight_bytes // 2))
+        (Path(save_directory) / 'model_index.json').write_text('{}')
+
+
+def test_converted_cache():
+    """해시 키, 저장/조회, 용량 상한에 따른 LRU 정리 확인"""
+    print("🔍 변환된 파이프라인 캐시 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        checkpoint = tmp_path / 'model.safetensors'
+        checkpoint.write_bytes(os.urandom(300_000))
+
+        cache = ConvertedPipelineCache(str(tmp_path / 'cache'), max_size_gb=2.5 * 100_000 / 1024 ** 3)
+        key = cache.make_key(checkpoint, 'StableDiffusionPipeline', 'torch.float16')
+        assert key.endswith('_StableDiffusionPipeline_float16')
+        assert key != cache.make_key(checkpoint, 'StableDiffusionPipeline', 'torch.bfloat16')
+
+        # 같은 내용이면 경로/mtime이 달라도 같은 키, 내용이 바뀌면 다른 키
+        copied = tmp_path / 'copy.safetensors'
+        copied.write_bytes(checkpoint.read_bytes())
+        assert cache.make_key(copied, 'StableDiffusionPipeline', 'torch.float16') == key
+        data = bytearray(checkpoint.read_bytes())
+        data[-1] ^= 0xFF
+        copied.write_bytes(bytes(data))
+        assert cache.make_key(copied, 'StableDiffusionPipeline', 'torch.float16') != key
+
+        assert cache.lookup(key) is None
+        entry_dir = cache.store(key, SavablePipeline(100_000), source_path=checkpoint)
+        assert entry_dir == cache.lookup(key)
+        assert (entry_dir / 'unet' / 'diffusion_pytorch_model.safetensors').exists()
+        assert cache.entries()[0]['source'] == str(checkpoint)
+        assert cache.total_size() >= 100_000
+
+        # 상한(약 2.5개)을 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+        cache.store('b', SavablePipeline(100_000))
+        time.sleep(0.02)
+        cache.lookup(key)  # key를 최근 사용으로 갱신
+        time.sleep(0.02)
+        cache.store('c', SavablePipeline(100_000))
+        keys = {meta['key'] for meta in cache.entries()}
+        assert keys == {key, 'c'}
+
+        # 상한보다 큰 항목도 방금 저장한 것은 유지
+        cache.store('huge', SavablePipeline(1_000_000))
+        assert [meta['key'] for meta in cache.entries()] == ['huge']
+
+        # 저장 실패 시 임시 폴더가 남지 않음
+        class BrokenPipeline:
+            def save_pretrained(self, save_directory, safe_serialization=True):
+                Path(save_directory).mkdir(parents=True)
+                raise RuntimeError('disk full')
+        assert cache.store('broken', BrokenPipeline()) is None
+        assert not list(cache.cache_dir.glob('.*.tmp-*'))
+
+        assert cache.clear() == 1
+        assert cache.entries() == []
+    print("✅ 변환된 파이프라인 캐시 테스트 통과")
+
+
+def test_full_hash_key():
+    """앞/중간/끝이 같고 다른 부분(VAE/텍스트 인코더)만 다른 변형은 다른 키, 해시는 스캔 인덱스에 저장해 재사용"""
+    from src.nicediff.services.model_hasher import ModelHashService
+    from src.nicediff.services.scan_index import ScanIndex
+
+    print("🔍 체크포인트 전체 해시 키 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        baked = tmp_path / 'model_bakedvae.safetensors'
+        no_vae = tmp_path / 'model_novae.safetensors'
+        data = bytearray(os.urandom(1_000_000))
+        baked.write_bytes(bytes(data))
+        data[200_000:200_100] = bytes(100)  # 샘플링 구간 밖의 차이
+        no_vae.write_bytes(bytes(data))
+
+        index = ScanIndex(tmp_path / ScanIndex.INDEX_FILENAME)
+        for path in (baked, no_vae):
+            index.store(path, 'checkpoints', ScanIndex.make_signature(path), {'name': path.stem, 'path': str(path)})
+        hasher = ModelHashService(index, max_mb_per_sec=0.001, should_pause=lambda: True)  # 백그라운드 제한은 무시
+
+        requested = []
+
+        def provider(path):
+            requested.append(Path(path).name)
+            return hasher.ensure_sha256(path)
+
+        cache = ConvertedPipelineCache(str(tmp_path / 'cache'), sha256_provider=provider)
+        baked_key = cache.make_key(baked, 'StableDiffusionPipeline', 'torch.float16')
+        assert baked_key != cache.make_key(no_vae, 'StableDiffusionPipeline', 'torch.float16')
+        assert cache.fingerprint(baked) == ConvertedPipelineCache.compute_sha256(baked)
+        assert requested == [baked.name, no_vae.name]  # 같은 파일 상태는 한 번만 요청
+
+        # 저장된 해시는 다음 실행(새 인덱스/캐시 객체)에서 파일을 다시 읽지 않고 재사용
+        reloaded = ModelHashService(ScanIndex(tmp_path / ScanIndex.INDEX_FILENAME))
+        assert reloaded.get_hashes(baked)['sha256'] == cache.fingerprint(baked)
+        reloaded.compute_sha256 = None  # 호출되면 실패
+        assert reloaded.ensure_sha256(no_vae) == cache.fingerprint(no_vae)
+    print("✅ 체크포인트 전체 해시 키 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_converted_cache()
+    test_full_hash_key()
+    print("\n🎉 변환된 파이프라인 캐시 테스트 성공!")
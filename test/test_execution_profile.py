@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""실행 프로파일 테스트 스크립트 (CPU 전용, 파이프라인 메서드 호출을 기록하는 작은 객체 사용)"""
+
+import os
+import sys
+
+import torch
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.execution_profile import (
+    resolve_profile, apply_profile, autocast_forward
+)
+
+
+class RecordingPipeline:
+    """apply_profile이 호출하는 파이프라인 메서드를 기록"""
+
+    def __init__(self):
+        self.calls = []
+        self.unet = torch.nn.Conv2d(4, 4, 3, padding=1)
+
+    def enable_attention_slicing(self, slice_size=1):
+        self.calls.append(('slicing', slice_size))
+
+    def disable_attention_slicing(self):
+        self.calls.append(('sdpa',))
+
+    def enable_vae_slicing(self):
+        self.calls.append(('vae_slicing',))
+
+    def enable_model_cpu_offload(self):
+        self.calls.append(('offload',))
+
+    def enable_xformers_memory_efficient_attention(self):
+        raise ModuleNotFoundError('xformers')
+
+
+def test_resolve_profile():
+    """장치에 따라 프로파일 자동 선택, [execution] 항목으로 덮어쓰기"""
+    print("🔍 실행 프로파일 선택 테스트...")
+    cuda = resolve_profile('cuda:0')
+    assert (cuda.name, cuda.dtype, cuda.attention, cuda.cpu_offload) == ('cuda', torch.float16, 'slicing', True)
+
+    cpu = resolve_profile('cpu', {'bf16_autocast': False})
+    assert (cpu.name, cpu.dtype, cpu.attention, cpu.cpu_offload) == ('cpu', torch.float32, 'sdpa', False)
+    assert cpu.channels_last and cpu.autocast_dtype is None
+
+    forced = resolve_profile('cpu', {'profile': 'cuda', 'dtype': 'bfloat16', 'cpu_offload': False, 'bf16_autocast': True})
+    assert (forced.name, forced.dtype, forced.cpu_offload, forced.autocast_dtype) == ('cuda', torch.bfloat16, False, torch.bfloat16)
+    assert resolve_profile('cpu', {'profile': 'unknown', 'bf16_autocast': False}).name == 'cpu'
+    print("✅ 실행 프로파일 선택 테스트 통과")
+
+
+def test_apply_profile():
+    """CUDA 프로파일은 기존 동작 유지, CPU 프로파일은 슬라이싱/오프로드 없이 SDPA + channels_last"""
+    print("🔍 실행 프로파일 적용 테스트...")
+    pipeline = RecordingPipeline()
+    apply_profile(pipeline, resolve_profile('cuda'))
+    assert pipeline.calls == [('slicing', 1), ('vae_slicing',), ('offload',)]
+
+    pipeline = RecordingPipeline()
+    apply_profile(pipeline, resolve_profile('cpu', {'bf16_autocast': False}))
+    assert pipeline.calls == [('sdpa',)]
+    assert pipeline.unet.weight.is_contiguous(memory_format=torch.channels_last)
+    print("✅ 실행 프로파일 적용 테스트 통과")
+
+
+def test_autocast_forward():
+    """bf16 autocast로 감싼 모듈도 출력은 원래 dtype(fp32)으로 돌려줌, 두 번 감싸지 않음"""
+    print("🔍 bf16 autocast 래퍼 테스트...")
+    module = torch.nn.Linear(8, 8)
+    x = torch.randn(2, 8)
+    autocast_forward(module, torch.bfloat16, output_dtype=torch.float32)
+    wrapped = module.forward
+    autocast_forward(module, torch.bfloat16, output_dtype=torch.float32)
+    assert module.forward is wrapped
+
+    assert module(x).dtype == torch.float32
+    tuple_module = torch.nn.Module()
+    tuple_module.forward = lambda t: (torch.nn.functional.linear(t, module.weight),)
+    autocast_forward(tuple_module, torch.bfloat16, output_dtype=torch.float32)
+    assert tuple_module(x)[0].dtype == torch.float32
+    print("✅ bf16 autocast 래퍼 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_resolve_profile()
+    test_apply_profile()
+    test_autocast_forward()
+    print("\n🎉 실행 프로파일 테스트 성공!")
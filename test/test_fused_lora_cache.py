@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""LoRA 융합 델타 캐시 테스트 스크립트 (CPU 전용, PEFT LoRA 레이어를 흉내 낸 작은 모듈 사용)"""
+
+import os
+import sys
+
+import torch
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.fused_lora_cache import FusedLoraCache
+
+
+class TinyLoraLinear(torch.nn.Module):
+    """PEFT LoraLayer와 같은 속성(base_layer, lora_A/B, active_adapters, get_delta_weight)을 가진 레이어"""
+
+    def __init__(self, features: int, adapters: dict, rank: int = 2):
+        super().__init__()
+        self.base_layer = torch.nn.Linear(features, features)
+        self.lora_A = torch.nn.ModuleDict({name: torch.nn.Linear(features, rank, bias=False) for name in adapters})
+        self.lora_B = torch.nn.ModuleDict({name: torch.nn.Linear(rank, features, bias=False) for name in adapters})
+        self.scaling = dict(adapters)
+        self.active_adapters = list(adapters)
+        self.disabled = False
+
+    def get_delta_weight(self, name):
+        return (self.lora_B[name].weight @ self.lora_A[name].weight) * self.scaling[name]
+
+    def forward(self, x):
+        out = self.base_layer(x)
+        if not self.disabled:
+            for name in self.active_adapters:
+                out = out + self.lora_B[name](self.lora_A[name](x)) * self.scaling[name]
+        return out
+
+
+class TinyPipeline:
+    def __init__(self):
+        torch.manual_seed(0)
+        self.unet = torch.nn.Sequential(TinyLoraLinear(16, {'a': 0.7, 'b': -0.3}), TinyLoraLinear(16, {'a': 0.7, 'b': -0.3}))
+        self.text_encoder = torch.nn.Linear(16, 16)  # LoRA 없는 구성 요소는 건드리지 않음
+
+    def _set_disabled(self, disabled: bool):
+        for layer in self.unet:
+            layer.disabled = disabled
+
+    def disable_lora(self):
+        self._set_disabled(True)
+
+    def enable_lora(self):
+        self._set_disabled(False)
+
+
+def test_fuse_matches_unfused():
+    """융합 결과가 어댑터 연산과 같고, 해제하면 원본 가중치로 정확히 복원"""
+    print("🔍 LoRA 융합 테스트...")
+    pipeline = TinyPipeline()
+    x = torch.randn(4, 16)
+    original = pipeline.unet[0].base_layer.weight.detach().clone()
+    with torch.no_grad():
+        expected = pipeline.unet(x)
+
+    cache = FusedLoraCache()
+    loras = [{'path': 'a.safetensors', 'weight': 0.7}, {'path': 'b.safetensors', 'weight': -0.3}]
+    key = cache.make_key('ckpt', loras)
+    assert key == cache.make_key('ckpt', list(reversed(loras)))  # 순서 무관
+    assert key != cache.make_key('ckpt', [loras[0], {'path': 'b.safetensors', 'weight': -0.2}])
+
+    assert cache.fuse(pipeline, key) is False  # 처음에는 델타 계산
+    assert pipeline.unet[0].disabled
+    with torch.no_grad():
+        assert torch.allclose(pipeline.unet(x), expected, atol=1e-5)
+    assert cache.fuse(pipeline, key) is True  # 이미 융합된 상태면 아무것도 하지 않음
+
+    cache.unfuse()
+    assert not pipeline.unet[0].disabled
+    assert torch.equal(pipeline.unet[0].base_layer.weight, original)
+    print("✅ LoRA 융합 테스트 통과")
+
+
+def test_cached_deltas():
+    """같은 조합으로 돌아오면 캐시된 델타를 다시 적용, 최대 개수 초과 시 LRU 제거"""
+    print("🔍 LoRA 델타 캐시 테스트...")
+    pipeline = TinyPipeline()
+    cache = FusedLoraCache(max_entries=2)
+
+    cache.fuse(pipeline, 'k1')
+    fused_weight = pipeline.unet[1].base_layer.weight.detach().clone()
+    cache.fuse(pipeline, 'k2')  # 다른 조합 → 해제 후 새로 계산
+    assert cache.fuse(pipeline, 'k1') is True  # 캐시 적중 (다시 계산하지 않음)
+    assert torch.equal(pipeline.unet[1].base_layer.weight, fused_weight)
+
+    cache.fuse(pipeline, 'k3')  # 가장 오래 쓰지 않은 k2 제거
+    stats = cache.get_stats()
+    assert (stats['entries'], stats['hits'], stats['misses']) == (2, 1, 3)
+    assert cache.fuse(pipeline, 'k2') is False
+
+    # 해제된 파이프라인은 참조만 끊음
+    cache.forget(pipeline)
+    assert cache.fused_key is None and pipeline.unet[0].disabled
+    print("✅ LoRA 델타 캐시 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_fuse_matches_unfused()
+    test_cached_deltas()
+    print("\n🎉 LoRA 융합 델타 캐시 테스트 성공!")
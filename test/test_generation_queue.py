@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""생성 작업 대기열 테스트 스크립트 (파이프라인 대신 짧게 대기하는 runner 사용)"""
+
+import asyncio
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.generation_queue import GenerationQueue, interrupt_callback
+
+
+class Params:
+    def __init__(self, prompt, seed=0, steps=20):
+        self.prompt = prompt
+        self.seed = seed
+        self.steps = steps
+
+
+async def _wait_idle(queue: GenerationQueue, timeout: float = 5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while queue.pending_count or queue.running_count:
+        assert loop.time() < deadline, "대기열이 비워지지 않음"
+        await asyncio.sleep(0.01)
+
+
+def test_priority_and_reorder():
+    """우선순위 순서 + 같은 우선순위는 FIFO, 대기 중 순서 변경/취소"""
+    print("🔍 우선순위/순서 변경 테스트...")
+
+    async def scenario():
+        order = []
+
+        async def runner(job):
+            order.append(job.params.prompt)
+            await asyncio.sleep(0.01)
+
+        changes = []
+        queue = GenerationQueue(runner, on_change=changes.append)
+        a = queue.submit(Params('a'))
+        b = queue.submit(Params('b'))
+        c = queue.submit(Params('c'), priority=5)
+        d = queue.submit(Params('d'))
+        assert [job['job_id'] for job in queue.snapshot()['jobs']] == [c.job_id, a.job_id, b.job_id, d.job_id]
+
+        assert queue.move(d.job_id, 1)
+        assert queue.cancel(b.job_id) and b.state == 'cancelled'
+        queue.start()
+        await _wait_idle(queue)
+        await queue.shutdown()
+
+        assert order == ['c', 'd', 'a']
+        assert changes[-1]['pending'] == 0 and changes[-1]['running'] == 0
+        timings = a.timings()
+        assert timings['queued'] is not None and timings['running'] is not None and timings['total'] >= timings['queued']
+        stats = queue.get_stats()
+        assert (stats['completed'], stats['cancelled']) == (3, 1)
+
+    asyncio.run(scenario())
+    print("✅ 우선순위/순서 변경 테스트 통과")
+
+
+def test_cancel_running_and_repeat():
+    """실행 중 취소는 runner가 확인하는 플래그로 전달, 반복 작업은 완료 시 다시 등록"""
+    print("🔍 실행 중 취소/반복 작업 테스트...")
+
+    async def scenario():
+        runs = []
+
+        async def runner(job):
+            runs.append(job.params.seed)
+            for _ in range(50):
+                if job.cancel_requested:
+                    return None
+                await asyncio.sleep(0.01)
+            job.mark_generated()
+
+        repeats = {'left': 2}
+
+        def on_repeat(job):
+            if repeats['left'] == 0:
+                return None
+            repeats['left'] -= 1
+            return Params(job.params.prompt, job.params.seed + 1)
+
+        queue = GenerationQueue(runner, on_repeat=on_repeat)
+        queue.start()
+        long_job = queue.submit(Params('long'))
+        await asyncio.sleep(0.05)
+        assert long_job.state == 'running'
+        queue.cancel(long_job.job_id)
+        await _wait_idle(queue)
+        assert long_job.state == 'cancelled'
+
+        # 우선순위가 낮은 반복 작업: 처음 + 재등록 2회
+        queue.submit(Params('loop', seed=10), priority=-1, repeat=True)
+        await _wait_idle(queue)
+        assert runs[1:] == [10, 11, 12]
+
+        # stop_repeating: 실행 중인 작업은 끝까지 실행하되 다시 등록하지 않음
+        repeats['left'] = 5
+        looping = queue.submit(Params('loop', seed=20), repeat=True)
+        await asyncio.sleep(0.05)
+        assert queue.stop_repeating() == 1
+        await _wait_idle(queue)
+        assert looping.state == 'done' and runs[-1] == 20
+        await queue.shutdown()
+
+    asyncio.run(scenario())
+    print("✅ 실행 중 취소/반복 작업 테스트 통과")
+
+
+def test_batching():
+    """설정이 같은 대기 작업은 max_batch개까지 묶어 실행, 다른 설정/우선순위는 따로 실행"""
+    print("🔍 묶음 실행 테스트...")
+
+    async def scenario():
+        calls = []
+
+        async def runner(job):
+            calls.append([job.params.prompt])
+            return job.params.prompt
+
+        async def batch_runner(jobs):
+            calls.append([job.params.prompt for job in jobs])
+            await asyncio.sleep(0.01)
+            return [job.params.prompt.upper() for job in jobs]
+
+        queue = GenerationQueue(runner, batch_runner=batch_runner, batch_key=lambda job: job.params.steps,
+                                max_batch=3)
+        jobs = [queue.submit(Params(prompt)) for prompt in 'abcd']
+        other = queue.submit(Params('x', steps=30))
+        repeat = queue.submit(Params('r'), priority=-1)
+        queue.start()
+        await _wait_idle(queue)
+
+        assert calls == [['a', 'b', 'c'], ['d'], ['x'], ['r']]
+        assert [job.result for job in jobs] == ['A', 'B', 'C', 'd'] and other.result == 'x'
+        assert all(job.state == 'done' for job in jobs + [other, repeat])
+        assert jobs[0].started_at == jobs[2].started_at
+
+        # max_wait: 실행 시작 직후 들어온 작업도 기다렸다가 같이 묶음
+        calls.clear()
+        queue.configure_batching(max_batch=4, max_wait=0.2)
+        first = queue.submit(Params('e'))
+        await asyncio.sleep(0.02)
+        second = queue.submit(Params('f'))
+        await _wait_idle(queue)
+        assert calls == [['e', 'f']] and (first.result, second.result) == ('E', 'F')
+        await queue.shutdown()
+
+    asyncio.run(scenario())
+    print("✅ 묶음 실행 테스트 통과")
+
+
+def test_interrupt_callback():
+    """취소 요청이 있으면 파이프라인 _interrupt 플래그 설정"""
+    print("🔍 스텝 중단 콜백 테스트...")
+
+    class Pipeline:
+        _interrupt = False
+
+    cancelled = {'value': False}
+    callback = interrupt_callback(lambda: cancelled['value'])
+    pipeline = Pipeline()
+    assert callback(pipeline, 0, 999, {'latents': 1}) == {'latents': 1} and not pipeline._interrupt
+    cancelled['value'] = True
+    callback(pipeline, 1, 998, {})
+    assert pipeline._interrupt
+    print("✅ 스텝 중단 콜백 테스트 통과")
+
+
+def test_pipeline_change_waits_for_running_job():
+    """pipeline_lock을 잡는 변경(모델/LoRA 교체)은 실행 중인 작업이 끝난 뒤, 다음 작업 전에 실행"""
+    print("🔍 파이프라인 변경 직렬화 테스트...")
+
+    async def scenario():
+        events = []
+        started = asyncio.Event()
+
+        async def runner(job):
+            events.append(('start', job.params.prompt))
+            started.set()
+            await asyncio.sleep(0.05)
+            events.append(('end', job.params.prompt))
+
+        async def change():
+            async with queue.pipeline_lock:
+                events.append(('change', None))
+
+        queue = GenerationQueue(runner)
+        queue.submit(Params('a'))
+        queue.start()
+        await started.wait()
+        queue.submit(Params('b'))
+        await change()
+        await _wait_idle(queue)
+        await queue.shutdown()
+
+        assert events == [('start', 'a'), ('end', 'a'), ('change', None), ('start', 'b'), ('end', 'b')]
+
+    asyncio.run(scenario())
+    print("✅ 파이프라인 변경 직렬화 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_priority_and_reorder()
+    test_cancel_running_and_repeat()
+    test_batching()
+    test_interrupt_callback()
+    test_pipeline_change_waits_for_running_job()
+    print("\n🎉 생성 작업 대기열 테스트 성공!")
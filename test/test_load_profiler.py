@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""모델 로드 계측 테스트 스크립트 (단계 기록 + JSONL 롤링 로그)"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.load_profiler import LoadProfiler, profile_phase
+
+
+def test_phases():
+    """단계별 시간/메모리 샘플 기록, 실패 로드도 기록"""
+    print("🔍 로드 단계 기록 테스트...")
+    profiler = LoadProfiler()
+    profile = profiler.start({'name': 'model_a', 'path': '/models/a.safetensors', 'model_type': 'SDXL'})
+    with profile.phase('single_file_load'):
+        time.sleep(0.02)
+    with profile_phase(None, 'ignored'):  # 계측 없는 호출은 기록하지 않음
+        pass
+    profile.add_phase('mmap_weights', 0.5, sample_memory=False)
+    profile.tag(cache_hit=False, loader='single_file')
+
+    record = profiler.finish(profile)
+    names = [phase['name'] for phase in record['phases']]
+    assert names == ['single_file_load', 'mmap_weights']
+    assert record['phases'][0]['seconds'] >= 0.02 and 'peak_rss_mb' in record['phases'][0]
+    assert 'peak_rss_mb' not in record['phases'][1]
+    assert (record['model'], record['model_type'], record['loader'], record['success']) == ('model_a', 'SDXL', 'single_file', True)
+
+    failed = profiler.finish(profiler.start({'name': 'model_b', 'path': '/models/b.safetensors'}), False, 'boom')
+    assert (failed['success'], failed['error']) == (False, 'boom')
+    assert [r['model'] for r in profiler.recent()] == ['model_b', 'model_a']
+    assert [r['model'] for r in profiler.recent(model_path='/models/a.safetensors')] == ['model_a']
+    print("✅ 로드 단계 기록 테스트 통과")
+
+
+def test_rolling_log():
+    """로그 파일은 최근 N개만 유지하고, 다시 열면 이전 기록을 이어서 읽음"""
+    print("🔍 롤링 로그 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / 'logs' / 'loads.jsonl'
+        profiler = LoadProfiler(log_path, max_entries=3)
+        for i in range(8):
+            profiler.finish(profiler.start({'name': f'model_{i}', 'path': f'/models/{i}.safetensors'}))
+
+        lines = log_path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) <= 6  # 최대 개수의 2배를 넘으면 다시 씀
+        assert json.loads(lines[-1])['model'] == 'model_7'
+
+        reopened = LoadProfiler(log_path, max_entries=3)
+        assert [r['model'] for r in reopened.recent()] == ['model_7', 'model_6', 'model_5']
+    print("✅ 롤링 로그 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_phases()
+    test_rolling_log()
+    print("\n🎉 모델 로드 계측 테스트 성공!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""LoRA 다중 어댑터 관리 테스트 스크립트 (파일 I/O 횟수 확인용 가짜 파이프라인 사용)"""
+
+import asyncio
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.model_loader import ModelLoader
+
+
+class AdapterPipeline:
+    """diffusers 어댑터 API(load_lora_weights/set_adapters/delete_adapters)만 흉내 내는 파이프라인"""
+
+    def __init__(self):
+        self.adapters = {}
+        self.active = {}
+        self.file_reads = 0
+
+    def load_lora_weights(self, path, adapter_name):
+        assert adapter_name not in self.adapters, "어댑터 이름 중복"
+        self.file_reads += 1
+        self.adapters[adapter_name] = path
+
+    def set_adapters(self, adapter_names, adapter_weights=None):
+        assert set(adapter_names) <= set(self.adapters)
+        self.active = dict(zip(adapter_names, adapter_weights))
+
+    def delete_adapters(self, adapter_names):
+        for name in [adapter_names] if isinstance(adapter_names, str) else adapter_names:
+            del self.adapters[name]
+            self.active.pop(name, None)
+
+    def unload_lora_weights(self):
+        self.adapters.clear()
+        self.active.clear()
+
+
+def test_lora_stack():
+    """LoRA 5개 스택: 추가는 파일당 1번만 읽고, 가중치 변경/개별 제거는 파일 I/O 없음"""
+    print("🔍 LoRA 다중 어댑터 테스트...")
+
+    async def run():
+        loader = ModelLoader('cpu')
+        pipeline = loader.current_pipeline = AdapterPipeline()
+        loras = [{'path': f'models/loras/style.v{i}.safetensors', 'name': f'style.v{i}'} for i in range(5)]
+
+        for i, lora in enumerate(loras):
+            assert await loader.load_lora(lora, weight=0.5 + i * 0.1)
+        assert pipeline.file_reads == 5
+        assert len(pipeline.active) == 5
+        assert 'style_v0' in pipeline.adapters  # '.'은 어댑터 이름에 쓸 수 없음
+
+        # 가중치 변경 (다시 로드를 눌러도 같은 경로면 가중치만 변경)
+        assert await loader.set_lora_weight('style.v2', 1.5)
+        assert await loader.load_lora(loras[3], weight=-0.5)
+        assert pipeline.file_reads == 5
+        assert pipeline.active['style_v2'] == 1.5 and pipeline.active['style_v3'] == -0.5
+
+        # 하나만 제거, 나머지 가중치 유지
+        assert await loader.unload_lora('style.v1')
+        assert pipeline.file_reads == 5
+        assert set(pipeline.active) == {'style_v0', 'style_v2', 'style_v3', 'style_v4'}
+        assert pipeline.active['style_v2'] == 1.5
+        assert [lora['name'] for lora in loader.get_loaded_loras()] == ['style.v0', 'style.v2', 'style.v3', 'style.v4']
+        assert not await loader.unload_lora('style.v1')
+
+        # 다른 폴더의 같은 파일명은 별도 어댑터
+        assert await loader.load_lora({'path': 'models/loras/other/style.v0.safetensors', 'name': 'style.v0'})
+        assert 'style_v0_2' in pipeline.adapters
+
+        # 번호 붙은 어댑터 이름이 다시 쓰여 앞선 LoRA의 파일명과 겹쳐도 어댑터 이름이 정확히 같은 쪽에 적용
+        assert await loader.load_lora({'path': 'models/loras/style_v0_2.safetensors', 'name': 'style_v0_2'}, weight=0.7)
+        assert 'style_v0_2_2' in pipeline.adapters
+        assert await loader.unload_lora('models/loras/other/style.v0.safetensors')
+        assert await loader.load_lora({'path': 'models/loras/third/style.v0.safetensors', 'name': 'style.v0'})
+        assert pipeline.adapters['style_v0_2'] == 'models/loras/third/style.v0.safetensors'
+        assert await loader.set_lora_weight('style_v0_2', 0.3)
+        assert pipeline.active['style_v0_2'] == 0.3
+        assert pipeline.active['style_v0'] == 0.5 and pipeline.active['style_v0_2_2'] == 0.7
+        assert await loader.unload_lora('style_v0_2')
+        assert 'style_v0' in pipeline.adapters and 'style_v0_2_2' in pipeline.adapters
+        assert 'style_v0_2' not in pipeline.adapters
+
+        assert await loader.unload_all_loras()
+        assert loader.get_loaded_loras() == [] and pipeline.adapters == {}
+
+    asyncio.run(run())
+    print("✅ LoRA 다중 어댑터 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_lora_stack()
+    print("\n🎉 LoRA 다중 어댑터 테스트 성공!")
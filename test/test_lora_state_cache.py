@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""LoRA state dict 캐시 테스트 스크립트"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.lora_state_cache import LoraStateCache
+
+
+def test_lora_state_cache():
+    """같은 아키텍처는 다시 파싱하지 않음, 파일이 바뀌면 다시 파싱, 최대 개수/용량 초과 시 LRU 제거"""
+    print("🔍 LoRA state dict 캐시 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            path = Path(tmp) / f'lora_{i}.safetensors'
+            path.write_bytes(b'\0' * 100)
+            paths.append(str(path))
+
+        parsed = []
+
+        def parser(path):
+            def parse():
+                parsed.append(path)
+                return {'unet.lora.down.weight': np.zeros((1024,), dtype=np.float32)}, {'unet.alpha': 8.0}
+            return parse
+
+        cache = LoraStateCache(max_entries=2, max_mb=None)
+        state_dict, alphas = cache.get(paths[0], 'StableDiffusionPipeline', parser(paths[0]))
+        assert alphas == {'unet.alpha': 8.0}
+
+        # 같은 아키텍처(다른 SD15 체크포인트)에서는 파싱 없이 같은 dict
+        assert cache.get(paths[0], 'StableDiffusionPipeline', parser(paths[0]))[0] is state_dict
+        assert parsed == [paths[0]]
+
+        # 다른 아키텍처는 별도 변환
+        cache.get(paths[0], 'StableDiffusionXLPipeline', parser(paths[0]))
+        assert len(parsed) == 2
+
+        # 파일이 바뀌면 다시 파싱
+        time.sleep(0.01)
+        Path(paths[0]).write_bytes(b'\1' * 200)
+        cache.get(paths[0], 'StableDiffusionPipeline', parser(paths[0]))
+        assert len(parsed) == 3
+
+        stats = cache.get_stats()
+        assert (stats['entries'], stats['hits'], stats['misses']) == (2, 1, 3)
+        assert abs(stats['size_mb'] - 2 * 4096 / (1024 * 1024)) < 1e-9
+
+        # 용량 상한 (항목 하나 반 정도) → 방금 넣은 항목만 유지
+        cache.configure(max_entries=10, max_mb=6000 / (1024 * 1024))
+        assert cache.get_stats()['entries'] == 1
+        cache.get(paths[1], 'StableDiffusionPipeline', parser(paths[1]))
+        assert cache.get_stats()['entries'] == 1
+        assert cache.get(paths[1], 'StableDiffusionPipeline', parser(paths[1])) is not None
+        assert cache.get_stats()['hits'] == 2
+
+        cache.clear()
+        assert cache.get_stats()['entries'] == 0
+    print("✅ LoRA state dict 캐시 테스트 통과")
+
+
+def test_sdxl_sgm_keys():
+    """SDXL은 load_lora_weights처럼 unet_config로 SGM 형식 kohya 키를 재매핑, UNet 설정이 다르면 따로 캐시"""
+    import torch
+    from types import SimpleNamespace
+    from diffusers.configuration_utils import FrozenDict
+    from diffusers.loaders import StableDiffusionXLLoraLoaderMixin
+    from safetensors.torch import save_file
+    from src.nicediff.domains.generation.services.model_loader import ModelLoader
+
+    class SDXLPipeline(StableDiffusionXLLoraLoaderMixin):
+        """실제 lora_state_dict를 쓰고 UNet/텍스트 인코더에 넣는 단계만 기록하는 SDXL 파이프라인"""
+
+        def __init__(self, layers_per_block: int):
+            self.unet = SimpleNamespace(config=FrozenDict(layers_per_block=layers_per_block))
+            self.text_encoder = self.text_encoder_2 = object()
+            self.unet_calls, self.text_encoder_calls = [], []
+
+        def load_lora_into_unet(self, state_dict, network_alphas, unet, adapter_name=None, **kwargs):
+            self.unet_calls.append((state_dict, kwargs))
+
+        def load_lora_into_text_encoder(self, state_dict, network_alphas, text_encoder, prefix=None, **kwargs):
+            self.text_encoder_calls.append(prefix)
+
+    print("🔍 SDXL SGM 형식 LoRA 키 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        lora_path = str(Path(tmp) / 'sgm_lora.safetensors')
+        tensors = {}
+        for module in ('lora_unet_input_blocks_4_1_transformer_blocks_0_attn1_to_q',
+                       'lora_unet_output_blocks_0_1_transformer_blocks_0_attn2_to_k',
+                       'lora_te1_text_model_encoder_layers_0_self_attn_q_proj'):
+            tensors[f'{module}.lora_down.weight'] = torch.zeros(4, 8)
+            tensors[f'{module}.lora_up.weight'] = torch.zeros(8, 4)
+            tensors[f'{module}.alpha'] = torch.tensor(4.0)
+        save_file(tensors, lora_path)
+
+        loader = ModelLoader('cpu')
+        pipeline = loader.current_pipeline = SDXLPipeline(layers_per_block=2)
+        assert loader._load_lora_adapter(lora_path, 'sgm_lora')
+        unet_state, unet_kwargs = pipeline.unet_calls[0]
+        keys = list(unet_state)
+        assert any('down_blocks.1.attentions.0' in key for key in keys), keys
+        assert any('up_blocks.0.attentions.0' in key for key in keys), keys
+        assert not any('input_blocks' in key or 'output_blocks' in key for key in keys), keys
+        assert 'low_cpu_mem_usage' in unet_kwargs and 'metadata' in unet_kwargs
+        assert pipeline.text_encoder_calls == ['text_encoder', 'text_encoder_2']
+
+        # 같은 UNet 구조면 캐시 재사용, 다른 구조면 다시 재매핑
+        loader._load_lora_adapter(lora_path, 'sgm_lora_2')
+        assert loader.lora_state_cache.get_stats()['hits'] == 1
+        loader.current_pipeline = SDXLPipeline(layers_per_block=3)
+        loader._load_lora_adapter(lora_path, 'sgm_lora')
+        assert loader.lora_state_cache.get_stats()['misses'] == 2
+    print("✅ SDXL SGM 형식 LoRA 키 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_lora_state_cache()
+    test_sdxl_sgm_keys()
+    print("\n🎉 LoRA state dict 캐시 테스트 성공!")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""mmap 가중치 로더 테스트 스크립트 (CPU 전용, 작은 모듈 사용)"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import torch
+from accelerate import init_empty_weights
+from safetensors.torch import save_file
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.mmap_loader import MmapWeightLoader
+
+
+class TinyBlock(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.proj = torch.nn.Linear(8, 8)
+        self.norm = torch.nn.BatchNorm1d(8)  # 버퍼(running_mean 등) 포함
+
+
+def test_assign_weights():
+    """meta 모듈에 텐서 단위로 float16 변환하여 할당되는지 확인"""
+    print("🔍 mmap 가중치 할당 테스트...")
+    torch.manual_seed(0)
+    source = TinyBlock()
+    with tempfile.TemporaryDirectory() as tmp:
+        weights_file = Path(tmp) / 'model.safetensors'
+        save_file({key: value.contiguous() for key, value in source.state_dict().items()}, str(weights_file))
+
+        with init_empty_weights():
+            target = TinyBlock()
+        assert target.proj.weight.device.type == 'meta'
+
+        loader = MmapWeightLoader(torch.float16)
+        assigned = loader.assign_weights(target, [weights_file])
+        assert assigned == len(source.state_dict())
+        assert target.proj.weight.dtype == torch.float16 and not target.proj.weight.requires_grad
+        assert torch.allclose(target.proj.weight.float(), source.proj.weight, atol=1e-3)
+        assert target.norm.num_batches_tracked.dtype == torch.int64  # 정수 버퍼는 변환하지 않음
+
+        # 가중치가 빠진 파일은 오류
+        partial_file = Path(tmp) / 'partial.safetensors'
+        save_file({'proj.weight': source.proj.weight.detach().contiguous()}, str(partial_file))
+        with init_empty_weights():
+            incomplete = TinyBlock()
+        try:
+            loader.assign_weights(incomplete, [partial_file])
+            assert False, "누락된 가중치가 통과됨"
+        except ValueError:
+            pass
+    print("✅ mmap 가중치 할당 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_assign_weights()
+    print("\n🎉 mmap 가중치 로더 테스트 성공!")
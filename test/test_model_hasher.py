@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""모델 해시 서비스 테스트 스크립트"""
+
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.model_hasher import ModelHashService
+from src.nicediff.services.model_scanner import ModelScanner
+from src.nicediff.services.scan_index import ScanIndex
+
+
+def _write_model(path: Path, payload_size: int, fill: bytes = b'\x01'):
+    """헤더 + 가중치 바이트를 가진 safetensors 파일 생성"""
+    header = json.dumps({'__metadata__': {}}).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(fill * payload_size)
+
+
+def test_hash_service():
+    """해시 계산/저장/조회 및 mtime당 1회 계산 확인"""
+    print("🔍 모델 해시 서비스 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        ckpt_dir = tmp_path / 'checkpoints'
+        ckpt_dir.mkdir()
+        _write_model(ckpt_dir / 'a.safetensors', 2 * 1024 * 1024)
+        _write_model(ckpt_dir / 'b.safetensors', 1024, fill=b'\x02')
+
+        index_path = tmp_path / ScanIndex.INDEX_FILENAME
+        scanner = ModelScanner({'checkpoints': str(ckpt_dir)}, index_path=index_path)
+        asyncio.run(scanner.scan_all_models())
+
+        hasher = ModelHashService(scanner.scan_index, full_hash=True, max_mb_per_sec=None, chunk_size=64 * 1024)
+        hasher.start()
+        assert hasher.enqueue_missing() == 2
+        assert hasher.wait_idle(timeout=10)
+        hasher.stop()
+
+        path_a = ckpt_dir / 'a.safetensors'
+        data = path_a.read_bytes()
+        hashes = hasher.get_hashes(path_a)
+        assert hashes['quick'] == hashlib.sha256(data[0x100000:0x110000]).hexdigest()[:8]
+        assert hashes['sha256'] == hashlib.sha256(data).hexdigest()
+        assert hashes['autov2'] == hashes['sha256'][:10]
+        assert ModelHashService.short_hash(hashes) == hashes['autov2']
+
+        # 인덱스에 저장되어 재시작 후에도 다시 계산하지 않음
+        reloaded = ModelHashService(ScanIndex(index_path), full_hash=True)
+        assert reloaded.enqueue_missing() == 0
+        assert reloaded.find_by_hash(hashes['autov2'].upper()) == str(path_a)
+        assert reloaded.find_by_hash(hashes['quick']) == str(path_a)
+        assert reloaded.find_by_hash(hashes['sha256'][:16], 'checkpoints') == str(path_a)
+        assert reloaded.find_by_hash(hashes['sha256'][:16], 'loras') is None
+
+        # 미리보기 PNG만 바뀌면 해시 유지, 모델 파일이 바뀌면 무효화
+        scanner = ModelScanner({'checkpoints': str(ckpt_dir)}, index_path=index_path)
+        (ckpt_dir / 'a.png').write_bytes(b'not really a png')
+        asyncio.run(scanner.scan_all_models())
+        assert ModelHashService(scanner.scan_index).get_hashes(path_a) is not None
+
+        _write_model(path_a, 2 * 1024 * 1024, fill=b'\x03')
+        stat_result = path_a.stat()
+        os.utime(path_a, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        scanner.apply_file_changes([path_a])
+        hasher = ModelHashService(scanner.scan_index)
+        assert hasher.get_hashes(path_a) is None
+        assert hasher.find_by_hash(hashes['autov2']) is None
+        assert hasher.enqueue_missing() == 1
+    print("✅ 모델 해시 서비스 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_hash_service()
+    print("\n🎉 모델 해시 테스트 성공!")
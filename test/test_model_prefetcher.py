@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""다음 모델 예측 프리페치 테스트 스크립트"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.model_prefetcher import ModelPrefetcher
+
+
+def _wait_idle(prefetcher: ModelPrefetcher, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while prefetcher.get_status()['jobs'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert not prefetcher.get_status()['jobs'], "프리페치 작업이 끝나지 않음"
+
+
+def _make_models(root: Path, count: int, size: int = 300_000):
+    models = []
+    for i in range(count):
+        path = root / f'model_{i}.safetensors'
+        path.write_bytes(os.urandom(size))
+        models.append({'path': str(path), 'name': path.stem, 'model_type': 'SD15'})
+    return models
+
+
+def test_warm_and_prebuild():
+    """페이지 캐시 예열(파일 전체 순차 읽기)과 CPU 파이프라인 사전 생성 확인"""
+    print("🔍 예열/사전 생성 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_a, model_b = _make_models(Path(tmp), 2)
+        built = []
+        prefetcher = ModelPrefetcher(build_pipeline=lambda path, model_type: built.append(path) or f'pipe:{path}',
+                                     prebuild=True, chunk_size=64 * 1024, hover_delay=0)
+
+        prefetcher.hint(model_a, reason='select')
+        _wait_idle(prefetcher)
+        assert prefetcher.stats['warmed_bytes'] == 300_000
+        assert built == [model_a['path']]
+
+        # 이미 준비된 모델은 다시 시작하지 않음, 가져가면 비워짐
+        assert prefetcher.prefetch(model_a) is None
+        assert prefetcher.take_prebuilt(model_a['path']) == f"pipe:{model_a['path']}"
+        assert prefetcher.take_prebuilt(model_a['path']) is None
+
+        # 사전 생성 결과는 하나만 유지 (다른 모델이 준비되면 이전 것은 해제)
+        prefetcher.prefetch(model_a)
+        _wait_idle(prefetcher)
+        prefetcher.prefetch(model_b)
+        _wait_idle(prefetcher)
+        assert prefetcher.get_status()['prebuilt'] == [model_b['path']]
+        prefetcher.shutdown()
+    print("✅ 예열/사전 생성 테스트 통과")
+
+
+def test_cancel_and_concurrency_cap():
+    """동시 작업 수 상한 초과 시 오래된 작업 취소, 취소된 사전 생성 결과는 버림"""
+    print("🔍 취소/동시 작업 상한 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_a, model_b, model_c = _make_models(Path(tmp), 3)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_build(path, model_type):
+            started.set()
+            release.wait(5)
+            return f'pipe:{path}'
+
+        prefetcher = ModelPrefetcher(build_pipeline=slow_build, prebuild=True, max_concurrent=1, hover_delay=0)
+        job_a = prefetcher.prefetch(model_a)
+        assert started.wait(5)
+        job_b = prefetcher.prefetch(model_b)  # 예측이 바뀜 → A 취소
+        assert job_a.cancelled and not job_b.cancelled
+        assert [job['path'] for job in prefetcher.get_status()['jobs']] == [model_b['path']]
+
+        # 로드할 모델이 정해지면 나머지는 취소
+        prefetcher.cancel_all(except_path=model_c['path'])
+        assert job_b.cancelled
+        release.set()
+        job_a.future.result(5)
+        assert job_b.future.cancelled()  # 시작 전에 취소되어 실행되지 않음
+        assert job_a.state == 'cancelled'
+        assert prefetcher.get_status()['prebuilt'] == []
+        assert prefetcher.stats['cancelled'] == 2
+        prefetcher.shutdown()
+
+        # 마우스 오버는 잠시 머무를 때만 시작 (빠르게 지나가면 마지막 것만)
+        prefetcher = ModelPrefetcher(hover_delay=0.1)
+        prefetcher.hint(model_a)
+        prefetcher.hint(model_b)
+        time.sleep(0.3)
+        _wait_idle(prefetcher)
+        assert prefetcher.stats['started'] == 1
+        assert prefetcher.stats['warmed_bytes'] == 300_000
+        prefetcher.shutdown()
+    print("✅ 취소/동시 작업 상한 테스트 통과")
+
+
+def test_take_cancels_pending_prebuild():
+    """사전 생성 전(대기/예열) 작업은 take_prebuilt가 취소해 같은 파이프라인을 두 번 만들지 않음, 생성 중이면 기다림"""
+    print("🔍 사전 생성 전 작업 가져가기 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_a, model_b = _make_models(Path(tmp), 2)
+        built = []
+        paused = threading.Event()
+        paused.set()
+        prefetcher = ModelPrefetcher(build_pipeline=lambda path, model_type: built.append(path) or f'pipe:{path}',
+                                     prebuild=True, hover_delay=0, should_pause=paused.is_set)
+
+        job = prefetcher.prefetch(model_a)  # 생성 중 일시정지로 대기 상태에 머묾
+        time.sleep(0.05)
+        assert job.state == 'queued'
+        prefetcher.cancel_all(except_path=model_a['path'])  # 로드할 모델의 작업은 유지
+        assert not job.cancelled
+        assert prefetcher.take_prebuilt(model_a['path']) is None
+        paused.clear()
+        assert job.cancelled
+        job.future.result(5)
+        assert prefetcher.get_status()['jobs'] == []
+        assert built == [] and prefetcher.get_status()['prebuilt'] == []
+
+        # 생성 중인 작업은 끝날 때까지 기다렸다가 가져감
+        release = threading.Event()
+        building = threading.Event()
+
+        def slow_build(path, model_type):
+            building.set()
+            release.wait(5)
+            return f'pipe:{path}'
+
+        prefetcher.build_pipeline = slow_build
+        prefetcher.prefetch(model_b)
+        assert building.wait(5)
+        threading.Timer(0.05, release.set).start()
+        assert prefetcher.take_prebuilt(model_b['path']) == f"pipe:{model_b['path']}"
+        prefetcher.shutdown()
+    print("✅ 사전 생성 전 작업 가져가기 테스트 통과")
+
+
+def test_usage_prediction():
+    """사용 기록의 전이 횟수로 다음 모델 예측 및 기록 저장/복원"""
+    print("🔍 사용 기록 예측 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_a, model_b, model_c = _make_models(Path(tmp), 3, size=1000)
+        history_path = Path(tmp) / 'usage.json'
+        prefetcher = ModelPrefetcher(history_path=history_path)
+        assert prefetcher.predict_next(model_a['path']) is None
+
+        # A → B 두 번, A → C 한 번
+        for model in (model_a, model_b, model_a, model_c, model_a, model_b, model_a):
+            prefetcher.record_usage(model)
+        assert prefetcher.predict_next(model_a['path'])['path'] == model_b['path']
+        # 전이 기록이 없으면 최근 사용 모델
+        assert prefetcher.predict_next(model_c['path'])['path'] == model_a['path']
+        prefetcher.shutdown()
+
+        restored = ModelPrefetcher(history_path=history_path)
+        assert restored.predict_next(model_a['path'])['path'] == model_b['path']
+
+        # 삭제된 파일은 예측하지 않음
+        os.remove(model_b['path'])
+        assert restored.predict_next(model_a['path'])['path'] == model_c['path']
+        restored.shutdown()
+    print("✅ 사용 기록 예측 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_warm_and_prebuild()
+    test_take_cancels_pending_prebuild()
+    test_cancel_and_concurrency_cap()
+    test_usage_prediction()
+    print("\n🎉 모델 프리페치 테스트 성공!")
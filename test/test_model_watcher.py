@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""모델 폴더 감시(증분 델타) 테스트 스크립트 - GPU 불필요"""
+
+import asyncio
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.model_scanner import ModelScanner
+from src.nicediff.services.model_watcher import ModelWatcher
+from src.nicediff.services.scan_index import ScanIndex
+
+
+def _write_safetensors_stub(path: Path, metadata: dict):
+    """헤더만 있는 safetensors 스텁 파일 생성"""
+    header = json.dumps({'__metadata__': metadata}).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+
+
+def _touch_later(path: Path):
+    """mtime 해상도가 낮은 파일 시스템에서도 변경이 보이도록 mtime을 1초 뒤로"""
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+
+def test_apply_file_changes():
+    """변경된 파일만 다시 파싱하여 added/modified/removed 델타를 만드는지 확인"""
+    print("🔍 파일 변경 델타 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        lora_dir = tmp_path / 'loras'
+        lora_dir.mkdir()
+        for i in range(3):
+            _write_safetensors_stub(lora_dir / f'lora_{i}.safetensors', {'ss_base_model_version': 'sd_v1'})
+
+        scanner = ModelScanner({'loras': str(lora_dir)}, index_path=tmp_path / ScanIndex.INDEX_FILENAME)
+        asyncio.run(scanner.scan_all_models())
+        assert scanner.reparsed_count == 3
+
+        # 추가 1, 수정 1, 삭제 1 (절대 경로로 보고되어도 스캔 결과와 같은 경로로 매칭)
+        added = lora_dir / 'lora_new.safetensors'
+        _write_safetensors_stub(added, {'ss_base_model_version': 'sdxl_base_v1-0'})
+        _write_safetensors_stub(lora_dir / 'lora_1.safetensors', {'ss_base_model_version': 'sdxl_base_v1-0'})
+        _touch_later(lora_dir / 'lora_1.safetensors')
+        (lora_dir / 'lora_2.safetensors').unlink()
+
+        scanner.reparsed_count = 0
+        changed = [added.absolute(), (lora_dir / 'lora_1.safetensors').absolute(),
+                   (lora_dir / 'lora_2.safetensors').absolute(), (lora_dir / 'notes.txt').absolute()]
+        deltas = scanner.apply_file_changes(changed)
+
+        assert list(deltas) == ['loras']
+        delta = deltas['loras']
+        assert [item['name'] for item in delta['added']] == ['lora_new']
+        assert [item['name'] for item in delta['modified']] == ['lora_1']
+        assert delta['removed'] == [str(lora_dir / 'lora_2.safetensors')]
+        assert scanner.reparsed_count == 2  # lora_0은 건드리지 않음
+
+        # 같은 변경을 다시 보고해도 델타 없음
+        assert scanner.apply_file_changes(changed) == {}
+    print("✅ 파일 변경 델타 테스트 통과")
+
+
+def test_polling_watcher():
+    """폴링 감시자가 파일 추가/삭제를 감지하여 콜백으로 델타를 전달하는지 확인"""
+    print("🔍 폴링 감시자 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        ckpt_dir = tmp_path / 'checkpoints' / 'sub'
+        ckpt_dir.mkdir(parents=True)
+        _write_safetensors_stub(ckpt_dir / 'base.safetensors', {})
+
+        scanner = ModelScanner({'checkpoints': str(tmp_path / 'checkpoints')},
+                               index_path=tmp_path / ScanIndex.INDEX_FILENAME)
+        received = []
+
+        async def run():
+            await scanner.scan_all_models()
+            watcher = ModelWatcher(scanner, lambda model_type, delta: received.append((model_type, delta)),
+                                   poll_interval=0.05, force_polling=True)
+            watcher.start()
+            await asyncio.sleep(0.2)
+            assert watcher.mode == 'polling'
+
+            _write_safetensors_stub(ckpt_dir / 'added.safetensors', {})
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.05)
+
+            (ckpt_dir / 'base.safetensors').unlink()
+            for _ in range(100):
+                if len(received) > 1:
+                    break
+                await asyncio.sleep(0.05)
+            await watcher.stop()
+            assert not watcher.is_running
+
+        asyncio.run(run())
+        assert len(received) == 2
+        assert received[0][0] == 'checkpoints'
+        assert [item['name'] for item in received[0][1]['added']] == ['added']
+        assert received[0][1]['added'][0]['folder'] == 'sub'
+        assert received[1][1]['removed'] == [str(ckpt_dir / 'base.safetensors')]
+        names = [item['name'] for items in scanner.get_cached_models()['checkpoints'].values() for item in items]
+        assert names == ['added']
+    print("✅ 폴링 감시자 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_apply_file_changes()
+    test_polling_watcher()
+    print("\n🎉 모델 폴더 감시 테스트 성공!")
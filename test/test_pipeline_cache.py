@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""파이프라인 LRU 캐시 테스트 스크립트 (CPU 전용, 작은 모듈 사용)"""
+
+import os
+import sys
+
+import torch
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.pipeline_cache import PipelineCache
+
+
+class TinyPipeline:
+    """diffusers 파이프라인처럼 components와 to()를 가진 작은 파이프라인"""
+
+    def __init__(self, features: int):
+        self.unet = torch.nn.Linear(features, features)
+        self.vae = torch.nn.Linear(features, 4)
+        self.scheduler = object()
+
+    @property
+    def components(self):
+        return {'unet': self.unet, 'vae': self.vae, 'scheduler': self.scheduler}
+
+    def to(self, device):
+        self.unet.to(device)
+        self.vae.to(device)
+        return self
+
+
+def test_pipeline_cache_cpu():
+    """적중/실패 통계, RAM 예산과 최대 개수에 따른 LRU 제거 확인"""
+    print("🔍 파이프라인 캐시 테스트...")
+    pipeline_bytes = sum(PipelineCache.measure(TinyPipeline(256)))
+    assert pipeline_bytes == (256 * 256 + 256 + 256 * 4 + 4) * 4
+
+    # 파이프라인 2개 반 정도의 RAM 예산
+    cache = PipelineCache('cpu', max_ram_mb=pipeline_bytes * 2.5 / (1024 * 1024), max_entries=5)
+    a, b, c = TinyPipeline(256), TinyPipeline(256), TinyPipeline(256)
+
+    assert cache.get('a') is None
+    cache.put('a', a, name='A')
+    assert cache.get('b') is None
+    cache.put('b', b, name='B')
+    assert cache.get('a')['pipeline'] is a  # a가 가장 최근으로 이동
+    cache.put('c', c, name='C')  # 예산 초과 → 가장 오래된 b 제거
+
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 2, 1)
+    assert abs(stats['ram_mb'] - pipeline_bytes * 2 / (1024 * 1024)) < 1e-6
+    assert [model['name'] for model in stats['models']] == ['A', 'C']
+
+    # 최대 개수 제한 (현재 항목은 항상 유지)
+    cache.configure(max_ram_mb=1024, max_entries=1)
+    assert len(cache) == 1 and 'c' in cache
+
+    # 예산보다 큰 파이프라인도 현재 항목이면 유지
+    cache.configure(max_ram_mb=0.001, max_entries=3)
+    cache.put('big', TinyPipeline(512), name='BIG')
+    assert len(cache) == 1 and 'big' in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    print("✅ 파이프라인 캐시 테스트 통과")
+
+
+class TrackedPipeline(TinyPipeline):
+    """실제 텐서는 CPU에 둔 채 장치 위치와 to() 호출 순서만 기록하는 파이프라인"""
+
+    def __init__(self, name: str, features: int, events: list):
+        super().__init__(features)
+        self.name = name
+        self.location = 'cpu'
+        self.events = events
+
+    def to(self, device):
+        self.events.append((self.name, str(device)))
+        self.location = str(device)
+        return self
+
+
+class TrackedCache(PipelineCache):
+    """TrackedPipeline.location 기준으로 장치/CPU 메모리를 측정하는 캐시 (GPU 없이 강등 순서 확인용)"""
+
+    @classmethod
+    def measure(cls, *pipelines):
+        device_bytes = cpu_bytes = 0
+        for pipeline in pipelines:
+            size = sum(super(TrackedCache, cls).measure(pipeline))
+            if getattr(pipeline, 'location', 'cpu') == 'cpu':
+                cpu_bytes += size
+            else:
+                device_bytes += size
+        return device_bytes, cpu_bytes
+
+
+def test_demote_before_device_move():
+    """캐시 미스로 새 모델을 로드할 때 이전 파이프라인을 먼저 CPU로 강등한 뒤 새 파이프라인을 장치로 이동"""
+    import asyncio
+    from src.nicediff.domains.generation.services.model_loader import ModelLoader
+
+    print("🔍 장치 이동 전 강등 테스트...")
+    events = []
+    pipelines = {name: TrackedPipeline(name, 256, events) for name in ('a', 'b', 'c')}
+    pipeline_bytes = sum(PipelineCache.measure(TinyPipeline(256)))
+
+    loader = ModelLoader('cpu')
+    loader.device = 'cuda'
+    # VRAM에는 파이프라인 하나 반만 들어감
+    loader.pipeline_cache = TrackedCache('cuda', max_vram_mb=pipeline_bytes * 1.5 / (1024 * 1024), max_ram_mb=1024,
+                                         max_entries=3, on_release=loader._release_shared_components)
+    loader.build_pipeline = lambda model_path, model_type, load_profile=None: pipelines[model_path]
+    loader._apply_optimizations = lambda pipeline, model_type, load_profile=None: None
+
+    async def run():
+        for name in ('a', 'b', 'c'):
+            assert await loader.load_model({'path': name, 'name': name, 'model_type': 'SD15'}) is pipelines[name]
+
+    asyncio.run(run())
+    assert events == [('a', 'cuda'), ('a', 'cpu'), ('b', 'cuda'), ('b', 'cpu'), ('c', 'cuda')], events
+    models = loader.pipeline_cache.get_stats()['models']
+    assert [model['location'] for model in models] == ['cpu', 'cpu', 'device']
+    print("✅ 장치 이동 전 강등 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_pipeline_cache_cpu()
+    test_demote_before_device_move()
+    print("\n🎉 파이프라인 캐시 테스트 성공!")
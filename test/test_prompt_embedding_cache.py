@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""프롬프트 임베딩 캐시 테스트 스크립트 (호출 횟수를 세는 가짜 텍스트 인코더 사용)"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from src.nicediff.domains.generation.services.prompt_embedding_cache import PromptEmbeddingCache
+from src.nicediff.domains.generation.services.advanced_encoder import AdvancedTextEncoder
+
+
+class Tokenizer:
+    bos_token_id, eos_token_id, pad_token_id = 1, 2, 0
+
+    def encode(self, text, add_special_tokens=True):
+        ids = [3 + len(word) for word in text.split()]
+        return [1] + ids + [2] if add_special_tokens else ids
+
+
+class TextEncoder:
+    device = torch.device('cpu')
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input_ids):
+        self.calls += 1
+        return (input_ids.unsqueeze(-1).float().expand(-1, -1, 8).clone(),)
+
+
+class Pipeline:
+    def __init__(self):
+        self.tokenizer = Tokenizer()
+        self.text_encoder = TextEncoder()
+
+
+def test_lru_and_size_cap():
+    """개수/바이트 상한을 넘으면 오래된 항목부터 제거, 조회하면 최신으로 갱신"""
+    print("🔍 LRU/용량 상한 테스트...")
+    embeds = (torch.zeros(1, 77, 64), torch.zeros(1, 77, 64), None, None)  # 약 38.5KB
+    cache = PromptEmbeddingCache(max_entries=3, max_mb=None)
+    keys = [cache.make_key('model', f'prompt {i}', '', 'A1111', True) for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, embeds)
+    assert cache.get(keys[0]) is embeds
+    cache.put(keys[3], embeds)
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is embeds
+
+    cache.configure(max_entries=10, max_mb=0.08)  # 2개만 들어감
+    assert cache.get_stats()['entries'] == 2
+    cache.invalidate('테스트')
+    assert cache.get_stats()['entries'] == 0
+    print("✅ LRU/용량 상한 테스트 통과")
+
+
+def test_encoder_uses_cache():
+    """같은 지문/프롬프트/설정이면 텍스트 인코더를 다시 실행하지 않음"""
+    print("🔍 인코더 캐시 적중 테스트...")
+    pipeline = Pipeline()
+    cache = PromptEmbeddingCache()
+
+    def encode(prompt, fingerprint='model-a', clip_skip=1, weight_mode='A1111'):
+        encoder = AdvancedTextEncoder(pipeline, weight_mode=weight_mode, embedding_cache=cache,
+                                      cache_fingerprint=fingerprint, clip_skip=clip_skip)
+        return encoder.encode_prompt_with_pooled(prompt, 'bad hands')
+
+    first = encode('a cat')
+    assert pipeline.text_encoder.calls == 1  # 긍정 + 부정을 한 번에
+    again = encode('a cat')
+    assert pipeline.text_encoder.calls == 1 and again[0] is first[0]
+    assert torch.equal(first[0], AdvancedTextEncoder(pipeline).encode_prompt_with_pooled('a cat', 'bad hands')[0])
+
+    calls = pipeline.text_encoder.calls
+    encode('a cat', fingerprint='model-a+lora')  # LoRA 조합이 바뀌면 다른 키
+    encode('a cat', clip_skip=2)
+    encode('a cat', weight_mode='comfy++')
+    assert pipeline.text_encoder.calls == calls + 3
+
+    # 지문이 없으면 캐시를 쓰지 않음
+    calls = pipeline.text_encoder.calls
+    encode('a cat', fingerprint=None)
+    assert pipeline.text_encoder.calls == calls + 1
+    print("✅ 인코더 캐시 적중 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_lru_and_size_cap()
+    test_encoder_uses_cache()
+    print("\n🎉 프롬프트 임베딩 캐시 테스트 성공!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""safetensors 헤더 캐시 테스트 스크립트 (접근자 간 헤더 읽기 공유, mtime/크기 변경 시 무효화)"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.metadata_parser import MetadataParser, SafetensorsHeaderCache
+
+
+class CountingHeaderCache(SafetensorsHeaderCache):
+    """실제 파일 읽기(_read_header) 횟수를 세는 헤더 캐시"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def _read_header(self, model_path: Path):
+        self.reads += 1
+        return SafetensorsHeaderCache._read_header(model_path)
+
+
+def _write_safetensors_stub(path: Path, metadata: dict, tensors: dict = None):
+    """헤더만 있는 safetensors 스텁 파일 생성"""
+    header = dict(tensors or {})
+    header['__metadata__'] = metadata
+    header_bytes = json.dumps(header).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+
+
+def _with_cache(test):
+    """MetadataParser 공유 캐시를 테스트 동안 새 캐시로 교체"""
+    def wrapper():
+        original = MetadataParser.header_cache
+        MetadataParser.header_cache = CountingHeaderCache()
+        try:
+            test(MetadataParser.header_cache)
+        finally:
+            MetadataParser.header_cache = original
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@_with_cache
+def test_single_read_shared(cache):
+    """메타데이터 추출, 모델 타입 감지, LoRA 정보 조회가 헤더 읽기 한 번을 공유"""
+    print("🔍 헤더 읽기 공유 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        lora_path = Path(tmp) / 'style.safetensors'
+        _write_safetensors_stub(lora_path, {
+            'ss_base_model_version': 'sdxl_base_v1-0',
+            'ss_tag_frequency': json.dumps({'data': {'red hair': 3, 'smile': 1}}),
+        })
+
+        metadata = MetadataParser.extract_from_safetensors(lora_path)
+        assert metadata['ss_base_model_version'] == 'sdxl_base_v1-0'
+        assert MetadataParser.detect_model_type(lora_path)[0] == 'SDXL'
+        lora_info = MetadataParser.get_lora_info(lora_path)
+        assert lora_info['base_model'] == 'SDXL' and lora_info['tags'] == ['red hair', 'smile']
+        MetadataParser.get_model_info(lora_path)
+
+        assert cache.reads == 1
+        assert cache.get_stats()['misses'] == 1 and cache.get_stats()['hits'] > 1
+
+        # 반환된 메타데이터를 수정해도 캐시된 헤더는 그대로
+        metadata['ss_base_model_version'] = 'changed'
+        assert MetadataParser.extract_from_safetensors(lora_path)['ss_base_model_version'] == 'sdxl_base_v1-0'
+        assert cache.reads == 1
+    print("✅ 헤더 읽기 공유 테스트 통과")
+
+
+@_with_cache
+def test_invalidated_on_change(cache):
+    """mtime 또는 크기가 바뀌면 헤더를 다시 읽음"""
+    print("🔍 헤더 캐시 무효화 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / 'model.safetensors'
+        _write_safetensors_stub(model_path, {'modelspec.architecture': 'stable-diffusion-v1'})
+        assert MetadataParser.extract_from_safetensors(model_path)['modelspec.architecture'] == 'stable-diffusion-v1'
+        assert cache.reads == 1
+        stat_result = model_path.stat()
+
+        # 같은 크기로 내용만 바꾸고 mtime만 변경
+        _write_safetensors_stub(model_path, {'modelspec.architecture': 'stable-diffusion-v2'})
+        assert model_path.stat().st_size == stat_result.st_size
+        os.utime(model_path, ns=(stat_result.st_mtime_ns, stat_result.st_mtime_ns))
+        assert MetadataParser.extract_from_safetensors(model_path)['modelspec.architecture'] == 'stable-diffusion-v1'
+        assert cache.reads == 1  # 시그니처가 같으면 캐시 사용
+
+        later = stat_result.st_mtime_ns + 10**9
+        os.utime(model_path, ns=(later, later))
+        assert MetadataParser.extract_from_safetensors(model_path)['modelspec.architecture'] == 'stable-diffusion-v2'
+        assert cache.reads == 2
+
+        # mtime은 그대로 두고 크기만 변경
+        _write_safetensors_stub(model_path, {'modelspec.architecture': 'stable-diffusion-xl-v1-base'})
+        os.utime(model_path, ns=(later, later))
+        assert MetadataParser.detect_model_type(model_path)[0] == 'SDXL'
+        assert cache.reads == 3
+    print("✅ 헤더 캐시 무효화 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_single_read_shared()
+    test_invalidated_on_change()
+    print("\n🎉 safetensors 헤더 캐시 테스트 성공!")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""스캔 인덱스(증분 스캔) 테스트 스크립트"""
+
+import asyncio
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.scan_index import ScanIndex
+
+
+def _write_safetensors_stub(path: Path, metadata: dict):
+    """헤더만 있는 safetensors 스텁 파일 생성"""
+    header = json.dumps({'__metadata__': metadata}).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+
+
+def test_scan_index_roundtrip():
+    """저장/로드/시그니처 비교/정리 테스트"""
+    print("🔍 스캔 인덱스 기본 동작 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        model_path = tmp_path / 'loras' / 'a.safetensors'
+        model_path.parent.mkdir()
+        _write_safetensors_stub(model_path, {'ss_base_model_version': 'sdxl_base_v1-0'})
+
+        index = ScanIndex(tmp_path / ScanIndex.INDEX_FILENAME)
+        signature = ScanIndex.make_signature(model_path)
+        assert index.lookup(model_path, 'loras', signature) is None
+
+        index.store(model_path, 'loras', signature, {'name': 'a', 'folder': 'Root', 'path': str(model_path)})
+        assert index.save()
+
+        # 다시 로드해도 동일한 시그니처면 캐시 히트
+        reloaded = ScanIndex(tmp_path / ScanIndex.INDEX_FILENAME)
+        assert reloaded.lookup(model_path, 'loras', signature)['name'] == 'a'
+        assert reloaded.build_result('loras') == {'Root': [{'name': 'a', 'folder': 'Root', 'path': str(model_path), 'signature': signature}]}
+
+        # 파일이 바뀌면 캐시 미스
+        _write_safetensors_stub(model_path, {'ss_base_model_version': 'sd_v1', 'extra': 'x' * 32})
+        os.utime(model_path, ns=(signature['mtime_ns'] + 10**9, signature['mtime_ns'] + 10**9))
+        assert reloaded.lookup(model_path, 'loras', ScanIndex.make_signature(model_path)) is None
+
+        # 기준 폴더를 주면 그 아래만 정리 (이름이 겹치는 형제 폴더는 유지)
+        sibling_path = tmp_path / 'loras_old' / 'b.safetensors'
+        reloaded.store(sibling_path, 'loras', signature, {'name': 'b', 'folder': 'Root', 'path': str(sibling_path)})
+        assert reloaded.prune('loras', [], base_path=tmp_path / 'loras') == 1
+        assert len(reloaded) == 1 and reloaded.lookup(sibling_path, 'loras', signature)['name'] == 'b'
+
+        # 발견되지 않은 항목은 정리
+        assert reloaded.prune('loras', []) == 1
+        assert len(reloaded) == 0
+    print("✅ 스캔 인덱스 기본 동작 테스트 통과")
+
+
+def test_incremental_rescan():
+    """두 번째 스캔에서는 변경된 파일만 다시 파싱하는지 확인"""
+    from src.nicediff.services.model_scanner import ModelScanner
+
+    print("🔍 증분 재스캔 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        lora_dir = tmp_path / 'loras'
+        lora_dir.mkdir()
+        for i in range(5):
+            _write_safetensors_stub(lora_dir / f'lora_{i}.safetensors', {'ss_base_model_version': 'sd_v1'})
+
+        index_path = tmp_path / ScanIndex.INDEX_FILENAME
+        scanner = ModelScanner({'loras': str(lora_dir)}, index_path=index_path)
+        first = asyncio.run(scanner.scan_all_models())
+        assert scanner.reparsed_count == 5
+        assert sum(len(items) for items in first['loras'].values()) == 5
+
+        # 새 스캐너(=앱 재시작)에서는 아무것도 다시 파싱하지 않음
+        (lora_dir / 'lora_0.safetensors').unlink()
+        _write_safetensors_stub(lora_dir / 'lora_new.safetensors', {'ss_base_model_version': 'sdxl_base_v1-0'})
+        scanner = ModelScanner({'loras': str(lora_dir)}, index_path=index_path)
+        assert sum(len(items) for items in scanner.get_cached_models()['loras'].values()) == 5
+
+        # 미리보기 PNG만 추가된 파일은 경로가 같아도 시그니처가 바뀜 (UI가 카드를 다시 그리는 기준)
+        (lora_dir / 'lora_1.png').write_bytes(b'png')
+        second = asyncio.run(scanner.scan_all_models())
+        assert scanner.reparsed_count == 2
+        names = sorted(item['name'] for items in second['loras'].values() for item in items)
+        assert names == ['lora_1', 'lora_2', 'lora_3', 'lora_4', 'lora_new']
+        signatures = [{item['name']: item['signature'] for items in result['loras'].values() for item in items}
+                      for result in (first, second)]
+        assert signatures[0]['lora_2'] == signatures[1]['lora_2']
+        assert signatures[0]['lora_1'] != signatures[1]['lora_1'] and signatures[1]['lora_1']['png'] is not None
+        assert len(ScanIndex(index_path)) == 5
+    print("✅ 증분 재스캔 테스트 통과")
+
+
+def test_streaming_batches():
+    """스트리밍 스캔이 batch_size 단위로 배치를 전달하고 최종 결과와 일치하는지 확인"""
+    from src.nicediff.services.model_scanner import ModelScanner
+
+    print("🔍 스트리밍 스캔 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for folder in ('a', 'b'):
+            (tmp_path / 'loras' / folder).mkdir(parents=True)
+            for i in range(5):
+                _write_safetensors_stub(tmp_path / 'loras' / folder / f'{folder}_{i}.safetensors', {})
+
+        scanner = ModelScanner({'loras': str(tmp_path / 'loras')},
+                               index_path=tmp_path / ScanIndex.INDEX_FILENAME, max_workers=4, batch_size=3)
+
+        async def collect():
+            return [batch async for batch in scanner.scan_models_stream()]
+
+        batches = asyncio.run(collect())
+        assert len(batches) == 4  # 10개 파일 / batch_size 3
+        assert all(model_type == 'loras' for model_type, _ in batches)
+        streamed = sorted(item['path'] for _, batch in batches for items in batch.values() for item in items)
+        final = sorted(item['path'] for items in scanner.last_result['loras'].values() for item in items)
+        assert streamed == final and len(final) == 10
+    print("✅ 스트리밍 스캔 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_scan_index_roundtrip()
+    test_incremental_rescan()
+    test_streaming_batches()
+    print("\n🎉 스캔 인덱스 테스트 성공!")
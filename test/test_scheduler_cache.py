@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""스케줄러 캐시 테스트 스크립트 (설정 오버라이드 적용, 인스턴스/timestep 표 재사용)"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from diffusers import EulerDiscreteScheduler, DPMSolverMultistepScheduler
+
+from src.nicediff.domains.generation.services.scheduler_manager import SchedulerManager
+
+
+def make_pipeline():
+    scheduler = EulerDiscreteScheduler(beta_start=0.00085, beta_end=0.012, beta_schedule='scaled_linear')
+    return SimpleNamespace(scheduler=scheduler)
+
+
+def test_overrides_apply():
+    """karras 등 스케줄 설정이 실제로 새 스케줄러 설정에 반영되고, 이전 샘플러 설정이 섞이지 않음"""
+    print("🔍 스케줄 설정 적용 테스트...")
+    SchedulerManager.clear_cache()
+    pipeline = make_pipeline()
+
+    assert SchedulerManager.apply_scheduler_to_pipeline(pipeline, 'dpmpp_2m', 'karras')
+    assert isinstance(pipeline.scheduler, DPMSolverMultistepScheduler)
+    assert pipeline.scheduler.config['use_karras_sigmas'] is True
+    assert 'karras_rho' not in pipeline.scheduler.config  # diffusers 설정이 아닌 항목은 넘기지 않음
+
+    assert SchedulerManager.apply_scheduler_to_pipeline(pipeline, 'dpmpp_2m', 'normal')
+    assert pipeline.scheduler.config['use_karras_sigmas'] is False  # 모델 원래 설정 기준
+    assert pipeline.scheduler.config['beta_end'] == 0.012
+    print("✅ 스케줄 설정 적용 테스트 통과")
+
+
+def test_instance_and_timestep_reuse():
+    """같은 설정이면 같은 스케줄러 인스턴스, 같은 스텝 수면 저장된 timestep/sigma 표로 상태 복원"""
+    print("🔍 스케줄러/timestep 재사용 테스트...")
+    SchedulerManager.clear_cache()
+    pipeline = make_pipeline()
+
+    SchedulerManager.apply_scheduler_to_pipeline(pipeline, 'dpmpp_2m', 'karras')
+    scheduler = pipeline.scheduler
+    SchedulerManager.apply_scheduler_to_pipeline(pipeline, 'euler', 'normal')
+    SchedulerManager.apply_scheduler_to_pipeline(pipeline, 'dpmpp_2m', 'karras')
+    assert pipeline.scheduler is scheduler
+
+    scheduler.set_timesteps(20, device='cpu')
+    timesteps, sigmas = scheduler.timesteps.clone(), scheduler.sigmas.clone()
+    sample = torch.zeros(1, 4, 8, 8)
+    for t in scheduler.timesteps[:3]:
+        sample = scheduler.step(torch.ones_like(sample), t, sample).prev_sample
+    assert scheduler.step_index == 3
+
+    scheduler.set_timesteps(20, device='cpu')
+    stats = SchedulerManager.get_cache_stats()
+    assert stats['timestep_hits'] == 1 and stats['timestep_misses'] == 1
+    assert scheduler.step_index is None and scheduler.model_outputs == [None] * scheduler.config.solver_order
+    assert torch.equal(scheduler.timesteps, timesteps) and torch.equal(scheduler.sigmas, sigmas)
+
+    reference = DPMSolverMultistepScheduler.from_config(make_pipeline().scheduler.config, use_karras_sigmas=True)
+    reference.set_timesteps(20, device='cpu')
+    assert torch.equal(reference.timesteps, timesteps) and torch.allclose(reference.sigmas, sigmas)
+
+    scheduler.set_timesteps(30, device='cpu')  # 다른 스텝 수는 새로 계산
+    assert len(scheduler.timesteps) == 30 and SchedulerManager.get_cache_stats()['timestep_misses'] == 2
+    print("✅ 스케줄러/timestep 재사용 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_overrides_apply()
+    test_instance_and_timestep_reuse()
+    print("\n🎉 스케줄러 캐시 테스트 성공!")
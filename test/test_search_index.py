@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""모델 검색 인덱스 테스트 스크립트"""
+
+import json
+import os
+import random
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.metadata_parser import MetadataParser
+from src.nicediff.services.search_index import ModelSearchIndex
+
+
+def _lora(name, folder='Root', base_model='SD1.5', trigger_words=None, tags=None):
+    return {
+        'name': name, 'path': f'/models/loras/{folder}/{name}.safetensors', 'folder': folder,
+        'base_model': base_model, 'trigger_words': trigger_words or [], 'tags': tags or [],
+    }
+
+
+def test_lora_keywords():
+    """ss_tag_frequency / ss_trigger_words 추출 확인"""
+    print("🔍 LoRA 키워드 추출 테스트...")
+    metadata = {
+        'ss_trigger_words': 'mychar, red hair',
+        'ss_tag_frequency': json.dumps({'10_mychar': {'1girl': 40, 'red hair': 12}, '5_extra': {'1girl': 5, 'smile': 30}}),
+    }
+    trigger_words, tags = MetadataParser.extract_lora_keywords(metadata)
+    assert trigger_words == ['mychar', 'red hair']
+    assert tags == ['1girl', 'smile', 'red hair']
+    assert MetadataParser.extract_lora_keywords({'ss_tag_frequency': 'not json'}) == ([], [])
+    print("✅ LoRA 키워드 추출 테스트 통과")
+
+
+def test_search_index():
+    """이름/트리거/태그/기본 모델/폴더 검색, 접두사/오타 허용, 증분 갱신 확인"""
+    print("🔍 모델 검색 인덱스 테스트...")
+    index = ModelSearchIndex()
+    detail = _lora('detailTweaker_v2', folder='style')
+    char = _lora('mychar_v1', folder='characters', base_model='SDXL', trigger_words=['mychar'], tags=['red hair', '1girl'])
+    index.rebuild({'loras': {'style': [detail], 'characters': [char]},
+                   'checkpoints': {'Root': [{'name': 'dreamshaper_8', 'path': '/models/checkpoints/dreamshaper_8.safetensors',
+                                             'folder': 'Root', 'base_model': 'SD1.5', 'model_type': 'SD15'}]}})
+
+    assert index.search('tweaker') == [detail]  # camelCase 분리
+    assert index.search('detailtw') == [detail]  # 합친 토큰의 접두사
+    assert index.search('red hair') == [char]
+    assert index.search('sdxl') == [char]
+    assert index.search('charac') == [char]  # 폴더 접두사
+    assert index.search('mychr') == [char]  # 오타 허용 (삭제)
+    assert index.search('dreamshapr') == index.search('dreamshaper', model_type='checkpoints')
+    assert index.search('sd15', model_type='loras') == [detail]
+    assert index.search('sd1.5', model_type='loras', base_model='SDXL') == []
+    assert index.search('') == [] and index.search('zzzz') == []
+    # 이름 일치가 태그 일치보다 앞섬
+    tagged = _lora('other', tags=['mychar'])
+    index.add_items('loras', [tagged])
+    assert index.search('mychar') == [char, tagged]
+
+    # 감시 델타 반영
+    renamed = dict(char, name='heroine_v1', trigger_words=['heroine'])
+    index.apply_delta('loras', {'added': [], 'modified': [renamed], 'removed': [tagged['path']]})
+    assert index.search('mychar') == []
+    assert index.search('heroine') == [renamed]
+    assert index.search('other') == []
+    print("✅ 모델 검색 인덱스 테스트 통과")
+
+
+def test_search_speed():
+    """2만 개 항목에서 검색이 1ms 안팎인지 확인"""
+    print("🔍 모델 검색 속도 테스트...")
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9))) for _ in range(3000)]
+    loras = {}
+    for i in range(20000):
+        item = _lora(f'{rng.choice(words)}_{rng.choice(words)}_v{i % 7}', folder=f'folder{i % 40}',
+                     base_model=rng.choice(['SD1.5', 'SDXL']), trigger_words=[rng.choice(words)],
+                     tags=rng.sample(words, 8))
+        loras.setdefault(item['folder'], []).append(item)
+
+    index = ModelSearchIndex()
+    started = time.perf_counter()
+    index.rebuild({'loras': loras})
+    print(f"   인덱스 구축: {time.perf_counter() - started:.2f}s, {index.get_stats()}")
+    assert len(index) == 20000
+
+    queries = [rng.choice(words) for _ in range(100)] + [rng.choice(words)[:3] for _ in range(100)] + \
+              [rng.choice(words)[:-1] + 'q' for _ in range(100)]
+    started = time.perf_counter()
+    for query in queries:
+        index.search(query, model_type='loras')
+    per_query_ms = (time.perf_counter() - started) * 1000 / len(queries)
+    print(f"   검색 평균: {per_query_ms:.3f}ms")
+    assert per_query_ms < 5.0  # CI 편차를 감안한 상한 (일반적으로 1ms 미만)
+    print("✅ 모델 검색 속도 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_lora_keywords()
+    test_search_index()
+    test_search_speed()
+    print("\n🎉 모델 검색 인덱스 테스트 성공!")
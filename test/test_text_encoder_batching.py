@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""텍스트 인코더 묶음 forward 테스트 스크립트 (행마다 따로 인코딩하던 기존 방식과 결과 비교)"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from src.nicediff.domains.generation.services.advanced_encoder import AdvancedTextEncoder
+
+
+class TextEncoder(torch.nn.Module):
+    """행끼리 섞이지 않는 작은 인코더 (임베딩 + causal 누적 평균 + 선형)"""
+
+    def __init__(self, vocab: int = 500, dim: int = 16):
+        super().__init__()
+        torch.manual_seed(0)
+        self.embedding = torch.nn.Embedding(vocab, dim)
+        self.linear = torch.nn.Linear(dim, dim)
+        self.calls = 0
+
+    @property
+    def device(self):
+        return self.linear.weight.device
+
+    def forward(self, input_ids):
+        self.calls += 1
+        hidden = self.embedding(input_ids)
+        counts = torch.arange(1, input_ids.shape[1] + 1, dtype=hidden.dtype).reshape(1, -1, 1)
+        return (self.linear(hidden.cumsum(dim=1) / counts),)
+
+
+def make_encoder(weight_mode: str) -> AdvancedTextEncoder:
+    tokenizer = SimpleNamespace(bos_token_id=1, eos_token_id=2, pad_token_id=0)
+    return AdvancedTextEncoder(SimpleNamespace(tokenizer=tokenizer, text_encoder=TextEncoder()), weight_mode=weight_mode)
+
+
+def reference_encode(encoder: AdvancedTextEncoder, rows) -> torch.Tensor:
+    """기존 방식: 청크마다 forward 한 번 + 텐서 전체 기준 가중치 적용 후 평균"""
+    chunks = []
+    for tokens, weights, word_ids in rows:
+        with torch.no_grad():
+            emb = encoder.text_encoder(torch.tensor([tokens]))[0]
+        if encoder.weight_mode == "A1111":
+            weighted = emb * torch.tensor(weights).reshape(1, -1, 1)
+            norm_weighted = torch.linalg.norm(weighted)
+            emb = (torch.linalg.norm(emb) / norm_weighted) * weighted if norm_weighted > 0 else weighted
+        elif encoder.weight_mode == "comfy++":
+            normalized = encoder.divide_length([word_ids], [weights])[0]
+            weighted = emb * torch.tensor(normalized, dtype=emb.dtype).reshape(1, -1, 1)
+            fixed_std = (emb.std() / weighted.std()) * (weighted - weighted.mean())
+            emb = fixed_std + (emb.mean() - fixed_std.mean())
+        chunks.append(emb)
+    return chunks[0] if len(chunks) == 1 else torch.mean(torch.stack(chunks), dim=0)
+
+
+def long_prompt(seed: int, length: int):
+    generator = torch.Generator().manual_seed(seed)
+    tokens = torch.randint(3, 500, (length,), generator=generator).tolist()
+    weights = [1.0 + 0.1 * (i % 5 - 2) for i in range(length)]
+    word_ids = [1 + i // 2 for i in range(length)]
+    return tokens, weights, word_ids
+
+
+def test_batched_matches_sequential():
+    """긍정/부정 프롬프트의 모든 청크를 한 번에 인코딩해도 기존 결과와 같음"""
+    print("🔍 묶음 forward 결과 비교 테스트...")
+    for weight_mode in ("A1111", "comfy++", "none"):
+        encoder = make_encoder(weight_mode)
+        prompts = [encoder._chunk_rows(*long_prompt(0, 320), chunk_size=77),
+                   encoder._chunk_rows(*long_prompt(1, 90), chunk_size=77)]
+        expected = [reference_encode(encoder, rows) for rows in prompts]
+
+        encoder.text_encoder.calls = 0
+        batched = encoder._encode_prompt_rows(prompts)
+        assert encoder.text_encoder.calls == 1
+        for actual, reference in zip(batched, expected):
+            assert actual.shape == reference.shape == (1, 77, 16)
+            assert torch.allclose(actual, reference, atol=1e-6), weight_mode
+    print("✅ 묶음 forward 결과 비교 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_batched_matches_sequential()
+    print("\n🎉 텍스트 인코더 묶음 forward 테스트 성공!")
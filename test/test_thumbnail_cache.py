@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""미리보기 썸네일 캐시 테스트 스크립트"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.services.thumbnail_cache import ThumbnailCache
+
+
+def test_thumbnail_cache():
+    """큰 PNG가 작은 썸네일로 변환되고, 원본이 바뀌면 새 이름을 받는지 확인"""
+    print("🔍 썸네일 캐시 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / 'model.png'
+        Image.effect_noise((1536, 1024), 64).convert('RGB').save(source)
+
+        cache = ThumbnailCache(cache_dir=str(tmp_path / '.thumbnails'), max_size=256)
+        try:
+            url = cache.get_url(source)
+            assert url.startswith(ThumbnailCache.ROUTE + '/')
+            name = url.rsplit('/', 1)[-1]
+
+            thumbnail_path = asyncio.run(cache.get_or_create(name))
+            assert thumbnail_path is not None and thumbnail_path.exists()
+            with Image.open(thumbnail_path) as thumb:
+                assert max(thumb.size) == 256
+                assert thumb.size == (256, 171)
+            assert thumbnail_path.stat().st_size < source.stat().st_size / 10
+
+            # 모르는 이름 / 경로 조작은 거부
+            assert asyncio.run(cache.get_or_create('0' * 24 + cache.extension)) is None
+            assert asyncio.run(cache.get_or_create('../' + name)) is None
+
+            # 원본 mtime이 바뀌면 새 이름, 오래된 썸네일은 prune으로 삭제
+            stat_result = source.stat()
+            os.utime(source, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+            new_names = cache.prewarm([source, tmp_path / 'missing.png'])
+            assert len(new_names) == 1 and name not in new_names
+            new_name = next(iter(new_names))
+            assert asyncio.run(cache.get_or_create(new_name)) is not None
+
+            assert cache.prune(new_names) == 1
+            assert not thumbnail_path.exists()
+            assert cache.path_for(new_name).exists()
+        finally:
+            cache.shutdown()
+    print("✅ 썸네일 캐시 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_thumbnail_cache()
+    print("\n🎉 썸네일 캐시 테스트 성공!")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""VAE 레지스트리 테스트 스크립트 (CPU 전용, 작은 AutoencoderKL 사용)"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from diffusers import AutoencoderKL
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.vae_registry import VaeRegistry
+
+
+def _save_tiny_vae(folder: Path) -> str:
+    vae = AutoencoderKL(
+        block_out_channels=[8], in_channels=3, out_channels=3, latent_channels=4, norm_num_groups=4,
+        down_block_types=['DownEncoderBlock2D'], up_block_types=['UpDecoderBlock2D'],
+    )
+    vae.save_pretrained(str(folder))
+    return str(folder)
+
+
+def test_vae_registry():
+    """같은 VAE는 다시 로드하지 않고 같은 모듈 반환, 최대 개수 초과 시 LRU 제거"""
+    print("🔍 VAE 레지스트리 테스트...")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [_save_tiny_vae(Path(tmp) / f'vae_{i}') for i in range(3)]
+        registry = VaeRegistry('cpu', max_entries=2)
+
+        first = registry.get(paths[0])
+        assert first.dtype == torch.float16
+        started = time.perf_counter()
+        assert registry.get(paths[0]) is first  # 디스크 I/O 없이 참조만 반환
+        assert time.perf_counter() - started < 0.05
+
+        # SDXL용은 scaling_factor가 달라 별도 항목
+        sdxl = registry.get(paths[0], model_type='SDXL')
+        assert sdxl is not first
+
+        registry.get(paths[1])  # 가장 오래된 paths[0](SD15)만 제거
+        assert registry.cache_key(paths[0]) not in registry
+        assert registry.cache_key(paths[0], 'SDXL') in registry
+        stats = registry.get_stats()
+        assert (stats['entries'], stats['hits'], stats['misses']) == (2, 1, 3)
+
+        registry.clear()
+        assert registry.get_stats()['entries'] == 0
+    print("✅ VAE 레지스트리 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_vae_registry()
+    print("\n🎉 VAE 레지스트리 테스트 성공!")
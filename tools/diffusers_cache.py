@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""변환된 파이프라인 캐시 관리 도구
+
+from_single_file 변환 결과(diffusers 형식) 디스크 캐시를 조회/정리하거나
+체크포인트를 미리 변환해 둡니다. 기본 경로/용량은 config.toml의 [converted_cache]를 따릅니다.
+
+사용 예:
+    python tools/diffusers_cache.py list
+    python tools/diffusers_cache.py prune --max-size-gb 10
+    python tools/diffusers_cache.py warm models/checkpoints/*.safetensors
+    python tools/diffusers_cache.py clear
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nicediff.domains.generation.services.converted_pipeline_cache import ConvertedPipelineCache
+
+
+def load_cache_config() -> dict:
+    config_path = Path('config.toml')
+    if not config_path.exists():
+        return {}
+    with open(config_path, 'rb') as f:
+        return tomllib.load(f).get('converted_cache', {})
+
+
+def cmd_list(cache: ConvertedPipelineCache, args):
+    entries = cache.entries()
+    if not entries:
+        print("캐시가 비어 있습니다.")
+        return
+    print(f"{'key':<48} {'size (GB)':>9}  {'last used':<16}  source")
+    for meta in entries:
+        last_used = datetime.fromtimestamp(meta['last_used']).strftime('%Y-%m-%d %H:%M')
+        print(f"{meta['key']:<48} {meta.get('size_bytes', 0) / 1024 ** 3:>9.2f}  {last_used:<16}  {meta.get('source') or '-'}")
+    total = sum(meta.get('size_bytes', 0) for meta in entries)
+    limit = f"{cache.max_size_bytes / 1024 ** 3:.1f}GB" if cache.max_size_bytes else '없음'
+    print(f"\n총 {len(entries)}개, {total / 1024 ** 3:.2f}GB (상한: {limit})")
+
+
+def cmd_prune(cache: ConvertedPipelineCache, args):
+    max_size_bytes = int(args.max_size_gb * 1024 ** 3) if args.max_size_gb is not None else None
+    removed = cache.prune(max_size_bytes=max_size_bytes)
+    print(f"삭제: {len(removed)}개")
+    for key in removed:
+        print(f"  - {key}")
+
+
+def cmd_clear(cache: ConvertedPipelineCache, args):
+    print(f"삭제: {cache.clear()}개")
+
+
+def cmd_warm(cache: ConvertedPipelineCache, args):
+    # torch/diffusers가 필요한 명령만 지연 임포트
+    import torch
+    from src.nicediff.domains.generation.services.model_loader import ModelLoader
+    from src.nicediff.services.metadata_parser import MetadataParser
+
+    loader = ModelLoader('cpu', cache_config={'max_entries': 1})
+    loader.converted_cache = cache
+    dtype = {'fp16': torch.float16, 'bf16': torch.bfloat16, 'fp32': torch.float32}[args.dtype]
+    for model_path in args.checkpoints:
+        model_type = args.model_type
+        if model_type == 'auto':
+            model_type, _ = MetadataParser.detect_model_type(Path(model_path))
+        pipeline_class = 'StableDiffusionXLPipeline' if model_type == 'SDXL' else 'StableDiffusionPipeline'
+        key = cache.make_key(Path(model_path), pipeline_class, dtype)
+        if cache.lookup(key) is not None:
+            print(f"✅ 이미 캐시됨: {model_path}")
+            continue
+        print(f"🔧 변환 중 ({model_type}, {args.dtype}): {model_path}")
+        loader.build_pipeline(model_path, model_type, dtype)
+
+
+def main():
+    cache_config = load_cache_config()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cache-dir', default=cache_config.get('cache_dir', 'models/.diffusers_cache'))
+    parser.add_argument('--limit-gb', type=float, default=cache_config.get('max_size_gb', 20.0), help='캐시 용량 상한')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='캐시 항목 목록')
+    prune_parser = subparsers.add_parser('prune', help='용량 상한에 맞게 오래된 항목 삭제')
+    prune_parser.add_argument('--max-size-gb', type=float, default=None, help='이번 정리에만 쓸 상한 (기본: --limit-gb)')
+    subparsers.add_parser('clear', help='모든 항목 삭제')
+    warm_parser = subparsers.add_parser('warm', help='체크포인트를 미리 변환해 캐시에 저장')
+    warm_parser.add_argument('checkpoints', nargs='+')
+    warm_parser.add_argument('--model-type', choices=['auto', 'SD15', 'SDXL'], default='auto')
+    warm_parser.add_argument('--dtype', choices=['fp16', 'bf16', 'fp32'], default='fp16')
+    args = parser.parse_args()
+
+    cache = ConvertedPipelineCache(args.cache_dir, args.limit_gb)
+    {'list': cmd_list, 'prune': cmd_prune, 'clear': cmd_clear, 'warm': cmd_warm}[args.command](cache, args)
+
+
+if __name__ == '__main__':
+    main()
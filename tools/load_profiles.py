@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""모델 로드 계측 로그 조회 도구
+
+StateManager가 남기는 로드 단계별 롤링 로그(JSONL)를 읽어 최근 로드를 보여 주거나
+모델/라이브러리 버전별로 단계 시간(median)을 비교합니다. 기본 경로는 config.toml의 [loading] profile_log를 따릅니다.
+
+사용 예:
+    python tools/load_profiles.py list --limit 10
+    python tools/load_profiles.py compare --by model
+    python tools/load_profiles.py compare --by versions --model myModel
+"""
+
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+
+def load_log_path() -> str:
+    config_path = Path('config.toml')
+    if config_path.exists():
+        with open(config_path, 'rb') as f:
+            return tomllib.load(f).get('loading', {}).get('profile_log', 'logs/model_load_profiles.jsonl')
+    return 'logs/model_load_profiles.jsonl'
+
+
+def read_records(log_path: Path, model: str = None) -> list:
+    records = []
+    if not log_path.exists():
+        return records
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if model is None or model.lower() in record.get('model', '').lower():
+                records.append(record)
+    return records
+
+
+def load_path_label(record: dict) -> str:
+    if record.get('cache_hit'):
+        return 'cache'
+    if record.get('prebuilt'):
+        return 'prebuilt'
+    return record.get('loader', '-')
+
+
+def cmd_list(records: list, args):
+    print(f"{'time':<19}  {'model':<32} {'path':<11} {'total (s)':>9}  phases")
+    for record in records[-args.limit:]:
+        phases = ', '.join(f"{phase['name']} {phase['seconds']:.2f}" for phase in record.get('phases', []))
+        status = '' if record.get('success', True) else ' ❌'
+        print(f"{record.get('timestamp', ''):<19}  {record.get('model', '')[:32]:<32} {load_path_label(record):<11} "
+              f"{record.get('total_seconds', 0):>9.2f}  {phases}{status}")
+
+
+def cmd_compare(records: list, args):
+    groups = defaultdict(list)
+    for record in records:
+        if not record.get('success', True):
+            continue
+        if args.by == 'model':
+            label = f"{record.get('model', '')} [{load_path_label(record)}]"
+        else:
+            versions = record.get('versions', {})
+            label = f"torch {versions.get('torch')} / diffusers {versions.get('diffusers')} [{load_path_label(record)}]"
+        groups[label].append(record)
+
+    for label, group in sorted(groups.items()):
+        phase_times = defaultdict(list)
+        for record in group:
+            for phase in record.get('phases', []):
+                phase_times[phase['name']].append(phase['seconds'])
+        total = statistics.median(record.get('total_seconds', 0) for record in group)
+        print(f"\n{label}: {len(group)}회, 전체 median {total:.2f}s")
+        for name, times in sorted(phase_times.items(), key=lambda item: -statistics.median(item[1])):
+            print(f"  {name:<24} median {statistics.median(times):>7.2f}s  max {max(times):>7.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', default=load_log_path(), help='로드 계측 로그 경로 (JSONL)')
+    parser.add_argument('--model', default=None, help='모델 이름 필터 (부분 일치)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help='최근 로드 기록')
+    list_parser.add_argument('--limit', type=int, default=20)
+    compare_parser = subparsers.add_parser('compare', help='단계별 시간 비교 (median)')
+    compare_parser.add_argument('--by', choices=['model', 'versions'], default='model')
+    args = parser.parse_args()
+
+    records = read_records(Path(args.log), args.model)
+    if not records:
+        print(f"기록이 없습니다: {args.log}")
+        return
+    {'list': cmd_list, 'compare': cmd_compare}[args.command](records, args)
+
+
+if __name__ == '__main__':
+    main()